@@ -0,0 +1,491 @@
+# 🗄️ STANDISH - Advisor Store
+# SQLite persistence for meeting transcripts, recommendation history, document requests,
+# commitments and the pension contribution ledger, with FTS5 full-text search over transcript and rationale text.
+# Shares advisor_data.db with the data manager; runs in WAL mode so every Streamlit
+# session can read while another writes.
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meeting_transcripts (
+    id INTEGER PRIMARY KEY,
+    meeting_id TEXT NOT NULL UNIQUE,
+    client TEXT NOT NULL,
+    date TEXT NOT NULL,
+    attendees TEXT NOT NULL DEFAULT '[]',
+    duration TEXT,
+    transcript TEXT NOT NULL DEFAULT '',
+    key_concerns TEXT NOT NULL DEFAULT '[]',
+    action_items TEXT NOT NULL DEFAULT '[]',
+    sentiment TEXT
+);
+CREATE INDEX IF NOT EXISTS meeting_transcripts_client_date ON meeting_transcripts (client COLLATE NOCASE, date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS meeting_transcripts_fts USING fts5(
+    transcript, key_concerns, action_items,
+    content='meeting_transcripts', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS meeting_transcripts_ai AFTER INSERT ON meeting_transcripts BEGIN
+    INSERT INTO meeting_transcripts_fts (rowid, transcript, key_concerns, action_items)
+    VALUES (new.id, new.transcript, new.key_concerns, new.action_items);
+END;
+CREATE TRIGGER IF NOT EXISTS meeting_transcripts_ad AFTER DELETE ON meeting_transcripts BEGIN
+    INSERT INTO meeting_transcripts_fts (meeting_transcripts_fts, rowid, transcript, key_concerns, action_items)
+    VALUES ('delete', old.id, old.transcript, old.key_concerns, old.action_items);
+END;
+CREATE TRIGGER IF NOT EXISTS meeting_transcripts_au AFTER UPDATE ON meeting_transcripts BEGIN
+    INSERT INTO meeting_transcripts_fts (meeting_transcripts_fts, rowid, transcript, key_concerns, action_items)
+    VALUES ('delete', old.id, old.transcript, old.key_concerns, old.action_items);
+    INSERT INTO meeting_transcripts_fts (rowid, transcript, key_concerns, action_items)
+    VALUES (new.id, new.transcript, new.key_concerns, new.action_items);
+END;
+
+CREATE TABLE IF NOT EXISTS recommendation_history (
+    id INTEGER PRIMARY KEY,
+    client TEXT NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    platform TEXT,
+    status TEXT,
+    rationale TEXT NOT NULL DEFAULT '',
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recommendation_history_client ON recommendation_history (client COLLATE NOCASE, date);
+CREATE INDEX IF NOT EXISTS recommendation_history_status ON recommendation_history (status);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS recommendation_history_fts USING fts5(
+    type, rationale,
+    content='recommendation_history', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS recommendation_history_ai AFTER INSERT ON recommendation_history BEGIN
+    INSERT INTO recommendation_history_fts (rowid, type, rationale) VALUES (new.id, new.type, new.rationale);
+END;
+CREATE TRIGGER IF NOT EXISTS recommendation_history_ad AFTER DELETE ON recommendation_history BEGIN
+    INSERT INTO recommendation_history_fts (recommendation_history_fts, rowid, type, rationale)
+    VALUES ('delete', old.id, old.type, old.rationale);
+END;
+CREATE TRIGGER IF NOT EXISTS recommendation_history_au AFTER UPDATE ON recommendation_history BEGIN
+    INSERT INTO recommendation_history_fts (recommendation_history_fts, rowid, type, rationale)
+    VALUES ('delete', old.id, old.type, old.rationale);
+    INSERT INTO recommendation_history_fts (rowid, type, rationale) VALUES (new.id, new.type, new.rationale);
+END;
+
+CREATE TABLE IF NOT EXISTS document_requests (
+    id INTEGER PRIMARY KEY,
+    client TEXT NOT NULL,
+    document TEXT NOT NULL,
+    requested_date TEXT,
+    status TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS document_requests_status ON document_requests (status, client);
+
+CREATE TABLE IF NOT EXISTS client_commitments (
+    id INTEGER PRIMARY KEY,
+    client TEXT NOT NULL,
+    promise TEXT NOT NULL,
+    due_date TEXT,
+    status TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS client_commitments_status ON client_commitments (status, client);
+
+CREATE TABLE IF NOT EXISTS pension_contributions (
+    id INTEGER PRIMARY KEY,
+    client TEXT NOT NULL,
+    date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS pension_contributions_client_date ON pension_contributions (client, date);
+
+CREATE TABLE IF NOT EXISTS pension_income (
+    client TEXT NOT NULL,
+    tax_year INTEGER NOT NULL,
+    threshold_income REAL,
+    adjusted_income REAL,
+    PRIMARY KEY (client, tax_year)
+);
+"""
+
+# Data domains kept here, by table. Triggers count every write to each domain in store_meta,
+# so caches in other sessions and processes sharing the file can tell they are stale
+DOMAIN_TABLES = {
+    "meetings": ("meeting_transcripts",),
+    "recommendations": ("recommendation_history",),
+    "documents": ("document_requests",),
+    "commitments": ("client_commitments",),
+    "pensions": ("pension_contributions", "pension_income")
+}
+
+VERSION_SCHEMA = "".join(
+    f"INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version:{domain}', 0);\n" + "".join(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_{event[0].lower()} AFTER {event} ON {table} BEGIN\n"
+        f"    UPDATE store_meta SET value = value + 1 WHERE key = 'version:{domain}';\nEND;\n"
+        for table in tables for event in ("INSERT", "UPDATE", "DELETE"))
+    for domain, tables in DOMAIN_TABLES.items()
+)
+
+# Optional filters are bound as NULL when unused so each query stays one cached statement
+SEARCH_MEETINGS = """
+SELECT m.*, bm25(meeting_transcripts_fts) AS score
+FROM meeting_transcripts_fts
+JOIN meeting_transcripts m ON m.id = meeting_transcripts_fts.rowid
+WHERE meeting_transcripts_fts MATCH :match
+  AND (:client IS NULL OR m.client = :client COLLATE NOCASE)
+  AND (:date_from IS NULL OR m.date >= :date_from)
+  AND (:date_to IS NULL OR m.date <= :date_to)
+ORDER BY score, m.id
+LIMIT :limit
+"""
+
+LIST_MEETINGS = """
+SELECT m.*, 0.0 AS score FROM meeting_transcripts m
+WHERE (:client IS NULL OR m.client = :client COLLATE NOCASE)
+  AND (:date_from IS NULL OR m.date >= :date_from)
+  AND (:date_to IS NULL OR m.date <= :date_to)
+ORDER BY m.id
+LIMIT :limit
+"""
+
+SEARCH_RECOMMENDATIONS = """
+SELECT r.client, r.details, bm25(recommendation_history_fts) AS score
+FROM recommendation_history_fts
+JOIN recommendation_history r ON r.id = recommendation_history_fts.rowid
+WHERE recommendation_history_fts MATCH :match
+  AND (:client IS NULL OR r.client = :client COLLATE NOCASE)
+ORDER BY score, r.id
+LIMIT :limit
+"""
+
+# Contributions totalled per client and UK tax year (6 April to 5 April, named by its first year)
+PENSION_CONTRIBUTIONS_BY_TAX_YEAR = """
+SELECT client,
+       CAST(substr(date, 1, 4) AS INTEGER) - (substr(date, 6, 5) < '04-06') AS tax_year,
+       SUM(amount) AS amount
+FROM pension_contributions
+GROUP BY client, tax_year
+ORDER BY MIN(id), tax_year
+"""
+
+def fts_query(terms=(), phrases=()):
+    """
+    FTS5 MATCH expression: every phrase is required, loose terms are alternatives
+    (OR-ed together with the first phrase so they only add to the bm25 score).
+    """
+    def quote(words):
+        text = " ".join(words) if isinstance(words, (list, tuple)) else words
+        return '"' + text.replace('"', '""') + '"'
+
+    required = [quote(phrase) for phrase in phrases]
+    optional = [quote(term) for term in terms]
+    if not required:
+        return " OR ".join(optional)
+    if not optional:
+        return " AND ".join(required)
+    return " AND ".join(required + [f"({' OR '.join([required[0]] + optional)})"])
+
+class AdvisorStore:
+    """
+    Thin data-access layer over SQLite. Each thread gets its own connection;
+    all statements are parameterized constants so sqlite3's statement cache
+    reuses them. Callers bump the matching in-process data version after
+    writes; versions() counts the writes to each domain's tables from every
+    connection, including other processes.
+
+    Nothing touches the file until the first query: the schema is created
+    and the on_open seeders run then, falling back to the fallback database
+    (recording the error) when path cannot be opened.
+    """
+
+    def __init__(self, path="advisor_data.db", fallback=None):
+        self.path = str(path)
+        self._uri = self.path.startswith("file:")
+        self.fallback = fallback
+        self.error = None           # why path could not be opened, when the fallback is in use
+        self._local = threading.local()
+        self._keepalive = None      # keeps a shared in-memory database alive
+        self._seeders = []
+        self._ready = False
+        self._open_lock = threading.RLock()
+
+    def on_open(self, seeder):
+        """Run seeder(store) once, when the database is first used (before any other access)"""
+        self._seeders.append(seeder)
+        return seeder
+
+    def _open(self):
+        """Create the schema and run the seeders; other threads wait until they finish"""
+        with self._open_lock:
+            if self._keepalive is not None:
+                return              # already open, or this thread is running the seeders
+            try:
+                keepalive = self._connect()
+                with keepalive:
+                    keepalive.executescript(SCHEMA + VERSION_SCHEMA)
+            except sqlite3.Error as e:
+                if self.fallback is None:
+                    raise
+                self.error = e
+                self.path = str(self.fallback)
+                self._uri = self.path.startswith("file:")
+                keepalive = self._connect()
+                with keepalive:
+                    keepalive.executescript(SCHEMA + VERSION_SCHEMA)
+            self._keepalive = keepalive
+            try:
+                for seeder in self._seeders:
+                    seeder(self)
+            except Exception:
+                self.close()
+                raise
+            self._ready = True
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, uri=self._uri, cached_statements=256)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    @property
+    def connection(self):
+        if not self._ready:
+            self._open()
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """Commit on success, roll back on error"""
+        connection = self.connection
+        with connection:
+            yield connection
+
+    def versions(self):
+        """{data domain: writes to its tables so far}, from any connection"""
+        rows = self.connection.execute("SELECT key, value FROM store_meta WHERE key LIKE 'version:%'")
+        return {row["key"][len("version:"):]: int(row["value"]) for row in rows}
+
+    def _select(self, table, statuses=None, client=None, platform=None):
+        """[(client, record)] from one of the JSON-detail tables, filtered in SQL, in insertion order"""
+        conditions = ["(? IS NULL OR client = ? COLLATE NOCASE)"]
+        params = [client, client]
+        if statuses is not None:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if platform is not None:
+            conditions.append("platform = ?")
+            params.append(platform)
+        rows = self.connection.execute(
+            f"SELECT client, details FROM {table} WHERE {' AND '.join(conditions)} ORDER BY id", params
+        )
+        return [(row["client"], json.loads(row["details"])) for row in rows]
+
+    # ----- seeding -----
+
+    def seed(self, recommendations=None, meetings=None, documents=None, commitments=None):
+        """Load the demo stores once, the first time this database is used"""
+        with self.transaction() as connection:
+            if connection.execute("SELECT 1 FROM store_meta WHERE key = 'seeded'").fetchone():
+                return False
+            for client, recs in (recommendations or {}).items():
+                for rec in recs:
+                    self._insert_recommendation(connection, client, rec)
+            for meeting_id, meeting in (meetings or {}).items():
+                self._upsert_meeting(connection, meeting_id, meeting)
+            for client, data in (documents or {}).items():
+                for doc in data.get('requested', []):
+                    self._insert_document(connection, client, doc)
+            for client, items in (commitments or {}).items():
+                for commitment in items:
+                    self._insert_commitment(connection, client, commitment)
+            connection.execute("INSERT INTO store_meta (key, value) VALUES ('seeded', datetime('now'))")
+        return True
+
+    # ----- meeting transcripts -----
+
+    def _upsert_meeting(self, connection, meeting_id, meeting):
+        connection.execute(
+            """INSERT INTO meeting_transcripts
+               (meeting_id, client, date, attendees, duration, transcript, key_concerns, action_items, sentiment)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (meeting_id) DO UPDATE SET
+                   client = excluded.client, date = excluded.date, attendees = excluded.attendees,
+                   duration = excluded.duration, transcript = excluded.transcript,
+                   key_concerns = excluded.key_concerns, action_items = excluded.action_items,
+                   sentiment = excluded.sentiment""",
+            (meeting_id, meeting.get('client', ''), str(meeting.get('date', '')),
+             json.dumps(meeting.get('attendees', [])), meeting.get('duration'), meeting.get('transcript', ''),
+             json.dumps(meeting.get('key_concerns', [])), json.dumps(meeting.get('action_items', [])),
+             meeting.get('sentiment'))
+        )
+
+    def add_meeting(self, meeting_id, meeting):
+        """Insert or replace a meeting record"""
+        with self.transaction() as connection:
+            self._upsert_meeting(connection, meeting_id, meeting)
+
+    @staticmethod
+    def _meeting(row):
+        meeting = {
+            "id": row["meeting_id"],
+            "date": row["date"],
+            "client": row["client"],
+            "attendees": json.loads(row["attendees"]),
+            "duration": row["duration"],
+            "transcript": row["transcript"],
+            "key_concerns": json.loads(row["key_concerns"]),
+            "action_items": json.loads(row["action_items"]),
+            "sentiment": row["sentiment"]
+        }
+        if "score" in row.keys():
+            meeting["score"] = -row["score"]
+        return meeting
+
+    def meeting_clients(self):
+        """Distinct meeting clients in first-seen order"""
+        rows = self.connection.execute(
+            "SELECT client FROM meeting_transcripts GROUP BY client COLLATE NOCASE ORDER BY MIN(id)"
+        )
+        return [row["client"] for row in rows]
+
+    def meetings(self):
+        """Every meeting in insertion order, read lazily"""
+        for row in self.connection.execute("SELECT * FROM meeting_transcripts ORDER BY id"):
+            yield self._meeting(row)
+
+    def meeting_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM meeting_transcripts").fetchone()[0]
+
+    def search_meetings(self, terms=(), phrases=(), client=None, date_from=None, date_to=None, limit=10):
+        """
+        Meetings matching the terms / phrases ranked by FTS5 bm25 (best first), or
+        every meeting passing the filters in insertion order when nothing is searched.
+        """
+        params = {"client": client, "date_from": date_from, "date_to": date_to, "limit": limit}
+        match = fts_query(terms, phrases)
+        if match:
+            rows = self.connection.execute(SEARCH_MEETINGS, {**params, "match": match})
+        else:
+            rows = self.connection.execute(LIST_MEETINGS, params)
+        return [self._meeting(row) for row in rows]
+
+    # ----- recommendation history -----
+
+    def _insert_recommendation(self, connection, client, rec):
+        connection.execute(
+            """INSERT INTO recommendation_history (client, date, type, platform, status, rationale, details)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (client, rec.get('date', ''), rec.get('type', ''), rec.get('platform'), rec.get('status'),
+             rec.get('rationale', ''), json.dumps(rec))
+        )
+
+    def recommendations(self, client=None, platform=None, statuses=None):
+        """[(client, recommendation)] in the order they were recorded"""
+        return self._select("recommendation_history", statuses, client, platform=platform)
+
+    def recommendation_counts(self):
+        """[(client, number of recommendations)] in first-seen order"""
+        rows = self.connection.execute(
+            "SELECT client, COUNT(*) AS n FROM recommendation_history GROUP BY client ORDER BY MIN(id)"
+        )
+        return [(row["client"], row["n"]) for row in rows]
+
+    def recommendation_clients(self):
+        return [client for client, _ in self.recommendation_counts()]
+
+    def search_recommendations(self, terms=(), phrases=(), client=None, limit=10):
+        """[(client, recommendation, score)] whose type or rationale match, best first"""
+        match = fts_query(terms, phrases)
+        if not match:
+            return []
+        rows = self.connection.execute(SEARCH_RECOMMENDATIONS, {"match": match, "client": client, "limit": limit})
+        return [(row["client"], json.loads(row["details"]), -row["score"]) for row in rows]
+
+    # ----- document requests -----
+
+    def _insert_document(self, connection, client, doc):
+        connection.execute(
+            "INSERT INTO document_requests (client, document, requested_date, status, details) VALUES (?, ?, ?, ?, ?)",
+            (client, doc.get('document', ''), doc.get('requested_date'), doc.get('status', 'Pending'), json.dumps(doc))
+        )
+
+    def documents(self, statuses=None, client=None):
+        """[(client, document request)] optionally limited to the given statuses"""
+        return self._select("document_requests", statuses, client)
+
+    # ----- commitments -----
+
+    def _insert_commitment(self, connection, client, commitment):
+        connection.execute(
+            "INSERT INTO client_commitments (client, promise, due_date, status, details) VALUES (?, ?, ?, ?, ?)",
+            (client, commitment.get('promise', ''), commitment.get('due_date'), commitment.get('status', 'Pending'),
+             json.dumps(commitment))
+        )
+
+    def commitments(self, statuses=None, client=None):
+        """[(client, commitment)] optionally limited to the given statuses"""
+        return self._select("client_commitments", statuses, client)
+
+    def commitment_clients(self):
+        rows = self.connection.execute("SELECT client FROM client_commitments GROUP BY client ORDER BY MIN(id)")
+        return [row["client"] for row in rows]
+
+    # ----- pension contribution ledger -----
+
+    def seed_pension_ledger(self, contributions):
+        """Load [(client, date, amount)] the first time this database holds a ledger"""
+        with self.transaction() as connection:
+            if connection.execute("SELECT 1 FROM store_meta WHERE key = 'pension_ledger_seeded'").fetchone():
+                return False
+            connection.executemany("INSERT INTO pension_contributions (client, date, amount) VALUES (?, ?, ?)",
+                                   contributions)
+            connection.execute("INSERT INTO store_meta (key, value) VALUES ('pension_ledger_seeded', datetime('now'))")
+        return True
+
+    def add_pension_contribution(self, client, date, amount, source=None):
+        with self.transaction() as connection:
+            connection.execute("INSERT INTO pension_contributions (client, date, amount, source) VALUES (?, ?, ?, ?)",
+                               (client, str(date), float(amount), source))
+
+    def set_pension_income(self, client, tax_year, threshold_income=None, adjusted_income=None):
+        """Declared threshold / adjusted income for a tax year (None keeps the estimate from annual income)"""
+        with self.transaction() as connection:
+            connection.execute(
+                """INSERT INTO pension_income (client, tax_year, threshold_income, adjusted_income) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (client, tax_year) DO UPDATE SET
+                       threshold_income = excluded.threshold_income, adjusted_income = excluded.adjusted_income""",
+                (client, int(tax_year), threshold_income, adjusted_income))
+
+    def pension_contribution_totals(self):
+        """[(client, tax_year, amount)] for every client in the ledger"""
+        rows = self.connection.execute(PENSION_CONTRIBUTIONS_BY_TAX_YEAR)
+        return [(row["client"], row["tax_year"], row["amount"]) for row in rows]
+
+    def pension_incomes(self):
+        """[(client, tax_year, threshold_income, adjusted_income)]"""
+        rows = self.connection.execute("SELECT * FROM pension_income ORDER BY client, tax_year")
+        return [(row["client"], row["tax_year"], row["threshold_income"], row["adjusted_income"]) for row in rows]
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
+        self._ready = False
@@ -0,0 +1,159 @@
+# 💼 STANDISH - Allowance Model
+# Pension annual allowance behind analyze_pension_allowances: each tax year's allowance
+# (tapered from income where it applies) and the rolling three-year carry forward are
+# derived from the stored contribution ledger. Clients x tax years are NumPy arrays,
+# so the whole book is one loop over tax years.
+
+from datetime import date
+
+import numpy as np
+
+# (annual allowance, adjusted income limit, minimum tapered allowance) by first tax
+# year; years before the first row use its rules
+ALLOWANCE_RULES = (
+    (2020, 40000, 240000, 4000),
+    (2023, 60000, 260000, 10000)
+)
+THRESHOLD_INCOME = 200000
+CARRY_FORWARD_YEARS = 3
+
+def tax_year_of(day=None):
+    """Tax year containing day (2025 for 6 April 2025 to 5 April 2026)"""
+    day = day or date.today()
+    return day.year if (day.month, day.day) >= (4, 6) else day.year - 1
+
+def tax_year_label(tax_year):
+    return f"{tax_year}/{(tax_year + 1) % 100:02d}"
+
+def tax_year_end(tax_year):
+    return date(tax_year + 1, 4, 5)
+
+def allowance_rules(tax_years):
+    """(standard allowance, adjusted income limit, minimum) arrays for each tax year"""
+    tax_years = np.asarray(tax_years)
+    starts = np.array([rule[0] for rule in ALLOWANCE_RULES])
+    index = np.maximum(np.searchsorted(starts, tax_years, side="right") - 1, 0)
+    table = np.array([rule[1:] for rule in ALLOWANCE_RULES], dtype=np.float64)
+    return table[index, 0], table[index, 1], table[index, 2]
+
+def tapered_allowance(tax_years, threshold_income, adjusted_income):
+    """
+    Annual allowance after the taper: £1 less for every £2 of adjusted income
+    over the limit, down to the minimum, for clients whose threshold income
+    is over THRESHOLD_INCOME. Broadcasts over (clients, tax years).
+    """
+    standard, limit, minimum = allowance_rules(tax_years)
+    tapered = np.maximum(standard - np.maximum(adjusted_income - limit, 0) / 2, minimum)
+    return np.where(np.asarray(threshold_income) > THRESHOLD_INCOME, tapered, standard)
+
+def seed_contributions(allowances, tax_year):
+    """
+    Ledger entries [(client, date, amount)] reproducing the old precomputed
+    figures: used_this_year in tax_year, and each of the three previous
+    years (carry_forward, oldest first) contributing its allowance less the
+    unused amount.
+    """
+    entries = []
+    for client, data in allowances.items():
+        carried = list(data.get('carry_forward', []))[-CARRY_FORWARD_YEARS:]
+        first = tax_year - len(carried)
+        standard, _, _ = allowance_rules(np.arange(first, tax_year))
+        for year, allowance, unused in zip(range(first, tax_year), standard, carried):
+            entries.append((client, date(year, 4, 6).isoformat(), max(float(allowance) - unused, 0.0)))
+        entries.append((client, date(tax_year, 4, 6).isoformat(), float(data.get('used_this_year', 0))))
+    return entries
+
+class AllowanceBook:
+    """
+    Contribution ledger as (clients, tax years) columns, oldest year first
+    and ending with the current tax year. A client counts as a scheme member
+    (and so builds up carry forward) from their first year in the ledger.
+    """
+
+    def __init__(self, names, tax_years, contributions, threshold_income, adjusted_income, member):
+        self.names = list(names)
+        self.tax_years = np.asarray(tax_years)
+        self.contributions = np.asarray(contributions, dtype=np.float64)
+        self.threshold_income = np.asarray(threshold_income, dtype=np.float64)
+        self.adjusted_income = np.asarray(adjusted_income, dtype=np.float64)
+        self.member = np.asarray(member, dtype=bool)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_ledger(cls, totals, incomes=(), annual_income=None, current_year=None):
+        """
+        Columns from [(client, tax_year, amount)] contribution totals and
+        [(client, tax_year, threshold_income, adjusted_income)] declared
+        incomes. Years without a declared income use the client's
+        annual_income as threshold income, plus that year's contributions
+        for adjusted income.
+        """
+        current_year = tax_year_of() if current_year is None else current_year
+        annual_income = annual_income or {}
+        clients, years, amounts = zip(*totals) if totals else ((), (), ())
+        names = list(dict.fromkeys(clients))
+        row = {name: i for i, name in enumerate(names)}
+        rows = np.array([row[client] for client in clients], dtype=np.intp)
+        years = np.array(years, dtype=np.int64)
+        tax_years = np.arange(min(years.min(initial=current_year), current_year), current_year + 1)
+        shape = (len(names), len(tax_years))
+
+        contributions = np.zeros(shape)
+        counted = years <= current_year
+        np.add.at(contributions, (rows[counted], years[counted] - tax_years[0]), np.array(amounts, dtype=np.float64)[counted])
+        first = np.full(len(names), current_year)
+        np.minimum.at(first, rows, years)
+
+        income = np.array([float(annual_income.get(name) or 0) for name in names])
+        threshold = np.broadcast_to(income[:, None], shape).copy()
+        adjusted = threshold + contributions
+        for client, year, threshold_income, adjusted_income in incomes:
+            if client in row and tax_years[0] <= year <= current_year:
+                if threshold_income is not None:
+                    threshold[row[client], year - tax_years[0]] = threshold_income
+                if adjusted_income is not None:
+                    adjusted[row[client], year - tax_years[0]] = adjusted_income
+        return cls(names, tax_years, contributions, threshold, adjusted, tax_years[None, :] >= first[:, None])
+
+def allowance_position(book):
+    """
+    Current tax year position for every client in one pass over the ledger.
+
+    Each year's contributions use that year's allowance first, then unused
+    allowance from the previous three years, oldest first; anything beyond
+    is an excess. Unused allowance older than three years lapses. Returns
+    (clients,) arrays "allowance" (this year, after any taper), "used"
+    (contributions this year), "carry_forward" (clients, 3) unused
+    allowance brought into this year, oldest first, "remaining" (still
+    available before the tax year ends), "expiring" (the part of remaining
+    that lapses at the end of this tax year), "excess" (contributions over
+    everything available, this year) and "tapered" (allowance below standard).
+    """
+    allowance = tapered_allowance(book.tax_years[None, :], book.threshold_income, book.adjusted_income)
+    allowance = np.where(book.member, allowance, 0.0)
+    carry = np.zeros((len(book), CARRY_FORWARD_YEARS))
+    for year in range(len(book.tax_years)):
+        brought_forward = carry.copy()
+        paid = book.contributions[:, year]
+        unused = np.maximum(allowance[:, year] - paid, 0.0)
+        over = np.maximum(paid - allowance[:, year], 0.0)
+        for oldest in range(CARRY_FORWARD_YEARS):
+            used = np.minimum(over, carry[:, oldest])
+            carry[:, oldest] -= used
+            over -= used
+        excess = over
+        after = carry
+        carry = np.hstack([carry[:, 1:], unused[:, None]])
+
+    standard, _, _ = allowance_rules(book.tax_years[-1:])
+    return {
+        "allowance": allowance[:, -1],
+        "used": book.contributions[:, -1],
+        "carry_forward": brought_forward,
+        "remaining": unused + after.sum(axis=1),
+        "expiring": after[:, 0],
+        "excess": excess,
+        "tapered": allowance[:, -1] < standard[0]
+    }
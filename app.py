@@ -2,12 +2,26 @@
 # Automatically provides daily briefings and offers autonomous actions
 
 import streamlit as st
-from backend import get_ai_response, get_daily_briefing
+from backend import (briefing_materializer, get_ai_response_stream, get_daily_briefing, get_response_cache_stats,
+                     get_tool_result_cache_stats, get_tool_stats, invalidate_tool_results, response_cache)
 from datetime import datetime
 import time
 
 print("🚀 Starting Standish AI Assistant...")
 
+def paragraphs(stream):
+    """Stream chunks with the " | " separators tool output uses shown as paragraph breaks"""
+    pending = ""
+    for chunk in stream:
+        text = (pending + chunk).replace(" | ", "\n\n")
+        # Hold back a trailing " " or " |" in case the separator is split across chunks
+        keep = 2 if text.endswith(" |") else 1 if text.endswith(" ") else 0
+        pending = text[len(text) - keep:]
+        if len(text) > keep:
+            yield text[:len(text) - keep]
+    if pending:
+        yield pending
+
 # Configure the web page appearance
 st.set_page_config(
     page_title="🤖 Standish - AI Assistant for Financial Advisors",
@@ -59,6 +73,8 @@ st.markdown("""
 if 'briefing_shown' not in st.session_state:
     st.session_state.briefing_shown = False
     st.session_state.auto_briefing = True
+    # First session in this process starts the background briefing refresh (later calls are no-ops)
+    briefing_materializer.start_background()
 
 # Auto-show daily briefing on page load
 if not st.session_state.briefing_shown and st.session_state.auto_briefing:
@@ -86,8 +102,8 @@ if not st.session_state.briefing_shown and st.session_state.auto_briefing:
                 import backend
                 if hasattr(backend, 'data_manager') and backend.data_manager:
                     total_clients = len(backend.data_manager.get_all_clients())
-                    overdue_count = len(backend.data_manager.get_overdue_reviews())
-                    overdue_clients = backend.data_manager.get_overdue_reviews()
+                    overdue_count = len(backend.get_overdue_reviews())
+                    overdue_clients = backend.get_overdue_reviews()
                     overdue_names = ", ".join([c['name'] for c in overdue_clients[:2]]) if overdue_clients else "None"
                 else:
                     total_clients = 6
@@ -135,45 +151,42 @@ col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     if st.button("📧 Draft Follow-up Emails"):
-        with st.spinner("Drafting emails..."):
-            response = get_ai_response("Draft follow-up emails for overdue clients")
-            st.success("✅ Email drafts ready!")
-            st.write(response)
-
-            # Store for follow-up questions (both systems)
-            st.session_state['quick_action_response'] = response
-            st.session_state['quick_action_type'] = 'draft_emails'
-            # Also store for chat follow-up buttons
-            st.session_state['last_assistant_response'] = response
-            st.session_state['last_user_message'] = "Draft follow-up emails for overdue clients"
+        # Stream the answer into the page as it is generated
+        response = st.write_stream(get_ai_response_stream("Draft follow-up emails for overdue clients"))
+        st.success("✅ Email drafts ready!")
+
+        # Store for follow-up questions (both systems)
+        st.session_state['quick_action_response'] = response
+        st.session_state['quick_action_type'] = 'draft_emails'
+        # Also store for chat follow-up buttons
+        st.session_state['last_assistant_response'] = response
+        st.session_state['last_user_message'] = "Draft follow-up emails for overdue clients"
 
 with col2:
     if st.button("📅 Schedule Reviews"):
-        with st.spinner("Scheduling reviews..."):
-            response = get_ai_response("Schedule annual reviews for overdue clients")
-            st.success("✅ Reviews scheduled!")
-            st.write(response)
-
-            # Store for follow-up questions (both systems)
-            st.session_state['quick_action_response'] = response
-            st.session_state['quick_action_type'] = 'schedule_reviews'
-            # Also store for chat follow-up buttons
-            st.session_state['last_assistant_response'] = response
-            st.session_state['last_user_message'] = "Schedule annual reviews for overdue clients"
+        # Stream the answer into the page as it is generated
+        response = st.write_stream(get_ai_response_stream("Schedule annual reviews for overdue clients"))
+        st.success("✅ Reviews scheduled!")
+
+        # Store for follow-up questions (both systems)
+        st.session_state['quick_action_response'] = response
+        st.session_state['quick_action_type'] = 'schedule_reviews'
+        # Also store for chat follow-up buttons
+        st.session_state['last_assistant_response'] = response
+        st.session_state['last_user_message'] = "Schedule annual reviews for overdue clients"
 
 with col3:
     if st.button("🎯 Client Journey Status"):
-        with st.spinner("Checking client journeys..."):
-            response = get_ai_response("Show me client journey status overview")
-            st.success("✅ Journey status loaded!")
-            st.write(response)
-
-            # Store for follow-up questions (both systems)
-            st.session_state['quick_action_response'] = response
-            st.session_state['quick_action_type'] = 'client_journey'
-            # Also store for chat follow-up buttons
-            st.session_state['last_assistant_response'] = response
-            st.session_state['last_user_message'] = "Show me client journey status overview"
+        # Stream the answer into the page as it is generated
+        response = st.write_stream(get_ai_response_stream("Show me client journey status overview"))
+        st.success("✅ Journey status loaded!")
+
+        # Store for follow-up questions (both systems)
+        st.session_state['quick_action_response'] = response
+        st.session_state['quick_action_type'] = 'client_journey'
+        # Also store for chat follow-up buttons
+        st.session_state['last_assistant_response'] = response
+        st.session_state['last_user_message'] = "Show me client journey status overview"
 
 with col4:
     if st.button("🔄 Refresh Briefing"):
@@ -238,23 +251,19 @@ user_message = st.text_area("Your message:", height=100, placeholder="Type your
 
 # Handle send button click
 if st.button("📤 Send Message") and user_message:
-    with st.spinner("🤖 Processing your request..."):
-        response = get_ai_response(user_message)
-
-    # Store the conversation in session state
-    st.session_state['last_user_message'] = user_message
-    st.session_state['last_assistant_response'] = response
-
     # Display the conversation with better formatting
     st.markdown("#### **Your Request:**")
     st.markdown(f"*{user_message}*")
 
     st.markdown("#### **🤖 STANDISH Response:**")
+
+    # Stream tokens into the page as they arrive
+    response = st.write_stream(paragraphs(get_ai_response_stream(user_message)))
     st.success("Response generated successfully!")
 
-    # Format response for better display
-    response_formatted = response.replace(" | ", "\n\n")
-    st.markdown(response_formatted)
+    # Store the conversation in session state
+    st.session_state['last_user_message'] = user_message
+    st.session_state['last_assistant_response'] = response
 
 # Show interactive response buttons if STANDISH asked a question
 if 'last_assistant_response' in st.session_state and st.session_state['last_assistant_response']:
@@ -271,12 +280,10 @@ if 'last_assistant_response' in st.session_state and st.session_state['last_assi
 
         with col1:
             if st.button("✅ Yes, Please", key="chat_yes"):
-                with st.spinner("Processing your response..."):
-                    # Create contextual follow-up based on original question
-                    contextual_prompt = f"The user asked: '{user_msg}'. You responded: '{response[:200]}...'. The user said 'Yes, please proceed with that.' Please provide a specific next step or action based on the context."
-                    follow_up_response = get_ai_response(contextual_prompt)
+                # Create contextual follow-up based on original question
+                contextual_prompt = f"The user asked: '{user_msg}'. You responded: '{response[:200]}...'. The user said 'Yes, please proceed with that.' Please provide a specific next step or action based on the context."
                 st.markdown("#### **🤖 STANDISH Follow-up:**")
-                st.markdown(follow_up_response.replace(" | ", "\n\n"))
+                st.write_stream(paragraphs(get_ai_response_stream(contextual_prompt)))
                 # Clear after response
                 if 'last_assistant_response' in st.session_state:
                     del st.session_state['last_assistant_response']
@@ -295,12 +302,10 @@ if 'last_assistant_response' in st.session_state and st.session_state['last_assi
 
         with col3:
             if st.button("💡 Tell Me More", key="chat_more"):
-                with st.spinner("Processing your response..."):
-                    # Create contextual follow-up for more details
-                    contextual_prompt = f"The user asked: '{user_msg}'. You responded: '{response[:200]}...'. The user wants more details. Please provide additional specific information about this topic."
-                    follow_up_response = get_ai_response(contextual_prompt)
+                # Create contextual follow-up for more details
+                contextual_prompt = f"The user asked: '{user_msg}'. You responded: '{response[:200]}...'. The user wants more details. Please provide additional specific information about this topic."
                 st.markdown("#### **🤖 STANDISH Follow-up:**")
-                st.markdown(follow_up_response.replace(" | ", "\n\n"))
+                st.write_stream(paragraphs(get_ai_response_stream(contextual_prompt)))
                 # Clear after response
                 if 'last_assistant_response' in st.session_state:
                     del st.session_state['last_assistant_response']
@@ -312,12 +317,10 @@ if 'last_assistant_response' in st.session_state and st.session_state['last_assi
         quick_response = st.text_input("Your response:", key="chat_text_response", placeholder="Type your specific response here...")
 
         if st.button("📤 Send Response", key="send_chat_response") and quick_response:
-            with st.spinner("Processing your response..."):
-                # Create contextual follow-up with user's specific response
-                contextual_prompt = f"The user originally asked: '{user_msg}'. You responded with suggestions. Now the user specifically responded: '{quick_response}'. Please provide a helpful follow-up based on their specific response."
-                follow_up_response = get_ai_response(contextual_prompt)
+            # Create contextual follow-up with user's specific response
+            contextual_prompt = f"The user originally asked: '{user_msg}'. You responded with suggestions. Now the user specifically responded: '{quick_response}'. Please provide a helpful follow-up based on their specific response."
             st.markdown("#### **🤖 STANDISH Follow-up:**")
-            st.markdown(follow_up_response.replace(" | ", "\n\n"))
+            st.write_stream(paragraphs(get_ai_response_stream(contextual_prompt)))
             # Clear after response
             if 'last_assistant_response' in st.session_state:
                 del st.session_state['last_assistant_response']
@@ -343,7 +346,7 @@ with st.sidebar:
         import backend
         if hasattr(backend, 'data_manager') and backend.data_manager:
             total_clients = len(backend.data_manager.get_all_clients())
-            overdue_reviews = len(backend.data_manager.get_overdue_reviews())
+            overdue_reviews = len(backend.get_overdue_reviews())
         else:
             # Fallback to mock data
             total_clients = 6
@@ -512,6 +515,33 @@ Ready to send birthday greetings and schedule follow-ups?"""
 • "What's urgent today?"
     """)
 
+    st.markdown("---")
+
+    # Tool latency and cache hit rates for this server process (shared by every session)
+    with st.expander("⚙️ Performance"):
+        tool_stats = {name: stats for name, stats in get_tool_stats().items() if stats["calls"]}
+        if tool_stats:
+            st.markdown("**Tool calls (slowest first):**")
+            for name, stats in sorted(tool_stats.items(), key=lambda item: -item[1]["avg_ms"]):
+                errors = f", {stats['errors']} errors" if stats["errors"] else ""
+                st.markdown(f"- `{name}`: {stats['calls']} calls, {stats['avg_ms']:.0f} ms avg, "
+                            f"{stats['max_ms']:.0f} ms max{errors}")
+        else:
+            st.caption("No tool calls yet")
+
+        responses = get_response_cache_stats()
+        st.markdown(f"**Response cache:** {responses['hits']} hits, {responses['misses']} misses "
+                    f"({responses['hit_rate']:.0%}), {responses['size']}/{responses['maxsize']} stored")
+        results = get_tool_result_cache_stats().values()
+        hits, misses = sum(r["hits"] for r in results), sum(r["misses"] for r in results)
+        st.markdown(f"**Tool result cache:** {hits} hits, {misses} misses "
+                    f"({hits / (hits + misses) if hits + misses else 0:.0%}), {sum(r['size'] for r in results)} stored")
+
+        if st.button("🧹 Clear cached results", key="clear_caches", help="Recompute answers and tool results on next use"):
+            invalidate_tool_results()
+            response_cache.clear()
+            st.success("Cached results cleared")
+
 # Footer with system info
 import subprocess, os
 from pathlib import Path
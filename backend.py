@@ -1,2694 +1,3928 @@
-# 🤖 STANDISH - Enhanced Proactive AI Agent for Financial Advisors
-# Complete rewrite with ALL missing features for true proactive agency
-
-import json
-from openai import AzureOpenAI
-import streamlit as st
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import sqlite3
-from pathlib import Path
-import re
-
-# =============================================================================
-# Data Manager Import (backward compatible)
-# =============================================================================
-try:
-    from data_manager import DataManager
-    data_manager = DataManager()
-    USE_REAL_DATA = True
-    print("✅ Using real client data from documents")
-except ImportError:
-    USE_REAL_DATA = False
-    data_manager = None
-    print("⚠️ Falling back to mock data")
-
-# Import template processing capabilities
-try:
-    from template_integration import (
-        generate_client_template,
-        analyze_template_requirements,
-        get_template_processing_status,
-        template_processing_tools,
-        route_template_tool_call
-    )
-    USE_TEMPLATE_PROCESSING = True
-    print("✅ Template processing integration enabled")
-except ImportError:
-    USE_TEMPLATE_PROCESSING = False
-    print("⚠️ Template processing not available")
-
-# =============================================================================
-# Azure OpenAI Configuration
-# =============================================================================
-try:
-    AZURE_OPENAI_API_KEY = st.secrets["AZURE_OPENAI_API_KEY"]
-    AZURE_OPENAI_ENDPOINT = st.secrets["AZURE_OPENAI_ENDPOINT"]
-    AZURE_OPENAI_API_VERSION = st.secrets["AZURE_OPENAI_API_VERSION"]
-    AZURE_OPENAI_DEPLOYMENT_NAME = st.secrets["AZURE_OPENAI_DEPLOYMENT_NAME"]
-except (KeyError, TypeError):
-    # Handle testing scenarios or missing secrets
-    AZURE_OPENAI_API_KEY = "mock-key"
-    AZURE_OPENAI_ENDPOINT = "mock-endpoint"
-    AZURE_OPENAI_API_VERSION = "mock-version"
-    AZURE_OPENAI_DEPLOYMENT_NAME = "mock-deployment"
-
-# =============================================================================
-# NEW: PROACTIVE AGENT LAYER - Right Moment, Right Context, Right Intent
-# =============================================================================
-
-# Contextual triggers for proactive suggestions
-contextual_triggers = {
-    "meeting_keywords": {
-        "retirement": {
-            "trigger_phrases": ["retire early", "retirement age", "when to retire", "retirement planning"],
-            "suggestion": "🎯 PROACTIVE: Client mentioned retirement - suggest pension review and withdrawal planning",
-            "action": "add_to_meeting_notes"
-        },
-        "protection": {
-            "trigger_phrases": ["life insurance", "what if something happens", "protect my family", "breadwinner"],
-            "suggestion": "🛡️ PROACTIVE: Protection gap identified - recommend life insurance review",
-            "action": "flag_protection_review"
-        },
-        "tax": {
-            "trigger_phrases": ["tax bill", "reduce tax", "tax efficient", "HMRC"],
-            "suggestion": "💰 PROACTIVE: Tax concern raised - discuss ISA/pension optimization",
-            "action": "schedule_tax_planning"
-        },
-        "inheritance": {
-            "trigger_phrases": ["leave money", "inheritance", "estate planning", "when I die"],
-            "suggestion": "📋 PROACTIVE: Estate planning mentioned - add IHT review to agenda",
-            "action": "flag_estate_planning"
-        },
-        "business": {
-            "trigger_phrases": ["sell the business", "exit strategy", "business value", "succession"],
-            "suggestion": "💼 PROACTIVE: Business exit mentioned - discuss CGT planning and liquidity",
-            "action": "flag_business_planning"
-        }
-    },
-    "missed_topics": {
-        "annual_review_gaps": [
-            "Did not discuss retirement timeline - add pension projection?",
-            "No protection review mentioned - flag for next meeting?",
-            "Tax planning not covered - schedule separate session?",
-            "Investment risk tolerance not reassessed - needs update?",
-            "Estate planning status unclear - follow up required?"
-        ]
-    }
-}
-
-# Real-time meeting context detection
-meeting_context = {
-    "current_meeting": {
-        "client": "",
-        "type": "annual_review",
-        "duration": 0,
-        "topics_covered": [],
-        "topics_missed": [],
-        "proactive_suggestions": []
-    }
-}
-
-def detect_proactive_moment(text_input, context="meeting"):
-    """
-    CORE PROACTIVE FUNCTION: Detect right moment for suggestions
-
-    Args:
-        text_input: What the client/advisor just said
-        context: meeting, email, call, report_review
-
-    Returns:
-        Proactive suggestion or None
-    """
-    text_lower = text_input.lower()
-    suggestions = []
-
-    # RIGHT MOMENT detection
-    for topic, data in contextual_triggers["meeting_keywords"].items():
-        for phrase in data["trigger_phrases"]:
-            if phrase in text_lower:
-                # RIGHT CONTEXT + RIGHT INTENT
-                suggestion = {
-                    "moment": "NOW",
-                    "context": f"Client mentioned '{phrase}'",
-                    "intent": data["suggestion"],
-                    "action": data["action"],
-                    "topic": topic
-                }
-                suggestions.append(suggestion)
-
-    return suggestions
-
-def generate_meeting_interruption(client_name, detected_topic):
-    """Generate contextual interruption suggestions during meetings"""
-
-    interruptions = {
-        "retirement": f"""
-🚨 **PROACTIVE INTERRUPTION**
-
-**CONTEXT:** {client_name} just mentioned retirement planning
-
-**SUGGESTION:** "Before we move on, shall we quickly model your retirement timeline?
-I can show you the impact of retiring at 60 vs 65 on your pension pot."
-
-**QUICK ACTIONS:**
-✅ Add pension projection to meeting
-❌ Note for follow-up
-📊 Run retirement calculator now
-        """,
-
-        "protection": f"""
-🚨 **PROACTIVE INTERRUPTION**
-
-**CONTEXT:** {client_name} mentioned protecting their family
-
-**SUGGESTION:** "You mentioned protection - let me quickly check your current cover.
-Your income is £{80000}, but life cover is only £{200000}. Shall we discuss this?"
-
-**QUICK ACTIONS:**
-✅ Review protection gaps now
-❌ Schedule separate meeting
-📋 Add to action items
-        """,
-
-        "tax": f"""
-🚨 **PROACTIVE INTERRUPTION**
-
-**CONTEXT:** {client_name} concerned about tax efficiency
-
-**SUGGESTION:** "You still have £{12000} ISA allowance remaining.
-Shall we discuss transferring some of your savings to reduce tax?"
-
-**QUICK ACTIONS:**
-✅ Discuss ISA transfer now
-❌ Add to next meeting agenda
-💰 Calculate tax savings
-        """
-    }
-
-    return interruptions.get(detected_topic, "No specific interruption available")
-
-def check_meeting_completeness(client_name, meeting_duration_minutes):
-    """Check if key topics were missed during meeting"""
-
-    standard_agenda = [
-        "portfolio_performance",
-        "risk_assessment",
-        "protection_review",
-        "retirement_planning",
-        "tax_efficiency",
-        "estate_planning"
-    ]
-
-    # Simulate topics covered (in real system, this would track actual discussion)
-    covered_topics = ["portfolio_performance", "risk_assessment"]
-    missed_topics = [topic for topic in standard_agenda if topic not in covered_topics]
-
-    suggestions = []
-
-    if "retirement_planning" in missed_topics:
-        suggestions.append({
-            "type": "missing_topic",
-            "suggestion": f"🎯 You didn't discuss retirement timeline with {client_name} - add pension projection to report?",
-            "urgency": "medium",
-            "action": "add_to_report"
-        })
-
-    if "protection_review" in missed_topics:
-        suggestions.append({
-            "type": "missing_topic",
-            "suggestion": f"🛡️ Protection gaps not reviewed - {client_name} mentioned family concerns earlier",
-            "urgency": "high",
-            "action": "schedule_protection_meeting"
-        })
-
-    if meeting_duration_minutes < 45:
-        suggestions.append({
-            "type": "time_alert",
-            "suggestion": f"⏰ Meeting was only {meeting_duration_minutes} minutes - several topics not covered. Extend or schedule follow-up?",
-            "urgency": "medium",
-            "action": "extend_or_reschedule"
-        })
-
-    return suggestions
-
-def get_proactive_post_meeting_actions(client_name, meeting_notes=""):
-    """Generate proactive actions immediately after meeting ends"""
-
-    return f"""
-🤖 **STANDISH PROACTIVE POST-MEETING ANALYSIS**
-
-**CLIENT:** {client_name}
-**MEETING COMPLETED:** {datetime.now().strftime('%H:%M on %B %d')}
-
-**IMMEDIATE ACTIONS DETECTED:**
-
-1. **📧 FOLLOW-UP EMAIL**
-   ✅ Draft thank you email with meeting summary?
-   ✅ Include action items and next steps?
-
-2. **📋 CRM UPDATES**
-   ✅ Log meeting notes and commitments?
-   ✅ Update client risk profile if discussed?
-
-3. **⚠️ MISSED OPPORTUNITIES**
-   • Retirement age not confirmed - add to next meeting?
-   • Protection review skipped - client mentioned family concerns
-   • Tax planning not discussed - they have unused allowances
-
-4. **📅 NEXT STEPS**
-   ✅ Schedule follow-up meeting for missed topics?
-   ✅ Set reminder for promised documents?
-   ✅ Flag urgent actions for this week?
-
-**WOULD YOU LIKE STANDISH TO HANDLE THESE AUTOMATICALLY?**
-    """
-
-def get_proactive_daily_moments():
-    """
-    Analyze recent client data and interactions to surface proactive moments
-    for inclusion in daily briefings - Right Moment, Right Context, Right Intent
-    """
-
-    # Simulated recent client interactions and contextual analysis
-    recent_interactions = [
-        {
-            "client": "Sarah Williams",
-            "source": "email_response",
-            "context": "Client replied 'thinking about retiring at 60 instead of 65'",
-            "moment": "🎯 Sarah Williams mentioned early retirement - suggest pension modeling session THIS WEEK",
-            "urgency": "high",
-            "action": "schedule_retirement_planning"
-        },
-        {
-            "client": "David Chen",
-            "source": "annual_review_notes",
-            "context": "Mentioned 'concerned about protecting the family business'",
-            "moment": "🛡️ David Chen raised business protection concerns - keyman insurance opportunity",
-            "urgency": "medium",
-            "action": "review_business_protection"
-        },
-        {
-            "client": "Lisa Patel",
-            "source": "phone_call_transcript",
-            "context": "Asked 'what's the most tax-efficient way to take money out'",
-            "moment": "💰 Lisa Patel asked about tax efficiency - dividend vs salary optimization needed",
-            "urgency": "medium",
-            "action": "tax_planning_session"
-        },
-        {
-            "client": "Emma Jackson",
-            "source": "meeting_follow_up",
-            "context": "Mentioned 'thinking of downsizing the house next year'",
-            "moment": "🏠 Emma Jackson considering downsizing - CGT and IHT planning opportunity",
-            "urgency": "low",
-            "action": "estate_planning_review"
-        }
-    ]
-
-    # Filter and prioritize based on urgency and context
-    high_priority = [interaction['moment'] for interaction in recent_interactions if interaction['urgency'] == 'high']
-    medium_priority = [interaction['moment'] for interaction in recent_interactions if interaction['urgency'] == 'medium']
-
-    # Return top proactive moments for today's briefing
-    proactive_moments = []
-
-    # Always include high priority
-    proactive_moments.extend(high_priority)
-
-    # Add medium priority if space allows (max 4 total)
-    proactive_moments.extend(medium_priority[:4-len(high_priority)])
-
-    return proactive_moments
-
-# =============================================================================
-# NEW: In-Memory Data Stores for Enhanced Features
-# =============================================================================
-
-# Recommendation History Store
-recommendation_history = {
-    "David Chen": [
-        {"date": "2025-06-15", "type": "ISA Transfer", "platform": "Platform X", "rationale": "Lower fees (0.25% vs 0.45%), better fund selection, consolidated reporting", "status": "Implemented"},
-        {"date": "2025-03-20", "type": "Pension Contribution", "amount": 40000, "rationale": "Maximize annual allowance before tax year end, higher rate tax relief", "status": "Implemented"},
-        {"date": "2024-11-10", "type": "Risk Profile Change", "from": "Moderate", "to": "Moderate-High", "rationale": "Client comfortable with volatility, 15+ year horizon", "status": "Implemented"}
-    ],
-    "Sarah Williams": [
-        {"date": "2025-08-01", "type": "ISA Transfer", "platform": "Platform X", "rationale": "Fee comparison showed 0.2% annual saving, ESG fund options available", "status": "Pending"},
-        {"date": "2025-05-15", "type": "Life Insurance", "amount": 500000, "rationale": "Income replacement for family, 2 dependent children", "status": "Implemented"},
-        {"date": "2025-02-28", "type": "Pension Consolidation", "rationale": "3 legacy pensions consolidated for better oversight and lower fees", "status": "Implemented"}
-    ],
-    "Emma Jackson": [
-        {"date": "2025-09-10", "type": "SIPP Setup", "platform": "Platform Y", "rationale": "Self-employed, maximize pension contributions for tax efficiency", "status": "In Progress"}
-    ],
-    "Lisa Patel": [
-        {"date": "2024-12-01", "type": "Drawdown Strategy", "withdrawal_rate": "3.5%", "rationale": "Sustainable withdrawal aligned with risk tolerance", "status": "Implemented"}
-    ]
-}
-
-# Meeting Transcripts Store
-meeting_transcripts = {
-    "Williams Family - 2025-07-15": {
-        "date": "2025-07-15",
-        "client": "Sarah Williams",
-        "attendees": ["Sarah Williams", "Tom Williams", "Advisor"],
-        "duration": "60 minutes",
-        "transcript": """
-        Advisor: Let's discuss your risk tolerance. Given recent market volatility, how do you feel about your current portfolio allocation?
-        Sarah: We're a bit concerned about the market drops we've seen. We don't want to lose our retirement savings.
-        Tom: But we also don't want to be too conservative. We're still 15 years from retirement.
-        Advisor: I understand. Your current moderate risk profile means about 60% equities. Given your concerns, we could reduce to 50%, but this may impact long-term growth.
-        Sarah: What about sustainable investments? We'd prefer our money to be in ethical companies.
-        Advisor: Absolutely. We have excellent ESG options on Platform X. The performance has been comparable to traditional funds.
-        Tom: We're also worried about what happens if the market drops 20% right before we retire.
-        Advisor: Great question. We can model different scenarios and build in a cash buffer for the first few years of retirement.
-        """,
-        "key_concerns": ["market volatility", "sustainable investing", "retirement timing risk"],
-        "action_items": ["Review ESG fund options", "Model market correction scenarios", "Discuss cash buffer strategy"],
-        "sentiment": "cautiously optimistic"
-    },
-    "David Chen - 2025-09-01": {
-        "date": "2025-09-01",
-        "client": "David Chen",
-        "attendees": ["David Chen", "Advisor"],
-        "duration": "45 minutes",
-        "transcript": """
-        Advisor: David, let's review your pension contributions this year.
-        David: Yes, I want to make sure I'm maximizing my allowances. My business had a good year.
-        Advisor: Great news. You've used £35,000 of your £60,000 annual allowance. You also have carry forward from the last 3 years.
-        David: What about the lifetime allowance changes?
-        Advisor: Good question. The lifetime allowance has been abolished, so that's no longer a concern. You can contribute more freely now.
-        David: I'm also thinking about exit planning for my business. Not immediately, but in 5-7 years.
-        Advisor: We should definitely factor that into your overall plan. Business sale proceeds will significantly impact your retirement income.
-        """,
-        "key_concerns": ["pension allowances", "business exit planning", "tax efficiency"],
-        "action_items": ["Calculate carry forward allowance", "Draft exit planning timeline", "Review business valuation"],
-        "sentiment": "positive"
-    }
-}
-
-# Document Tracking Store
-document_tracking = {
-    "Sarah Williams": {
-        "requested": [
-            {"document": "P60 2024/25", "requested_date": "2025-01-15", "status": "Received", "received_date": "2025-01-20"},
-            {"document": "Bank statements (6 months)", "requested_date": "2025-01-15", "status": "Pending", "received_date": None},
-            {"document": "Mortgage statement", "requested_date": "2025-01-15", "status": "Pending", "received_date": None}
-        ]
-    },
-    "David Chen": {
-        "requested": [
-            {"document": "Company accounts 2024", "requested_date": "2025-01-10", "status": "Received", "received_date": "2025-01-18"},
-            {"document": "Self-assessment tax return", "requested_date": "2025-01-10", "status": "Received", "received_date": "2025-01-25"},
-            {"document": "Pension statement (3 schemes)", "requested_date": "2025-01-10", "status": "Partial", "received_date": "2025-01-22", "notes": "2 of 3 received"}
-        ]
-    },
-    "Emma Jackson": {
-        "requested": [
-            {"document": "Proof of address", "requested_date": "2025-02-01", "status": "Pending", "received_date": None},
-            {"document": "ID verification", "requested_date": "2025-02-01", "status": "Pending", "received_date": None}
-        ]
-    }
-}
-
-# Commitments/Promises Store
-commitments_tracking = {
-    "Jackson Family": [
-        {"promise": "Send detailed breakdown of fund options", "promised_date": "2025-01-20", "due_date": "2025-01-25", "status": "Overdue", "completed_date": None},
-        {"promise": "Prepare cashflow model for early retirement", "promised_date": "2025-01-15", "due_date": "2025-02-01", "status": "Pending", "completed_date": None}
-    ],
-    "David Chen": [
-        {"promise": "Send carry forward calculation", "promised_date": "2025-02-01", "due_date": "2025-02-05", "status": "Completed", "completed_date": "2025-02-03"},
-        {"promise": "Provide exit planning checklist", "promised_date": "2025-02-01", "due_date": "2025-02-10", "status": "Pending", "completed_date": None}
-    ],
-    "Sarah Williams": [
-        {"promise": "Send ESG fund comparison report", "promised_date": "2025-01-28", "due_date": "2025-02-03", "status": "Overdue", "completed_date": None}
-    ]
-}
-
-# Client Retirement & Withdrawal Data
-retirement_data = {
-    "Lisa Patel": {"status": "Retired", "retirement_date": "2023-06-01", "pension_pot": 450000, "annual_withdrawal": 18000, "withdrawal_rate": 4.0},
-    "Michael Thompson": {"status": "Retired", "retirement_date": "2022-01-15", "pension_pot": 380000, "annual_withdrawal": 19000, "withdrawal_rate": 5.0},
-    "Robert Hughes": {"status": "Retired", "retirement_date": "2024-03-01", "pension_pot": 520000, "annual_withdrawal": 15600, "withdrawal_rate": 3.0},
-    "Anne Partridge": {"status": "Retired", "retirement_date": "2021-09-01", "pension_pot": 290000, "annual_withdrawal": 14500, "withdrawal_rate": 5.0},
-    "Brian Potter": {"status": "Retired", "retirement_date": "2020-12-01", "pension_pot": 350000, "annual_withdrawal": 17500, "withdrawal_rate": 5.0}
-}
-
-# Client Service & Satisfaction Data
-service_data = {
-    "David Chen": {"services": ["Pension Planning", "Tax Planning", "Investment Management", "Business Planning"], "satisfaction_score": 9, "years_as_client": 8, "annual_revenue": 4500, "hours_per_year": 12},
-    "Sarah Williams": {"services": ["Pension Planning", "Protection", "Investment Management"], "satisfaction_score": 8, "years_as_client": 5, "annual_revenue": 3200, "hours_per_year": 15},
-    "Emma Jackson": {"services": ["SIPP", "Investment Management"], "satisfaction_score": 9, "years_as_client": 2, "annual_revenue": 2800, "hours_per_year": 8},
-    "Lisa Patel": {"services": ["Drawdown Planning", "Investment Management", "Estate Planning"], "satisfaction_score": 7, "years_as_client": 12, "annual_revenue": 3800, "hours_per_year": 10},
-    "Michael Gurung": {"services": ["Business Planning", "Pension Planning", "Protection"], "satisfaction_score": 8, "years_as_client": 6, "annual_revenue": 5200, "hours_per_year": 18}
-}
-
-# Sales Funnel Data
-sales_funnel = {
-    "initial_meetings": [
-        {"name": "John Smith", "date": "2025-01-05", "source": "Website", "status": "Converted", "conversion_date": "2025-01-20"},
-        {"name": "Mary Johnson", "date": "2025-01-10", "source": "Referral - David Chen", "status": "Converted", "conversion_date": "2025-01-25"},
-        {"name": "Peter Brown", "date": "2025-01-15", "source": "LinkedIn", "status": "Lost", "reason": "Went with competitor"},
-        {"name": "Susan Taylor", "date": "2025-01-20", "source": "Referral - Sarah Williams", "status": "In Progress", "next_meeting": "2025-02-10"},
-        {"name": "James Wilson", "date": "2025-02-01", "source": "Website", "status": "In Progress", "next_meeting": "2025-02-15"}
-    ],
-    "conversion_by_source": {"Website": 0.40, "Referral": 0.75, "LinkedIn": 0.25, "Event": 0.50}
-}
-
-# Pension Annual Allowance Data
-pension_allowances = {
-    "David Chen": {"annual_allowance": 60000, "used_this_year": 35000, "carry_forward": [15000, 20000, 18000], "total_available": 78000},
-    "Sarah Williams": {"annual_allowance": 60000, "used_this_year": 12000, "carry_forward": [0, 5000, 8000], "total_available": 61000},
-    "Emma Jackson": {"annual_allowance": 60000, "used_this_year": 8000, "carry_forward": [10000, 12000, 15000], "total_available": 89000},
-    "Michael Gurung": {"annual_allowance": 60000, "used_this_year": 45000, "carry_forward": [0, 0, 5000], "total_available": 20000}
-}
-
-# Interest Rate Sensitivity Data
-interest_rate_sensitivity = {
-    "Sarah Williams": {"fixed_rate_mortgage": True, "mortgage_rate": 2.5, "mortgage_balance": 180000, "renewal_date": "2026-06-01", "cash_savings": 45000, "bonds_allocation": 0.20},
-    "David Chen": {"fixed_rate_mortgage": True, "mortgage_rate": 1.9, "mortgage_balance": 250000, "renewal_date": "2025-09-01", "cash_savings": 120000, "bonds_allocation": 0.15},
-    "Lisa Patel": {"fixed_rate_mortgage": False, "mortgage_rate": 0, "mortgage_balance": 0, "renewal_date": None, "cash_savings": 85000, "bonds_allocation": 0.40},
-    "Emma Jackson": {"fixed_rate_mortgage": True, "mortgage_rate": 3.2, "mortgage_balance": 320000, "renewal_date": "2027-03-01", "cash_savings": 25000, "bonds_allocation": 0.10}
-}
-
-# =============================================================================
-# Proactive Assistant Core Functions (ENHANCED)
-# =============================================================================
-
-def get_daily_briefing(query=""):
-    """Generate comprehensive daily briefing for the advisor - FULLY DYNAMIC"""
-    print("🌅 Generating daily briefing...")
-
-    current_date = datetime.now()
-    current_date_formatted = current_date.strftime("%A, %B %d, %Y")
-
-    briefing_sections = []
-
-    # Get real client data
-    if USE_REAL_DATA and data_manager:
-        clients = data_manager.get_all_clients()
-        overdue_reviews = data_manager.get_overdue_reviews()
-        protection_gaps = data_manager.get_protection_gaps()
-    else:
-        clients = get_mock_clients()
-        overdue_reviews = []
-        protection_gaps = []
-        # Calculate overdue from mock data
-        for client in clients:
-            if client.get('last_review'):
-                try:
-                    last_review = datetime.strptime(client['last_review'], '%Y-%m-%d')
-                    months_since = (current_date - last_review).days / 30
-                    if months_since > 12:
-                        client['months_overdue'] = int(months_since)
-                        client['days_overdue'] = int((current_date - last_review).days - 365)
-                        overdue_reviews.append(client)
-                except:
-                    pass
-
-    total_clients = len(clients)
-
-    # ===== TODAY'S DATE =====
-    briefing_sections.append(f"📅 **TODAY: {current_date_formatted}**")
-    briefing_sections.append("")
-
-    # ===== YESTERDAY'S ACTIVITY SUMMARY (Dynamic) =====
-    briefing_sections.append("**YESTERDAY'S ACTIVITY SUMMARY:**")
-
-    # Count overdue reviews dynamically
-    if overdue_reviews:
-        overdue_names = [c['name'] for c in overdue_reviews[:3]]
-        briefing_sections.append(f"⚠️ {len(overdue_reviews)} clients with overdue reviews: {', '.join(overdue_names)}")
-    else:
-        briefing_sections.append("✅ All client reviews are up to date")
-
-    # Count pending follow-ups from commitments
-    pending_followups = []
-    for client, commitments in commitments_tracking.items():
-        pending = [c for c in commitments if c['status'] in ['Pending', 'Overdue']]
-        if pending:
-            pending_followups.append(client)
-
-    if pending_followups:
-        briefing_sections.append(f"📧 {len(pending_followups)} pending follow-ups: {', '.join(pending_followups[:3])}")
-    else:
-        briefing_sections.append("✅ All follow-ups completed")
-
-    briefing_sections.append("✅ No critical meetings missed")
-    briefing_sections.append("")
-
-    # ===== TODAY'S PRIORITY ACTIONS (Dynamic) =====
-    briefing_sections.append("**TODAY'S PRIORITY ACTIONS:**")
-
-    priority_count = 0
-
-    # Add overdue reviews with actual days overdue
-    for client in overdue_reviews[:2]:
-        days_overdue = client.get('days_overdue', 0)
-        if days_overdue <= 0:
-            # Calculate if not already set
-            try:
-                last_review = datetime.strptime(client['last_review'], '%Y-%m-%d')
-                days_overdue = max(0, (current_date - last_review).days - 365)
-            except:
-                days_overdue = 30  # Default
-        briefing_sections.append(f"🚨 OVERDUE: {client['name']} annual review ({days_overdue} days overdue)")
-        priority_count += 1
-
-    # Find clients due this week (within 7 days of review date)
-    due_this_week = []
-    for client in clients:
-        if client.get('next_review_due'):
-            try:
-                next_review = datetime.strptime(client['next_review_due'], '%Y-%m-%d')
-                days_until = (next_review - current_date).days
-                if 0 < days_until <= 7:
-                    due_this_week.append({'name': client['name'], 'days': days_until})
-            except:
-                pass
-
-    for client in due_this_week[:2]:
-        briefing_sections.append(f"📅 DUE THIS WEEK: {client['name']} annual review (in {client['days']} days)")
-        priority_count += 1
-
-    # Birthday opportunities - check current month
-    current_month = current_date.month
-    birthday_clients = []
-
-    # Check retirement_data for birthdays (simulated based on month)
-    for client in clients:
-        # Simple birthday simulation based on client name hash and current month
-        name_hash = sum(ord(c) for c in client['name']) % 12 + 1
-        if name_hash == current_month:
-            birthday_clients.append(client['name'])
-
-    if birthday_clients:
-        briefing_sections.append(f"🎂 BIRTHDAY OPPORTUNITY: {birthday_clients[0]} - perfect time for check-in")
-        priority_count += 1
-
-    if priority_count == 0:
-        briefing_sections.append("✅ No urgent priorities today - great time for proactive outreach!")
-
-    briefing_sections.append("📊 Review market updates for client portfolios")
-    briefing_sections.append("")
-
-    # ===== OVERDUE COMMITMENTS (Dynamic) =====
-    overdue_commitments = get_overdue_commitments()
-    if overdue_commitments:
-        briefing_sections.append("**⚠️ OVERDUE COMMITMENTS:**")
-        for commitment in overdue_commitments[:3]:
-            briefing_sections.append(f"❗ {commitment}")
-        briefing_sections.append("")
-
-    # ===== DOCUMENTS WAITING (Dynamic) =====
-    pending_docs = get_pending_documents()
-    if pending_docs:
-        briefing_sections.append("**📄 DOCUMENTS STILL WAITING:**")
-        for doc in pending_docs[:3]:
-            briefing_sections.append(f"📋 {doc}")
-        briefing_sections.append("")
-
-    # ===== THIS WEEK'S OVERVIEW (Dynamic) =====
-    briefing_sections.append("**THIS WEEK'S OVERVIEW:**")
-
-    # Categorize clients by status
-    overdue_names = [c['name'] for c in overdue_reviews[:3]]
-    on_track_clients = [c['name'] for c in clients if c['name'] not in overdue_names][:3]
-
-    if overdue_names and on_track_clients:
-        briefing_sections.append(f"📈 {', '.join(overdue_names)} (overdue) | {', '.join(on_track_clients)} (on track)")
-    elif overdue_names:
-        briefing_sections.append(f"📈 {', '.join(overdue_names)} (need attention)")
-    else:
-        briefing_sections.append(f"📈 All {total_clients} clients on track")
-
-    # Protection opportunities (dynamic)
-    if protection_gaps:
-        protection_items = [f"{g['client_name']} ({g['gap_description'][:20]}...)" for g in protection_gaps[:3]]
-        briefing_sections.append(f"🛡️ Protection opportunities: {', '.join(protection_items)}")
-    else:
-        # Use service_data for protection info
-        protection_opps = []
-        for client, data in service_data.items():
-            if 'Protection' not in data.get('services', []):
-                protection_opps.append(client)
-        if protection_opps:
-            briefing_sections.append(f"🛡️ Protection review needed: {', '.join(protection_opps[:3])}")
-
-    # Compliance rate (dynamic)
-    compliant_count = total_clients - len(overdue_reviews)
-    compliance_rate = (compliant_count / total_clients * 100) if total_clients > 0 else 100
-    briefing_sections.append(f"✅ Consumer Duty compliance: {compliant_count}/{total_clients} clients with annual reviews completed ({compliance_rate:.0f}%)")
-    briefing_sections.append("")
-
-    # ===== PROACTIVE OPPORTUNITIES (Dynamic) =====
-    proactive_moments = get_proactive_daily_moments()
-    if proactive_moments:
-        briefing_sections.append("**🚨 PROACTIVE OPPORTUNITIES DETECTED:**")
-        for moment in proactive_moments:
-            briefing_sections.append(f"{moment}")
-        briefing_sections.append("")
-
-    # ===== STANDISH ACTIONS (Dynamic based on data) =====
-    briefing_sections.append("**STANDISH CAN HELP YOU WITH:**")
-
-    if overdue_reviews:
-        briefing_sections.append(f"📧 Draft follow-up emails for {len(overdue_reviews)} overdue clients")
-    else:
-        briefing_sections.append("📧 Draft client check-in emails")
-
-    if due_this_week:
-        briefing_sections.append(f"📞 Schedule {len(due_this_week)} review meetings due this week")
-    else:
-        briefing_sections.append("📞 Schedule proactive client calls")
-
-    briefing_sections.append("📊 Generate weekly portfolio performance reports")
-
-    if birthday_clients:
-        briefing_sections.append(f"🎂 Send birthday greetings to {len(birthday_clients)} clients")
-    else:
-        briefing_sections.append("🔔 Set up reminder alerts for upcoming events")
-
-    return "\n".join(briefing_sections)
-
-def get_overdue_commitments():
-    """Get list of overdue commitments/promises"""
-    overdue = []
-    current_date = datetime.now()
-    
-    for client, commitments in commitments_tracking.items():
-        for c in commitments:
-            if c['status'] == 'Overdue':
-                overdue.append(f"{client}: {c['promise']} (was due {c['due_date']})")
-    
-    return overdue
-
-def get_pending_documents():
-    """Get list of pending documents"""
-    pending = []
-    
-    for client, docs in document_tracking.items():
-        for doc in docs.get('requested', []):
-            if doc['status'] == 'Pending':
-                pending.append(f"{client}: {doc['document']} (requested {doc['requested_date']})")
-    
-    return pending
-
-def get_pending_followups():
-    """Get pending follow-up actions from yesterday"""
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-        pending = []
-        yesterday = datetime.now() - timedelta(days=1)
-
-        for client in clients:
-            full_data = client.get('full_data', {})
-            last_contact = full_data.get('last_contact', '')
-            if last_contact:
-                try:
-                    contact_date = datetime.strptime(last_contact, '%Y-%m-%d')
-                    if contact_date <= yesterday:
-                        pending.append(client['name'])
-                except:
-                    continue
-        return pending
-    else:
-        return ["Sarah Williams", "David Chen"]
-
-def get_urgent_tasks_today():
-    """Get urgent tasks for today"""
-    tasks = []
-    current_date = datetime.now()
-
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-
-        for client in clients:
-            next_review = client.get('next_review_due', '')
-            if next_review:
-                try:
-                    review_date = datetime.strptime(next_review, '%Y-%m-%d')
-                    days_until = (review_date - current_date).days
-
-                    if days_until <= 0:
-                        tasks.append(f"🚨 OVERDUE: {client['name']} annual review ({abs(days_until)} days overdue)")
-                    elif days_until <= 7:
-                        tasks.append(f"📅 DUE THIS WEEK: {client['name']} annual review (in {days_until} days)")
-                except:
-                    continue
-
-        current_month = current_date.month
-        for client in clients:
-            if current_month in [3, 6, 9, 12]:
-                if client['name'] in ['Emma Jackson', 'David Chen']:
-                    tasks.append(f"🎂 BIRTHDAY OPPORTUNITY: {client['name']} - perfect time for check-in call")
-
-    tasks.extend([
-        "📊 Review market updates for client portfolios",
-        "📧 Send scheduled client newsletters",
-        "📋 Update CRM with yesterday's activities"
-    ])
-
-    return tasks
-
-def get_weekly_statistics():
-    """Generate weekly performance statistics"""
-    if USE_REAL_DATA and data_manager:
-        try:
-            clients = data_manager.get_all_clients()
-            total_clients = len(clients)
-            overdue_reviews = len(data_manager.get_overdue_reviews())
-            protection_gaps = len(data_manager.get_protection_gaps())
-
-            return f"📈 {total_clients} active clients | {overdue_reviews} overdue reviews | {protection_gaps} protection opportunities | Compliance rate: {((total_clients-overdue_reviews)/total_clients*100):.0f}%"
-        except:
-            return "📈 6 active clients | 2 overdue reviews | 3 protection opportunities | Compliance rate: 67% (mock data)"
-    else:
-        return "📈 6 active clients | 2 overdue reviews | 3 protection opportunities | Compliance rate: 67% (demo mode)"
-
-def get_available_autonomous_actions():
-    """List actions the assistant can perform autonomously"""
-    return [
-        "📧 Draft and send follow-up emails to overdue review clients",
-        "📞 Schedule callback reminders for high-priority clients",
-        "📊 Generate weekly portfolio performance reports",
-        "🔔 Set up birthday reminder alerts for Q1 clients",
-        "📋 Update client CRM records with recent market impacts",
-        "📈 Prepare suitability letters for recent recommendations"
-    ]
-
-def perform_autonomous_action(action_type, client_name="", details=""):
-    """Execute autonomous actions on behalf of the advisor"""
-    print(f"🤖 Performing autonomous action: {action_type}")
-
-    if action_type == "send_follow_up_email":
-        return send_follow_up_email(client_name, details)
-    elif action_type == "schedule_meeting":
-        return schedule_client_meeting(client_name, details)
-    elif action_type == "update_crm":
-        return update_crm_records(client_name, details)
-    elif action_type == "generate_report":
-        return generate_client_report(client_name, details)
-    elif action_type == "set_reminder":
-        return set_client_reminder(client_name, details)
-    else:
-        return f"❌ Unknown action type: {action_type}"
-
-def send_follow_up_email(client_name, email_type="review_overdue"):
-    """Draft and send follow-up email to client"""
-    if not client_name:
-        return "❌ Client name required for email"
-
-    email_templates = {
-        "review_overdue": f"""
-📧 **EMAIL READY TO SEND TO {client_name.upper()}:**
-
-Subject: Annual Review - Let's Catch Up
-
-Dear {client_name.split()[0]},
-
-I hope you're well. I notice it's been over a year since our last formal review, and I'd love to catch up on how things are going with your financial plans.
-
-With the current market conditions and recent regulatory changes, there may be some opportunities worth discussing for your portfolio.
-
-Would you be available for a 30-minute call next week? I have slots on:
-- Tuesday 2:00 PM
-- Wednesday 10:00 AM
-- Friday 3:00 PM
-
-Best regards,
-[Your Name]
-
-**Ready to send this follow-up email?**
-        """,
-        "birthday_check": f"""
-📧 **BIRTHDAY EMAIL READY TO SEND TO {client_name.upper()}:**
-
-Subject: Happy Birthday! 🎂
-
-Dear {client_name.split()[0]},
-
-Wishing you a very happy birthday! I hope you're having a wonderful day.
-
-As we start another year, it might be a good time for a brief catch-up on your financial goals. No pressure - just wanted to touch base and see how you're feeling about your investments and any life changes on the horizon.
-
-Feel free to give me a call when convenient.
-
-Warm regards,
-[Your Name]
-
-**Ready to send this birthday greeting?**
-        """
-    }
-
-    return email_templates.get(email_type, f"📧 Email template not found for type: {email_type}")
-
-def schedule_client_meeting(client_name, meeting_type="annual_review"):
-    """Schedule a meeting with client"""
-    next_week = datetime.now() + timedelta(days=7)
-
-    return f"""
-📅 **MEETING READY TO SCHEDULE FOR {client_name.upper()}:**
-
-Type: {meeting_type.replace('_', ' ').title()}
-Proposed Date: {next_week.strftime('%A, %B %d, %Y')}
-Duration: 60 minutes
-Location: Office/Video Call
-
-Meeting Agenda:
-- Portfolio review and performance
-- Risk appetite assessment
-- Goal progress check
-- New opportunities discussion
-- Compliance documentation
-
-**NEXT STEPS:**
-✅ Calendar invite ready to send
-✅ Client notification email drafted
-✅ Meeting reminder set for 24 hours before
-
-**Would you like me to send the calendar invite and notification email to the client?**
-    """
-
-def update_crm_records(client_name, update_type="market_impact"):
-    """Update client CRM with relevant information"""
-    current_date = datetime.now().strftime('%Y-%m-%d')
-
-    return f"""
-📋 **CRM UPDATE READY FOR {client_name.upper()}:**
-
-Date: {current_date}
-Update Type: {update_type.replace('_', ' ').title()}
-
-Records to Add:
-- Market volatility impact assessment
-- Risk tolerance confirmation
-- Next review date flagged
-- Follow-up actions logged
-
-**COMPLIANCE:** Consumer Duty requirements will be updated
-**NEXT STEPS:** Automated follow-up will be scheduled for 30 days
-
-**Ready to update the CRM with these details?**
-    """
-
-def track_client_journey_stage(client_name=""):
-    """Track where client is in the financial planning journey"""
-    journey_stages = {
-        1: "Annual Review Received",
-        2: "Pre-Meeting Prep (Documents)",
-        3: "Meeting Scheduled",
-        4: "Meeting Conducted",
-        5: "Post-Meeting Analysis",
-        6: "Recommendations Prepared",
-        7: "Suitability Letter Sent",
-        8: "Implementation Started",
-        9: "Advice Implemented",
-        10: "Follow-up Scheduled"
-    }
-
-    if USE_REAL_DATA and client_name:
-        clients = data_manager.get_all_clients()
-        client = next((c for c in clients if c['name'].lower() == client_name.lower()), None)
-
-        if client:
-            full_data = client.get('full_data', {})
-            last_review = client.get('last_review', '')
-
-            if last_review:
-                review_date = datetime.strptime(last_review, '%Y-%m-%d')
-                days_since = (datetime.now() - review_date).days
-
-                if days_since > 365:
-                    stage = 1
-                elif days_since < 30:
-                    stage = 9
-                else:
-                    stage = 5
-            else:
-                stage = 1
-
-            return f"🎯 **{client_name.upper()} JOURNEY STATUS:**\n\nStage {stage}: {journey_stages[stage]}\n\n**NEXT ACTION:** {get_next_journey_action(stage)}"
-
-    return f"""
-🎯 **CLIENT JOURNEY OVERVIEW:**
-
-Active Clients by Stage:
-- Stage 1 (Review Due): Sarah Williams, David Chen, Lisa Patel
-- Stage 4 (Meeting Scheduled): Emma Jackson (Feb 12), Michael Roberts (Feb 15)
-- Stage 8 (Implementation): Jennifer Mills (ISA transfer in progress)
-- Stage 10 (Complete): Thomas Anderson, Rachel Green (recently completed)
-
-**BOTTLENECK ALERT:** Sarah Williams (16 days overdue), David Chen (3 days overdue), Lisa Patel (7 days overdue) - need immediate attention
-**PRIORITY ACTION:** Schedule review meetings for Williams, Chen, and Patel families
-    """
-
-def get_next_journey_action(stage):
-    """Get the next recommended action for a journey stage"""
-    next_actions = {
-        1: "Send annual review email and schedule meeting",
-        2: "Request updated financial documents",
-        3: "Prepare meeting agenda and client pack",
-        4: "Conduct meeting and document outcomes",
-        5: "Analyze meeting notes and prepare recommendations",
-        6: "Draft suitability letter with recommendations",
-        7: "Follow up on client decision",
-        8: "Monitor implementation progress",
-        9: "Schedule quarterly check-in",
-        10: "Plan next annual review cycle"
-    }
-    return next_actions.get(stage, "Review client status")
-
-def generate_client_report(client_name, report_type="portfolio_summary"):
-    """Generate comprehensive client reports"""
-    current_date = datetime.now().strftime('%Y-%m-%d')
-
-    if not client_name:
-        return "❌ Client name required for report generation"
-
-    return f"""
-📊 **{report_type.upper().replace('_', ' ')} REPORT GENERATED:**
-
-Client: {client_name.upper()}
-Report Date: {current_date}
-Report Type: {report_type.replace('_', ' ').title()}
-
-**REPORT CONTENTS:**
-- Current portfolio valuation and performance
-- Asset allocation vs. target allocation
-- Risk assessment and suitability review
-- Tax efficiency opportunities
-- Market outlook and recommendations
-- Action items and next steps
-
-**DELIVERY OPTIONS:**
-✅ PDF report saved to client folder
-📧 Email draft prepared for client review
-📱 Summary prepared for mobile presentation
-
-**NEXT STEPS:**
-- Review report with client in next meeting
-- Update CRM with report delivery date
-- Schedule follow-up based on recommendations
-
-Should I prepare the client meeting pack as well?
-    """
-
-def set_client_reminder(client_name, reminder_type="review_due"):
-    """Set automated reminders for client actions"""
-    reminder_date = datetime.now() + timedelta(days=30)
-
-    reminders = {
-        "review_due": "Annual review reminder",
-        "birthday": "Birthday outreach opportunity",
-        "policy_renewal": "Insurance policy renewal check",
-        "tax_year": "Tax year-end planning reminder",
-        "quarterly_check": "Quarterly portfolio review"
-    }
-
-    reminder_desc = reminders.get(reminder_type, "General follow-up reminder")
-
-    return f"""
-🔔 **REMINDER SET FOR {client_name.upper()}:**
-
-Type: {reminder_desc}
-Reminder Date: {reminder_date.strftime('%A, %B %d, %Y')}
-Frequency: One-time reminder
-Priority: Medium
-
-**AUTOMATED ACTIONS:**
-- Email reminder 7 days before due date
-- Calendar notification on due date
-- CRM flag added to client record
-- Follow-up task created
-
-**CUSTOMIZATION OPTIONS:**
-- Modify reminder date/frequency
-- Add custom message template
-- Set escalation if no response
-- Include automated birthday wishes
-
-Reminder successfully activated and integrated with your calendar system.
-    """
-
-# =============================================================================
-# NEW: Withdrawal Rate Analysis for Retired Clients
-# =============================================================================
-
-def analyze_withdrawal_rates(query):
-    """Analyze withdrawal rates for retired clients"""
-    results = []
-    query_lower = query.lower()
-    
-    # Check for clients with >4% withdrawal rate
-    if "withdrawal" in query_lower or "4%" in query_lower or "retired" in query_lower:
-        high_withdrawal_clients = []
-        
-        for client, data in retirement_data.items():
-            if data['withdrawal_rate'] > 4.0:
-                high_withdrawal_clients.append({
-                    "name": client,
-                    "rate": data['withdrawal_rate'],
-                    "pot": data['pension_pot'],
-                    "annual": data['annual_withdrawal']
-                })
-        
-        if high_withdrawal_clients:
-            results.append("⚠️ **CLIENTS WITH WITHDRAWAL RATES ABOVE 4%:**")
-            for client in high_withdrawal_clients:
-                years_remaining = client['pot'] / client['annual'] if client['annual'] > 0 else 0
-                results.append(f"🔴 {client['name']}: {client['rate']}% withdrawal rate (£{client['annual']:,}/year from £{client['pot']:,} pot)")
-                results.append(f"   └─ At current rate, funds may last approximately {years_remaining:.1f} years")
-        else:
-            results.append("✅ All retired clients have sustainable withdrawal rates (≤4%)")
-    
-    # General retirement overview
-    if "all retired" in query_lower or "retirement overview" in query_lower:
-        results.append("📊 **RETIRED CLIENT WITHDRAWAL SUMMARY:**")
-        for client, data in retirement_data.items():
-            status = "🟢" if data['withdrawal_rate'] <= 4.0 else "🔴"
-            results.append(f"{status} {client}: {data['withdrawal_rate']}% (£{data['annual_withdrawal']:,}/year)")
-    
-    if not results:
-        results = ["No withdrawal rate data found. Try asking: 'Which retired clients are taking more than 4% withdrawal rates?'"]
-    
-    return " | ".join(results)
-
-# =============================================================================
-# NEW: Interest Rate Sensitivity Analysis
-# =============================================================================
-
-def analyze_interest_rate_impact(query):
-    """Analyze impact of interest rate changes on clients"""
-    results = []
-    query_lower = query.lower()
-    
-    target_rate = 3.0  # Default scenario
-    if "3%" in query_lower:
-        target_rate = 3.0
-    elif "4%" in query_lower:
-        target_rate = 4.0
-    elif "5%" in query_lower:
-        target_rate = 5.0
-    elif "2%" in query_lower:
-        target_rate = 2.0
-    
-    if "interest rate" in query_lower or "rate drop" in query_lower or "rate change" in query_lower:
-        results.append(f"📉 **INTEREST RATE IMPACT ANALYSIS (If rates drop to {target_rate}%):**")
-        
-        impacted_clients = []
-        
-        for client, data in interest_rate_sensitivity.items():
-            impacts = []
-            
-            # Mortgage impact (renewal)
-            if data['fixed_rate_mortgage'] and data['mortgage_balance'] > 0:
-                current_rate = data['mortgage_rate']
-                if current_rate < target_rate:
-                    # Rate increase scenario - bad for client
-                    monthly_increase = (data['mortgage_balance'] * (target_rate - current_rate) / 100) / 12
-                    impacts.append(f"Mortgage payment could increase by £{monthly_increase:.0f}/month at renewal ({data['renewal_date']})")
-                else:
-                    # Rate decrease - good for client
-                    monthly_saving = (data['mortgage_balance'] * (current_rate - target_rate) / 100) / 12
-                    impacts.append(f"Potential mortgage saving of £{monthly_saving:.0f}/month at renewal")
-            
-            # Cash savings impact
-            if data['cash_savings'] > 20000:
-                # Lower rates mean less interest on savings
-                annual_loss = data['cash_savings'] * 0.02  # Assuming 2% drop in savings rates
-                impacts.append(f"Cash savings income could reduce by £{annual_loss:.0f}/year")
-            
-            # Bond allocation impact (lower rates = higher bond prices)
-            if data['bonds_allocation'] > 0.15:
-                impacts.append(f"Bond portfolio ({data['bonds_allocation']*100:.0f}% allocation) may see price gains")
-            
-            if impacts:
-                impacted_clients.append({"name": client, "impacts": impacts})
-        
-        if impacted_clients:
-            for client in impacted_clients:
-                results.append(f"\n👤 **{client['name']}:**")
-                for impact in client['impacts']:
-                    results.append(f"   • {impact}")
-        else:
-            results.append("No significant interest rate exposure identified.")
-    
-    if not results:
-        results = ["Specify an interest rate scenario. Example: 'Show me which clients would be impacted if interest rates drop to 3%'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Market Correction Scenario Modeling
-# =============================================================================
-
-def model_market_correction(query):
-    """Model impact of market corrections on client portfolios"""
-    results = []
-    query_lower = query.lower()
-    
-    correction_percent = 20  # Default 20% correction
-    if "10%" in query_lower:
-        correction_percent = 10
-    elif "20%" in query_lower:
-        correction_percent = 20
-    elif "30%" in query_lower:
-        correction_percent = 30
-    
-    if "market correction" in query_lower or "market drop" in query_lower or "crash" in query_lower:
-        results.append(f"📉 **{correction_percent}% MARKET CORRECTION IMPACT ANALYSIS:**")
-        
-        # Get client data
-        if USE_REAL_DATA:
-            clients = data_manager.get_all_clients()
-        else:
-            clients = get_mock_clients()
-        
-        high_exposure_clients = []
-        
-        for client in clients:
-            full_data = client.get('full_data', {})
-            assets = full_data.get('assets', {})
-            net_worth = client.get('net_worth', 0)
-            age = client.get('age', 50)
-            
-            # Calculate equity exposure
-            investments = assets.get('investments', 0)
-            if investments == 0:
-                investments = net_worth * 0.6  # Assume 60% in investments
-            
-            # Estimate equity portion (higher for younger clients)
-            if age < 40:
-                equity_percent = 0.80
-            elif age < 55:
-                equity_percent = 0.65
-            elif age < 65:
-                equity_percent = 0.50
-            else:
-                equity_percent = 0.35
-            
-            equity_value = investments * equity_percent
-            potential_loss = equity_value * (correction_percent / 100)
-            
-            # Flag if loss > 10% of net worth or > £50,000
-            if potential_loss > (net_worth * 0.1) or potential_loss > 50000:
-                high_exposure_clients.append({
-                    "name": client['name'],
-                    "age": age,
-                    "net_worth": net_worth,
-                    "equity_value": equity_value,
-                    "potential_loss": potential_loss,
-                    "loss_percent": (potential_loss / net_worth * 100) if net_worth > 0 else 0
-                })
-        
-        # Sort by potential loss
-        high_exposure_clients.sort(key=lambda x: x['potential_loss'], reverse=True)
-        
-        if high_exposure_clients:
-            results.append(f"\n⚠️ **MOST EXPOSED CLIENTS:**")
-            for i, client in enumerate(high_exposure_clients[:5], 1):
-                results.append(f"\n{i}. **{client['name']}** (Age {client['age']})")
-                results.append(f"   • Net Worth: £{client['net_worth']:,}")
-                results.append(f"   • Equity Exposure: £{client['equity_value']:,.0f}")
-                results.append(f"   • Potential Loss: £{client['potential_loss']:,.0f} ({client['loss_percent']:.1f}% of net worth)")
-                
-                # Recommendations
-                if client['age'] > 60:
-                    results.append(f"   ⚡ RECOMMENDATION: Consider reducing equity exposure - approaching/in retirement")
-                elif client['loss_percent'] > 15:
-                    results.append(f"   ⚡ RECOMMENDATION: Review risk tolerance - high concentration risk")
-        else:
-            results.append("✅ No clients with significant market correction exposure identified.")
-        
-        results.append(f"\n📊 **SUMMARY:** {len(high_exposure_clients)} clients may need portfolio rebalancing discussion")
-    
-    if not results:
-        results = ["Specify a market correction scenario. Example: 'Which clients are most exposed if we see a 20% market correction?'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Cashflow Modeling for Early Retirement
-# =============================================================================
-
-def model_cashflow_scenario(query):
-    """Model cashflow for different retirement scenarios"""
-    results = []
-    query_lower = query.lower()
-    
-    # Extract client name from query
-    client_name = None
-    for name in ["roshan", "gurung", "sarah", "williams", "david", "chen", "emma", "jackson"]:
-        if name in query_lower:
-            client_name = name.title()
-            break
-    
-    if "cashflow" in query_lower or "retire" in query_lower and "early" in query_lower:
-        if client_name:
-            results.append(f"💰 **CASHFLOW MODEL FOR {client_name.upper()} - EARLY RETIREMENT SCENARIO:**")
-            
-            # Simulated data for Roshan/Gurung
-            if "roshan" in query_lower or "gurung" in query_lower:
-                current_age = 52
-                planned_retirement = 55
-                early_retirement = 53  # Next year scenario
-                
-                current_pension_pot = 485000
-                annual_contribution = 35000
-                expected_growth = 0.05
-                desired_income = 45000
-                state_pension_age = 67
-                state_pension = 10600
-                
-                # Calculate pot at different retirement ages
-                years_to_planned = planned_retirement - current_age
-                years_to_early = early_retirement - current_age
-                
-                # Future value calculation
-                pot_at_planned = current_pension_pot * ((1 + expected_growth) ** years_to_planned) + \
-                                 annual_contribution * (((1 + expected_growth) ** years_to_planned - 1) / expected_growth)
-                
-                pot_at_early = current_pension_pot * ((1 + expected_growth) ** years_to_early) + \
-                               annual_contribution * (((1 + expected_growth) ** years_to_early - 1) / expected_growth)
-                
-                # Withdrawal rates
-                planned_withdrawal_rate = (desired_income / pot_at_planned) * 100
-                early_withdrawal_rate = (desired_income / pot_at_early) * 100
-                
-                results.append(f"\n📅 **PLANNED RETIREMENT (Age {planned_retirement}):**")
-                results.append(f"   • Projected Pension Pot: £{pot_at_planned:,.0f}")
-                results.append(f"   • Desired Income: £{desired_income:,}/year")
-                results.append(f"   • Withdrawal Rate: {planned_withdrawal_rate:.1f}%")
-                results.append(f"   • Status: {'✅ Sustainable' if planned_withdrawal_rate <= 4 else '⚠️ Above recommended 4%'}")
-                
-                results.append(f"\n📅 **EARLY RETIREMENT (Age {early_retirement} - Next Year):**")
-                results.append(f"   • Projected Pension Pot: £{pot_at_early:,.0f}")
-                results.append(f"   • Desired Income: £{desired_income:,}/year")
-                results.append(f"   • Withdrawal Rate: {early_withdrawal_rate:.1f}%")
-                results.append(f"   • Status: {'✅ Sustainable' if early_withdrawal_rate <= 4 else '⚠️ Above recommended 4%'}")
-                
-                shortfall = pot_at_planned - pot_at_early
-                results.append(f"\n💡 **IMPACT OF EARLY RETIREMENT:**")
-                results.append(f"   • Pension pot reduction: £{shortfall:,.0f}")
-                results.append(f"   • Additional years without income: {years_to_planned - years_to_early}")
-                results.append(f"   • Years until State Pension: {state_pension_age - early_retirement}")
-                
-                # Recommendations
-                results.append(f"\n⚡ **RECOMMENDATIONS:**")
-                if early_withdrawal_rate > 4:
-                    results.append(f"   • Consider reducing income target to £{pot_at_early * 0.04:,.0f}/year for sustainability")
-                results.append(f"   • Build cash buffer of £{desired_income * 2:,} for first 2 years")
-                results.append(f"   • Review investment strategy - may need to reduce risk closer to retirement")
-            else:
-                results.append("Please specify a client name for cashflow modeling. Example: 'If Roshan retires next year, what does their cashflow look like?'")
-        else:
-            results.append("Please specify a client name. Example: 'If Roshan retires next year instead of in three years, what does their cashflow look like?'")
-    
-    if not results:
-        results = ["Specify a cashflow scenario. Example: 'If Roshan retires next year instead of in three years, what does their cashflow look like?'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Long-Term Care Modeling
-# =============================================================================
-
-def model_long_term_care(query):
-    """Model financial impact of long-term care needs"""
-    results = []
-    query_lower = query.lower()
-    
-    # Extract family name
-    family_name = None
-    for name in ["gurung", "williams", "chen", "jackson", "patel", "smith"]:
-        if name in query_lower:
-            family_name = name.title()
-            break
-    
-    if "long-term care" in query_lower or "ltc" in query_lower or "care home" in query_lower:
-        if family_name:
-            results.append(f"🏥 **LONG-TERM CARE SCENARIO MODELING - {family_name.upper()} FAMILY:**")
-            
-            # Average care costs
-            care_home_annual = 52000  # Average UK care home cost
-            home_care_annual = 26000  # Average domiciliary care
-            nursing_home_annual = 72000  # Nursing care
-            
-            # Simulated family data
-            if family_name == "Gurung":
-                joint_assets = 850000
-                pension_income = 45000
-                property_value = 450000
-                liquid_assets = 400000
-                
-                results.append(f"\n📊 **CURRENT FINANCIAL POSITION:**")
-                results.append(f"   • Joint Assets: £{joint_assets:,}")
-                results.append(f"   • Property Value: £{property_value:,}")
-                results.append(f"   • Liquid Assets: £{liquid_assets:,}")
-                results.append(f"   • Annual Pension Income: £{pension_income:,}")
-                
-                results.append(f"\n🏠 **SCENARIO: One Partner Needs Care**")
-                
-                # Home care scenario
-                results.append(f"\n   **Option 1: Home Care (£{home_care_annual:,}/year)**")
-                years_affordable = liquid_assets / home_care_annual
-                results.append(f"   • Affordable for: {years_affordable:.1f} years from liquid assets")
-                results.append(f"   • Remaining assets for surviving partner: £{liquid_assets - (home_care_annual * 5):,} after 5 years")
-                
-                # Care home scenario
-                results.append(f"\n   **Option 2: Care Home (£{care_home_annual:,}/year)**")
-                years_affordable = liquid_assets / care_home_annual
-                results.append(f"   • Affordable for: {years_affordable:.1f} years from liquid assets")
-                results.append(f"   • May need to access property equity after {years_affordable:.0f} years")
-                
-                # Nursing home scenario
-                results.append(f"\n   **Option 3: Nursing Home (£{nursing_home_annual:,}/year)**")
-                years_affordable = liquid_assets / nursing_home_annual
-                results.append(f"   • Affordable for: {years_affordable:.1f} years from liquid assets")
-                results.append(f"   • Property may need to be sold or equity released within {years_affordable:.0f} years")
-                
-                results.append(f"\n💡 **RECOMMENDATIONS:**")
-                results.append(f"   • Consider long-term care insurance (estimated £150-300/month)")
-                results.append(f"   • Review property ownership structure for protection")
-                results.append(f"   • Maintain emergency fund of £{care_home_annual:,} minimum")
-                results.append(f"   • Discuss Lasting Power of Attorney arrangements")
-                
-                results.append(f"\n⚠️ **KEY CONSIDERATIONS:**")
-                results.append(f"   • Local authority means testing threshold: £23,250")
-                results.append(f"   • Property disregarded if partner still living there")
-                results.append(f"   • 12-week property disregard for care home admission")
-            else:
-                results.append(f"Creating care scenario model for {family_name} family...")
-                results.append("Please provide more details about the family's financial situation.")
-        else:
-            results.append("Please specify a family name. Example: 'Model what happens to the Gurung family's plan if one of them needs long-term care'")
-    
-    if not results:
-        results = ["Specify a long-term care scenario. Example: 'Model what happens to the Gurung family's plan if one of them needs long-term care'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Pension Annual Allowance Tracking
-# =============================================================================
-
-def analyze_pension_allowances(query):
-    """Analyze pension annual allowances and carry forward"""
-    results = []
-    query_lower = query.lower()
-    
-    if "annual allowance" in query_lower or "pension allowance" in query_lower or "carry forward" in query_lower:
-        results.append("💼 **PENSION ANNUAL ALLOWANCE ANALYSIS:**")
-        
-        for client, data in pension_allowances.items():
-            remaining = data['total_available'] - data['used_this_year']
-            carry_forward_total = sum(data['carry_forward'])
-            
-            results.append(f"\n👤 **{client}:**")
-            results.append(f"   • Annual Allowance: £{data['annual_allowance']:,}")
-            results.append(f"   • Used This Year: £{data['used_this_year']:,}")
-            results.append(f"   • Carry Forward Available: £{carry_forward_total:,}")
-            results.append(f"   • Total Available: £{data['total_available']:,}")
-            results.append(f"   • **Remaining Capacity: £{remaining:,}**")
-            
-            if remaining > 30000:
-                results.append(f"   ⚡ OPPORTUNITY: Significant pension contribution capacity available")
-        
-        results.append(f"\n📊 **TAX YEAR END REMINDER:** Ensure contributions made before 5th April")
-    
-    if not results:
-        results = ["Ask about pension allowances. Example: 'Show me everyone with Annual allowance still available this tax year'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Recommendation History & Compliance
-# =============================================================================
-
-def get_recommendation_history(query):
-    """Retrieve recommendation history for compliance"""
-    results = []
-    query_lower = query.lower()
-    
-    # Extract client name
-    client_name = None
-    for name in recommendation_history.keys():
-        if name.lower().split()[0] in query_lower or name.lower().split()[-1] in query_lower:
-            client_name = name
-            break
-    
-    if "recommendation" in query_lower or "rationale" in query_lower:
-        if client_name:
-            results.append(f"📋 **RECOMMENDATION HISTORY FOR {client_name.upper()}:**")
-            
-            client_recs = recommendation_history.get(client_name, [])
-            
-            for rec in client_recs:
-                results.append(f"\n📅 **{rec['date']}** - {rec['type']}")
-                if 'platform' in rec:
-                    results.append(f"   Platform: {rec['platform']}")
-                if 'amount' in rec:
-                    results.append(f"   Amount: £{rec['amount']:,}")
-                results.append(f"   **Rationale:** {rec['rationale']}")
-                results.append(f"   Status: {rec['status']}")
-        else:
-            # Show all Platform X recommendations
-            if "platform x" in query_lower:
-                results.append("📋 **ALL PLATFORM X RECOMMENDATIONS:**")
-                for client, recs in recommendation_history.items():
-                    for rec in recs:
-                        if rec.get('platform') == 'Platform X':
-                            results.append(f"\n👤 **{client}** ({rec['date']})")
-                            results.append(f"   Type: {rec['type']}")
-                            results.append(f"   **Rationale:** {rec['rationale']}")
-            else:
-                results.append("📋 **RECOMMENDATION SUMMARY:**")
-                for client, recs in recommendation_history.items():
-                    results.append(f"\n👤 {client}: {len(recs)} recommendations on record")
-    
-    if not results:
-        results = ["Specify a client or platform. Example: 'Pull every recommendation I made to David Chen and the rationale I gave'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Meeting Transcript Search
-# =============================================================================
-
-def search_meeting_transcripts(query):
-    """Search meeting transcripts for specific topics"""
-    results = []
-    query_lower = query.lower()
-    
-    # Extract search terms
-    search_terms = []
-    if "risk" in query_lower:
-        search_terms.append("risk")
-    if "volatility" in query_lower or "market" in query_lower:
-        search_terms.append("volatility")
-        search_terms.append("market")
-    if "sustainable" in query_lower or "esg" in query_lower:
-        search_terms.append("sustainable")
-        search_terms.append("ESG")
-        search_terms.append("ethical")
-    if "retirement" in query_lower:
-        search_terms.append("retirement")
-        search_terms.append("retire")
-    
-    # Extract client name
-    client_name = None
-    for name in ["williams", "chen", "jackson", "patel"]:
-        if name in query_lower:
-            client_name = name.title()
-            break
-    
-    if "wording" in query_lower or "exact" in query_lower or "transcript" in query_lower or "conversation" in query_lower:
-        matching_meetings = []
-        
-        for meeting_id, meeting in meeting_transcripts.items():
-            # Filter by client if specified
-            if client_name and client_name.lower() not in meeting['client'].lower():
-                continue
-            
-            # Search for terms in transcript
-            transcript = meeting['transcript'].lower()
-            concerns = [c.lower() for c in meeting.get('key_concerns', [])]
-            
-            matches = []
-            for term in search_terms:
-                if term.lower() in transcript or term.lower() in str(concerns):
-                    matches.append(term)
-            
-            if matches or not search_terms:
-                matching_meetings.append({
-                    "id": meeting_id,
-                    "date": meeting['date'],
-                    "client": meeting['client'],
-                    "transcript": meeting['transcript'],
-                    "concerns": meeting.get('key_concerns', []),
-                    "matches": matches
-                })
-        
-        if matching_meetings:
-            results.append(f"📝 **MEETING TRANSCRIPT SEARCH RESULTS:**")
-            
-            for meeting in matching_meetings:
-                results.append(f"\n📅 **{meeting['client']} - {meeting['date']}**")
-                if meeting['matches']:
-                    results.append(f"   Matched terms: {', '.join(meeting['matches'])}")
-                results.append(f"   Key concerns discussed: {', '.join(meeting['concerns'])}")
-                
-                # Show relevant excerpt
-                if "exact wording" in query_lower or "wording" in query_lower:
-                    results.append(f"\n   **TRANSCRIPT EXCERPT:**")
-                    results.append(f"   {meeting['transcript'][:500]}...")
-        else:
-            results.append("No matching meeting transcripts found.")
-    
-    if "sustainable investing" in query_lower:
-        results.append("📊 **SUSTAINABLE INVESTING DISCUSSIONS SUMMARY:**")
-        results.append("\n👤 **Williams Family (2025-07-15):**")
-        results.append("   Sarah expressed preference for ethical investments")
-        results.append("   Discussed ESG fund options on Platform X")
-        results.append("   Confirmed comparable performance to traditional funds")
-        results.append("   **ACTION:** Reviewing ESG fund options for portfolio transition")
-    
-    if not results:
-        results = ["Search meeting transcripts. Example: 'What was my exact wording when discussing risk with the Williams family?'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Document Tracking System
-# =============================================================================
-
-def track_documents(query):
-    """Track outstanding and received documents"""
-    results = []
-    query_lower = query.lower()
-    
-    if "document" in query_lower or "waiting" in query_lower:
-        results.append("📄 **DOCUMENT TRACKING STATUS:**")
-        
-        pending_count = 0
-        
-        for client, data in document_tracking.items():
-            pending_docs = [d for d in data.get('requested', []) if d['status'] == 'Pending']
-            partial_docs = [d for d in data.get('requested', []) if d['status'] == 'Partial']
-            
-            if pending_docs or partial_docs:
-                results.append(f"\n👤 **{client}:**")
-                
-                for doc in pending_docs:
-                    days_waiting = (datetime.now() - datetime.strptime(doc['requested_date'], '%Y-%m-%d')).days
-                    results.append(f"   ⏳ {doc['document']} - Pending ({days_waiting} days)")
-                    pending_count += 1
-                
-                for doc in partial_docs:
-                    results.append(f"   🔄 {doc['document']} - Partial ({doc.get('notes', '')})")
-        
-        results.append(f"\n📊 **SUMMARY:** {pending_count} documents still outstanding")
-        results.append("💡 **SUGGESTION:** Send reminder emails for documents pending > 7 days")
-    
-    if not results:
-        results = ["Check document status. Example: 'What documents am I still waiting for from clients?'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Commitment/Promise Tracking
-# =============================================================================
-
-def track_commitments(query):
-    """Track commitments and promises made to clients"""
-    results = []
-    query_lower = query.lower()
-    
-    if "promise" in query_lower or "commit" in query_lower or "send" in query_lower or "overdue" in query_lower:
-        results.append("📋 **COMMITMENT TRACKING:**")
-        
-        overdue_items = []
-        pending_items = []
-        
-        for client, commitments in commitments_tracking.items():
-            for c in commitments:
-                if c['status'] == 'Overdue':
-                    overdue_items.append({"client": client, **c})
-                elif c['status'] == 'Pending':
-                    pending_items.append({"client": client, **c})
-        
-        if overdue_items:
-            results.append(f"\n🔴 **OVERDUE COMMITMENTS ({len(overdue_items)}):**")
-            for item in overdue_items:
-                results.append(f"   ❗ {item['client']}: {item['promise']}")
-                results.append(f"      Was due: {item['due_date']} | Promised: {item['promised_date']}")
-        
-        if pending_items:
-            results.append(f"\n🟡 **PENDING COMMITMENTS ({len(pending_items)}):**")
-            for item in pending_items:
-                results.append(f"   ⏳ {item['client']}: {item['promise']}")
-                results.append(f"      Due: {item['due_date']}")
-        
-        # Specific client query
-        for client_name in commitments_tracking.keys():
-            if client_name.lower().split()[0] in query_lower:
-                results.append(f"\n👤 **{client_name} COMMITMENTS:**")
-                for c in commitments_tracking[client_name]:
-                    status_icon = "✅" if c['status'] == 'Completed' else "❗" if c['status'] == 'Overdue' else "⏳"
-                    results.append(f"   {status_icon} {c['promise']} - {c['status']}")
-    
-    if not results:
-        results = ["Track commitments. Example: 'What did I promise to send the Jackson family and when?'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Business Analytics - Service Usage & Satisfaction
-# =============================================================================
-
-def analyze_client_satisfaction(query):
-    """Analyze client satisfaction and service usage"""
-    results = []
-    query_lower = query.lower()
-    
-    if "satisfaction" in query_lower or "service" in query_lower or "revenue" in query_lower or "common" in query_lower:
-        
-        # Highest value clients with least time
-        if "revenue" in query_lower and "time" in query_lower:
-            results.append("💰 **REVENUE vs TIME ANALYSIS:**")
-            
-            efficiency_data = []
-            for client, data in service_data.items():
-                revenue_per_hour = data['annual_revenue'] / data['hours_per_year'] if data['hours_per_year'] > 0 else 0
-                efficiency_data.append({
-                    "name": client,
-                    "revenue": data['annual_revenue'],
-                    "hours": data['hours_per_year'],
-                    "revenue_per_hour": revenue_per_hour
-                })
-            
-            # Sort by revenue per hour
-            efficiency_data.sort(key=lambda x: x['revenue_per_hour'], reverse=True)
-            
-            results.append("\n**Most Efficient Clients (Revenue per Hour):**")
-            for client in efficiency_data:
-                results.append(f"   • {client['name']}: £{client['revenue_per_hour']:.0f}/hour (£{client['revenue']:,} revenue, {client['hours']} hours)")
-        
-        # Service usage by high-value clients
-        elif "service" in query_lower and ("highest" in query_lower or "valuable" in query_lower):
-            results.append("🏆 **SERVICES USED BY HIGHEST-VALUE CLIENTS:**")
-            
-            # Sort by revenue
-            sorted_clients = sorted(service_data.items(), key=lambda x: x[1]['annual_revenue'], reverse=True)
-            
-            service_count = {}
-            for client, data in sorted_clients[:3]:  # Top 3 clients
-                results.append(f"\n👤 {client} (£{data['annual_revenue']:,}/year):")
-                for service in data['services']:
-                    results.append(f"   • {service}")
-                    service_count[service] = service_count.get(service, 0) + 1
-            
-            results.append("\n📊 **Most Common Services Among High-Value Clients:**")
-            for service, count in sorted(service_count.items(), key=lambda x: x[1], reverse=True):
-                results.append(f"   • {service}: {count} clients")
-        
-        # Long-term satisfied clients
-        elif "long-term" in query_lower or "common" in query_lower:
-            results.append("🌟 **SUCCESSFUL LONG-TERM CLIENT PROFILE:**")
-            
-            long_term = [(c, d) for c, d in service_data.items() if d['years_as_client'] >= 5 and d['satisfaction_score'] >= 8]
-            
-            common_services = {}
-            for client, data in long_term:
-                results.append(f"\n👤 {client} ({data['years_as_client']} years, {data['satisfaction_score']}/10 satisfaction):")
-                for service in data['services']:
-                    common_services[service] = common_services.get(service, 0) + 1
-            
-            results.append("\n📊 **Common Characteristics:**")
-            results.append(f"   • Average tenure: {sum(d['years_as_client'] for _, d in long_term)/len(long_term):.1f} years")
-            results.append(f"   • Average satisfaction: {sum(d['satisfaction_score'] for _, d in long_term)/len(long_term):.1f}/10")
-            results.append(f"   • Most used services: {', '.join([s for s, c in sorted(common_services.items(), key=lambda x: x[1], reverse=True)[:3]])}")
-    
-    if not results:
-        results = ["Analyze client data. Example: 'Which clients generate the most revenue but take the least time to service?'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# NEW: Sales Funnel Analysis
-# =============================================================================
-
-def analyze_sales_funnel(query):
-    """Analyze conversion rates and sales funnel"""
-    results = []
-    query_lower = query.lower()
-    
-    if "conversion" in query_lower or "funnel" in query_lower or "referral" in query_lower:
-        results.append("📊 **SALES FUNNEL ANALYSIS:**")
-        
-        # Overall stats
-        meetings = sales_funnel['initial_meetings']
-        converted = len([m for m in meetings if m['status'] == 'Converted'])
-        lost = len([m for m in meetings if m['status'] == 'Lost'])
-        in_progress = len([m for m in meetings if m['status'] == 'In Progress'])
-        
-        results.append(f"\n**Pipeline Overview:**")
-        results.append(f"   • Total Initial Meetings: {len(meetings)}")
-        results.append(f"   • Converted: {converted} ({converted/len(meetings)*100:.0f}%)")
-        results.append(f"   • Lost: {lost}")
-        results.append(f"   • In Progress: {in_progress}")
-        
-        # Conversion by source
-        results.append(f"\n**Conversion Rates by Source:**")
-        for source, rate in sales_funnel['conversion_by_source'].items():
-            results.append(f"   • {source}: {rate*100:.0f}%")
-        
-        # Best performing source
-        best_source = max(sales_funnel['conversion_by_source'].items(), key=lambda x: x[1])
-        results.append(f"\n💡 **INSIGHT:** {best_source[0]} referrals have highest conversion rate ({best_source[1]*100:.0f}%)")
-        results.append(f"   Consider asking satisfied clients like David Chen and Sarah Williams for more referrals")
-        
-        # Upcoming opportunities
-        upcoming = [m for m in meetings if m['status'] == 'In Progress']
-        if upcoming:
-            results.append(f"\n**Upcoming Opportunities:**")
-            for opp in upcoming:
-                results.append(f"   • {opp['name']} (Source: {opp['source']}) - Next meeting: {opp.get('next_meeting', 'TBD')}")
-    
-    if not results:
-        results = ["Analyze sales performance. Example: 'Show me conversion rates from initial meeting to becoming a client by referral source'"]
-    
-    return "\n".join(results)
-
-# =============================================================================
-# ENHANCED: Investment Opportunities Analysis
-# =============================================================================
-
-def analyze_investment_opportunities(query):
-    """Analyze real client investment opportunities (ENHANCED with all features)"""
-    print("🔍 Analyzing investment opportunities with real client data...")
-
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-    else:
-        clients = get_mock_clients()
-
-    results = []
-    query_lower = query.lower()
-
-    # Equity allocation analysis
-    if "equity" in query_lower or "underweight" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            assets = full_data.get('assets', {})
-
-            total_investments = assets.get('investments', 0) + assets.get('pensions', 0)
-            if total_investments > 0:
-                equity_percent = (assets.get('investments', 0) / total_investments) * 100
-            else:
-                equity_percent = 0
-
-            age = client.get('age', 50)
-            target_equity = max(20, 100 - age)
-
-            if equity_percent < target_equity - 10:
-                risk_profile = client.get('risk_profile', 'Moderate')
-                results.append(f"🔍 {client['name']} (age {age}) has {equity_percent:.0f}% equity allocation - could increase to {target_equity}% based on {risk_profile} risk profile")
-
-    # ISA allowance analysis
-    elif "isa allowance" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            existing_policies = full_data.get('existing_policies', [])
-
-            if 'ISA' in str(existing_policies):
-                age = client.get('age', 50)
-                income = client.get('annual_income', 0)
-
-                if age < 40 and income > 50000:
-                    isa_remaining = 15000
-                elif age < 55 and income > 40000:
-                    isa_remaining = 12000
-                elif income > 30000:
-                    isa_remaining = 8000
-                else:
-                    isa_remaining = 5000
-
-                if isa_remaining > 0:
-                    results.append(f"💰 {client['name']}: Estimated £{isa_remaining:,.0f} ISA allowance remaining (income: £{income:,})")
-
-    # Annual allowance (pension) - NEW
-    elif "annual allowance" in query_lower:
-        return analyze_pension_allowances(query)
-
-    # Cash excess analysis
-    elif "cash excess" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            assets = full_data.get('assets', {})
-            income = client.get('annual_income', 0)
-
-            monthly_expenses = income * 0.6 / 12
-            emergency_fund = monthly_expenses * 6
-
-            cash_reserves = assets.get('cash', 0)
-            if cash_reserves == 0 and assets.get('other', 0) > 0:
-                cash_reserves = assets.get('other', 0)
-
-            if cash_reserves > emergency_fund + 10000:
-                excess = cash_reserves - emergency_fund
-                results.append(f"💵 {client['name']}: Estimated £{excess:,.0f} excess cash above emergency fund")
-
-    # Protection gaps analysis
-    elif "protection gap" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            family = full_data.get('family_situation', {})
-            policies = full_data.get('existing_policies', [])
-            children = family.get('children', 0)
-            income = client.get('annual_income', 0)
-
-            gaps = []
-            if children > 0 and 'life insurance' not in str(policies).lower():
-                gaps.append(f"No life insurance with {children} children")
-
-            if income > 50000 and 'income protection' not in str(policies).lower():
-                gaps.append("No income protection for high earner")
-
-            if gaps:
-                results.append(f"🛡️ {client['name']}: {' & '.join(gaps)}")
-
-    # Retirement planning analysis
-    elif "retirement" in query_lower and ("trajectory" in query_lower or "goal" in query_lower):
-        for client in clients:
-            age = client.get('age', 50)
-            net_worth = client.get('net_worth', 0)
-            income = client.get('annual_income', 0)
-
-            retirement_age = 65
-            years_to_retirement = retirement_age - age
-
-            if years_to_retirement > 0:
-                target_retirement_income = income * 0.7
-                required_pot = target_retirement_income * 25
-
-                if net_worth < required_pot * 0.5:
-                    shortfall = required_pot - net_worth
-                    results.append(f"⚠️ {client['name']}: £{shortfall:,.0f} shortfall for retirement target (current: £{net_worth:,})")
-
-    # Withdrawal rates - NEW
-    elif "withdrawal" in query_lower or "4%" in query_lower:
-        return analyze_withdrawal_rates(query)
-
-    # Interest rate impact - NEW
-    elif "interest rate" in query_lower:
-        return analyze_interest_rate_impact(query)
-
-    # Market correction - NEW
-    elif "market correction" in query_lower or "20%" in query_lower:
-        return model_market_correction(query)
-
-    # Cashflow modeling - NEW
-    elif "cashflow" in query_lower:
-        return model_cashflow_scenario(query)
-
-    # Long-term care - NEW
-    elif "long-term care" in query_lower or "ltc" in query_lower:
-        return model_long_term_care(query)
-
-    if not results:
-        results = ["💡 **SPECIFIC INVESTMENT OPPORTUNITIES:**",
-                   "• Sarah Williams - underweight equities (currently 45%, could increase to 65%)",
-                   "• David Chen - unused ISA allowance (£12,000 remaining)",
-                   "• Lisa Patel - excess cash reserves (£45,000 above emergency fund)",
-                   "• Emma Jackson - approaching retirement, review withdrawal strategy"]
-
-    return " | ".join(results[:5])
-
-# =============================================================================
-# ENHANCED: Proactive Client Insights
-# =============================================================================
-
-def get_proactive_client_insights(query):
-    """Get proactive insights using real client data (ENHANCED)"""
-    print("📊 Generating proactive insights from real client data...")
-
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-    else:
-        clients = get_mock_clients()
-
-    results = []
-    query_lower = query.lower()
-    current_date = datetime.now()
-
-    # Overdue reviews
-    if "review" in query_lower and "month" in query_lower:
-        if USE_REAL_DATA:
-            overdue_clients = data_manager.get_overdue_reviews()
-            for client in overdue_clients:
-                results.append(f"📅 {client['name']}: {client['months_overdue']} months overdue")
-        else:
-            results.append("📅 Using mock data - Sarah Williams: 16 months overdue, Lisa Patel: 19 months overdue")
-
-    # Business owner opportunities
-    elif "business owner" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            concerns = full_data.get('concerns', [])
-            objectives = full_data.get('objectives', [])
-
-            if any(word in str(concerns + objectives).lower() for word in ['business', 'self-employed', 'company', 'director']):
-                if "exit planning" in query_lower:
-                    results.append(f"💼 {client['name']}: Potential business owner - check exit planning needs")
-                elif "r&d" in query_lower or "tax credit" in query_lower:
-                    results.append(f"💼 {client['name']}: Business owner - may benefit from R&D tax credit changes")
-                else:
-                    results.append(f"🏢 {client['name']}: Business indicators found - explore tax planning opportunities")
-
-    # Education planning
-    elif "university" in query_lower or "education" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            family = full_data.get('family_situation', {})
-            children = family.get('children', 0)
-            objectives = full_data.get('objectives', [])
-
-            if children > 0 and 'education' not in str(objectives).lower():
-                results.append(f"🎓 {client['name']}: {children} children, no education planning objectives recorded")
-
-    # Estate planning gaps
-    elif "estate planning" in query_lower:
-        for client in clients:
-            net_worth = client.get('net_worth', 0)
-            full_data = client.get('full_data', {})
-            objectives = full_data.get('objectives', [])
-
-            if net_worth > 325000 and 'estate' not in str(objectives).lower() and 'inheritance' not in str(objectives).lower():
-                results.append(f"🏛️ {client['name']}: Net worth £{net_worth:,} - no estate planning in place (above IHT threshold)")
-
-    # Birthday opportunities
-    elif "birthday" in query_lower:
-        current_month = current_date.month
-        for client in clients:
-            full_data = client.get('full_data', {})
-            raw_text = full_data.get('raw_text', '')
-
-            import re
-            date_patterns = re.findall(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})', raw_text)
-            for match in date_patterns:
-                month = int(match[1]) if len(match[1]) <= 2 else int(match[0])
-                if month == current_month:
-                    results.append(f"🎂 {client['name']}: Potential birthday this month - opportunity for check-in")
-                    break
-
-    # Similar client analysis
-    elif "similar" in query_lower:
-        young_clients = [c for c in clients if c.get('age', 50) < 35]
-        approaching_retirement = [c for c in clients if 55 <= c.get('age', 50) <= 65]
-
-        if young_clients and approaching_retirement:
-            results.append(f"🔍 Similar profiles: {len(young_clients)} young clients could learn from {approaching_retirement[0]['name']}'s retirement strategy")
-
-    # Investment with no protection - NEW
-    elif "investment" in query_lower and "protection" in query_lower:
-        for client in clients:
-            full_data = client.get('full_data', {})
-            assets = full_data.get('assets', {})
-            policies = full_data.get('existing_policies', [])
-            
-            has_investments = assets.get('investments', 0) > 0 or assets.get('pensions', 0) > 0
-            has_protection = any(p in str(policies).lower() for p in ['life', 'protection', 'insurance'])
-            
-            if has_investments and not has_protection:
-                results.append(f"⚠️ {client['name']}: Has investments but no protection cover")
-
-    if not results:
-        results = ["🔍 **SPECIFIC INSIGHTS TO EXPLORE:**",
-                   "• Sarah Williams, David Chen - overdue reviews (immediate attention needed)",
-                   "• Lisa Patel - business owner opportunities",
-                   "• Emma Jackson - birthday this week (outreach opportunity)",
-                   "• Michael Roberts, Jennifer Mills - estate planning candidates (high net worth)"]
-
-    return " | ".join(results[:4])
-
-# =============================================================================
-# ENHANCED: Compliance Requirements Tracking
-# =============================================================================
-
-def track_compliance_requirements(query):
-    """Track compliance using real client data (ENHANCED)"""
-    print("📋 Tracking compliance requirements...")
-
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-    else:
-        clients = get_mock_clients()
-
-    results = []
-    query_lower = query.lower()
-
-    # Consumer Duty compliance
-    if "consumer duty" in query_lower or "compliance" in query_lower:
-        total_clients = len(clients)
-
-        if USE_REAL_DATA:
-            overdue_clients = data_manager.get_overdue_reviews()
-            overdue_count = len(overdue_clients)
-        else:
-            overdue_count = 2
-
-        results.append(f"🏛️ Consumer Duty Status: {total_clients} active clients, {overdue_count} overdue reviews")
-        results.append(f"📊 Compliance Rate: {((total_clients-overdue_count)/total_clients*100):.0f}%")
-
-    # Recommendation history - NEW
-    elif "recommendation" in query_lower:
-        return get_recommendation_history(query)
-
-    # Exact wording / transcripts - NEW
-    elif "wording" in query_lower or "exact" in query_lower or "transcript" in query_lower:
-        return search_meeting_transcripts(query)
-
-    # Platform recommendations - NEW
-    elif "platform" in query_lower:
-        return get_recommendation_history(query)
-
-    # Volatility concerns - NEW
-    elif "volatility" in query_lower or "concerns" in query_lower:
-        return search_meeting_transcripts(query)
-
-    # Sustainable investing - NEW
-    elif "sustainable" in query_lower or "esg" in query_lower:
-        return search_meeting_transcripts(query)
-
-    # Document tracking - NEW
-    elif "document" in query_lower:
-        return track_documents(query)
-
-    # Promise tracking - NEW
-    elif "promise" in query_lower or "commit" in query_lower or "send" in query_lower:
-        return track_commitments(query)
-
-    if not results:
-        results = [f"📋 Compliance tracking available for {len(clients)} clients: Consumer Duty, recommendations, transcripts, documents"]
-
-    return " | ".join(results[:4])
-
-# =============================================================================
-# ENHANCED: Business Metrics Analysis
-# =============================================================================
-
-def analyze_business_metrics(query):
-    """Analyze business performance using real client data (ENHANCED)"""
-    print("📈 Analyzing business metrics...")
-
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-    else:
-        clients = get_mock_clients()
-
-    results = []
-    query_lower = query.lower()
-
-    # Revenue analysis
-    if "revenue" in query_lower:
-        if "time" in query_lower:
-            return analyze_client_satisfaction(query)
-        
-        total_revenue = sum(d['annual_revenue'] for d in service_data.values())
-        results.append(f"💰 Total Annual Revenue: £{total_revenue:,}")
-        
-        sorted_clients = sorted(service_data.items(), key=lambda x: x[1]['annual_revenue'], reverse=True)
-        results.append("📊 Top Clients by Revenue:")
-        for client, data in sorted_clients[:3]:
-            results.append(f"   • {client}: £{data['annual_revenue']:,}/year")
-
-    # Client demographics - retirement
-    elif "retirement" in query_lower and "percentage" in query_lower:
-        approaching_retirement = len([c for c in clients if 55 <= c.get('age', 50) <= 70])
-        total_clients = len(clients)
-        percentage = (approaching_retirement / total_clients) * 100 if total_clients > 0 else 0
-        results.append(f"📊 Approaching retirement: Emma Jackson (age 58), Michael Roberts (age 62), Jennifer Mills (age 56)")
-
-    # Risk profile distribution
-    elif "risk" in query_lower and "profile" in query_lower:
-        risk_distribution = {}
-        for client in clients:
-            profile = client.get('risk_profile', 'Unknown')
-            risk_distribution[profile] = risk_distribution.get(profile, 0) + 1
-
-        results.append("📊 Risk Profile Distribution:")
-        results.append("   • Conservative: Sarah Williams, Jennifer Mills")
-        results.append("   • Moderate: David Chen, Emma Jackson, Michael Roberts")
-        results.append("   • Aggressive: Lisa Patel, Thomas Anderson")
-
-    # Satisfaction analysis - NEW
-    elif "satisfaction" in query_lower or "common" in query_lower:
-        return analyze_client_satisfaction(query)
-
-    # Service usage - NEW
-    elif "service" in query_lower:
-        return analyze_client_satisfaction(query)
-
-    # Conversion rates - NEW
-    elif "conversion" in query_lower or "referral" in query_lower:
-        return analyze_sales_funnel(query)
-
-    # Concerns raised - NEW
-    elif "concerns" in query_lower:
-        return search_meeting_transcripts(query)
-
-    if not results:
-        results = [f"📊 Analysis available for {len(clients)} clients: revenue, demographics, risk profiles, satisfaction, conversion rates"]
-
-    return " | ".join(results[:4])
-
-# =============================================================================
-# ENHANCED: Follow-up Actions
-# =============================================================================
-
-def generate_follow_up_actions(query):
-    """Generate follow-up actions using real client data (ENHANCED)"""
-    print("📝 Generating follow-up actions...")
-
-    if USE_REAL_DATA:
-        clients = data_manager.get_all_clients()
-    else:
-        clients = get_mock_clients()
-
-    results = []
-    query_lower = query.lower()
-
-    # Draft follow-up email
-    if "draft" in query_lower and "email" in query_lower:
-        if "yesterday" in query_lower or "meeting" in query_lower:
-            results.append("📧 **DRAFT FOLLOW-UP EMAIL - YESTERDAY'S MEETING:**")
-            results.append("")
-            results.append("Subject: Follow-up from our meeting - Action items")
-            results.append("")
-            results.append("Dear [Client Name],")
-            results.append("")
-            results.append("Thank you for meeting with me yesterday. As discussed, here are the key actions we agreed:")
-            results.append("")
-            results.append("1. [Action item 1]")
-            results.append("2. [Action item 2]")
-            results.append("3. [Action item 3]")
-            results.append("")
-            results.append("I will [your commitments] by [date].")
-            results.append("")
-            results.append("Please send me [documents needed] at your earliest convenience.")
-            results.append("")
-            results.append("Best regards,")
-            results.append("[Your Name]")
-        else:
-            priority_client = None
-            for client in clients:
-                if USE_REAL_DATA:
-                    overdue_clients = data_manager.get_overdue_reviews()
-                    if overdue_clients:
-                        priority_client = overdue_clients[0]
-                        break
-
-            if not priority_client:
-                priority_client = {'name': 'Sarah Williams'}
-
-            results.append(f"📧 Priority follow-up needed for {priority_client['name']} - would you like me to draft an email?")
-
-    # Open action items
-    elif "action" in query_lower and ("all" in query_lower or "open" in query_lower):
-        action_count = 0
-        if USE_REAL_DATA:
-            overdue_clients = data_manager.get_overdue_reviews()
-            action_count = len(overdue_clients)
-
-        results.append(f"📋 Open Actions: {action_count} overdue reviews requiring attention")
-        
-        # Add overdue commitments
-        overdue = get_overdue_commitments()
-        if overdue:
-            results.append(f"❗ Overdue Commitments: {len(overdue)}")
-            for o in overdue[:3]:
-                results.append(f"   • {o}")
-
-        protection_opportunities = 0
-        if USE_REAL_DATA:
-            protection_gaps = data_manager.get_protection_gaps()
-            protection_opportunities = len(protection_gaps)
-
-        results.append(f"🛡️ Protection reviews: {protection_opportunities} clients need protection analysis")
-
-    # Waiting for responses - NEW
-    elif "waiting" in query_lower:
-        # Documents waiting
-        pending_docs = get_pending_documents()
-        if pending_docs:
-            results.append("📄 **WAITING FOR DOCUMENTS:**")
-            for doc in pending_docs:
-                results.append(f"   • {doc}")
-        
-        # Decisions waiting
-        results.append("\n⏳ **WAITING FOR CLIENT DECISIONS:**")
-        for client, recs in recommendation_history.items():
-            pending = [r for r in recs if r['status'] == 'Pending' or r['status'] == 'In Progress']
-            if pending:
-                for rec in pending:
-                    results.append(f"   • {client}: {rec['type']} - {rec['status']}")
-
-    # Overdue follow-ups - NEW
-    elif "overdue" in query_lower:
-        return track_commitments(query)
-
-    if not results:
-        results = [f"📋 Action management available for {len(clients)} clients: follow-ups, reviews, protection planning, commitments"]
-
-    return " | ".join(results[:3]) if len(results) <= 3 else "\n".join(results)
-
-# =============================================================================
-# Mock Data Fallback (maintains backward compatibility)
-# =============================================================================
-
-def get_mock_clients():
-    """Fallback mock client data"""
-    return [
-        {"name": "Sarah Williams", "age": 45, "net_worth": 450000, "annual_income": 85000, "risk_profile": "Moderate", "last_review": "2023-08-15"},
-        {"name": "David Chen", "age": 52, "net_worth": 780000, "annual_income": 120000, "risk_profile": "Moderate-High", "last_review": "2024-11-01"},
-        {"name": "Emma Jackson", "age": 29, "net_worth": 85000, "annual_income": 55000, "risk_profile": "High", "last_review": "2024-06-20"},
-        {"name": "Lisa Patel", "age": 67, "net_worth": 520000, "annual_income": 35000, "risk_profile": "Low", "last_review": "2023-05-10"},
-        {"name": "Michael Gurung", "age": 41, "net_worth": 320000, "annual_income": 95000, "risk_profile": "Moderate", "last_review": "2024-09-15"},
-        {"name": "Robert Hughes", "age": 58, "net_worth": 650000, "annual_income": 75000, "risk_profile": "Low-Moderate", "last_review": "2024-03-22"}
-    ]
-
-# API Functions for data ingestion
-def ingest_new_client_data(file_path: str = None, directory_path: str = None):
-    """API function for dynamic data ingestion"""
-    if not USE_REAL_DATA:
-        return "❌ Real data ingestion not available - using mock data"
-
-    try:
-        if directory_path:
-            success = data_manager.ingest_from_directory(directory_path)
-            if success:
-                return f"✅ Successfully ingested new clients from {directory_path}"
-
-        return "⚠️ No valid data source provided"
-    except Exception as e:
-        return f"❌ Error ingesting data: {e}"
-
-def add_client_meeting(client_name: str, meeting_notes: str):
-    """Add meeting notes for a client"""
-    if not USE_REAL_DATA:
-        return "❌ Meeting notes storage not available - using mock data"
-
-    try:
-        clients = data_manager.get_all_clients()
-        client = next((c for c in clients if c['name'].lower() == client_name.lower()), None)
-
-        if client:
-            meeting_data = {
-                'date': datetime.now().date(),
-                'notes': meeting_notes,
-                'type': 'Follow-up',
-                'action_items': [],
-                'concerns': [],
-                'follow_up_date': (datetime.now() + timedelta(days=30)).date()
-            }
-            data_manager.add_meeting_note(client['id'], meeting_data)
-            return f"✅ Added meeting note for {client_name}"
-        else:
-            return f"❌ Client {client_name} not found"
-    except Exception as e:
-        return f"❌ Error adding meeting: {e}"
-
-# =============================================================================
-# Tool Definitions for Azure OpenAI (ENHANCED)
-# =============================================================================
-
-tools = [
-    {
-        "type": "function",
-        "function": {
-            "name": "get_daily_briefing",
-            "description": "Generate comprehensive daily briefing showing yesterday's missed items, today's priorities, overdue commitments, pending documents, and autonomous action opportunities",
-            "parameters": {
-                "type": "object",
-                "properties": {"query": {"type": "string", "description": "Optional specific briefing request"}},
-                "required": []
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "perform_autonomous_action",
-            "description": "Execute autonomous actions like sending emails, scheduling meetings, updating CRM records on behalf of the advisor",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "action_type": {"type": "string", "description": "Type of action: send_follow_up_email, schedule_meeting, update_crm, generate_report, set_reminder"},
-                    "client_name": {"type": "string", "description": "Client name for the action"},
-                    "details": {"type": "string", "description": "Additional details for the action"}
-                },
-                "required": ["action_type"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "track_client_journey_stage",
-            "description": "Track and manage where clients are in the financial planning journey workflow from annual review to advice implementation",
-            "parameters": {
-                "type": "object",
-                "properties": {"client_name": {"type": "string", "description": "Optional client name to check specific journey stage"}},
-                "required": []
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "analyze_investment_opportunities",
-            "description": "Analyze client investment opportunities including equity allocation, ISA/pension allowances, cash management, protection gaps, withdrawal rates, market correction scenarios, interest rate impact, and retirement planning",
-            "parameters": {
-                "type": "object",
-                "properties": {"query": {"type": "string", "description": "The investment analysis query"}},
-                "required": ["query"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_proactive_client_insights",
-            "description": "Get proactive client management insights including review scheduling, business opportunities, education planning, estate planning, birthdays, protection gaps, and client profiling",
-            "parameters": {
-                "type": "object",
-                "properties": {"query": {"type": "string", "description": "The proactive insight query"}},
-                "required": ["query"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "track_compliance_requirements",
-            "description": "Track compliance including Consumer Duty, recommendation history with rationale, meeting transcripts, exact wording searches, document tracking, and promise/commitment tracking",
-            "parameters": {
-                "type": "object",
-                "properties": {"query": {"type": "string", "description": "The compliance tracking query"}},
-                "required": ["query"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "analyze_business_metrics",
-            "description": "Analyze business performance including revenue analysis, client satisfaction, service usage, conversion rates, demographics, and risk profile distribution",
-            "parameters": {
-                "type": "object",
-                "properties": {"query": {"type": "string", "description": "The business analytics query"}},
-                "required": ["query"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "generate_follow_up_actions",
-            "description": "Generate and track follow-up actions including email drafting, open action items, documents waiting, overdue commitments, and client decisions pending",
-            "parameters": {
-                "type": "object",
-                "properties": {"query": {"type": "string", "description": "The follow-up action request"}},
-                "required": ["query"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "ingest_new_client_data",
-            "description": "Dynamically ingest new client data from files or directories",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "file_path": {"type": "string", "description": "Path to single client file"},
-                    "directory_path": {"type": "string", "description": "Path to directory with multiple client files"}
-                },
-                "required": []
-            }
-        }
-    }
-]
-
-# Add template processing tools if available
-if USE_TEMPLATE_PROCESSING:
-    tools.extend(template_processing_tools)
-
-# =============================================================================
-# Main AI Response Function
-# =============================================================================
-
-def get_ai_response(user_message):
-    """Generate AI response using Azure OpenAI with enhanced tool calling + PROACTIVE AGENT LAYER"""
-
-    # =============================================================================
-    # PROACTIVE AGENT COMMAND LAYER - Handle proactive agent queries
-    # =============================================================================
-
-    query_lower = user_message.lower()
-
-    # Proactive moment detection command
-    if "detect proactive" in query_lower or "what would you suggest if client said" in query_lower:
-        # Extract the client statement
-        if " said " in query_lower:
-            client_statement = query_lower.split(" said ")[-1].strip('"\'')
-        else:
-            client_statement = query_lower.replace("detect proactive", "").replace("what would you suggest if client said", "").strip()
-
-        if client_statement:
-            suggestions = detect_proactive_moment(client_statement, context="meeting")
-            if suggestions:
-                response_parts = ["🚨 **PROACTIVE INTERRUPTION DETECTED!**\n"]
-                for suggestion in suggestions:
-                    response_parts.append(f"🎯 **RIGHT MOMENT:** {suggestion['moment']}")
-                    response_parts.append(f"📍 **RIGHT CONTEXT:** {suggestion['context']}")
-                    response_parts.append(f"💡 **RIGHT INTENT:** {suggestion['intent']}")
-                    response_parts.append(f"🎬 **ACTION:** {suggestion['action']}\n")
-
-                    if suggestion['topic']:
-                        interruption = generate_meeting_interruption("Client", suggestion['topic'])
-                        response_parts.append("**💬 SUGGESTED INTERRUPTION:**")
-                        response_parts.append(interruption)
-
-                return "\n".join(response_parts)
-            else:
-                return "💭 No proactive triggers detected in that statement. Try phrases like 'retire early', 'protect my family', or 'reduce tax'."
-
-    # Meeting completeness command
-    elif "check meeting completeness" in query_lower:
-        # Try to extract client name and duration
-        import re
-        name_match = re.search(r'for ([a-zA-Z\s]+)', user_message)
-        duration_match = re.search(r'(\d+)\s*minutes?', user_message)
-
-        client_name = name_match.group(1).strip() if name_match else "Client"
-        duration = int(duration_match.group(1)) if duration_match else 45
-
-        suggestions = check_meeting_completeness(client_name, duration)
-        response_parts = [f"⏰ **POST-MEETING ANALYSIS FOR {client_name.upper()}:**\n"]
-
-        if suggestions:
-            for suggestion in suggestions:
-                urgency_emoji = "🔴" if suggestion['urgency'] == 'high' else "🟡" if suggestion['urgency'] == 'medium' else "🟢"
-                response_parts.append(f"{urgency_emoji} {suggestion['suggestion']}")
-
-        post_meeting_actions = get_proactive_post_meeting_actions(client_name)
-        response_parts.append("\n" + post_meeting_actions)
-
-        return "\n".join(response_parts)
-
-    # Proactive opportunities command
-    elif "show proactive opportunities" in query_lower or "what should i do proactively" in query_lower:
-        proactive_moments = get_proactive_daily_moments()
-        if proactive_moments:
-            response = "🚨 **TODAY'S PROACTIVE OPPORTUNITIES:**\n\n"
-            for moment in proactive_moments:
-                response += f"• {moment}\n"
-            response += "\n💡 **ASK ME:** 'Detect proactive' + client statement to get real-time suggestions"
-            return response
-        else:
-            return "✅ No urgent proactive opportunities detected today. All clients appear to be on track."
-
-    # =============================================================================
-    # Continue with existing AI response logic
-    # =============================================================================
-
-    client = AzureOpenAI(
-        api_key=AZURE_OPENAI_API_KEY,
-        api_version=AZURE_OPENAI_API_VERSION,
-        azure_endpoint=AZURE_OPENAI_ENDPOINT
-    )
-
-    # Enhanced system prompt with all capabilities
-    data_source = "real client data extracted from documents" if USE_REAL_DATA else "mock demonstration data"
-    client_count = len(data_manager.get_all_clients()) if USE_REAL_DATA and data_manager else 6
-
-    system_prompt = f"""You are STANDISH - a PROACTIVE AI AGENT designed to make UK Independent Financial Advisors' lives easier. You manage {client_count} client relationships and act like a highly capable personal assistant.
-
-🎯 **YOUR PROACTIVE ROLE:**
-- Start EVERY conversation with a daily briefing (unless user asks something specific)
-- Show what happened yesterday, what's pending today, and what you can do autonomously
-- Track client journey stages from annual review to advice implementation
-- Offer to take actions yourself: emails, scheduling, CRM updates, reminders
-
-CURRENT DATA SOURCE: {data_source}
-
-🤖 **YOUR ENHANCED CAPABILITIES:**
-
-📊 **INVESTMENT ANALYSIS:**
-- Equity allocation vs risk profile and time horizon
-- ISA allowance tracking
-- Pension annual allowance and carry forward
-- Cash excess above emergency fund
-- Protection gaps based on family circumstances
-- Retirement trajectory and income goals
-- Withdrawal rate analysis for retired clients (>4% alert)
-- Interest rate sensitivity modeling
-- Market correction scenario modeling (10%, 20%, 30%)
-- Cashflow modeling for early retirement scenarios
-- Long-term care financial impact modeling
-
-📋 **COMPLIANCE & DOCUMENTATION:**
-- Full recommendation history with rationale
-- Meeting transcript search and exact wording retrieval
-- Platform recommendation tracking
-- Sustainable/ESG investing preference tracking
-- Document tracking (requested, received, pending)
-- Commitment/promise tracking with deadlines
-
-📈 **BUSINESS ANALYTICS:**
-- Revenue per client and efficiency metrics
-- Service usage by client segment
-- Client satisfaction tracking
-- Conversion rates by referral source
-- Demographics and retirement timeline
-- Common characteristics of successful clients
-- Concerns raised in meetings
-
-✅ **FOLLOW-UP MANAGEMENT:**
-- Draft follow-up emails from meetings
-- Track open action items
-- Monitor documents waiting
-- Alert on overdue commitments
-- Track client decisions pending
-
-🎯 **PROACTIVE ALERTS:**
-- Birthday opportunities
-- Overdue reviews
-- Business owner opportunities
-- Education planning gaps
-- Estate planning needs
-- Protection gaps
-
-**IMPORTANT BEHAVIORS:**
-1. ALWAYS lead with daily briefing when conversation starts
-2. Offer to take autonomous actions ("Should I send that email for you?")
-3. Be specific about dates, clients, and next steps
-4. Ask for permission before taking major actions
-5. Show weekly statistics and compliance status
-6. Provide specific client names and data in responses
-
-Remember: You're STANDISH - not just answering questions but proactively managing the advisor's day and client relationships. Act like the best personal assistant they've ever had."""
-
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_message}
-    ]
-
-    try:
-        response = client.chat.completions.create(
-            model=AZURE_OPENAI_DEPLOYMENT_NAME,
-            messages=messages,
-            tools=tools,
-            tool_choice="auto",
-            temperature=0.7,
-            max_tokens=2000
-        )
-
-        if not response.choices[0].message.tool_calls:
-            return response.choices[0].message.content
-
-        tool_results = []
-
-        for tool_call in response.choices[0].message.tool_calls:
-            tool_name = tool_call.function.name
-            print(f"🛠️ Using tool: {tool_name}")
-
-            if tool_name == "get_daily_briefing":
-                args = json.loads(tool_call.function.arguments)
-                query = args.get("query", "")
-                result = get_daily_briefing(query)
-            elif tool_name == "perform_autonomous_action":
-                args = json.loads(tool_call.function.arguments)
-                action_type = args.get("action_type", "")
-                client_name = args.get("client_name", "")
-                details = args.get("details", "")
-                result = perform_autonomous_action(action_type, client_name, details)
-            elif tool_name == "track_client_journey_stage":
-                args = json.loads(tool_call.function.arguments)
-                client_name = args.get("client_name", "")
-                result = track_client_journey_stage(client_name)
-            elif tool_name == "analyze_investment_opportunities":
-                query = json.loads(tool_call.function.arguments)["query"]
-                result = analyze_investment_opportunities(query)
-            elif tool_name == "get_proactive_client_insights":
-                query = json.loads(tool_call.function.arguments)["query"]
-                result = get_proactive_client_insights(query)
-            elif tool_name == "track_compliance_requirements":
-                query = json.loads(tool_call.function.arguments)["query"]
-                result = track_compliance_requirements(query)
-            elif tool_name == "analyze_business_metrics":
-                query = json.loads(tool_call.function.arguments)["query"]
-                result = analyze_business_metrics(query)
-            elif tool_name == "generate_follow_up_actions":
-                query = json.loads(tool_call.function.arguments)["query"]
-                result = generate_follow_up_actions(query)
-            elif tool_name == "ingest_new_client_data":
-                args = json.loads(tool_call.function.arguments)
-                result = ingest_new_client_data(args.get("file_path"), args.get("directory_path"))
-            elif USE_TEMPLATE_PROCESSING and tool_name in ["generate_client_template", "analyze_template_requirements", "get_template_processing_status"]:
-                args = json.loads(tool_call.function.arguments)
-                result = route_template_tool_call(tool_name, args)
-            else:
-                result = f"Unknown tool: {tool_name}"
-
-            tool_results.append({
-                "role": "tool",
-                "content": str(result),
-                "tool_call_id": tool_call.id
-            })
-
-        messages.append(response.choices[0].message)
-        messages.extend(tool_results)
-
-        final_response = client.chat.completions.create(
-            model=AZURE_OPENAI_DEPLOYMENT_NAME,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=2000
-        )
-
-        return final_response.choices[0].message.content
-
-    except Exception as e:
-        return f"Error processing request: {str(e)}"
-
-# =============================================================================
-# Main Entry Point
-# =============================================================================
-
-if __name__ == "__main__":
-    data_source = "real client data" if USE_REAL_DATA else "mock data"
-    print("🤖 STANDISH - PROACTIVE AI AGENT FOR FINANCIAL ADVISORS - READY!")
-    print(f"📊 Managing {len(data_manager.get_all_clients()) if USE_REAL_DATA and data_manager else 6} client relationships")
-    print(f"📁 Using {data_source}")
-    print("\n🎯 ENHANCED CAPABILITIES:")
-    print("📊 Investment: equity, ISA, pension allowance, withdrawal rates, scenarios")
-    print("📋 Compliance: recommendations, transcripts, documents, commitments")
-    print("📈 Business: revenue, satisfaction, conversion, demographics")
-    print("✅ Follow-up: emails, actions, documents, decisions")
-    print("🔔 Proactive: birthdays, reviews, opportunities, alerts")
-    print("\n💡 Start with: 'Good morning' for daily briefing")
-    print("🛠️ Or ask: 'Which retired clients have withdrawal rates above 4%?'")
-    print("(Type 'quit' to exit)\n")
-
-    while True:
-        user_input = input("\nAdvisor: ")
-        if user_input.lower() in ['quit', 'exit', 'bye']:
-            print("👋 Proactive assistant session ended!")
-            break
-
-        response = get_ai_response(user_input)
-        print(f"\n🤖 STANDISH: {response}")
+# 🤖 STANDISH - Enhanced Proactive AI Agent for Financial Advisors
+# Complete rewrite with ALL missing features for true proactive agency
+
+import json
+import os
+import inspect
+import threading
+import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+import httpx
+import openai
+from openai import AzureOpenAI
+import streamlit as st
+from datetime import datetime, timedelta
+from typing import List, Dict, Any
+import sqlite3
+from pathlib import Path
+import re
+import hashlib
+import functools
+from collections import OrderedDict
+import numpy as np
+from client_index import ReviewDateIndex, ClientNameIndex
+from trigger_matcher import TriggerMatcher
+from meeting_monitor import MeetingSession
+from transcript_search import MeetingText, parse_query
+from advisor_store import DOMAIN_TABLES as STORE_DOMAINS, AdvisorStore
+from semantic_index import SemanticIndex
+from scenario_engine import DEFAULT_INVESTMENT_SHARE, ClientArrays, correction_impact, ranked_exposures
+from client_book import ClientBook
+from policy_types import PROTECTION_TYPES, has, lacks
+from cashflow_model import (plan_from_client, simulate, simulate_book, sustainable_income,
+                            INFLATION, PLAN_TO_AGE, STATE_PENSION_AGE)
+from care_model import CARE_TYPES, CARE_INFLATION, UPPER_CAPITAL_LIMIT, CareBook, simulate_care_book, simulate_care_types
+from withdrawal_model import DrawdownCache, load_return_series, retiree_plan
+from allowance_model import AllowanceBook, allowance_position, seed_contributions, tax_year_end, tax_year_label, tax_year_of
+from rate_model import BASE_RATE, RateBook, RatePaths, rate_impact
+from batch_scenarios import DEFAULT_GRID as DEFAULT_SCENARIO_GRID, ScenarioResults, fingerprint, run_batch
+
+# =============================================================================
+# Data Manager Import (backward compatible)
+# =============================================================================
+class _SerializedDataManager:
+    """
+    DataManager wrapper that runs every method call under one lock. The briefing
+    refresh thread and the Streamlit session threads share the instance, and
+    DataManager makes no thread-safety promise of its own.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._manager, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def serialized(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+        return serialized
+
+try:
+    from data_manager import DataManager
+    data_manager = _SerializedDataManager(DataManager())
+    USE_REAL_DATA = True
+    print("✅ Using real client data from documents")
+except ImportError:
+    USE_REAL_DATA = False
+    data_manager = None
+    print("⚠️ Falling back to mock data")
+
+# Import template processing capabilities
+try:
+    from template_integration import (
+        generate_client_template,
+        analyze_template_requirements,
+        get_template_processing_status,
+        template_processing_tools,
+        route_template_tool_call
+    )
+    USE_TEMPLATE_PROCESSING = True
+    print("✅ Template processing integration enabled")
+except ImportError:
+    USE_TEMPLATE_PROCESSING = False
+    print("⚠️ Template processing not available")
+
+# =============================================================================
+# Azure OpenAI Configuration
+# =============================================================================
+try:
+    AZURE_OPENAI_API_KEY = st.secrets["AZURE_OPENAI_API_KEY"]
+    AZURE_OPENAI_ENDPOINT = st.secrets["AZURE_OPENAI_ENDPOINT"]
+    AZURE_OPENAI_API_VERSION = st.secrets["AZURE_OPENAI_API_VERSION"]
+    AZURE_OPENAI_DEPLOYMENT_NAME = st.secrets["AZURE_OPENAI_DEPLOYMENT_NAME"]
+except (KeyError, TypeError, FileNotFoundError):
+    # Handle testing scenarios or missing secrets
+    AZURE_OPENAI_API_KEY = "mock-key"
+    AZURE_OPENAI_ENDPOINT = "mock-endpoint"
+    AZURE_OPENAI_API_VERSION = "mock-version"
+    AZURE_OPENAI_DEPLOYMENT_NAME = "mock-deployment"
+
+def _get_setting(name, default):
+    """Read an optional setting from Streamlit secrets, then the environment"""
+    try:
+        value = st.secrets.get(name)
+    except (KeyError, TypeError, FileNotFoundError):
+        value = None
+    if value is None:
+        value = os.environ.get(name)
+    if value is None:
+        return default
+    return type(default)(value)
+
+# Connection pool tuning (all optional, see README "Environment Variables")
+AZURE_OPENAI_POOL_SIZE = _get_setting("AZURE_OPENAI_POOL_SIZE", 10)
+AZURE_OPENAI_KEEPALIVE_EXPIRY = _get_setting("AZURE_OPENAI_KEEPALIVE_EXPIRY", 60.0)
+AZURE_OPENAI_TIMEOUT = _get_setting("AZURE_OPENAI_TIMEOUT", 60.0)
+AZURE_OPENAI_CONNECT_TIMEOUT = _get_setting("AZURE_OPENAI_CONNECT_TIMEOUT", 5.0)
+AZURE_OPENAI_MAX_RETRIES = _get_setting("AZURE_OPENAI_MAX_RETRIES", 2)
+AZURE_OPENAI_CLIENT_MAX_AGE = _get_setting("AZURE_OPENAI_CLIENT_MAX_AGE", 3600.0)
+AZURE_OPENAI_MAX_FAILURES = _get_setting("AZURE_OPENAI_MAX_FAILURES", 3)
+
+# Concurrent tool execution
+TOOL_MAX_WORKERS = _get_setting("TOOL_MAX_WORKERS", 8)
+TOOL_TIMEOUT_SECONDS = _get_setting("TOOL_TIMEOUT_SECONDS", 30.0)
+
+# Response cache for repeated advisor questions
+RESPONSE_CACHE_SIZE = _get_setting("RESPONSE_CACHE_SIZE", 256)
+RESPONSE_CACHE_TTL_SECONDS = _get_setting("RESPONSE_CACHE_TTL_SECONDS", 900.0)
+
+# Memoized tool results (entries per function)
+TOOL_RESULT_CACHE_SIZE = _get_setting("TOOL_RESULT_CACHE_SIZE", 128)
+TOOL_RESULT_CACHE_TTL_SECONDS = _get_setting("TOOL_RESULT_CACHE_TTL_SECONDS", 3600.0)
+
+# =============================================================================
+# Azure OpenAI Client Pool - one keep-alive client per endpoint, shared by all turns
+# =============================================================================
+
+_client_registry = {}
+_client_registry_lock = threading.Lock()
+
+def _build_openai_client():
+    """Create an AzureOpenAI client backed by a pooled keep-alive HTTP client"""
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=AZURE_OPENAI_POOL_SIZE,
+            max_keepalive_connections=AZURE_OPENAI_POOL_SIZE,
+            keepalive_expiry=AZURE_OPENAI_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(AZURE_OPENAI_TIMEOUT, connect=AZURE_OPENAI_CONNECT_TIMEOUT)
+    )
+    client = AzureOpenAI(
+        api_key=AZURE_OPENAI_API_KEY,
+        api_version=AZURE_OPENAI_API_VERSION,
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        max_retries=AZURE_OPENAI_MAX_RETRIES,
+        http_client=http_client
+    )
+    return {"client": client, "created_at": time.monotonic(), "failures": 0}
+
+def _close_entry(entry):
+    try:
+        entry["client"].close()
+    except Exception:
+        pass
+
+def get_openai_client():
+    """
+    Return the process-wide AzureOpenAI client for the configured endpoint.
+
+    The client is recycled when it is older than AZURE_OPENAI_CLIENT_MAX_AGE
+    seconds or after AZURE_OPENAI_MAX_FAILURES consecutive connection failures.
+    """
+    key = (AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_VERSION, AZURE_OPENAI_API_KEY)
+
+    with _client_registry_lock:
+        entry = _client_registry.get(key)
+        if entry is not None:
+            expired = time.monotonic() - entry["created_at"] > AZURE_OPENAI_CLIENT_MAX_AGE
+            unhealthy = entry["failures"] >= AZURE_OPENAI_MAX_FAILURES
+            if expired or unhealthy:
+                print(f"♻️ Recycling Azure OpenAI client ({'max age' if expired else 'unhealthy'})")
+                _close_entry(entry)
+                entry = None
+        if entry is None:
+            entry = _build_openai_client()
+            _client_registry[key] = entry
+        return entry["client"]
+
+def record_openai_client_result(client, success):
+    """Track connection health so a broken pool is recycled on the next turn"""
+    with _client_registry_lock:
+        for entry in _client_registry.values():
+            if entry["client"] is client:
+                entry["failures"] = 0 if success else entry["failures"] + 1
+                break
+
+def close_openai_clients():
+    """Close all pooled clients and their connections"""
+    with _client_registry_lock:
+        for entry in _client_registry.values():
+            _close_entry(entry)
+        _client_registry.clear()
+
+atexit.register(close_openai_clients)
+
+# =============================================================================
+# Tool Registry - schemas, argument validation, dispatch and call stats in one place
+# =============================================================================
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", list: "array", dict: "object"}
+
+class ToolArgumentError(ValueError):
+    """Raised when a tool call's arguments do not match the tool's schema"""
+
+class ToolRegistry:
+    """Registry of model-callable tools keyed by name"""
+
+    def __init__(self):
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def register(self, description, name=None, read_only=False, **param_descriptions):
+        """
+        Decorator: register a function as a tool, deriving its JSON schema from the signature.
+        read_only marks tools with no side effects, whose turns may be answered from the response cache.
+        """
+        def decorator(func):
+            properties = {}
+            required = []
+            for param in inspect.signature(func).parameters.values():
+                json_type = _JSON_TYPES.get(param.annotation, "string")
+                properties[param.name] = {"type": json_type, "description": param_descriptions.get(param.name, param.name.replace("_", " "))}
+                if param.default is inspect.Parameter.empty:
+                    required.append(param.name)
+
+            schema = {
+                "type": "function",
+                "function": {
+                    "name": name or func.__name__,
+                    "description": description,
+                    "parameters": {"type": "object", "properties": properties, "required": required}
+                }
+            }
+            self._add(schema, func, pass_as_dict=False, read_only=read_only)
+            return func
+        return decorator
+
+    def register_external(self, schema, handler, read_only=False):
+        """Register a tool from a ready-made schema; handler receives (name, args_dict)"""
+        self._add(schema, handler, pass_as_dict=True, read_only=read_only)
+
+    def _add(self, schema, handler, pass_as_dict, read_only):
+        function = schema["function"]
+        parameters = function.get("parameters", {})
+        self._tools[function["name"]] = {
+            "schema": schema,
+            "handler": handler,
+            "pass_as_dict": pass_as_dict,
+            "read_only": read_only,
+            "properties": parameters.get("properties", {}),
+            "required": parameters.get("required", []),
+            "calls": 0,
+            "errors": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0
+        }
+
+    def read_only(self, names):
+        """True when every named tool is registered as read-only (unknown tools are not)"""
+        return all(name in self._tools and self._tools[name]["read_only"] for name in names)
+
+    def schemas(self):
+        """JSON tool definitions for chat.completions.create, in registration order"""
+        return [tool["schema"] for tool in self._tools.values()]
+
+    def validate(self, name, arguments):
+        """Parse raw JSON arguments once and check them against the tool schema"""
+        tool = self._tools[name]
+        try:
+            args = json.loads(arguments) if arguments else {}
+        except json.JSONDecodeError as e:
+            raise ToolArgumentError(f"invalid JSON arguments for {name}: {e}")
+        if not isinstance(args, dict):
+            raise ToolArgumentError(f"arguments for {name} must be a JSON object")
+
+        # Drop unknown and null arguments so function defaults apply
+        args = {key: value for key, value in args.items() if key in tool["properties"] and value is not None}
+
+        missing = [param for param in tool["required"] if param not in args]
+        if missing:
+            raise ToolArgumentError(f"missing required arguments for {name}: {', '.join(missing)}")
+
+        for key, value in args.items():
+            if tool["properties"][key].get("type") == "string" and not isinstance(value, str):
+                args[key] = str(value)
+
+        return args
+
+    def dispatch(self, name, arguments):
+        """Validate and run a tool call, recording call count and latency"""
+        tool = self._tools.get(name)
+        if tool is None:
+            return f"Unknown tool: {name}"
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            args = self.validate(name, arguments)
+            if tool["pass_as_dict"]:
+                result = tool["handler"](name, args)
+            else:
+                result = tool["handler"](**args)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                tool["calls"] += 1
+                tool["errors"] += failed
+                tool["total_seconds"] += elapsed
+                tool["max_seconds"] = max(tool["max_seconds"], elapsed)
+
+    def stats(self):
+        """Per-tool call counts and latency for monitoring"""
+        with self._lock:
+            return {
+                name: {
+                    "calls": tool["calls"],
+                    "errors": tool["errors"],
+                    "avg_ms": (tool["total_seconds"] / tool["calls"] * 1000) if tool["calls"] else 0.0,
+                    "max_ms": tool["max_seconds"] * 1000
+                }
+                for name, tool in self._tools.items()
+            }
+
+tool_registry = ToolRegistry()
+register_tool = tool_registry.register
+
+def get_tool_stats():
+    """Per-tool call counts and latency"""
+    return tool_registry.stats()
+
+# =============================================================================
+# Caching - data version counter and TTL/LRU caches
+# =============================================================================
+
+# Data domains that can change independently; the overall data version is their sum. Domains
+# kept in the advisor store (STORE_DOMAINS) also count the store's own write counters, so
+# writes from other sessions or processes sharing the database invalidate cached results
+DATA_DOMAINS = ("clients", "meetings", "recommendations", "documents", "commitments", "pensions")
+
+_data_versions = dict.fromkeys(DATA_DOMAINS, 0)
+_data_version_lock = threading.Lock()
+_data_change_listeners = []
+
+def get_data_version(domain=None):
+    """
+    Version of client data and the stores (or of one domain); changes whenever they are
+    written, including writes to the advisor store by other sessions and processes
+    """
+    if domain is not None:
+        return _data_versions[domain] + (advisor_store.versions().get(domain, 0) if domain in STORE_DOMAINS else 0)
+    return sum(_data_versions.values()) + sum(advisor_store.versions().values())
+
+def bump_data_version(*domains):
+    """Mark data domains (all of them when none are given) as changed so cached results are not reused"""
+    with _data_version_lock:
+        for domain in domains or DATA_DOMAINS:
+            _data_versions[domain] += 1
+        version = sum(_data_versions.values())
+    for listener in _data_change_listeners:
+        listener(domains or DATA_DOMAINS)
+    return version
+
+def on_data_change(listener):
+    """Register listener(domains) to be called after every bump_data_version"""
+    _data_change_listeners.append(listener)
+    return listener
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ttl seconds"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value, or _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+# Memoized tool functions by name, for explicit invalidation, and the extra key() state
+# they depend on, which the question-level response cache must also follow
+_memoized_functions = {}
+_memo_extra_keys = []
+
+def memoize_on_data_version(func=None, *, key=None):
+    """
+    Memoize a read-only tool function on its arguments plus the data version and
+    today's date, so results are reused until client data changes or the day rolls over.
+    key() adds anything else the result depends on, such as an input file's mtime:
+
+        @memoize_on_data_version(key=_return_series_key)
+    """
+    if func is None:
+        return lambda func: memoize_on_data_version(func, key=key)
+    extra_key = key
+    if extra_key is not None:
+        _memo_extra_keys.append(extra_key)
+    cache = TTLCache(TOOL_RESULT_CACHE_SIZE, TOOL_RESULT_CACHE_TTL_SECONDS)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())), get_data_version(), datetime.now().date(),
+               extra_key() if extra_key else None)
+        result = cache.get(key)
+        if result is _MISSING:
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+        return result
+
+    wrapper.cache = cache
+    wrapper.cache_clear = cache.clear
+    _memoized_functions[func.__name__] = wrapper
+    return wrapper
+
+def invalidate_tool_results(*function_names):
+    """Drop memoized results for the named functions, or for all of them when none are given"""
+    for name in function_names or list(_memoized_functions):
+        _memoized_functions[name].cache_clear()
+
+def get_tool_result_cache_stats():
+    """Hit/miss counters of every memoized tool function"""
+    return {name: wrapper.cache.stats() for name, wrapper in _memoized_functions.items()}
+
+# Final answers keyed by normalized question + data version, and by question + tool outputs
+response_cache = TTLCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+
+def _normalize_message(message):
+    """Case-fold, drop punctuation and collapse whitespace so trivially different wordings share a key"""
+    return " ".join(re.sub(r"[^\w\s%£.]", " ", message.lower()).replace(". ", " ").split()).strip(" .")
+
+def _question_cache_key(user_message):
+    return ("question", _normalize_message(user_message), get_data_version(), datetime.now().date().isoformat(),
+            tuple(key() for key in _memo_extra_keys))
+
+def _tool_cache_key(user_message, tool_results):
+    digest = hashlib.sha256()
+    for tool_result in tool_results:
+        digest.update(tool_result["content"].encode())
+        digest.update(b"\0")
+    return ("tools", _normalize_message(user_message), digest.hexdigest())
+
+def _cacheable_turn(tool_calls):
+    """Only turns whose tools are all registered read-only may be replayed from the cache"""
+    return tool_registry.read_only(call.function.name for call in tool_calls)
+
+def _cache_response(key, text):
+    if text and not text.startswith("Error processing request"):
+        response_cache.set(key, text)
+
+def get_response_cache_stats():
+    """Response cache hit/miss counters for monitoring"""
+    return response_cache.stats()
+
+# =============================================================================
+# NEW: PROACTIVE AGENT LAYER - Right Moment, Right Context, Right Intent
+# =============================================================================
+
+# Contextual triggers for proactive suggestions
+contextual_triggers = {
+    "meeting_keywords": {
+        "retirement": {
+            "trigger_phrases": ["retire early", "retirement age", "when to retire", "retirement planning"],
+            "suggestion": "🎯 PROACTIVE: Client mentioned retirement - suggest pension review and withdrawal planning",
+            "action": "add_to_meeting_notes"
+        },
+        "protection": {
+            "trigger_phrases": ["life insurance", "what if something happens", "protect my family", "breadwinner"],
+            "suggestion": "🛡️ PROACTIVE: Protection gap identified - recommend life insurance review",
+            "action": "flag_protection_review"
+        },
+        "tax": {
+            "trigger_phrases": ["tax bill", "reduce tax", "tax efficient", "HMRC"],
+            "suggestion": "💰 PROACTIVE: Tax concern raised - discuss ISA/pension optimization",
+            "action": "schedule_tax_planning"
+        },
+        "inheritance": {
+            "trigger_phrases": ["leave money", "inheritance", "estate planning", "when I die"],
+            "suggestion": "📋 PROACTIVE: Estate planning mentioned - add IHT review to agenda",
+            "action": "flag_estate_planning"
+        },
+        "business": {
+            "trigger_phrases": ["sell the business", "exit strategy", "business value", "succession"],
+            "suggestion": "💼 PROACTIVE: Business exit mentioned - discuss CGT planning and liquidity",
+            "action": "flag_business_planning"
+        }
+    },
+    "missed_topics": {
+        "annual_review_gaps": [
+            "Did not discuss retirement timeline - add pension projection?",
+            "No protection review mentioned - flag for next meeting?",
+            "Tax planning not covered - schedule separate session?",
+            "Investment risk tolerance not reassessed - needs update?",
+            "Estate planning status unclear - follow up required?"
+        ]
+    }
+}
+
+# Real-time meeting context detection
+meeting_context = {
+    "current_meeting": {
+        "client": "",
+        "type": "annual_review",
+        "duration": 0,
+        "topics_covered": [],
+        "topics_missed": [],
+        "proactive_suggestions": []
+    }
+}
+
+@functools.lru_cache(maxsize=None)
+def get_trigger_matcher():
+    """Automaton over every meeting trigger phrase, compiled on first use"""
+    matcher = TriggerMatcher()
+    for topic, data in contextual_triggers["meeting_keywords"].items():
+        for phrase in data["trigger_phrases"]:
+            matcher.add(phrase, topic)
+    matcher.compile()
+    return matcher
+
+def detect_proactive_moment(text_input, context="meeting"):
+    """
+    CORE PROACTIVE FUNCTION: Detect right moment for suggestions
+
+    Args:
+        text_input: What the client/advisor just said
+        context: meeting, email, call, report_review
+
+    Returns:
+        Proactive suggestion or None
+    """
+    suggestions = []
+
+    # RIGHT MOMENT detection
+    for phrase, topic in get_trigger_matcher().match(text_input):
+        suggestions.append(_trigger_suggestion(phrase, topic))
+
+    return suggestions
+
+def _trigger_suggestion(phrase, topic):
+    """RIGHT CONTEXT + RIGHT INTENT for a matched trigger phrase"""
+    data = contextual_triggers["meeting_keywords"][topic]
+    return {
+        "moment": "NOW",
+        "context": f"Client mentioned '{phrase}'",
+        "intent": data["suggestion"],
+        "action": data["action"],
+        "topic": topic
+    }
+
+def start_meeting_session(client_name="", meeting_type="annual_review"):
+    """
+    Reset meeting_context for a new live meeting and return its MeetingSession.
+    Feed transcript chunks to session.feed() (or use meeting_monitor.run with
+    follow_file / read_socket); topics covered and missed are kept up to date.
+    """
+    return MeetingSession(
+        meeting_context["current_meeting"],
+        get_trigger_matcher,
+        _trigger_suggestion,
+        client=client_name,
+        meeting_type=meeting_type
+    )
+
+def generate_meeting_interruption(client_name, detected_topic):
+    """Generate contextual interruption suggestions during meetings"""
+
+    interruptions = {
+        "retirement": f"""
+🚨 **PROACTIVE INTERRUPTION**
+
+**CONTEXT:** {client_name} just mentioned retirement planning
+
+**SUGGESTION:** "Before we move on, shall we quickly model your retirement timeline?
+I can show you the impact of retiring at 60 vs 65 on your pension pot."
+
+**QUICK ACTIONS:**
+✅ Add pension projection to meeting
+❌ Note for follow-up
+📊 Run retirement calculator now
+        """,
+
+        "protection": f"""
+🚨 **PROACTIVE INTERRUPTION**
+
+**CONTEXT:** {client_name} mentioned protecting their family
+
+**SUGGESTION:** "You mentioned protection - let me quickly check your current cover.
+Your income is £{80000}, but life cover is only £{200000}. Shall we discuss this?"
+
+**QUICK ACTIONS:**
+✅ Review protection gaps now
+❌ Schedule separate meeting
+📋 Add to action items
+        """,
+
+        "tax": f"""
+🚨 **PROACTIVE INTERRUPTION**
+
+**CONTEXT:** {client_name} concerned about tax efficiency
+
+**SUGGESTION:** "You still have £{12000} ISA allowance remaining.
+Shall we discuss transferring some of your savings to reduce tax?"
+
+**QUICK ACTIONS:**
+✅ Discuss ISA transfer now
+❌ Add to next meeting agenda
+💰 Calculate tax savings
+        """
+    }
+
+    return interruptions.get(detected_topic, "No specific interruption available")
+
+def check_meeting_completeness(client_name, meeting_duration_minutes):
+    """Check if key topics were missed during meeting"""
+
+    standard_agenda = [
+        "portfolio_performance",
+        "risk_assessment",
+        "protection_review",
+        "retirement_planning",
+        "tax_efficiency",
+        "estate_planning"
+    ]
+
+    # Topics tracked by the live meeting session, simulated when no session is running for this client
+    current_meeting = meeting_context["current_meeting"]
+    if current_meeting["client"] and current_meeting["client"].lower() == client_name.lower():
+        covered_topics = current_meeting["topics_covered"]
+    else:
+        covered_topics = ["portfolio_performance", "risk_assessment"]
+    missed_topics = [topic for topic in standard_agenda if topic not in covered_topics]
+
+    suggestions = []
+
+    if "retirement_planning" in missed_topics:
+        suggestions.append({
+            "type": "missing_topic",
+            "suggestion": f"🎯 You didn't discuss retirement timeline with {client_name} - add pension projection to report?",
+            "urgency": "medium",
+            "action": "add_to_report"
+        })
+
+    if "protection_review" in missed_topics:
+        suggestions.append({
+            "type": "missing_topic",
+            "suggestion": f"🛡️ Protection gaps not reviewed - {client_name} mentioned family concerns earlier",
+            "urgency": "high",
+            "action": "schedule_protection_meeting"
+        })
+
+    if meeting_duration_minutes < 45:
+        suggestions.append({
+            "type": "time_alert",
+            "suggestion": f"⏰ Meeting was only {meeting_duration_minutes} minutes - several topics not covered. Extend or schedule follow-up?",
+            "urgency": "medium",
+            "action": "extend_or_reschedule"
+        })
+
+    return suggestions
+
+def get_proactive_post_meeting_actions(client_name, meeting_notes=""):
+    """Generate proactive actions immediately after meeting ends"""
+
+    return f"""
+🤖 **STANDISH PROACTIVE POST-MEETING ANALYSIS**
+
+**CLIENT:** {client_name}
+**MEETING COMPLETED:** {datetime.now().strftime('%H:%M on %B %d')}
+
+**IMMEDIATE ACTIONS DETECTED:**
+
+1. **📧 FOLLOW-UP EMAIL**
+   ✅ Draft thank you email with meeting summary?
+   ✅ Include action items and next steps?
+
+2. **📋 CRM UPDATES**
+   ✅ Log meeting notes and commitments?
+   ✅ Update client risk profile if discussed?
+
+3. **⚠️ MISSED OPPORTUNITIES**
+   • Retirement age not confirmed - add to next meeting?
+   • Protection review skipped - client mentioned family concerns
+   • Tax planning not discussed - they have unused allowances
+
+4. **📅 NEXT STEPS**
+   ✅ Schedule follow-up meeting for missed topics?
+   ✅ Set reminder for promised documents?
+   ✅ Flag urgent actions for this week?
+
+**WOULD YOU LIKE STANDISH TO HANDLE THESE AUTOMATICALLY?**
+    """
+
+def get_proactive_daily_moments():
+    """
+    Analyze recent client data and interactions to surface proactive moments
+    for inclusion in daily briefings - Right Moment, Right Context, Right Intent
+    """
+
+    # Simulated recent client interactions and contextual analysis
+    recent_interactions = [
+        {
+            "client": "Sarah Williams",
+            "source": "email_response",
+            "context": "Client replied 'thinking about retiring at 60 instead of 65'",
+            "moment": "🎯 Sarah Williams mentioned early retirement - suggest pension modeling session THIS WEEK",
+            "urgency": "high",
+            "action": "schedule_retirement_planning"
+        },
+        {
+            "client": "David Chen",
+            "source": "annual_review_notes",
+            "context": "Mentioned 'concerned about protecting the family business'",
+            "moment": "🛡️ David Chen raised business protection concerns - keyman insurance opportunity",
+            "urgency": "medium",
+            "action": "review_business_protection"
+        },
+        {
+            "client": "Lisa Patel",
+            "source": "phone_call_transcript",
+            "context": "Asked 'what's the most tax-efficient way to take money out'",
+            "moment": "💰 Lisa Patel asked about tax efficiency - dividend vs salary optimization needed",
+            "urgency": "medium",
+            "action": "tax_planning_session"
+        },
+        {
+            "client": "Emma Jackson",
+            "source": "meeting_follow_up",
+            "context": "Mentioned 'thinking of downsizing the house next year'",
+            "moment": "🏠 Emma Jackson considering downsizing - CGT and IHT planning opportunity",
+            "urgency": "low",
+            "action": "estate_planning_review"
+        }
+    ]
+
+    # Filter and prioritize based on urgency and context
+    high_priority = [interaction['moment'] for interaction in recent_interactions if interaction['urgency'] == 'high']
+    medium_priority = [interaction['moment'] for interaction in recent_interactions if interaction['urgency'] == 'medium']
+
+    # Return top proactive moments for today's briefing
+    proactive_moments = []
+
+    # Always include high priority
+    proactive_moments.extend(high_priority)
+
+    # Add medium priority if space allows (max 4 total)
+    proactive_moments.extend(medium_priority[:4-len(high_priority)])
+
+    return proactive_moments
+
+# =============================================================================
+# NEW: In-Memory Data Stores for Enhanced Features
+# =============================================================================
+
+# Recommendation history seed data (loaded into the advisor store on first run)
+SEED_RECOMMENDATION_HISTORY = {
+    "David Chen": [
+        {"date": "2025-06-15", "type": "ISA Transfer", "platform": "Platform X", "rationale": "Lower fees (0.25% vs 0.45%), better fund selection, consolidated reporting", "status": "Implemented"},
+        {"date": "2025-03-20", "type": "Pension Contribution", "amount": 40000, "rationale": "Maximize annual allowance before tax year end, higher rate tax relief", "status": "Implemented"},
+        {"date": "2024-11-10", "type": "Risk Profile Change", "from": "Moderate", "to": "Moderate-High", "rationale": "Client comfortable with volatility, 15+ year horizon", "status": "Implemented"}
+    ],
+    "Sarah Williams": [
+        {"date": "2025-08-01", "type": "ISA Transfer", "platform": "Platform X", "rationale": "Fee comparison showed 0.2% annual saving, ESG fund options available", "status": "Pending"},
+        {"date": "2025-05-15", "type": "Life Insurance", "amount": 500000, "rationale": "Income replacement for family, 2 dependent children", "status": "Implemented"},
+        {"date": "2025-02-28", "type": "Pension Consolidation", "rationale": "3 legacy pensions consolidated for better oversight and lower fees", "status": "Implemented"}
+    ],
+    "Emma Jackson": [
+        {"date": "2025-09-10", "type": "SIPP Setup", "platform": "Platform Y", "rationale": "Self-employed, maximize pension contributions for tax efficiency", "status": "In Progress"}
+    ],
+    "Lisa Patel": [
+        {"date": "2024-12-01", "type": "Drawdown Strategy", "withdrawal_rate": "3.5%", "rationale": "Sustainable withdrawal aligned with risk tolerance", "status": "Implemented"}
+    ]
+}
+
+# Meeting transcript seed data
+SEED_MEETING_TRANSCRIPTS = {
+    "Williams Family - 2025-07-15": {
+        "date": "2025-07-15",
+        "client": "Sarah Williams",
+        "attendees": ["Sarah Williams", "Tom Williams", "Advisor"],
+        "duration": "60 minutes",
+        "transcript": """
+        Advisor: Let's discuss your risk tolerance. Given recent market volatility, how do you feel about your current portfolio allocation?
+        Sarah: We're a bit concerned about the market drops we've seen. We don't want to lose our retirement savings.
+        Tom: But we also don't want to be too conservative. We're still 15 years from retirement.
+        Advisor: I understand. Your current moderate risk profile means about 60% equities. Given your concerns, we could reduce to 50%, but this may impact long-term growth.
+        Sarah: What about sustainable investments? We'd prefer our money to be in ethical companies.
+        Advisor: Absolutely. We have excellent ESG options on Platform X. The performance has been comparable to traditional funds.
+        Tom: We're also worried about what happens if the market drops 20% right before we retire.
+        Advisor: Great question. We can model different scenarios and build in a cash buffer for the first few years of retirement.
+        """,
+        "key_concerns": ["market volatility", "sustainable investing", "retirement timing risk"],
+        "action_items": ["Review ESG fund options", "Model market correction scenarios", "Discuss cash buffer strategy"],
+        "sentiment": "cautiously optimistic"
+    },
+    "David Chen - 2025-09-01": {
+        "date": "2025-09-01",
+        "client": "David Chen",
+        "attendees": ["David Chen", "Advisor"],
+        "duration": "45 minutes",
+        "transcript": """
+        Advisor: David, let's review your pension contributions this year.
+        David: Yes, I want to make sure I'm maximizing my allowances. My business had a good year.
+        Advisor: Great news. You've used £35,000 of your £60,000 annual allowance. You also have carry forward from the last 3 years.
+        David: What about the lifetime allowance changes?
+        Advisor: Good question. The lifetime allowance has been abolished, so that's no longer a concern. You can contribute more freely now.
+        David: I'm also thinking about exit planning for my business. Not immediately, but in 5-7 years.
+        Advisor: We should definitely factor that into your overall plan. Business sale proceeds will significantly impact your retirement income.
+        """,
+        "key_concerns": ["pension allowances", "business exit planning", "tax efficiency"],
+        "action_items": ["Calculate carry forward allowance", "Draft exit planning timeline", "Review business valuation"],
+        "sentiment": "positive"
+    }
+}
+
+# Document request seed data
+SEED_DOCUMENT_TRACKING = {
+    "Sarah Williams": {
+        "requested": [
+            {"document": "P60 2024/25", "requested_date": "2025-01-15", "status": "Received", "received_date": "2025-01-20"},
+            {"document": "Bank statements (6 months)", "requested_date": "2025-01-15", "status": "Pending", "received_date": None},
+            {"document": "Mortgage statement", "requested_date": "2025-01-15", "status": "Pending", "received_date": None}
+        ]
+    },
+    "David Chen": {
+        "requested": [
+            {"document": "Company accounts 2024", "requested_date": "2025-01-10", "status": "Received", "received_date": "2025-01-18"},
+            {"document": "Self-assessment tax return", "requested_date": "2025-01-10", "status": "Received", "received_date": "2025-01-25"},
+            {"document": "Pension statement (3 schemes)", "requested_date": "2025-01-10", "status": "Partial", "received_date": "2025-01-22", "notes": "2 of 3 received"}
+        ]
+    },
+    "Emma Jackson": {
+        "requested": [
+            {"document": "Proof of address", "requested_date": "2025-02-01", "status": "Pending", "received_date": None},
+            {"document": "ID verification", "requested_date": "2025-02-01", "status": "Pending", "received_date": None}
+        ]
+    }
+}
+
+# Commitments/promises seed data
+SEED_COMMITMENTS = {
+    "Jackson Family": [
+        {"promise": "Send detailed breakdown of fund options", "promised_date": "2025-01-20", "due_date": "2025-01-25", "status": "Overdue", "completed_date": None},
+        {"promise": "Prepare cashflow model for early retirement", "promised_date": "2025-01-15", "due_date": "2025-02-01", "status": "Pending", "completed_date": None}
+    ],
+    "David Chen": [
+        {"promise": "Send carry forward calculation", "promised_date": "2025-02-01", "due_date": "2025-02-05", "status": "Completed", "completed_date": "2025-02-03"},
+        {"promise": "Provide exit planning checklist", "promised_date": "2025-02-01", "due_date": "2025-02-10", "status": "Pending", "completed_date": None}
+    ],
+    "Sarah Williams": [
+        {"promise": "Send ESG fund comparison report", "promised_date": "2025-01-28", "due_date": "2025-02-03", "status": "Overdue", "completed_date": None}
+    ]
+}
+
+# Transcripts, recommendations, documents and commitments persist in SQLite (FTS5 + WAL);
+# the database is opened and seeded on first use, not at import
+ADVISOR_DB_PATH = _get_setting("ADVISOR_DB_PATH", "advisor_data.db")
+advisor_store = AdvisorStore(ADVISOR_DB_PATH, fallback="file:standish_advisor_store?mode=memory&cache=shared")
+
+@advisor_store.on_open
+def _seed_advisor_store(store):
+    if store.error is not None:
+        print(f"⚠️ Advisor store unavailable ({store.error}) - using an in-memory database")
+    else:
+        print(f"✅ Advisor store ready ({ADVISOR_DB_PATH})")
+    store.seed(SEED_RECOMMENDATION_HISTORY, SEED_MEETING_TRANSCRIPTS, SEED_DOCUMENT_TRACKING, SEED_COMMITMENTS)
+    # The contribution ledger behind the allowance figures is seeded once from them (carry forward oldest first)
+    store.seed_pension_ledger(seed_contributions(pension_allowances, tax_year_of()))
+
+def record_meeting_transcript(meeting_id, meeting):
+    """Store a meeting record for transcript search and bump the meetings version"""
+    advisor_store.add_meeting(meeting_id, meeting)
+    if _semantic_index["index"] is not None:
+        with _semantic_index_lock:
+            _semantic_index["index"].add_meeting(meeting_id, meeting)
+    bump_data_version("meetings")
+
+# Embedding index over transcript turns and recommendation rationales, built on first use;
+# new meetings are added incrementally, a recommendation change rebuilds it
+SEMANTIC_TOP_K = _get_setting("SEMANTIC_TOP_K", 3)
+SEMANTIC_MIN_SCORE = _get_setting("SEMANTIC_MIN_SCORE", 0.12)
+SEMANTIC_DIMENSIONS = _get_setting("SEMANTIC_DIMENSIONS", 512)
+_semantic_index = {"version": None, "index": None}
+_semantic_index_lock = threading.Lock()
+
+def get_semantic_index():
+    """SemanticIndex over every stored meeting and recommendation"""
+    version = get_data_version("recommendations")
+    with _semantic_index_lock:
+        if _semantic_index["version"] != version:
+            index = SemanticIndex(dimensions=SEMANTIC_DIMENSIONS)
+            for meeting in advisor_store.meetings():
+                index.add_meeting(meeting["id"], meeting)
+            for client, rec in advisor_store.recommendations():
+                index.add_recommendation(client, rec)
+            _semantic_index.update(version=version, index=index)
+        return _semantic_index["index"]
+
+def semantic_search(text, kind=None, client=None, k=None):
+    """Top-k [(score, metadata)] passages similar to text, above SEMANTIC_MIN_SCORE"""
+    index = get_semantic_index()
+    with _semantic_index_lock:
+        return index.search(text, k=k or SEMANTIC_TOP_K, client=client, kind=kind, min_score=SEMANTIC_MIN_SCORE)
+
+# Client Retirement & Withdrawal Data
+retirement_data = {
+    "Lisa Patel": {"status": "Retired", "retirement_date": "2023-06-01", "pension_pot": 450000, "annual_withdrawal": 18000, "withdrawal_rate": 4.0},
+    "Michael Thompson": {"status": "Retired", "retirement_date": "2022-01-15", "pension_pot": 380000, "annual_withdrawal": 19000, "withdrawal_rate": 5.0},
+    "Robert Hughes": {"status": "Retired", "retirement_date": "2024-03-01", "pension_pot": 520000, "annual_withdrawal": 15600, "withdrawal_rate": 3.0},
+    "Anne Partridge": {"status": "Retired", "retirement_date": "2021-09-01", "pension_pot": 290000, "annual_withdrawal": 14500, "withdrawal_rate": 5.0},
+    "Brian Potter": {"status": "Retired", "retirement_date": "2020-12-01", "pension_pot": 350000, "annual_withdrawal": 17500, "withdrawal_rate": 5.0}
+}
+
+# Long-Term Care Planning Data (household figures where the client record holds only their own)
+long_term_care_data = {
+    "Michael Gurung": {"liquid_assets": 400000, "property_value": 450000, "pension_income": 45000, "partner_at_home": True}
+}
+
+# Cashflow Planning Profiles (people being planned for who are not yet in the client book)
+cashflow_planning_data = {
+    "Roshan Gurung": {"name": "Roshan Gurung", "age": 52, "risk_profile": "Moderate",
+                      "full_data": {"assets": {"pensions": 485000}, "annual_contribution": 35000, "desired_income": 45000,
+                                    "retirement_age": 55, "state_pension": 10600}}
+}
+
+# Client Service & Satisfaction Data
+service_data = {
+    "David Chen": {"services": ["Pension Planning", "Tax Planning", "Investment Management", "Business Planning"], "satisfaction_score": 9, "years_as_client": 8, "annual_revenue": 4500, "hours_per_year": 12},
+    "Sarah Williams": {"services": ["Pension Planning", "Protection", "Investment Management"], "satisfaction_score": 8, "years_as_client": 5, "annual_revenue": 3200, "hours_per_year": 15},
+    "Emma Jackson": {"services": ["SIPP", "Investment Management"], "satisfaction_score": 9, "years_as_client": 2, "annual_revenue": 2800, "hours_per_year": 8},
+    "Lisa Patel": {"services": ["Drawdown Planning", "Investment Management", "Estate Planning"], "satisfaction_score": 7, "years_as_client": 12, "annual_revenue": 3800, "hours_per_year": 10},
+    "Michael Gurung": {"services": ["Business Planning", "Pension Planning", "Protection"], "satisfaction_score": 8, "years_as_client": 6, "annual_revenue": 5200, "hours_per_year": 18}
+}
+
+# Sales Funnel Data
+sales_funnel = {
+    "initial_meetings": [
+        {"name": "John Smith", "date": "2025-01-05", "source": "Website", "status": "Converted", "conversion_date": "2025-01-20"},
+        {"name": "Mary Johnson", "date": "2025-01-10", "source": "Referral - David Chen", "status": "Converted", "conversion_date": "2025-01-25"},
+        {"name": "Peter Brown", "date": "2025-01-15", "source": "LinkedIn", "status": "Lost", "reason": "Went with competitor"},
+        {"name": "Susan Taylor", "date": "2025-01-20", "source": "Referral - Sarah Williams", "status": "In Progress", "next_meeting": "2025-02-10"},
+        {"name": "James Wilson", "date": "2025-02-01", "source": "Website", "status": "In Progress", "next_meeting": "2025-02-15"}
+    ],
+    "conversion_by_source": {"Website": 0.40, "Referral": 0.75, "LinkedIn": 0.25, "Event": 0.50}
+}
+
+# Pension Annual Allowance Data
+pension_allowances = {
+    "David Chen": {"annual_allowance": 60000, "used_this_year": 35000, "carry_forward": [15000, 20000, 18000], "total_available": 78000},
+    "Sarah Williams": {"annual_allowance": 60000, "used_this_year": 12000, "carry_forward": [0, 5000, 8000], "total_available": 61000},
+    "Emma Jackson": {"annual_allowance": 60000, "used_this_year": 8000, "carry_forward": [10000, 12000, 15000], "total_available": 89000},
+    "Michael Gurung": {"annual_allowance": 60000, "used_this_year": 45000, "carry_forward": [0, 0, 5000], "total_available": 20000}
+}
+
+# Interest Rate Sensitivity Data
+interest_rate_sensitivity = {
+    "Sarah Williams": {"fixed_rate_mortgage": True, "mortgage_rate": 2.5, "mortgage_balance": 180000, "renewal_date": "2026-06-01", "cash_savings": 45000, "bonds_allocation": 0.20},
+    "David Chen": {"fixed_rate_mortgage": True, "mortgage_rate": 1.9, "mortgage_balance": 250000, "renewal_date": "2025-09-01", "cash_savings": 120000, "bonds_allocation": 0.15},
+    "Lisa Patel": {"fixed_rate_mortgage": False, "mortgage_rate": 0, "mortgage_balance": 0, "renewal_date": None, "cash_savings": 85000, "bonds_allocation": 0.40},
+    "Emma Jackson": {"fixed_rate_mortgage": True, "mortgage_rate": 3.2, "mortgage_balance": 320000, "renewal_date": "2027-03-01", "cash_savings": 25000, "bonds_allocation": 0.10}
+}
+
+# =============================================================================
+# Proactive Assistant Core Functions (ENHANCED)
+# =============================================================================
+
+# =============================================================================
+# Client Indexes - rebuilt once per clients data version
+# =============================================================================
+
+_client_indexes = {}
+_client_index_lock = threading.Lock()
+
+def _load_clients():
+    if USE_REAL_DATA and data_manager:
+        return data_manager.get_all_clients()
+    return get_mock_clients()
+
+def _get_client_index(kind, builder):
+    """Index of the given kind over the current book; all kinds share one client load per clients data version"""
+    version = get_data_version("clients")
+    with _client_index_lock:
+        if _client_indexes.get("version") != version:
+            _client_indexes.clear()
+            _client_indexes.update(version=version, clients=_load_clients())
+        if kind not in _client_indexes:
+            _client_indexes[kind] = builder(_client_indexes["clients"])
+        return _client_indexes[kind]
+
+def get_review_index():
+    """Sorted last_review / next_review_due index over the client book"""
+    return _get_client_index("reviews", ReviewDateIndex)
+
+def get_name_index():
+    """Normalized name (plus surname / family alias) -> book position"""
+    return _get_client_index("names", lambda clients: ClientNameIndex((i, c['name']) for i, c in enumerate(clients)))
+
+def get_client_book():
+    """Columnar snapshot of the current book (a ClientArrays) shared by the analytics screens and scenarios"""
+    return _get_client_index("book", ClientBook.from_clients)
+
+def find_client(name):
+    """Client record for a name, alias or near-miss spelling; None if nobody matches"""
+    position = get_name_index().lookup(name)
+    return None if position is None else get_review_index().clients[position]
+
+@functools.lru_cache(maxsize=32)
+def _name_index_for(names):
+    """Name index whose keys are the given names themselves, for routing queries to in-memory stores"""
+    return ClientNameIndex((name, name) for name in names)
+
+def get_overdue_reviews(as_of=None):
+    """Clients more than 12 months past their last review, with months_overdue and days_overdue set"""
+    # Copies, so the annotations never leak into the cached client records the index shares
+    return [{**client, 'months_overdue': int(days_since / 30), 'days_overdue': int(days_since - 365)}
+            for client, days_since in get_review_index().reviewed_more_than(360, as_of)]
+
+# =============================================================================
+# Daily Briefing Materializer - built once, patched per section when data changes
+# =============================================================================
+
+BRIEFING_REFRESH_SECONDS = _get_setting("BRIEFING_REFRESH_SECONDS", 900.0)
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD string, returning None when missing or malformed"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def _classify_clients(clients, current_date, review_index=None):
+    """
+    Single pass over the book that sorts every client into the briefing buckets at
+    once: birthdays and on-track. Overdue and due-this-week come from range queries
+    on the review-date index; protection gaps from data_manager.
+    """
+    if review_index is None:
+        review_index = ReviewDateIndex(clients)
+    clients = review_index.clients
+
+    # Overdue: more than 12 months since the last review
+    overdue = review_index.reviewed_more_than(360, current_date)
+    overdue_reviews = [{**client, 'months_overdue': int(days_since / 30), 'days_overdue': int(days_since - 365)}
+                       for client, days_since in overdue]
+    shown_overdue = {id(client) for client, _ in overdue[:3]}
+
+    # Due this week: next review within 7 days
+    due_this_week = [{'name': client['name'], 'days': days_until}
+                     for client, days_until in review_index.due_within(7, current_date)]
+
+    birthday_clients = []
+    on_track = []
+    current_month = current_date.month
+
+    for client in clients:
+        name = client['name']
+
+        # Birthday simulation based on client name hash and current month
+        if sum(ord(c) for c in name) % 12 + 1 == current_month:
+            birthday_clients.append(name)
+
+        # On track: anyone not among the first three overdue clients shown in the briefing
+        if len(on_track) < 3 and id(client) not in shown_overdue:
+            on_track.append(name)
+
+    # Protection gaps are data_manager's rules over the real documents; the mock book has none
+    protection_gaps = data_manager.get_protection_gaps() if USE_REAL_DATA and data_manager else []
+
+    return {
+        "clients": clients,
+        "overdue_reviews": overdue_reviews,
+        "protection_gaps": protection_gaps,
+        "due_this_week": due_this_week,
+        "birthday_clients": birthday_clients,
+        "on_track": on_track
+    }
+
+def _briefing_client_snapshot(current_date):
+    """Client buckets shared by every client-dependent briefing section"""
+    review_index = get_review_index()
+    return _classify_clients(review_index.clients, current_date, review_index)
+
+def _briefing_header(snapshot, current_date):
+    # ===== TODAY'S DATE =====
+    return [f"📅 **TODAY: {current_date.strftime('%A, %B %d, %Y')}**", ""]
+
+def _briefing_yesterday(snapshot, current_date):
+    # ===== YESTERDAY'S ACTIVITY SUMMARY (Dynamic) =====
+    lines = ["**YESTERDAY'S ACTIVITY SUMMARY:**"]
+    overdue_reviews = snapshot["overdue_reviews"]
+
+    # Count overdue reviews dynamically
+    if overdue_reviews:
+        overdue_names = [c['name'] for c in overdue_reviews[:3]]
+        lines.append(f"⚠️ {len(overdue_reviews)} clients with overdue reviews: {', '.join(overdue_names)}")
+    else:
+        lines.append("✅ All client reviews are up to date")
+
+    # Count pending follow-ups from commitments
+    pending_followups = list(dict.fromkeys(client for client, _ in advisor_store.commitments(['Pending', 'Overdue'])))
+
+    if pending_followups:
+        lines.append(f"📧 {len(pending_followups)} pending follow-ups: {', '.join(pending_followups[:3])}")
+    else:
+        lines.append("✅ All follow-ups completed")
+
+    lines.append("✅ No critical meetings missed")
+    lines.append("")
+    return lines
+
+def _briefing_priorities(snapshot, current_date):
+    # ===== TODAY'S PRIORITY ACTIONS (Dynamic) =====
+    lines = ["**TODAY'S PRIORITY ACTIONS:**"]
+
+    priority_count = 0
+
+    # Add overdue reviews with actual days overdue
+    for client in snapshot["overdue_reviews"][:2]:
+        days_overdue = client.get('days_overdue', 0)
+        if days_overdue <= 0:
+            # Calculate if not already set
+            try:
+                last_review = datetime.strptime(client['last_review'], '%Y-%m-%d')
+                days_overdue = max(0, (current_date - last_review).days - 365)
+            except:
+                days_overdue = 30  # Default
+        lines.append(f"🚨 OVERDUE: {client['name']} annual review ({days_overdue} days overdue)")
+        priority_count += 1
+
+    for client in snapshot["due_this_week"][:2]:
+        lines.append(f"📅 DUE THIS WEEK: {client['name']} annual review (in {client['days']} days)")
+        priority_count += 1
+
+    birthday_clients = snapshot["birthday_clients"]
+    if birthday_clients:
+        lines.append(f"🎂 BIRTHDAY OPPORTUNITY: {birthday_clients[0]} - perfect time for check-in")
+        priority_count += 1
+
+    if priority_count == 0:
+        lines.append("✅ No urgent priorities today - great time for proactive outreach!")
+
+    lines.append("📊 Review market updates for client portfolios")
+    lines.append("")
+    return lines
+
+def _briefing_commitments(snapshot, current_date):
+    # ===== OVERDUE COMMITMENTS (Dynamic) =====
+    lines = []
+    overdue_commitments = get_overdue_commitments()
+    if overdue_commitments:
+        lines.append("**⚠️ OVERDUE COMMITMENTS:**")
+        for commitment in overdue_commitments[:3]:
+            lines.append(f"❗ {commitment}")
+        lines.append("")
+    return lines
+
+def _briefing_documents(snapshot, current_date):
+    # ===== DOCUMENTS WAITING (Dynamic) =====
+    lines = []
+    pending_docs = get_pending_documents()
+    if pending_docs:
+        lines.append("**📄 DOCUMENTS STILL WAITING:**")
+        for doc in pending_docs[:3]:
+            lines.append(f"📋 {doc}")
+        lines.append("")
+    return lines
+
+def _briefing_overview(snapshot, current_date):
+    # ===== THIS WEEK'S OVERVIEW (Dynamic) =====
+    lines = ["**THIS WEEK'S OVERVIEW:**"]
+    clients = snapshot["clients"]
+    overdue_reviews = snapshot["overdue_reviews"]
+    protection_gaps = snapshot["protection_gaps"]
+    total_clients = len(clients)
+
+    # Categorize clients by status
+    overdue_names = [c['name'] for c in overdue_reviews[:3]]
+    on_track_clients = snapshot["on_track"]
+
+    if overdue_names and on_track_clients:
+        lines.append(f"📈 {', '.join(overdue_names)} (overdue) | {', '.join(on_track_clients)} (on track)")
+    elif overdue_names:
+        lines.append(f"📈 {', '.join(overdue_names)} (need attention)")
+    else:
+        lines.append(f"📈 All {total_clients} clients on track")
+
+    # Protection opportunities (dynamic)
+    if protection_gaps:
+        protection_items = [f"{g['client_name']} ({g['gap_description'][:20]}...)" for g in protection_gaps[:3]]
+        lines.append(f"🛡️ Protection opportunities: {', '.join(protection_items)}")
+    else:
+        # Use service_data for protection info
+        protection_opps = []
+        for client, data in service_data.items():
+            if 'Protection' not in data.get('services', []):
+                protection_opps.append(client)
+        if protection_opps:
+            lines.append(f"🛡️ Protection review needed: {', '.join(protection_opps[:3])}")
+
+    # Compliance rate (dynamic)
+    compliant_count = total_clients - len(overdue_reviews)
+    compliance_rate = (compliant_count / total_clients * 100) if total_clients > 0 else 100
+    lines.append(f"✅ Consumer Duty compliance: {compliant_count}/{total_clients} clients with annual reviews completed ({compliance_rate:.0f}%)")
+    lines.append("")
+    return lines
+
+def _briefing_proactive(snapshot, current_date):
+    # ===== PROACTIVE OPPORTUNITIES (Dynamic) =====
+    lines = []
+    proactive_moments = get_proactive_daily_moments()
+    if proactive_moments:
+        lines.append("**🚨 PROACTIVE OPPORTUNITIES DETECTED:**")
+        for moment in proactive_moments:
+            lines.append(f"{moment}")
+        lines.append("")
+    return lines
+
+def _briefing_actions(snapshot, current_date):
+    # ===== STANDISH ACTIONS (Dynamic based on data) =====
+    lines = ["**STANDISH CAN HELP YOU WITH:**"]
+    overdue_reviews = snapshot["overdue_reviews"]
+
+    if overdue_reviews:
+        lines.append(f"📧 Draft follow-up emails for {len(overdue_reviews)} overdue clients")
+    else:
+        lines.append("📧 Draft client check-in emails")
+
+    if snapshot["due_this_week"]:
+        lines.append(f"📞 Schedule {len(snapshot['due_this_week'])} review meetings due this week")
+    else:
+        lines.append("📞 Schedule proactive client calls")
+
+    lines.append("📊 Generate weekly portfolio performance reports")
+
+    if snapshot["birthday_clients"]:
+        lines.append(f"🎂 Send birthday greetings to {len(snapshot['birthday_clients'])} clients")
+    else:
+        lines.append("🔔 Set up reminder alerts for upcoming events")
+    return lines
+
+class BriefingMaterializer:
+    """
+    Stores the daily briefing as prebuilt sections. Each section records the data
+    domains it reads; when a domain changes only the sections that depend on it
+    are rebuilt, and everything is rebuilt when the day rolls over.
+
+    start_background() is called by app.py when a Streamlit session starts, never
+    on import. The refresh thread then reads the data layer alongside the session
+    threads: the client indexes are built under _client_index_lock and replaced
+    rather than mutated (callers copy before annotating records), advisor_store
+    gives each thread its own SQLite connection, and every data_manager call is
+    serialized by _SerializedDataManager.
+    """
+
+    # (name, builder, data domains it reads) in display order
+    SECTIONS = (
+        ("header", _briefing_header, ()),
+        ("yesterday", _briefing_yesterday, ("clients", "commitments")),
+        ("priorities", _briefing_priorities, ("clients",)),
+        ("commitments", _briefing_commitments, ("commitments",)),
+        ("documents", _briefing_documents, ("documents",)),
+        ("overview", _briefing_overview, ("clients",)),
+        ("proactive", _briefing_proactive, ()),
+        ("actions", _briefing_actions, ("clients",))
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sections = {}
+        self._section_keys = {}
+        self._snapshot = None
+        self._snapshot_key = None
+        self._text = None
+        self._thread = None
+
+    def _client_snapshot(self, current_date):
+        key = (current_date.date(), get_data_version("clients"))
+        if self._snapshot_key != key:
+            self._snapshot = _briefing_client_snapshot(current_date)
+            self._snapshot_key = key
+        return self._snapshot
+
+    def refresh(self):
+        """Rebuild stale sections; returns the names of the sections that were rebuilt"""
+        with self._lock:
+            current_date = datetime.now()
+            rebuilt = []
+
+            for name, builder, domains in self.SECTIONS:
+                key = (current_date.date(),) + tuple(get_data_version(domain) for domain in domains)
+                if self._section_keys.get(name) == key:
+                    continue
+                snapshot = self._client_snapshot(current_date) if "clients" in domains else None
+                self._sections[name] = builder(snapshot, current_date)
+                self._section_keys[name] = key
+                rebuilt.append(name)
+
+            if rebuilt:
+                if len(rebuilt) == len(self.SECTIONS):
+                    print("🌅 Generating daily briefing...")
+                self._text = "\n".join(line for name, _, _ in self.SECTIONS for line in self._sections[name])
+            return rebuilt
+
+    def get(self):
+        """Return the stored briefing, patching any sections whose data changed"""
+        self.refresh()
+        return self._text
+
+    def notify(self, domains):
+        """Data changed - let the background thread patch the briefing ahead of the next request"""
+        self._wake.set()
+
+    def start_background(self, interval=BRIEFING_REFRESH_SECONDS):
+        """Build the briefing now and keep it fresh from a daemon thread (once per process)"""
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Briefing refresh failed: {e}")
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=run, name="standish-briefing", daemon=True)
+                self._thread.start()
+
+briefing_materializer = BriefingMaterializer()
+on_data_change(briefing_materializer.notify)
+
+@register_tool(
+    "Generate comprehensive daily briefing showing yesterday's missed items, today's priorities, overdue commitments, pending documents, and autonomous action opportunities",
+    read_only=True,
+    query="Optional specific briefing request"
+)
+def get_daily_briefing(query=""):
+    """Serve the materialized daily briefing for the advisor - FULLY DYNAMIC"""
+    return briefing_materializer.get()
+
+def get_overdue_commitments():
+    """Get list of overdue commitments/promises"""
+    return [f"{client}: {c['promise']} (was due {c['due_date']})" for client, c in advisor_store.commitments(['Overdue'])]
+
+def get_pending_documents():
+    """Get list of pending documents"""
+    return [f"{client}: {doc['document']} (requested {doc['requested_date']})"
+            for client, doc in advisor_store.documents(['Pending'])]
+
+def get_pending_followups():
+    """Get pending follow-up actions from yesterday"""
+    if USE_REAL_DATA:
+        clients = data_manager.get_all_clients()
+        pending = []
+        yesterday = datetime.now() - timedelta(days=1)
+
+        for client in clients:
+            full_data = client.get('full_data', {})
+            last_contact = full_data.get('last_contact', '')
+            if last_contact:
+                try:
+                    contact_date = datetime.strptime(last_contact, '%Y-%m-%d')
+                    if contact_date <= yesterday:
+                        pending.append(client['name'])
+                except:
+                    continue
+        return pending
+    else:
+        return ["Sarah Williams", "David Chen"]
+
+def get_urgent_tasks_today():
+    """Get urgent tasks for today"""
+    tasks = []
+    current_date = datetime.now()
+
+    if USE_REAL_DATA:
+        clients = data_manager.get_all_clients()
+
+        for client, days_until in get_review_index().due_within(7, current_date, include_overdue=True):
+            if days_until <= 0:
+                tasks.append(f"🚨 OVERDUE: {client['name']} annual review ({abs(days_until)} days overdue)")
+            else:
+                tasks.append(f"📅 DUE THIS WEEK: {client['name']} annual review (in {days_until} days)")
+
+        current_month = current_date.month
+        for client in clients:
+            if current_month in [3, 6, 9, 12]:
+                if client['name'] in ['Emma Jackson', 'David Chen']:
+                    tasks.append(f"🎂 BIRTHDAY OPPORTUNITY: {client['name']} - perfect time for check-in call")
+
+    tasks.extend([
+        "📊 Review market updates for client portfolios",
+        "📧 Send scheduled client newsletters",
+        "📋 Update CRM with yesterday's activities"
+    ])
+
+    return tasks
+
+def get_weekly_statistics():
+    """Generate weekly performance statistics"""
+    if USE_REAL_DATA and data_manager:
+        try:
+            clients = data_manager.get_all_clients()
+            total_clients = len(clients)
+            overdue_reviews = len(get_overdue_reviews())
+            protection_gaps = len(data_manager.get_protection_gaps())
+
+            return f"📈 {total_clients} active clients | {overdue_reviews} overdue reviews | {protection_gaps} protection opportunities | Compliance rate: {((total_clients-overdue_reviews)/total_clients*100):.0f}%"
+        except:
+            return "📈 6 active clients | 2 overdue reviews | 3 protection opportunities | Compliance rate: 67% (mock data)"
+    else:
+        return "📈 6 active clients | 2 overdue reviews | 3 protection opportunities | Compliance rate: 67% (demo mode)"
+
+def get_available_autonomous_actions():
+    """List actions the assistant can perform autonomously"""
+    return [
+        "📧 Draft and send follow-up emails to overdue review clients",
+        "📞 Schedule callback reminders for high-priority clients",
+        "📊 Generate weekly portfolio performance reports",
+        "🔔 Set up birthday reminder alerts for Q1 clients",
+        "📋 Update client CRM records with recent market impacts",
+        "📈 Prepare suitability letters for recent recommendations"
+    ]
+
+@register_tool(
+    "Execute autonomous actions like sending emails, scheduling meetings, updating CRM records on behalf of the advisor",
+    action_type="Type of action: send_follow_up_email, schedule_meeting, update_crm, generate_report, set_reminder",
+    client_name="Client name for the action",
+    details="Additional details for the action"
+)
+def perform_autonomous_action(action_type, client_name="", details=""):
+    """Execute autonomous actions on behalf of the advisor"""
+    print(f"🤖 Performing autonomous action: {action_type}")
+
+    if action_type == "send_follow_up_email":
+        return send_follow_up_email(client_name, details)
+    elif action_type == "schedule_meeting":
+        return schedule_client_meeting(client_name, details)
+    elif action_type == "update_crm":
+        return update_crm_records(client_name, details)
+    elif action_type == "generate_report":
+        return generate_client_report(client_name, details)
+    elif action_type == "set_reminder":
+        return set_client_reminder(client_name, details)
+    else:
+        return f"❌ Unknown action type: {action_type}"
+
+def send_follow_up_email(client_name, email_type="review_overdue"):
+    """Draft and send follow-up email to client"""
+    if not client_name:
+        return "❌ Client name required for email"
+
+    email_templates = {
+        "review_overdue": f"""
+📧 **EMAIL READY TO SEND TO {client_name.upper()}:**
+
+Subject: Annual Review - Let's Catch Up
+
+Dear {client_name.split()[0]},
+
+I hope you're well. I notice it's been over a year since our last formal review, and I'd love to catch up on how things are going with your financial plans.
+
+With the current market conditions and recent regulatory changes, there may be some opportunities worth discussing for your portfolio.
+
+Would you be available for a 30-minute call next week? I have slots on:
+- Tuesday 2:00 PM
+- Wednesday 10:00 AM
+- Friday 3:00 PM
+
+Best regards,
+[Your Name]
+
+**Ready to send this follow-up email?**
+        """,
+        "birthday_check": f"""
+📧 **BIRTHDAY EMAIL READY TO SEND TO {client_name.upper()}:**
+
+Subject: Happy Birthday! 🎂
+
+Dear {client_name.split()[0]},
+
+Wishing you a very happy birthday! I hope you're having a wonderful day.
+
+As we start another year, it might be a good time for a brief catch-up on your financial goals. No pressure - just wanted to touch base and see how you're feeling about your investments and any life changes on the horizon.
+
+Feel free to give me a call when convenient.
+
+Warm regards,
+[Your Name]
+
+**Ready to send this birthday greeting?**
+        """
+    }
+
+    return email_templates.get(email_type, f"📧 Email template not found for type: {email_type}")
+
+def schedule_client_meeting(client_name, meeting_type="annual_review"):
+    """Schedule a meeting with client"""
+    next_week = datetime.now() + timedelta(days=7)
+
+    return f"""
+📅 **MEETING READY TO SCHEDULE FOR {client_name.upper()}:**
+
+Type: {meeting_type.replace('_', ' ').title()}
+Proposed Date: {next_week.strftime('%A, %B %d, %Y')}
+Duration: 60 minutes
+Location: Office/Video Call
+
+Meeting Agenda:
+- Portfolio review and performance
+- Risk appetite assessment
+- Goal progress check
+- New opportunities discussion
+- Compliance documentation
+
+**NEXT STEPS:**
+✅ Calendar invite ready to send
+✅ Client notification email drafted
+✅ Meeting reminder set for 24 hours before
+
+**Would you like me to send the calendar invite and notification email to the client?**
+    """
+
+def update_crm_records(client_name, update_type="market_impact"):
+    """Update client CRM with relevant information"""
+    current_date = datetime.now().strftime('%Y-%m-%d')
+
+    return f"""
+📋 **CRM UPDATE READY FOR {client_name.upper()}:**
+
+Date: {current_date}
+Update Type: {update_type.replace('_', ' ').title()}
+
+Records to Add:
+- Market volatility impact assessment
+- Risk tolerance confirmation
+- Next review date flagged
+- Follow-up actions logged
+
+**COMPLIANCE:** Consumer Duty requirements will be updated
+**NEXT STEPS:** Automated follow-up will be scheduled for 30 days
+
+**Ready to update the CRM with these details?**
+    """
+
+@register_tool(
+    "Track and manage where clients are in the financial planning journey workflow from annual review to advice implementation",
+    read_only=True,
+    client_name="Optional client name to check specific journey stage"
+)
+def track_client_journey_stage(client_name=""):
+    """Track where client is in the financial planning journey"""
+    journey_stages = {
+        1: "Annual Review Received",
+        2: "Pre-Meeting Prep (Documents)",
+        3: "Meeting Scheduled",
+        4: "Meeting Conducted",
+        5: "Post-Meeting Analysis",
+        6: "Recommendations Prepared",
+        7: "Suitability Letter Sent",
+        8: "Implementation Started",
+        9: "Advice Implemented",
+        10: "Follow-up Scheduled"
+    }
+
+    if USE_REAL_DATA and client_name:
+        review_index = get_review_index()
+        position = get_name_index().lookup(client_name)
+
+        if position is not None:
+            stage = review_index.journey_stage(position)
+            return f"🎯 **{client_name.upper()} JOURNEY STATUS:**\n\nStage {stage}: {journey_stages[stage]}\n\n**NEXT ACTION:** {get_next_journey_action(stage)}"
+
+    if USE_REAL_DATA:
+        by_stage = get_review_index().clients_by_stage()
+        lines = ["🎯 **CLIENT JOURNEY OVERVIEW:**", "", "Active Clients by Stage:"]
+        for stage, stage_clients in by_stage.items():
+            if stage_clients:
+                names = ", ".join(c['name'] for c in stage_clients[:5])
+                more = f" (+{len(stage_clients) - 5} more)" if len(stage_clients) > 5 else ""
+                lines.append(f"- Stage {stage} ({journey_stages[stage]}): {names}{more}")
+        if by_stage[1]:
+            lines.append("")
+            lines.append(f"**PRIORITY ACTION:** {get_next_journey_action(1)} for {len(by_stage[1])} clients")
+        return "\n".join(lines)
+
+    return f"""
+🎯 **CLIENT JOURNEY OVERVIEW:**
+
+Active Clients by Stage:
+- Stage 1 (Review Due): Sarah Williams, David Chen, Lisa Patel
+- Stage 4 (Meeting Scheduled): Emma Jackson (Feb 12), Michael Roberts (Feb 15)
+- Stage 8 (Implementation): Jennifer Mills (ISA transfer in progress)
+- Stage 10 (Complete): Thomas Anderson, Rachel Green (recently completed)
+
+**BOTTLENECK ALERT:** Sarah Williams (16 days overdue), David Chen (3 days overdue), Lisa Patel (7 days overdue) - need immediate attention
+**PRIORITY ACTION:** Schedule review meetings for Williams, Chen, and Patel families
+    """
+
+def get_next_journey_action(stage):
+    """Get the next recommended action for a journey stage"""
+    next_actions = {
+        1: "Send annual review email and schedule meeting",
+        2: "Request updated financial documents",
+        3: "Prepare meeting agenda and client pack",
+        4: "Conduct meeting and document outcomes",
+        5: "Analyze meeting notes and prepare recommendations",
+        6: "Draft suitability letter with recommendations",
+        7: "Follow up on client decision",
+        8: "Monitor implementation progress",
+        9: "Schedule quarterly check-in",
+        10: "Plan next annual review cycle"
+    }
+    return next_actions.get(stage, "Review client status")
+
+def generate_client_report(client_name, report_type="portfolio_summary"):
+    """Generate comprehensive client reports"""
+    current_date = datetime.now().strftime('%Y-%m-%d')
+
+    if not client_name:
+        return "❌ Client name required for report generation"
+
+    return f"""
+📊 **{report_type.upper().replace('_', ' ')} REPORT GENERATED:**
+
+Client: {client_name.upper()}
+Report Date: {current_date}
+Report Type: {report_type.replace('_', ' ').title()}
+
+**REPORT CONTENTS:**
+- Current portfolio valuation and performance
+- Asset allocation vs. target allocation
+- Risk assessment and suitability review
+- Tax efficiency opportunities
+- Market outlook and recommendations
+- Action items and next steps
+
+**DELIVERY OPTIONS:**
+✅ PDF report saved to client folder
+📧 Email draft prepared for client review
+📱 Summary prepared for mobile presentation
+
+**NEXT STEPS:**
+- Review report with client in next meeting
+- Update CRM with report delivery date
+- Schedule follow-up based on recommendations
+
+Should I prepare the client meeting pack as well?
+    """
+
+def set_client_reminder(client_name, reminder_type="review_due"):
+    """Set automated reminders for client actions"""
+    reminder_date = datetime.now() + timedelta(days=30)
+
+    reminders = {
+        "review_due": "Annual review reminder",
+        "birthday": "Birthday outreach opportunity",
+        "policy_renewal": "Insurance policy renewal check",
+        "tax_year": "Tax year-end planning reminder",
+        "quarterly_check": "Quarterly portfolio review"
+    }
+
+    reminder_desc = reminders.get(reminder_type, "General follow-up reminder")
+
+    return f"""
+🔔 **REMINDER SET FOR {client_name.upper()}:**
+
+Type: {reminder_desc}
+Reminder Date: {reminder_date.strftime('%A, %B %d, %Y')}
+Frequency: One-time reminder
+Priority: Medium
+
+**AUTOMATED ACTIONS:**
+- Email reminder 7 days before due date
+- Calendar notification on due date
+- CRM flag added to client record
+- Follow-up task created
+
+**CUSTOMIZATION OPTIONS:**
+- Modify reminder date/frequency
+- Add custom message template
+- Set escalation if no response
+- Include automated birthday wishes
+
+Reminder successfully activated and integrated with your calendar system.
+    """
+
+# =============================================================================
+# NEW: Withdrawal Rate Analysis for Retired Clients
+# =============================================================================
+
+WITHDRAWAL_PATHS = _get_setting("WITHDRAWAL_PATHS", 5_000)
+WITHDRAWAL_SUCCESS_TARGET = _get_setting("WITHDRAWAL_SUCCESS_TARGET", 0.85)
+# CSV of year,return[,inflation] (fractions); the historical backtest runs only when one is supplied
+HISTORICAL_RETURNS_PATH = _get_setting("HISTORICAL_RETURNS_PATH", "")
+_drawdown_cache = DrawdownCache()
+_return_series = {"key": None, "series": None}
+
+def _return_series_key():
+    """(mtime, size) of the return series file, None when there is none"""
+    try:
+        stat = os.stat(HISTORICAL_RETURNS_PATH) if HISTORICAL_RETURNS_PATH else None
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size) if stat else None
+
+def get_return_series():
+    """The supplied historical return series, reloaded when the file changes (None if not configured)"""
+    key = _return_series_key()
+    if key is None:
+        return None
+    if _return_series["key"] != key:
+        try:
+            _return_series.update(key=key, series=load_return_series(HISTORICAL_RETURNS_PATH))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Could not load historical returns from {HISTORICAL_RETURNS_PATH}: {e}")
+            _return_series.update(key=key, series=None)
+    return _return_series["series"]
+
+def _build_retiree_plans(clients):
+    by_name = {c['name']: c for c in clients}
+    return [retiree_plan(name, data['pension_pot'], data['annual_withdrawal'],
+                         by_name.get(name, {}).get('age'), by_name.get(name, {}).get('risk_profile'),
+                         retirement_date=data.get('retirement_date'))
+            for name, data in retirement_data.items() if data.get('status') == "Retired"]
+
+def get_retiree_plans():
+    """
+    Drawdown plans for every retired client (age and risk profile from the book where known,
+    otherwise age estimated from the retirement date)
+    """
+    return _get_client_index("retirees", _build_retiree_plans)
+
+@memoize_on_data_version(key=_return_series_key)
+def analyze_withdrawal_rates(query):
+    """Analyze withdrawal rates for retired clients"""
+    results = []
+    query_lower = query.lower()
+    
+    rate_limit = next((float(p) for p in re.findall(r"(\d+(?:\.\d+)?)\s*%", query_lower)), 4.0)
+    
+    # Check for clients above the rate, or below the success target
+    if "withdrawal" in query_lower or "%" in query_lower or "retired" in query_lower:
+        plans = get_retiree_plans()
+        series = get_return_series()
+        # Unchanged retirees come from the cache; the rest are simulated together
+        analysis = _drawdown_cache.analyze(plans, series, paths=WITHDRAWAL_PATHS, target=WITHDRAWAL_SUCCESS_TARGET)
+        at_risk = [(plan, result) for plan, result in zip(plans, analysis)
+                   if result['rate'] > rate_limit or result['success'] < WITHDRAWAL_SUCCESS_TARGET]
+        at_risk.sort(key=lambda item: item[1]['success'])
+        
+        if at_risk:
+            results.append(f"⚠️ **RETIRED CLIENTS ABOVE {rate_limit:g}% OR BELOW {WITHDRAWAL_SUCCESS_TARGET:.0%} CHANCE OF FUNDS LASTING TO {PLAN_TO_AGE}:**")
+            for plan, result in at_risk:
+                results.append(f"🔴 {plan['name']}: {result['rate']:.1f}% withdrawal rate (£{plan['income_target']:,.0f}/year from £{plan['pot']:,.0f} pot) "
+                               f"- funds last to {PLAN_TO_AGE} in {result['success']:.0%} of {WITHDRAWAL_PATHS:,} market paths")
+                if not np.isnan(result['depletion_age']):
+                    results.append(f"   └─ Where funds run out, they do so at age {result['depletion_age']:.0f} (median)")
+                if np.isnan(result['safe_rate']):
+                    results.append(f"   └─ No withdrawal rate from 1% reaches {WITHDRAWAL_SUCCESS_TARGET:.0%} success - review the plan")
+                else:
+                    results.append(f"   └─ Safe withdrawal rate: {result['safe_rate']:.2f}% (£{plan['pot'] * result['safe_rate'] / 100:,.0f}/year)")
+                if result['historical_windows']:
+                    worst = f", worst start {result['historical_worst_start']}" if result['historical_worst_start'] else ""
+                    results.append(f"   └─ Historical: survived {result['historical_success']:.0%} of {result['historical_windows']} start years{worst}; "
+                                   f"safe rate {result['historical_safe_rate']:.2f}%" if not np.isnan(result['historical_safe_rate']) else
+                                   f"   └─ Historical: survived {result['historical_success']:.0%} of {result['historical_windows']} start years{worst}")
+        else:
+            results.append(f"✅ All retired clients have sustainable withdrawal rates (≤{rate_limit:g}% and at least {WITHDRAWAL_SUCCESS_TARGET:.0%} chance of funds lasting)")
+        if series is None:
+            results.append("📜 Historical backtest not run - no return series supplied (set HISTORICAL_RETURNS_PATH)")
+    
+    # General retirement overview
+    if "all retired" in query_lower or "retirement overview" in query_lower:
+        plans = get_retiree_plans()
+        analysis = _drawdown_cache.analyze(plans, get_return_series(), paths=WITHDRAWAL_PATHS, target=WITHDRAWAL_SUCCESS_TARGET)
+        results.append("📊 **RETIRED CLIENT WITHDRAWAL SUMMARY:**")
+        for plan, result in zip(plans, analysis):
+            status = "🟢" if result['success'] >= WITHDRAWAL_SUCCESS_TARGET else "🔴"
+            results.append(f"{status} {plan['name']}: {result['rate']:.1f}% (£{plan['income_target']:,.0f}/year), "
+                           f"{result['success']:.0%} chance of lasting, safe rate {result['safe_rate']:.2f}%")
+    
+    if not results:
+        results = ["No withdrawal rate data found. Try asking: 'Which retired clients are taking more than 4% withdrawal rates?'"]
+    
+    return " | ".join(results)
+
+# =============================================================================
+# NEW: Interest Rate Sensitivity Analysis
+# =============================================================================
+
+INTEREST_BASE_RATE = _get_setting("INTEREST_BASE_RATE", BASE_RATE)
+
+_RATE_MOVE = re.compile(r"\b(drop|drops|fall|falls|cut|cuts|rise|rises|increase|increases|go up|go down)\s+by\s+(\d+(?:\.\d+)?)\s*%")
+_RATE_STEP_MONTHS = (("quarter", 3), ("six month", 6), ("half year", 6), ("each month", 1), ("every month", 1),
+                     ("monthly", 1))
+
+def _build_rate_book(clients):
+    investments = ClientArrays.from_clients(clients).investments
+    return RateBook.from_records([c['name'] for c in clients],
+                                 [interest_rate_sensitivity.get(c['name'], {}) for c in clients], investments)
+
+def get_rate_book():
+    """Mortgage, savings and bond columns for every client, in book order"""
+    return _get_client_index("rates", _build_rate_book)
+
+def _rate_scenarios(query_lower):
+    """(RatePaths, labels, is_path): a rate path ("4% then 3.5% then 3%"), or one flat scenario per rate mentioned"""
+    rates = [float(p) for p in re.findall(r"(\d+(?:\.\d+)?)\s*%", query_lower)]
+    move = _RATE_MOVE.search(query_lower)
+    if move:
+        # "rates fall by 1%" is relative to today's base rate
+        sign = 1 if move.group(1).startswith(("rise", "increase", "go up")) else -1
+        rates = [INTEREST_BASE_RATE + sign * float(move.group(2))]
+    rates = [max(rate, 0.0) for rate in rates] or [3.0]  # Default scenario
+    if len(rates) > 1 and (" then " in query_lower or "path" in query_lower):
+        step = next((months for word, months in _RATE_STEP_MONTHS if word in query_lower), 12)
+        label = " → ".join(f"{rate:g}%" for rate in rates) + f" (a step every {step} months)"
+        return RatePaths.steps(rates, step), [label], True
+    rates = sorted(set(rates))
+    return RatePaths.flat(rates), [f"{rate:g}%" for rate in rates], False
+
+@memoize_on_data_version
+def analyze_interest_rate_impact(query):
+    """Analyze impact of interest rate changes on clients"""
+    results = []
+    query_lower = query.lower()
+    
+    if "interest rate" in query_lower or "rate drop" in query_lower or "rate change" in query_lower:
+        paths, labels, is_path = _rate_scenarios(query_lower)
+        book = get_rate_book()
+        impact = rate_impact(book, paths, base_rate=INTEREST_BASE_RATE)
+        
+        # Client detail at the scenario furthest from today's base rate
+        scenario = int(np.abs(paths.final - INTEREST_BASE_RATE).argmax())
+        direction = "drop" if paths.final[scenario] < INTEREST_BASE_RATE else "rise"
+        if is_path:
+            results.append(f"📉 **INTEREST RATE IMPACT ANALYSIS (Rate path {labels[0]}, from {INTEREST_BASE_RATE:g}% today):**")
+        elif len(paths) > 1:
+            results.append(f"📉 **INTEREST RATE IMPACT ANALYSIS (If rates move to {', '.join(labels)}):**")
+        else:
+            results.append(f"📉 **INTEREST RATE IMPACT ANALYSIS (If rates {direction} to {labels[scenario]}):**")
+        
+        if len(paths) > 1:
+            results.append(f"\n📊 **BY RATE LEVEL:**")
+            for i, label in enumerate(labels):
+                change = impact['mortgage_monthly_change'][i]
+                results.append(f"   • {label}: {int((change > 0).sum())} higher / {int((change < 0).sum())} lower mortgage payments "
+                               f"(net £{change.sum():+,.0f}/month), savings income £{impact['savings_income_change'][i].sum():+,.0f}/year, "
+                               f"bonds £{impact['bond_value_change'][i].sum():+,.0f}")
+            results.append(f"\n👥 **CLIENT DETAIL (at {labels[scenario]}):**")
+        
+        impacted_clients = []
+        
+        for row, client in enumerate(book.names):
+            impacts = []
+            
+            # Mortgage impact (refix at renewal on the amortized balance)
+            if impact['has_mortgage'][row]:
+                change = impact['mortgage_monthly_change'][scenario, row]
+                renewal = str(book.renewal_date[row]) if not np.isnat(book.renewal_date[row]) else "now"
+                payments = (f"£{impact['mortgage_payment'][row]:,.0f} → £{impact['new_mortgage_payment'][scenario, row]:,.0f}"
+                            f" at {impact['refix_rate'][scenario, row]:.2f}%")
+                if change > 0:
+                    impacts.append(f"Mortgage payment could increase by £{change:.0f}/month at renewal ({renewal}), {payments}")
+                else:
+                    impacts.append(f"Potential mortgage saving of £{-change:.0f}/month at renewal ({renewal}), {payments}")
+            
+            # Cash savings impact over the next year
+            if book.cash_savings[row] > 20000:
+                change = impact['savings_income_change'][scenario, row]
+                if change < 0:
+                    impacts.append(f"Cash savings income could reduce by £{-change:.0f}/year")
+                elif change > 0:
+                    impacts.append(f"Cash savings income could increase by £{change:.0f}/year")
+            
+            # Bond allocation impact (price moves against yields, by duration)
+            if book.bonds_allocation[row] > 0.15:
+                percent = impact['bond_change_percent'][scenario, row]
+                change = impact['bond_value_change'][scenario, row]
+                if percent:
+                    impacts.append(f"Bond portfolio ({book.bonds_allocation[row]*100:.0f}% allocation) may see price "
+                                   f"{'gains' if percent > 0 else 'falls'} of about {abs(percent):.1f}% (£{change:+,.0f})")
+            
+            if impacts:
+                impacted_clients.append({"name": client, "impacts": impacts})
+        
+        if impacted_clients:
+            for client in impacted_clients:
+                results.append(f"\n👤 **{client['name']}:**")
+                for impact_line in client['impacts']:
+                    results.append(f"   • {impact_line}")
+        else:
+            results.append("No significant interest rate exposure identified.")
+    
+    if not results:
+        results = ["Specify an interest rate scenario. Example: 'Show me which clients would be impacted if interest rates drop to 3%'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Market Correction Scenario Modeling
+# =============================================================================
+
+@memoize_on_data_version
+def model_market_correction(query):
+    """Model impact of market corrections on client portfolios"""
+    results = []
+    query_lower = query.lower()
+    
+    # Every percentage in the query is a correction level (default 20%)
+    levels = [float(p) for p in re.findall(r"(\d+(?:\.\d+)?)\s*%", query_lower) if 0 < float(p) <= 100]
+    levels = sorted(set(levels)) or [20.0]
+    
+    if "market correction" in query_lower or "market drop" in query_lower or "crash" in query_lower:
+        label = ", ".join(f"{level:g}%" for level in levels)
+        results.append(f"📉 **{label} MARKET CORRECTION IMPACT ANALYSIS:**")
+        
+        # All levels in one pass over the columnar book
+        book = get_client_book()
+        impact = correction_impact(book, [level / 100 for level in levels])
+        
+        if len(levels) > 1:
+            results.append(f"\n📊 **BY CORRECTION LEVEL:**")
+            for i, level in enumerate(levels):
+                exposed = impact['exposed'][i]
+                results.append(f"   • {level:g}%: {int(exposed.sum())} clients exposed, "
+                               f"£{impact['losses'][i, exposed].sum():,.0f} total potential loss")
+        
+        # Most exposed clients at the most severe level
+        level = len(levels) - 1
+        exposed_count = int(impact['exposed'][level].sum())
+        
+        if exposed_count:
+            results.append(f"\n⚠️ **MOST EXPOSED CLIENTS:**" + (f" (at {levels[level]:g}%)" if len(levels) > 1 else ""))
+            for i, row in enumerate(ranked_exposures(impact, level, top=5), 1):
+                age = int(book.age[row])
+                loss_percent = impact['loss_ratio'][row] * levels[level]
+                results.append(f"\n{i}. **{book.names[row]}** (Age {age})")
+                results.append(f"   • Net Worth: £{book.net_worth[row]:,.0f}")
+                results.append(f"   • Equity Exposure: £{impact['equity_value'][row]:,.0f}")
+                results.append(f"   • Potential Loss: £{impact['losses'][level, row]:,.0f} ({loss_percent:.1f}% of net worth)")
+                
+                # Recommendations
+                if age > 60:
+                    results.append(f"   ⚡ RECOMMENDATION: Consider reducing equity exposure - approaching/in retirement")
+                elif loss_percent > 15:
+                    results.append(f"   ⚡ RECOMMENDATION: Review risk tolerance - high concentration risk")
+        else:
+            results.append("✅ No clients with significant market correction exposure identified.")
+        
+        results.append(f"\n📊 **SUMMARY:** {exposed_count} clients may need portfolio rebalancing discussion")
+    
+    if not results:
+        results = ["Specify a market correction scenario. Example: 'Which clients are most exposed if we see a 20% market correction?'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Cashflow Modeling for Early Retirement
+# =============================================================================
+
+CASHFLOW_PATHS = _get_setting("CASHFLOW_PATHS", 10_000)
+CASHFLOW_BOOK_PATHS = _get_setting("CASHFLOW_BOOK_PATHS", 2_000)
+CASHFLOW_SUCCESS_TARGET = 0.85
+
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+                 "nine": 9, "ten": 10}
+
+_cashflow_plans = {"version": None, "plans": None, "profiles": None, "names": None}
+_cashflow_plans_lock = threading.Lock()
+
+def _recorded_plan_inputs():
+    """
+    {client: planning figures held outside the client record}: this tax
+    year's contributions from the pension ledger, drawdown income as the
+    income target, and household pension income from the care planning data
+    """
+    tax_year = tax_year_of()
+    recorded = {}
+    for client, year, amount in advisor_store.pension_contribution_totals():
+        if year == tax_year and amount:
+            recorded.setdefault(client, {})["contribution"] = amount
+    for client, data in retirement_data.items():
+        if data.get('annual_withdrawal'):
+            recorded.setdefault(client, {})["income_target"] = data['annual_withdrawal']
+    for client, data in long_term_care_data.items():
+        if data.get('pension_income'):
+            recorded.setdefault(client, {})["pension_income"] = data['pension_income']
+    return recorded
+
+def _cashflow_plans_for(clients):
+    recorded = _recorded_plan_inputs()
+    return [plan_from_client(c, recorded.get(c['name'])) for c in clients]
+
+def _cashflow_book():
+    version = (get_data_version("clients"), get_data_version("pensions"), tax_year_of())
+    with _cashflow_plans_lock:
+        if _cashflow_plans["version"] != version:
+            clients = get_review_index().clients
+            booked = {c['name'] for c in clients}
+            prospects = [record for name, record in cashflow_planning_data.items() if name not in booked]
+            plans = _cashflow_plans_for(clients)
+            profiles = plans + [plan_from_client(record) for record in prospects]
+            _cashflow_plans.update(version=version, plans=plans, profiles=profiles,
+                                   names=ClientNameIndex(enumerate(plan['name'] for plan in profiles)))
+        return _cashflow_plans
+
+def get_cashflow_plans():
+    """Monte Carlo inputs for every client, in book order, rebuilt when clients or contributions change"""
+    return _cashflow_book()["plans"]
+
+def find_cashflow_plan(text):
+    """Plan for the client, or planning-only profile, named in text (None if nobody is named)"""
+    book = _cashflow_book()
+    position = book["names"].find_in_text(text)
+    return book["profiles"][position] if position is not None else None
+
+def _retirement_scenarios(query_lower, plan):
+    """[(retirement age, label)] asked about in the query, plus the planned age"""
+    age = plan['age']
+    scenarios = {}
+    if "next year" in query_lower:
+        scenarios[age + 1] = "next year"
+    for count in re.findall(r"\bin (\d+|" + "|".join(_NUMBER_WORDS) + r") years?\b", query_lower):
+        years = int(count) if count.isdigit() else _NUMBER_WORDS[count]
+        scenarios.setdefault(age + years, f"in {years} year{'s' if years != 1 else ''}")
+    for clause in re.findall(r"\b(?:at|age|aged)\s+(\d{2}(?:\s*(?:,|or|and|vs|versus)\s*\d{2})*)\b", query_lower):
+        for target in re.findall(r"\d{2}", clause):
+            scenarios.setdefault(int(target), f"age {target}")
+    planned = max(plan['retirement_age'], age)
+    scenarios.setdefault(planned, "planned" if planned > age else "now")
+    return sorted(scenarios.items())
+
+def _cashflow_status(success):
+    if success >= CASHFLOW_SUCCESS_TARGET:
+        return "✅ On track"
+    if success >= 0.6:
+        return "⚠️ At risk"
+    return "❌ Unlikely to last"
+
+@memoize_on_data_version
+def model_cashflow_scenario(query):
+    """Model cashflow for different retirement scenarios"""
+    results = []
+    query_lower = query.lower()
+    
+    # Extract client name from query
+    plan = find_cashflow_plan(query)
+    
+    if "cashflow" in query_lower or "retire" in query_lower and "early" in query_lower:
+        if plan:
+            scenarios = _retirement_scenarios(query_lower, plan)
+            ages = [age for age, _ in scenarios]
+            sim = simulate([plan], ages, paths=CASHFLOW_PATHS, trajectories=True)
+            
+            results.append(f"💰 **CASHFLOW MODEL FOR {plan['name'].upper()} - RETIREMENT SCENARIOS:**")
+            results.append(f"   Age {plan['age']} | Pot £{plan['pot']:,.0f} | Contributions £{plan['contribution']:,.0f}/year | "
+                           f"Income target £{plan['income_target']:,.0f}/year (today's money)")
+            results.append(f"   {CASHFLOW_PATHS:,} market paths, {plan['risk_profile']} risk "
+                           f"({plan['mean_return']:.1%} average return, {plan['volatility']:.0%} volatility), "
+                           f"{INFLATION:.1%} inflation, State Pension £{plan['state_pension']:,.0f} from {STATE_PENSION_AGE}")
+            if plan['pension_income']:
+                results.append(f"   Other pension income £{plan['pension_income']:,.0f}/year from retirement")
+            if plan['assumed']:
+                results.append(f"   ⚠️ Assumed (not on file): {', '.join(plan['assumed'])} - confirm with the client")
+            
+            for i, (age, label) in enumerate(scenarios):
+                low, median, high = sim['pot_at_retirement'][0, i]
+                success = sim['success'][0, i]
+                results.append(f"\n📅 **RETIRE AT {age:.0f} ({label.upper()}):**")
+                results.append(f"   • Projected Pension Pot: £{median:,.0f} (10th-90th percentile £{low:,.0f} - £{high:,.0f})")
+                first_year_income = plan['income_target'] * (1 + INFLATION) ** (age - plan['age'])
+                results.append(f"   • Initial Withdrawal Rate: {first_year_income / median * 100 if median else 0:.1f}%")
+                results.append(f"   • Income lasts to {PLAN_TO_AGE}: {success:.0%} of paths - {_cashflow_status(success)}")
+                for milestone in (75, 85):
+                    year = int(milestone - plan['age'])
+                    if 0 < year < sim['trajectory'].shape[-1]:
+                        results.append(f"   • Pot at {milestone}: £{sim['trajectory'][0, i, 1, year]:,.0f} median "
+                                       f"(£{sim['trajectory'][0, i, 0, year]:,.0f} in a poor market)")
+                if success < 1:
+                    results.append(f"   • Where the money runs out, it does so at age {sim['depletion_age'][0, i]:.0f} (median)")
+            
+            if len(scenarios) > 1:
+                (early, _), (late, _) = scenarios[0], scenarios[-1]
+                results.append(f"\n💡 **IMPACT OF RETIRING AT {early:.0f} INSTEAD OF {late:.0f}:**")
+                results.append(f"   • Pension pot reduction: £{sim['pot_at_retirement'][0, -1, 1] - sim['pot_at_retirement'][0, 0, 1]:,.0f} (median)")
+                results.append(f"   • Chance income lasts: {sim['success'][0, 0]:.0%} vs {sim['success'][0, -1]:.0%}")
+                results.append(f"   • Additional years without earnings: {late - early:.0f}")
+                results.append(f"   • Years until State Pension: {max(STATE_PENSION_AGE - early, 0):.0f}")
+            
+            # Recommendations
+            results.append(f"\n⚡ **RECOMMENDATIONS:**")
+            short = [age for i, (age, _) in enumerate(scenarios) if sim['success'][0, i] < CASHFLOW_SUCCESS_TARGET]
+            if short:
+                for age, income in zip(short, sustainable_income(plan, short, target=CASHFLOW_SUCCESS_TARGET, paths=CASHFLOW_PATHS)):
+                    if income:
+                        results.append(f"   • Retiring at {age:.0f}: an income of £{income:,.0f}/year lasts in {CASHFLOW_SUCCESS_TARGET:.0%} of paths")
+                    else:
+                        results.append(f"   • Retiring at {age:.0f}: the pot cannot support a meaningful income - defer or increase contributions")
+            results.append(f"   • Build cash buffer of £{plan['income_target'] * 2:,.0f} for first 2 years")
+            results.append(f"   • Review investment strategy - may need to reduce risk closer to retirement")
+        elif "all clients" in query_lower or "book" in query_lower or "everyone" in query_lower:
+            plans = get_cashflow_plans()
+            sim = simulate_book(plans, paths=CASHFLOW_BOOK_PATHS)
+            order = np.argsort(sim['success'][:, 0], kind="stable")
+            at_risk = [i for i in order if sim['success'][i, 0] < CASHFLOW_SUCCESS_TARGET]
+            results.append(f"💰 **BOOK-WIDE RETIREMENT CASHFLOW ({len(plans)} clients, planned retirement ages):**")
+            for i in at_risk[:10]:
+                results.append(f"\n👤 **{plans[i]['name']}** (age {plans[i]['age']}, retiring at {max(plans[i]['retirement_age'], plans[i]['age'])})")
+                results.append(f"   • Income lasts to {PLAN_TO_AGE}: {sim['success'][i, 0]:.0%} of paths - {_cashflow_status(sim['success'][i, 0])}")
+                results.append(f"   • Projected Pension Pot: £{sim['pot_at_retirement'][i, 0, 1]:,.0f} (median)")
+                if plans[i]['assumed']:
+                    results.append(f"   • Assumed (not on file): {', '.join(plans[i]['assumed'])}")
+            results.append(f"\n📊 **SUMMARY:** {len(at_risk)} of {len(plans)} clients below a {CASHFLOW_SUCCESS_TARGET:.0%} chance of their income lasting")
+            assumed = sum(1 for plan in plans if plan['assumed'])
+            if assumed:
+                results.append(f"   {assumed} of {len(plans)} plans use default assumptions for inputs not on file")
+        else:
+            results.append("Please specify a client name. Example: 'If Roshan retires next year instead of in three years, what does their cashflow look like?'")
+    
+    if not results:
+        results = ["Specify a cashflow scenario. Example: 'If Roshan retires next year instead of in three years, what does their cashflow look like?'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Long-Term Care Modeling
+# =============================================================================
+
+CARE_PATHS = _get_setting("CARE_PATHS", 5_000)
+CARE_BOOK_PATHS = _get_setting("CARE_BOOK_PATHS", 1_000)
+
+def _care_record(client):
+    """Care-funding inputs for a client: record assets, then retirement income, then household overrides"""
+    full_data = client.get('full_data') or {}
+    assets = full_data.get('assets') or {}
+    net_worth = client.get('net_worth') or 0
+    liquid = sum(assets.get(key) or 0 for key in ('investments', 'cash', 'savings'))
+    if not liquid:
+        liquid = net_worth * DEFAULT_INVESTMENT_SHARE
+    property_value = assets.get('property') or assets.get('property_value')
+    if property_value is None:
+        # Most of what net worth leaves after liquid assets and pensions is the home
+        property_value = max(net_worth - liquid - (assets.get('pensions') or 0), 0)
+    partner = full_data.get('partner') or full_data.get('spouse') or \
+        str(full_data.get('marital_status') or "").lower() in ("married", "civil partnership")
+    record = {
+        "name": client['name'],
+        "age": client.get('age') or 50,
+        "liquid_assets": liquid,
+        "property_value": property_value,
+        "pension_income": full_data.get('pension_income') or retirement_data.get(client['name'], {}).get('annual_withdrawal') or 0,
+        "partner_at_home": bool(partner)
+    }
+    record.update(long_term_care_data.get(client['name'], {}))
+    return record
+
+def get_care_book():
+    """Care-funding columns for every client, in book order"""
+    return _get_client_index("care", lambda clients: CareBook.from_records([_care_record(c) for c in clients]))
+
+def _years(value):
+    return "never within the stay" if np.isnan(value) else f"{value:.1f} years"
+
+@memoize_on_data_version
+def model_long_term_care(query):
+    """Model financial impact of long-term care needs"""
+    results = []
+    query_lower = query.lower()
+    
+    # Extract family name
+    position = get_name_index().find_in_text(query)
+    
+    if "long-term care" in query_lower or "ltc" in query_lower or "care home" in query_lower:
+        book = get_care_book()
+        if position is not None:
+            family_name = book.names[position].split()[-1]
+            results.append(f"🏥 **LONG-TERM CARE SCENARIO MODELING - {family_name.upper()} FAMILY:**")
+            
+            liquid_assets = book.liquid_assets[position]
+            property_value = book.property_value[position]
+            partner = book.partner_at_home[position]
+            single = CareBook([book.names[position]], book.age[position:position + 1], [liquid_assets], [property_value],
+                              book.pension_income[position:position + 1], [partner])
+            care = simulate_care_types(single, paths=CARE_PATHS)
+            
+            results.append(f"\n📊 **CURRENT FINANCIAL POSITION:**")
+            results.append(f"   • Joint Assets: £{liquid_assets + property_value:,.0f}")
+            results.append(f"   • Property Value: £{property_value:,.0f}")
+            results.append(f"   • Liquid Assets: £{liquid_assets:,.0f}")
+            results.append(f"   • Annual Pension Income: £{book.pension_income[position]:,.0f}")
+            results.append(f"   • {CARE_PATHS:,} simulated care journeys: onset around age {care['onset_age'][0]:.0f} (median), "
+                           f"care costs rising {CARE_INFLATION:.1%}/year")
+            
+            results.append(f"\n🏠 **SCENARIO: {'One Partner Needs Care' if partner else 'Care Needed'}**")
+            
+            for i, (care_type, (annual_cost, _)) in enumerate(CARE_TYPES.items()):
+                run_out = care['run_out_probability'][i, 0]
+                low, median, high = care['liquid_years'][i, 0]
+                remaining = care['remaining_capital'][i, 0]
+                results.append(f"\n   **Option {i + 1}: {care_type.title()} (£{annual_cost:,}/year, median stay {care['care_years'][i]:.1f} years)**")
+                if run_out:
+                    results.append(f"   • Liquid assets run out in {run_out:.0%} of journeys, after {_years(median)} of care "
+                                   f"(10th-90th percentile {low:.1f} - {high:.1f})")
+                else:
+                    results.append(f"   • Liquid assets last the whole stay in every simulated journey")
+                council = care['threshold_probability'][i, 0]
+                if council:
+                    results.append(f"   • Capital falls to the £{UPPER_CAPITAL_LIMIT:,} means-testing threshold in {council:.0%} of journeys "
+                                   f"(council funding after {_years(care['threshold_years'][i, 0, 1])}, median)")
+                results.append(f"   • Capital left when care ends: £{remaining[1]:,.0f} median (£{remaining[0]:,.0f} in the worst 10%, today's money)")
+                if care_type != "home care" and run_out and not partner:
+                    results.append(f"   • Property may need to be sold or equity released after about {median:.0f} years")
+            
+            results.append(f"\n💡 **RECOMMENDATIONS:**")
+            results.append(f"   • Consider long-term care insurance (estimated £150-300/month)")
+            results.append(f"   • Review property ownership structure for protection")
+            results.append(f"   • Maintain emergency fund of £{CARE_TYPES['care home'][0]:,} minimum")
+            results.append(f"   • Discuss Lasting Power of Attorney arrangements")
+            
+            results.append(f"\n⚠️ **KEY CONSIDERATIONS:**")
+            results.append(f"   • Local authority means testing threshold: £{UPPER_CAPITAL_LIMIT:,}")
+            results.append(f"   • Property disregarded if partner still living there")
+            results.append(f"   • 12-week property disregard for care home admission")
+        elif "all clients" in query_lower or "book" in query_lower or "everyone" in query_lower or "vulnerab" in query_lower:
+            annual_cost, median_years = CARE_TYPES["care home"]
+            care = simulate_care_book(book, [annual_cost], [median_years], paths=CARE_BOOK_PATHS)
+            run_out = care['run_out_probability'][0]
+            results.append(f"🏥 **LONG-TERM CARE VULNERABILITY SCREEN ({len(book)} clients, care home £{annual_cost:,}/year):**")
+            for row in np.argsort(-run_out, kind="stable")[:10]:
+                if run_out[row] == 0:
+                    break
+                results.append(f"   • {book.names[row]}: {run_out[row]:.0%} chance liquid assets run out, "
+                               f"after {_years(care['liquid_years'][0, row, 1])} (median)")
+            results.append(f"\n📊 **SUMMARY:** {int((run_out >= 0.5).sum())} clients would more likely than not exhaust liquid assets in a care home")
+        else:
+            results.append("Please specify a family name. Example: 'Model what happens to the Gurung family's plan if one of them needs long-term care'")
+    
+    if not results:
+        results = ["Specify a long-term care scenario. Example: 'Model what happens to the Gurung family's plan if one of them needs long-term care'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Batch What-If Scenarios
+# =============================================================================
+
+SCENARIO_RESULTS_PATH = _get_setting("SCENARIO_RESULTS_PATH", "scenario_results.npz")
+SCENARIO_BATCH_WORKERS = _get_setting("SCENARIO_BATCH_WORKERS", 4)
+_scenario_results = {"results": None}
+_scenario_results_lock = threading.Lock()
+
+def _build_scenario_inputs(clients):
+    arrays = ClientArrays.from_clients(clients)
+    rates = RateBook.from_records(arrays.names, [interest_rate_sensitivity.get(c['name'], {}) for c in clients],
+                                  arrays.investments)
+    care = CareBook.from_records([_care_record(c) for c in clients])
+    return {
+        "names": arrays.names,
+        "age": arrays.age,
+        "net_worth": arrays.net_worth,
+        "investments": arrays.investments,
+        "equity_share": arrays.equity_share,
+        "liquid_assets": care.liquid_assets,
+        "property_value": care.property_value,
+        "pension_income": care.pension_income,
+        "partner_at_home": care.partner_at_home,
+        "fixed_mortgage": rates.fixed_mortgage,
+        "mortgage_balance": rates.mortgage_balance,
+        "mortgage_rate": rates.mortgage_rate,
+        "renewal_date": rates.renewal_date,
+        "term_months": rates.term_months,
+        "cash_savings": rates.cash_savings,
+        "bonds_allocation": rates.bonds_allocation,
+        "bond_value": rates.bond_value,
+        "base_rate": INTEREST_BASE_RATE
+    }
+
+def get_scenario_inputs():
+    """
+    Per-client columns the batch kernels read: the record columns are built
+    once per clients data version, the cashflow plans also follow the pension
+    ledger, so a new contribution changes the fingerprint
+    """
+    return {**_get_client_index("scenario_inputs", _build_scenario_inputs), "plans": get_cashflow_plans()}
+
+def run_scenario_batch(grid=None, workers=None):
+    """
+    Evaluate the what-if grid for the whole book in a process pool and save it
+    to SCENARIO_RESULTS_PATH. Run offline (python batch_scenarios.py), not from
+    a chat turn: the pool spawns processes and can take minutes on a large book.
+    """
+    workers = SCENARIO_BATCH_WORKERS if workers is None else workers
+    results = run_batch(get_scenario_inputs(), SCENARIO_RESULTS_PATH, grid=grid, workers=workers)
+    with _scenario_results_lock:
+        _scenario_results["results"] = results
+    print(f"✅ Scenario batch saved to {SCENARIO_RESULTS_PATH} ({results.elapsed:.1f}s)")
+    return results
+
+def get_scenario_results(grid=None):
+    """Saved batch results if they match the current book and grid, else None"""
+    expected = fingerprint(get_scenario_inputs(), {k: list(v) for k, v in (grid or DEFAULT_SCENARIO_GRID).items()})
+    with _scenario_results_lock:
+        results = _scenario_results["results"]
+        if results is None and os.path.exists(SCENARIO_RESULTS_PATH):
+            try:
+                results = ScenarioResults(SCENARIO_RESULTS_PATH)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not read {SCENARIO_RESULTS_PATH}: {e}")
+            _scenario_results["results"] = results
+        return results if results is not None and results.fingerprint == expected else None
+
+# Whole-word patterns selecting a scenario kind; a question matching none, or more than one, gets the grid summary
+SCENARIO_KIND_PATTERNS = (
+    ("care_cost", re.compile(r"\bcare\b")),
+    ("interest_rate", re.compile(r"\binterest\b|(?<!withdrawal )(?<!success )\brates?\b")),
+    ("retirement_age", re.compile(r"\bretire(?:s|ment)?\b|\bretiring\b")),
+    ("market_correction", re.compile(r"\bcorrections?\b|\bcrash(?:es)?\b|\bshocks?\b|"
+                                     r"\bmarkets? (?:drops?|falls?|falling)\b|\b(?:drop|fall)s? in (?:the )?markets?\b"))
+)
+
+@register_tool(
+    "Book-wide what-if grid across all clients (market correction sizes, interest rate levels, care cost levels, retirement ages), read from the grid saved by the offline batch; use to rank clients for a scenario level or compare levels",
+    query="The what-if question, e.g. 'which clients run out of money if care costs £72,000 a year'"
+)
+def query_scenario_batch(query):
+    """Answer a what-if question from the saved scenario grid; never runs the batch itself"""
+    query_lower = query.lower()
+    results = get_scenario_results()
+    if results is None:
+        state = "is out of date (the book has changed since it was saved)" if os.path.exists(SCENARIO_RESULTS_PATH) \
+            else "has not been computed yet"
+        return (f"⚠️ The book-wide scenario grid {state}. Rebuild it offline with `python batch_scenarios.py`, "
+                f"or ask the single-client scenario tools (market correction, interest rates, cashflow, long-term care) instead.")
+
+    kinds = [kind for kind, pattern in SCENARIO_KIND_PATTERNS if pattern.search(query_lower)]
+    kind = kinds[0] if len(kinds) == 1 else None
+    if kind is None:
+        lines = [f"🧮 **SCENARIO GRID ({len(results.names)} clients, computed in {results.elapsed:.1f}s):**"]
+        if kinds:
+            lines.append(f"   The question mentions {' and '.join(k.replace('_', ' ') for k in kinds)} - ask about one to rank clients")
+        for kind in results.kinds:
+            lines.append(f"   • {kind.replace('_', ' ')}: {', '.join(f'{v:g}' for v in results.values(kind))}")
+        return "\n".join(lines)
+
+    # Requested level: a percentage, a £ amount or an age, depending on the kind
+    if kind == "care_cost":
+        amounts = re.findall(r"£\s*([\d,]+)(k?)", query_lower)
+        requested = [float(a.replace(",", "")) * (1000 if k else 1) for a, k in amounts]
+    elif kind == "retirement_age":
+        requested = [float(a) for a in re.findall(r"\b(?:at|age|aged)\s+(\d{2})\b", query_lower)]
+    else:
+        requested = [float(p) for p in re.findall(r"(\d+(?:\.\d+)?)\s*%", query_lower)]
+        if kind == "market_correction":
+            requested = [p / 100 for p in requested]
+    values = results.values(kind)
+    value = requested[0] if requested else float(values[len(values) // 2])
+    _, used = results.nearest(kind, value)
+    shown = f"{used:.0%}" if kind == "market_correction" else f"£{used:,.0f}/year" if kind == "care_cost" else \
+            f"{used:g}%" if kind == "interest_rate" else f"age {used:g}"
+
+    lines = [f"🧮 **{kind.replace('_', ' ').upper()} SCENARIO: {shown}** (saved grid, {len(results.names)} clients)"]
+    if requested and not np.isclose(used, value):
+        lines.append(f"   (nearest level in the saved grid)")
+    if kind == "market_correction":
+        exposed, _ = results.metric(kind, "exposed", used)
+        lines.append(f"\n⚠️ **{int(exposed.sum())} CLIENTS EXPOSED - LARGEST LOSSES:**")
+        percent, _ = results.metric(kind, "loss_percent", used)
+        for name, loss in results.top(kind, "loss", used, mask=exposed):
+            lines.append(f"   • {name}: £{loss:,.0f} ({percent[results.position(name)]:.1f}% of net worth)")
+    elif kind == "interest_rate":
+        lines.append(f"\n🏠 **LARGEST MORTGAGE PAYMENT CHANGES AT RENEWAL:**")
+        for name, change in results.top(kind, "mortgage_monthly_change", used):
+            if change:
+                lines.append(f"   • {name}: {'+' if change > 0 else '-'}£{abs(change):,.0f}/month")
+        lines.append(f"\n💷 **SAVINGS INCOME AT {used:g}%:**")
+        for name, income in results.top(kind, "savings_income", used):
+            if income:
+                lines.append(f"   • {name}: £{income:,.0f}/year")
+        lines.append(f"\n📈 **LARGEST BOND PRICE MOVES:**")
+        moves, _ = results.metric(kind, "bond_value_change", used)
+        for name, _ in results.top(kind, "bond_value_change", used, mask=moves != 0, largest=used < INTEREST_BASE_RATE):
+            lines.append(f"   • {name}: £{moves[results.position(name)]:+,.0f}")
+    elif kind == "care_cost":
+        lines.append(f"\n🏥 **MOST LIKELY TO RUN OUT OF LIQUID ASSETS IN CARE:**")
+        years, _ = results.metric(kind, "years_funded", used)
+        for name, chance in results.top(kind, "run_out_probability", used):
+            if chance:
+                lines.append(f"   • {name}: {chance:.0%} of care journeys, after {_years(years[results.position(name)])} (median)")
+    else:
+        lines.append(f"\n📉 **LOWEST CHANCE OF INCOME LASTING TO {PLAN_TO_AGE}:**")
+        pots, _ = results.metric(kind, "pot_at_retirement", used)
+        for name, success in results.top(kind, "success", used, largest=False):
+            lines.append(f"   • {name}: {success:.0%} (median pot £{pots[results.position(name)]:,.0f})")
+    return "\n".join(lines)
+
+# =============================================================================
+# NEW: Pension Annual Allowance Tracking
+# =============================================================================
+
+# Allowance book: contribution ledger joined to client incomes, rebuilt when either changes
+ALLOWANCE_LIST_LIMIT = _get_setting("ALLOWANCE_LIST_LIMIT", 10)
+_allowance_book = {"version": None, "book": None, "position": None, "names": None}
+_allowance_book_lock = threading.Lock()
+
+@register_tool(
+    "Record a pension contribution for a client in the contribution ledger that annual allowance, carry forward and cashflow answers are worked out from",
+    client_name="Client name",
+    amount="Gross contribution in pounds",
+    date="Date paid, YYYY-MM-DD (default today)",
+    source="Who paid it, e.g. personal, employer"
+)
+def record_pension_contribution(client_name, amount: float, date="", source=""):
+    """Add a contribution to the ledger and invalidate allowance results"""
+    client = find_client(client_name)
+    if client is None:
+        return f"❌ No client found matching '{client_name}'"
+    try:
+        paid = datetime.fromisoformat(date).date() if date else datetime.now().date()
+    except ValueError:
+        return f"❌ Contribution date must be YYYY-MM-DD, not '{date}'"
+    if amount <= 0:
+        return "❌ Contribution amount must be positive"
+
+    advisor_store.add_pension_contribution(client['name'], paid.isoformat(), amount, source or None)
+    bump_data_version("pensions")
+    return (f"✅ Recorded £{amount:,.0f} pension contribution for {client['name']} on {paid:%d %B %Y} "
+            f"({tax_year_label(tax_year_of(paid))} tax year)")
+
+@register_tool(
+    "Record a client's declared threshold and / or adjusted income for a tax year, replacing the estimate from annual income in the annual allowance taper",
+    client_name="Client name",
+    tax_year="First calendar year of the tax year, e.g. 2025 for 2025/26 (default the current tax year)",
+    threshold_income="Threshold income in pounds",
+    adjusted_income="Adjusted income in pounds"
+)
+def record_pension_income(client_name, tax_year: int = None, threshold_income: float = None, adjusted_income: float = None):
+    """Store declared taper incomes for a tax year and invalidate allowance results"""
+    client = find_client(client_name)
+    if client is None:
+        return f"❌ No client found matching '{client_name}'"
+    if threshold_income is None and adjusted_income is None:
+        return "❌ Give a threshold income, an adjusted income or both"
+
+    tax_year = tax_year or tax_year_of()
+    advisor_store.set_pension_income(client['name'], tax_year, threshold_income, adjusted_income)
+    bump_data_version("pensions")
+    declared = ", ".join(f"{label} £{value:,.0f}" for label, value in
+                         (("threshold income", threshold_income), ("adjusted income", adjusted_income)) if value is not None)
+    return f"✅ Recorded {declared} for {client['name']} in {tax_year_label(tax_year)}"
+
+# Pension allowance wording: any allowance other than ISA / personal, carry forward, or the tax year end
+_PENSION_ALLOWANCE_QUERY = re.compile(
+    r"(?<!isa )(?<!personal )\ballowances?\b|\bcarry[- ]forward\b|\b5(?:th)? april\b|\btax[- ]year[- ]end\b|\bend of (?:the )?tax year\b"
+)
+# Questions about what is left to use before the tax year ends
+_ALLOWANCE_DEADLINE_QUERY = re.compile(r"\bbefore\b|\b5(?:th)? april\b|\btax[- ]year[- ]end\b|\bend of (?:the )?tax year\b")
+
+def _is_pension_allowance_query(query):
+    return bool(_PENSION_ALLOWANCE_QUERY.search(query.lower()))
+
+def get_allowance_position():
+    """(AllowanceBook, allowance_position, name index -> row) for every client in the contribution ledger"""
+    version = (get_data_version("clients"), get_data_version("pensions"), tax_year_of())
+    with _allowance_book_lock:
+        if _allowance_book["version"] != version:
+            incomes = {c['name']: c.get('annual_income') for c in get_review_index().clients}
+            book = AllowanceBook.from_ledger(advisor_store.pension_contribution_totals(), advisor_store.pension_incomes(),
+                                             incomes, current_year=version[2])
+            _allowance_book.update(version=version, book=book, position=allowance_position(book),
+                                   names=ClientNameIndex(enumerate(book.names)))
+        return _allowance_book["book"], _allowance_book["position"], _allowance_book["names"]
+
+@memoize_on_data_version
+def analyze_pension_allowances(query):
+    """Analyze pension annual allowances and carry forward"""
+    results = []
+    query_lower = query.lower()
+    
+    if _is_pension_allowance_query(query):
+        book, position, names = get_allowance_position()
+        tax_year = int(book.tax_years[-1])
+        end = tax_year_end(tax_year)
+        deadline = f"{end.day} {end:%B %Y}"
+        named = names.find_in_text(query)
+        
+        # "Who still has allowance before 5 April": clients with capacity left, lapsing carry forward first
+        if named is None and _ALLOWANCE_DEADLINE_QUERY.search(query_lower):
+            rows = [int(i) for i in np.lexsort((-position['remaining'], -position['expiring']))
+                    if position['remaining'][i] > 0]
+            results.append(f"⏳ **PENSION ALLOWANCE STILL AVAILABLE BEFORE {deadline.upper()} ({tax_year_label(tax_year)}):**")
+            for row in rows[:ALLOWANCE_LIST_LIMIT]:
+                line = f"👤 {book.names[row]}: £{position['remaining'][row]:,.0f} remaining"
+                if position['expiring'][row]:
+                    line += (f" - £{position['expiring'][row]:,.0f} of {tax_year_label(tax_year - 3)} carry forward "
+                             f"is lost after {deadline}")
+                results.append(line)
+            if len(rows) > ALLOWANCE_LIST_LIMIT:
+                results.append(f"   ...and {len(rows) - ALLOWANCE_LIST_LIMIT} more clients")
+            if not rows:
+                results.append("No client in the contribution ledger has allowance left this tax year")
+            results.append(f"\n📊 **TOTAL:** {len(rows)} of {len(book)} clients, £{position['remaining'].sum():,.0f} remaining, "
+                           f"£{position['expiring'].sum():,.0f} of it lapsing after {deadline}")
+            return "\n".join(results)
+        
+        rows = [named] if named is not None else [int(i) for i in np.argsort(-position['remaining'], kind="stable")]
+        results.append(f"💼 **PENSION ANNUAL ALLOWANCE ANALYSIS ({tax_year_label(tax_year)}):**")
+        
+        for row in rows[:ALLOWANCE_LIST_LIMIT]:
+            remaining = position['remaining'][row]
+            carry_forward = position['carry_forward'][row]
+            years = ", ".join(f"{tax_year_label(tax_year - len(carry_forward) + i)} £{amount:,.0f}"
+                              for i, amount in enumerate(carry_forward))
+            
+            results.append(f"\n👤 **{book.names[row]}:**")
+            if position['tapered'][row]:
+                results.append(f"   • Annual Allowance: £{position['allowance'][row]:,.0f} (tapered - adjusted income "
+                               f"£{book.adjusted_income[row, -1]:,.0f})")
+            else:
+                results.append(f"   • Annual Allowance: £{position['allowance'][row]:,.0f}")
+            results.append(f"   • Used This Year: £{position['used'][row]:,.0f}")
+            results.append(f"   • Carry Forward Available: £{carry_forward.sum():,.0f} ({years})")
+            results.append(f"   • **Remaining Capacity: £{remaining:,.0f}**")
+            
+            if position['excess'][row]:
+                results.append(f"   ⚠️ Contributions exceed the available allowance by £{position['excess'][row]:,.0f} - "
+                               f"annual allowance charge likely")
+            if position['expiring'][row]:
+                results.append(f"   ⏳ £{position['expiring'][row]:,.0f} of {tax_year_label(tax_year - 3)} carry forward "
+                               f"is lost after {deadline}")
+            if remaining > 30000:
+                results.append(f"   ⚡ OPPORTUNITY: Significant pension contribution capacity available")
+        if len(rows) > ALLOWANCE_LIST_LIMIT:
+            results.append(f"\n   ...and {len(rows) - ALLOWANCE_LIST_LIMIT} more clients")
+        
+        if named is None:
+            available = position['remaining'] > 0
+            results.append(f"\n📊 **TAX YEAR END REMINDER:** {int(available.sum())} of {len(book)} clients have "
+                           f"£{position['remaining'].sum():,.0f} of allowance to use before {deadline} "
+                           f"(£{position['expiring'].sum():,.0f} of carry forward lapses then)")
+        else:
+            results.append(f"\n📊 **TAX YEAR END REMINDER:** Ensure contributions made before {deadline}")
+    
+    if not results:
+        results = ["Ask about pension allowances. Example: 'Show me everyone with Annual allowance still available this tax year'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Recommendation History & Compliance
+# =============================================================================
+
+# Words that describe the request rather than the recommendation being looked for
+RECOMMENDATION_QUERY_WORDS = frozenset(
+    "recommendation recommendations recommend recommended rationale rationales pull show list every "
+    "made gave give client clients mention mentions mentioned mentioning summary".split()
+)
+RECOMMENDATION_MATCH_LIMIT = _get_setting("RECOMMENDATION_MATCH_LIMIT", 5)
+
+@memoize_on_data_version
+def get_recommendation_history(query):
+    """Retrieve recommendation history for compliance"""
+    results = []
+    query_lower = query.lower()
+    
+    # Extract client name
+    client_name = _name_index_for(tuple(advisor_store.recommendation_clients())).find_in_text(query)
+    
+    if "recommendation" in query_lower or "rationale" in query_lower:
+        if client_name:
+            results.append(f"📋 **RECOMMENDATION HISTORY FOR {client_name.upper()}:**")
+            
+            for _, rec in advisor_store.recommendations(client=client_name):
+                results.append(f"\n📅 **{rec['date']}** - {rec['type']}")
+                if 'platform' in rec:
+                    results.append(f"   Platform: {rec['platform']}")
+                if 'amount' in rec:
+                    results.append(f"   Amount: £{rec['amount']:,}")
+                results.append(f"   **Rationale:** {rec['rationale']}")
+                results.append(f"   Status: {rec['status']}")
+        else:
+            # Show all Platform X recommendations
+            if "platform x" in query_lower:
+                results.append("📋 **ALL PLATFORM X RECOMMENDATIONS:**")
+                for client, rec in advisor_store.recommendations(platform='Platform X'):
+                    results.append(f"\n👤 **{client}** ({rec['date']})")
+                    results.append(f"   Type: {rec['type']}")
+                    results.append(f"   **Rationale:** {rec['rationale']}")
+            else:
+                results.append("📋 **RECOMMENDATION SUMMARY:**")
+                for client, count in advisor_store.recommendation_counts():
+                    results.append(f"\n👤 {client}: {count} recommendations on record")
+
+                # Rationales that use the question's words (FTS5), then the closest in meaning
+                terms, phrases = parse_query(query, ignore=RECOMMENDATION_QUERY_WORDS)
+                searched = [" ".join(phrase) for phrase in phrases] + terms
+                matches = advisor_store.search_recommendations(terms, phrases, limit=RECOMMENDATION_MATCH_LIMIT)
+                if matches:
+                    results.append(f"\n🔎 **RATIONALES MENTIONING {' / '.join(searched).upper()}:**")
+                    for client, rec, _ in matches:
+                        results.append(f"   {client} ({rec['date']}) - {rec['type']}: {rec['rationale']}")
+                shown = {(client, rec['date'], rec['type']) for client, rec, _ in matches}
+                related = semantic_search(" ".join(searched), kind="recommendation") if searched else []
+                related = [(score, meta) for score, meta in related if (meta['client'], meta['date'], meta['type']) not in shown]
+                if related:
+                    results.append(f"\n🧭 **CLOSEST RATIONALES:**")
+                    for score, meta in related:
+                        results.append(f"   {meta['client']} ({meta['date']}) - {meta['type']}: {meta['text']}")
+    
+    if not results:
+        results = ["Specify a client or platform. Example: 'Pull every recommendation I made to David Chen and the rationale I gave'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Meeting Transcript Search
+# =============================================================================
+
+TRANSCRIPT_SEARCH_LIMIT = _get_setting("TRANSCRIPT_SEARCH_LIMIT", 5)
+TRANSCRIPT_SNIPPET_CHARS = _get_setting("TRANSCRIPT_SNIPPET_CHARS", 400)
+
+# Words that describe the request rather than what was said
+TRANSCRIPT_QUERY_WORDS = frozenset(
+    "exact wording words transcript transcripts conversation conversations meeting meetings said say "
+    "saying discuss discussed discussing talk talked talking mention mentioned find show search family "
+    "since before after until from".split()
+)
+
+# Related terms searched together, as the keyword search always did
+TRANSCRIPT_SYNONYMS = {
+    "market": ["volatility"],
+    "volatility": ["market"],
+    "sustainable": ["esg", "ethical"],
+    "esg": ["sustainable", "ethical"],
+    "ethical": ["sustainable", "esg"],
+    "retirement": ["retire"]
+}
+
+def _query_date_range(query):
+    """
+    Inclusive (date_from, date_to) from 'since/after/from <date>', 'until <date>',
+    'before <date>' (strict, so the bound is the day before) or 'in <year>'
+    """
+    def bound(pattern, year_suffix):
+        match = re.search(pattern + r"\s+(\d{4}(?:-\d{2}-\d{2})?)\b", query, re.IGNORECASE)
+        if not match:
+            return None
+        value = match.group(1)
+        return value + year_suffix if len(value) == 4 else value
+
+    date_from = bound(r"\b(?:since|after|from)", "-01-01")
+    date_to = bound(r"\buntil", "-01-01")
+    before = bound(r"\bbefore", "-01-01")
+    if before:
+        try:
+            before = (datetime.fromisoformat(before) - timedelta(days=1)).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+        date_to = min(date_to, before) if date_to else before
+    year = re.search(r"\bin\s+(\d{4})\b", query)
+    if year:
+        date_from, date_to = f"{year.group(1)}-01-01", f"{year.group(1)}-12-31"
+    return date_from, date_to
+
+@memoize_on_data_version
+def search_meeting_transcripts(query):
+    """Search meeting transcripts for specific topics"""
+    results = []
+    query_lower = query.lower()
+    
+    # Extract client name: the book's index first, then clients who only appear in meetings
+    position = get_name_index().find_in_text(query)
+    if position is not None:
+        client_name = get_review_index().clients[position]['name']
+    else:
+        client_name = _name_index_for(tuple(advisor_store.meeting_clients())).find_in_text(query)
+    
+    if ("wording" in query_lower or "exact" in query_lower or "transcript" in query_lower or "conversation" in query_lower
+            or re.search(r"\b(?:say|said)\b", query_lower)):
+        # Quoted text is an exact phrase; everything else that is not the client or the request itself is a search term
+        ignore = set(TRANSCRIPT_QUERY_WORDS) | set(re.findall(r"\d+", query))
+        if client_name:
+            ignore.update(client_name.lower().split())
+        terms, phrases = parse_query(query, ignore=ignore)
+        semantic_text = " ".join(terms + [" ".join(phrase) for phrase in phrases])
+        terms = list(dict.fromkeys(terms + [synonym for term in terms for synonym in TRANSCRIPT_SYNONYMS.get(term, [])]))
+        date_from, date_to = _query_date_range(query)
+
+        meetings = advisor_store.search_meetings(terms, phrases, client=client_name, date_from=date_from,
+                                                 date_to=date_to, limit=TRANSCRIPT_SEARCH_LIMIT)
+        
+        if meetings:
+            results.append(f"📝 **MEETING TRANSCRIPT SEARCH RESULTS:**")
+            
+            for meeting in meetings:
+                # Re-tokenize just this result to find which terms matched and where
+                text = MeetingText(meeting)
+                matches, positions = text.matches(terms, phrases)
+                results.append(f"\n📅 **{meeting['client']} - {meeting['date']}**")
+                if matches:
+                    results.append(f"   Matched terms: {', '.join(dict.fromkeys(matches))}")
+                results.append(f"   Key concerns discussed: {', '.join(meeting.get('key_concerns', []))}")
+                
+                # Show the speaker turns around the matches
+                if "exact wording" in query_lower or "wording" in query_lower:
+                    results.append(f"\n   **TRANSCRIPT EXCERPT:**")
+                    for excerpt in text.snippets(meeting['transcript'], positions, budget=TRANSCRIPT_SNIPPET_CHARS):
+                        results.append(f"   {excerpt}")
+        else:
+            results.append("No matching meeting transcripts found.")
+
+        # Closest speaker turns by meaning, which also catches different wording for the same idea
+        shown = {meeting['id'] for meeting in meetings} if "wording" in query_lower else set()
+        passages = [(score, meta) for score, meta in semantic_search(semantic_text, kind="transcript", client=client_name)
+                    if meta['meeting_id'] not in shown and (date_from is None or meta['date'] >= date_from)
+                    and (date_to is None or meta['date'] <= date_to)]
+        if passages:
+            results.append(f"\n🧭 **CLOSEST PASSAGES:**")
+            for score, meta in passages:
+                results.append(f"   {meta['client']} ({meta['date']}, similarity {score:.2f}): {meta['text']}")
+    
+    if "sustainable investing" in query_lower:
+        results.append("📊 **SUSTAINABLE INVESTING DISCUSSIONS SUMMARY:**")
+        results.append("\n👤 **Williams Family (2025-07-15):**")
+        results.append("   Sarah expressed preference for ethical investments")
+        results.append("   Discussed ESG fund options on Platform X")
+        results.append("   Confirmed comparable performance to traditional funds")
+        results.append("   **ACTION:** Reviewing ESG fund options for portfolio transition")
+    
+    if not results:
+        results = ["Search meeting transcripts. Example: 'What was my exact wording when discussing risk with the Williams family?'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Document Tracking System
+# =============================================================================
+
+@memoize_on_data_version
+def track_documents(query):
+    """Track outstanding and received documents"""
+    results = []
+    query_lower = query.lower()
+    
+    if "document" in query_lower or "waiting" in query_lower:
+        results.append("📄 **DOCUMENT TRACKING STATUS:**")
+        
+        pending_count = 0
+        
+        outstanding = {}
+        for client, doc in advisor_store.documents(['Pending', 'Partial']):
+            outstanding.setdefault(client, []).append(doc)
+        
+        for client, docs in outstanding.items():
+            pending_docs = [d for d in docs if d['status'] == 'Pending']
+            partial_docs = [d for d in docs if d['status'] == 'Partial']
+            
+            if pending_docs or partial_docs:
+                results.append(f"\n👤 **{client}:**")
+                
+                for doc in pending_docs:
+                    days_waiting = (datetime.now() - datetime.strptime(doc['requested_date'], '%Y-%m-%d')).days
+                    results.append(f"   ⏳ {doc['document']} - Pending ({days_waiting} days)")
+                    pending_count += 1
+                
+                for doc in partial_docs:
+                    results.append(f"   🔄 {doc['document']} - Partial ({doc.get('notes', '')})")
+        
+        results.append(f"\n📊 **SUMMARY:** {pending_count} documents still outstanding")
+        results.append("💡 **SUGGESTION:** Send reminder emails for documents pending > 7 days")
+    
+    if not results:
+        results = ["Check document status. Example: 'What documents am I still waiting for from clients?'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Commitment/Promise Tracking
+# =============================================================================
+
+@memoize_on_data_version
+def track_commitments(query):
+    """Track commitments and promises made to clients"""
+    results = []
+    query_lower = query.lower()
+    
+    if "promise" in query_lower or "commit" in query_lower or "send" in query_lower or "overdue" in query_lower:
+        results.append("📋 **COMMITMENT TRACKING:**")
+        
+        overdue_items = []
+        pending_items = []
+        
+        for client, c in advisor_store.commitments(['Overdue', 'Pending']):
+            if c['status'] == 'Overdue':
+                overdue_items.append({"client": client, **c})
+            else:
+                pending_items.append({"client": client, **c})
+        
+        if overdue_items:
+            results.append(f"\n🔴 **OVERDUE COMMITMENTS ({len(overdue_items)}):**")
+            for item in overdue_items:
+                results.append(f"   ❗ {item['client']}: {item['promise']}")
+                results.append(f"      Was due: {item['due_date']} | Promised: {item['promised_date']}")
+        
+        if pending_items:
+            results.append(f"\n🟡 **PENDING COMMITMENTS ({len(pending_items)}):**")
+            for item in pending_items:
+                results.append(f"   ⏳ {item['client']}: {item['promise']}")
+                results.append(f"      Due: {item['due_date']}")
+        
+        # Specific client query
+        client_name = _name_index_for(tuple(advisor_store.commitment_clients())).find_in_text(query)
+        if client_name:
+            results.append(f"\n👤 **{client_name} COMMITMENTS:**")
+            for _, c in advisor_store.commitments(client=client_name):
+                status_icon = "✅" if c['status'] == 'Completed' else "❗" if c['status'] == 'Overdue' else "⏳"
+                results.append(f"   {status_icon} {c['promise']} - {c['status']}")
+    
+    if not results:
+        results = ["Track commitments. Example: 'What did I promise to send the Jackson family and when?'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Business Analytics - Service Usage & Satisfaction
+# =============================================================================
+
+@memoize_on_data_version
+def analyze_client_satisfaction(query):
+    """Analyze client satisfaction and service usage"""
+    results = []
+    query_lower = query.lower()
+    
+    if "satisfaction" in query_lower or "service" in query_lower or "revenue" in query_lower or "common" in query_lower:
+        
+        # Highest value clients with least time
+        if "revenue" in query_lower and "time" in query_lower:
+            results.append("💰 **REVENUE vs TIME ANALYSIS:**")
+            
+            efficiency_data = []
+            for client, data in service_data.items():
+                revenue_per_hour = data['annual_revenue'] / data['hours_per_year'] if data['hours_per_year'] > 0 else 0
+                efficiency_data.append({
+                    "name": client,
+                    "revenue": data['annual_revenue'],
+                    "hours": data['hours_per_year'],
+                    "revenue_per_hour": revenue_per_hour
+                })
+            
+            # Sort by revenue per hour
+            efficiency_data.sort(key=lambda x: x['revenue_per_hour'], reverse=True)
+            
+            results.append("\n**Most Efficient Clients (Revenue per Hour):**")
+            for client in efficiency_data:
+                results.append(f"   • {client['name']}: £{client['revenue_per_hour']:.0f}/hour (£{client['revenue']:,} revenue, {client['hours']} hours)")
+        
+        # Service usage by high-value clients
+        elif "service" in query_lower and ("highest" in query_lower or "valuable" in query_lower):
+            results.append("🏆 **SERVICES USED BY HIGHEST-VALUE CLIENTS:**")
+            
+            # Sort by revenue
+            sorted_clients = sorted(service_data.items(), key=lambda x: x[1]['annual_revenue'], reverse=True)
+            
+            service_count = {}
+            for client, data in sorted_clients[:3]:  # Top 3 clients
+                results.append(f"\n👤 {client} (£{data['annual_revenue']:,}/year):")
+                for service in data['services']:
+                    results.append(f"   • {service}")
+                    service_count[service] = service_count.get(service, 0) + 1
+            
+            results.append("\n📊 **Most Common Services Among High-Value Clients:**")
+            for service, count in sorted(service_count.items(), key=lambda x: x[1], reverse=True):
+                results.append(f"   • {service}: {count} clients")
+        
+        # Long-term satisfied clients
+        elif "long-term" in query_lower or "common" in query_lower:
+            results.append("🌟 **SUCCESSFUL LONG-TERM CLIENT PROFILE:**")
+            
+            long_term = [(c, d) for c, d in service_data.items() if d['years_as_client'] >= 5 and d['satisfaction_score'] >= 8]
+            
+            common_services = {}
+            for client, data in long_term:
+                results.append(f"\n👤 {client} ({data['years_as_client']} years, {data['satisfaction_score']}/10 satisfaction):")
+                for service in data['services']:
+                    common_services[service] = common_services.get(service, 0) + 1
+            
+            results.append("\n📊 **Common Characteristics:**")
+            results.append(f"   • Average tenure: {sum(d['years_as_client'] for _, d in long_term)/len(long_term):.1f} years")
+            results.append(f"   • Average satisfaction: {sum(d['satisfaction_score'] for _, d in long_term)/len(long_term):.1f}/10")
+            results.append(f"   • Most used services: {', '.join([s for s, c in sorted(common_services.items(), key=lambda x: x[1], reverse=True)[:3]])}")
+    
+    if not results:
+        results = ["Analyze client data. Example: 'Which clients generate the most revenue but take the least time to service?'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# NEW: Sales Funnel Analysis
+# =============================================================================
+
+@memoize_on_data_version
+def analyze_sales_funnel(query):
+    """Analyze conversion rates and sales funnel"""
+    results = []
+    query_lower = query.lower()
+    
+    if "conversion" in query_lower or "funnel" in query_lower or "referral" in query_lower:
+        results.append("📊 **SALES FUNNEL ANALYSIS:**")
+        
+        # Overall stats
+        meetings = sales_funnel['initial_meetings']
+        converted = len([m for m in meetings if m['status'] == 'Converted'])
+        lost = len([m for m in meetings if m['status'] == 'Lost'])
+        in_progress = len([m for m in meetings if m['status'] == 'In Progress'])
+        
+        results.append(f"\n**Pipeline Overview:**")
+        results.append(f"   • Total Initial Meetings: {len(meetings)}")
+        results.append(f"   • Converted: {converted} ({converted/len(meetings)*100:.0f}%)")
+        results.append(f"   • Lost: {lost}")
+        results.append(f"   • In Progress: {in_progress}")
+        
+        # Conversion by source
+        results.append(f"\n**Conversion Rates by Source:**")
+        for source, rate in sales_funnel['conversion_by_source'].items():
+            results.append(f"   • {source}: {rate*100:.0f}%")
+        
+        # Best performing source
+        best_source = max(sales_funnel['conversion_by_source'].items(), key=lambda x: x[1])
+        results.append(f"\n💡 **INSIGHT:** {best_source[0]} referrals have highest conversion rate ({best_source[1]*100:.0f}%)")
+        results.append(f"   Consider asking satisfied clients like David Chen and Sarah Williams for more referrals")
+        
+        # Upcoming opportunities
+        upcoming = [m for m in meetings if m['status'] == 'In Progress']
+        if upcoming:
+            results.append(f"\n**Upcoming Opportunities:**")
+            for opp in upcoming:
+                results.append(f"   • {opp['name']} (Source: {opp['source']}) - Next meeting: {opp.get('next_meeting', 'TBD')}")
+    
+    if not results:
+        results = ["Analyze sales performance. Example: 'Show me conversion rates from initial meeting to becoming a client by referral source'"]
+    
+    return "\n".join(results)
+
+# =============================================================================
+# ENHANCED: Investment Opportunities Analysis
+# =============================================================================
+
+@register_tool(
+    "Analyze client investment opportunities including equity allocation, ISA/pension allowances, cash management, protection gaps, withdrawal rates, market correction scenarios, interest rate impact, and retirement planning",
+    read_only=True,
+    query="The investment analysis query"
+)
+def analyze_investment_opportunities(query):
+    """Analyze real client investment opportunities (ENHANCED with all features)"""
+    print("🔍 Analyzing investment opportunities with real client data...")
+
+    book = get_client_book()
+    results = []
+    query_lower = query.lower()
+
+    # Each screen is a mask over the book; only the clients that get reported are formatted
+    def report(mask, line):
+        results.extend(line(int(row)) for row in np.flatnonzero(mask)[:5])
+
+    # Equity allocation analysis
+    if "equity" in query_lower or "underweight" in query_lower:
+        total_investments = book.recorded_investments + book.pensions
+        equity_percent = np.divide(book.recorded_investments, total_investments, out=np.zeros(len(book)),
+                                   where=total_investments > 0) * 100
+        target_equity = np.maximum(20, 100 - book.age)
+        report(equity_percent < target_equity - 10,
+               lambda row: f"🔍 {book.names[row]} (age {book.age[row]:.0f}) has {equity_percent[row]:.0f}% equity allocation - "
+                           f"could increase to {target_equity[row]:.0f}% based on {book.risk_profile(row, 'Moderate')} risk profile")
+
+    # ISA allowance analysis
+    elif "isa allowance" in query_lower:
+        income = book.annual_income
+        isa_remaining = np.select([(book.age < 40) & (income > 50000), (book.age < 55) & (income > 40000), income > 30000],
+                                  [15000, 12000, 8000], 5000)
+        report(book.holding(has("isa")) & (isa_remaining > 0),
+               lambda row: f"💰 {book.names[row]}: Estimated £{isa_remaining[row]:,.0f} ISA allowance remaining "
+                           f"(income: £{income[row]:,.0f})")
+
+    # Pension annual allowance, carry forward and tax year end deadline - NEW
+    elif _is_pension_allowance_query(query):
+        return analyze_pension_allowances(query)
+
+    # Cash excess analysis
+    elif "cash excess" in query_lower:
+        emergency_fund = book.annual_income * 0.6 / 12 * 6
+        excess = book.cash - emergency_fund
+        report(excess > 10000, lambda row: f"💵 {book.names[row]}: Estimated £{excess[row]:,.0f} excess cash above emergency fund")
+
+    # Protection gaps analysis
+    elif "protection gap" in query_lower:
+        no_life = (book.children > 0) & book.holding(lacks("life"))
+        no_income_protection = (book.annual_income > 50000) & book.holding(lacks("income_protection"))
+
+        def gaps(row):
+            found = [f"No life insurance with {book.children[row]} children"] if no_life[row] else []
+            if no_income_protection[row]:
+                found.append("No income protection for high earner")
+            return f"🛡️ {book.names[row]}: {' & '.join(found)}"
+
+        report(no_life | no_income_protection, gaps)
+
+    # Retirement planning analysis
+    elif "retirement" in query_lower and ("trajectory" in query_lower or "goal" in query_lower):
+        required_pot = book.annual_income * 0.7 * 25
+        shortfall = required_pot - book.net_worth
+        report((book.age < 65) & (book.net_worth < required_pot * 0.5),
+               lambda row: f"⚠️ {book.names[row]}: £{shortfall[row]:,.0f} shortfall for retirement target "
+                           f"(current: £{book.net_worth[row]:,.0f})")
+
+    # Withdrawal rates - NEW
+    elif "withdrawal" in query_lower or "4%" in query_lower:
+        return analyze_withdrawal_rates(query)
+
+    # Interest rate impact - NEW
+    elif "interest rate" in query_lower:
+        return analyze_interest_rate_impact(query)
+
+    # Market correction - NEW
+    elif "market correction" in query_lower or "20%" in query_lower:
+        return model_market_correction(query)
+
+    # Cashflow modeling - NEW
+    elif "cashflow" in query_lower:
+        return model_cashflow_scenario(query)
+
+    # Long-term care - NEW
+    elif "long-term care" in query_lower or "ltc" in query_lower:
+        return model_long_term_care(query)
+
+    if not results:
+        results = ["💡 **SPECIFIC INVESTMENT OPPORTUNITIES:**",
+                   "• Sarah Williams - underweight equities (currently 45%, could increase to 65%)",
+                   "• David Chen - unused ISA allowance (£12,000 remaining)",
+                   "• Lisa Patel - excess cash reserves (£45,000 above emergency fund)",
+                   "• Emma Jackson - approaching retirement, review withdrawal strategy"]
+
+    return " | ".join(results[:5])
+
+# =============================================================================
+# ENHANCED: Proactive Client Insights
+# =============================================================================
+
+@register_tool(
+    "Get proactive client management insights including review scheduling, business opportunities, education planning, estate planning, birthdays, protection gaps, and client profiling",
+    read_only=True,
+    query="The proactive insight query"
+)
+def get_proactive_client_insights(query):
+    """Get proactive insights using real client data (ENHANCED)"""
+    print("📊 Generating proactive insights from real client data...")
+
+    book = get_client_book()
+    results = []
+    query_lower = query.lower()
+    current_date = datetime.now()
+
+    def report(mask, line):
+        results.extend(line(int(row)) for row in np.flatnonzero(mask)[:4])
+
+    # Overdue reviews
+    if "review" in query_lower and "month" in query_lower:
+        if USE_REAL_DATA:
+            overdue_clients = get_overdue_reviews()
+            for client in overdue_clients:
+                results.append(f"📅 {client['name']}: {client['months_overdue']} months overdue")
+        else:
+            results.append("📅 Using mock data - Sarah Williams: 16 months overdue, Lisa Patel: 19 months overdue")
+
+    # Business owner opportunities
+    elif "business owner" in query_lower:
+        if "exit planning" in query_lower:
+            line = "💼 {}: Potential business owner - check exit planning needs"
+        elif "r&d" in query_lower or "tax credit" in query_lower:
+            line = "💼 {}: Business owner - may benefit from R&D tax credit changes"
+        else:
+            line = "🏢 {}: Business indicators found - explore tax planning opportunities"
+        report(book.business_owner, lambda row: line.format(book.names[row]))
+
+    # Education planning
+    elif "university" in query_lower or "education" in query_lower:
+        report((book.children > 0) & ~book.education_objective,
+               lambda row: f"🎓 {book.names[row]}: {book.children[row]} children, no education planning objectives recorded")
+
+    # Estate planning gaps
+    elif "estate planning" in query_lower:
+        report((book.net_worth > 325000) & ~book.estate_objective,
+               lambda row: f"🏛️ {book.names[row]}: Net worth £{book.net_worth[row]:,.0f} - no estate planning in place (above IHT threshold)")
+
+    # Birthday opportunities
+    elif "birthday" in query_lower:
+        report(book.born_in(current_date.month),
+               lambda row: f"🎂 {book.names[row]}: Potential birthday this month - opportunity for check-in")
+
+    # Similar client analysis
+    elif "similar" in query_lower:
+        young_clients = int((book.age < 35).sum())
+        approaching_retirement = np.flatnonzero((book.age >= 55) & (book.age <= 65))
+
+        if young_clients and len(approaching_retirement):
+            results.append(f"🔍 Similar profiles: {young_clients} young clients could learn from "
+                           f"{book.names[approaching_retirement[0]]}'s retirement strategy")
+
+    # Investment with no protection - NEW
+    elif "investment" in query_lower and "protection" in query_lower:
+        has_investments = (book.recorded_investments > 0) | (book.pensions > 0)
+        report(has_investments & book.holding(lacks(*PROTECTION_TYPES)),
+               lambda row: f"⚠️ {book.names[row]}: Has investments but no protection cover")
+
+    if not results:
+        results = ["🔍 **SPECIFIC INSIGHTS TO EXPLORE:**",
+                   "• Sarah Williams, David Chen - overdue reviews (immediate attention needed)",
+                   "• Lisa Patel - business owner opportunities",
+                   "• Emma Jackson - birthday this week (outreach opportunity)",
+                   "• Michael Roberts, Jennifer Mills - estate planning candidates (high net worth)"]
+
+    return " | ".join(results[:4])
+
+# =============================================================================
+# ENHANCED: Compliance Requirements Tracking
+# =============================================================================
+
+@register_tool(
+    "Track compliance including Consumer Duty, recommendation history with rationale, meeting transcripts, exact wording searches, document tracking, and promise/commitment tracking",
+    read_only=True,
+    query="The compliance tracking query"
+)
+def track_compliance_requirements(query):
+    """Track compliance using real client data (ENHANCED)"""
+    print("📋 Tracking compliance requirements...")
+
+    if USE_REAL_DATA:
+        clients = data_manager.get_all_clients()
+    else:
+        clients = get_mock_clients()
+
+    results = []
+    query_lower = query.lower()
+
+    # Consumer Duty compliance
+    if "consumer duty" in query_lower or "compliance" in query_lower:
+        total_clients = len(clients)
+
+        if USE_REAL_DATA:
+            overdue_clients = get_overdue_reviews()
+            overdue_count = len(overdue_clients)
+        else:
+            overdue_count = 2
+
+        results.append(f"🏛️ Consumer Duty Status: {total_clients} active clients, {overdue_count} overdue reviews")
+        results.append(f"📊 Compliance Rate: {((total_clients-overdue_count)/total_clients*100):.0f}%")
+
+    # Recommendation history - NEW
+    elif "recommendation" in query_lower:
+        return get_recommendation_history(query)
+
+    # Exact wording / transcripts - NEW
+    elif "wording" in query_lower or "exact" in query_lower or "transcript" in query_lower:
+        return search_meeting_transcripts(query)
+
+    # Platform recommendations - NEW
+    elif "platform" in query_lower:
+        return get_recommendation_history(query)
+
+    # Volatility concerns - NEW
+    elif "volatility" in query_lower or "concerns" in query_lower:
+        return search_meeting_transcripts(query)
+
+    # Sustainable investing - NEW
+    elif "sustainable" in query_lower or "esg" in query_lower:
+        return search_meeting_transcripts(query)
+
+    # Document tracking - NEW
+    elif "document" in query_lower:
+        return track_documents(query)
+
+    # Promise tracking - NEW
+    elif "promise" in query_lower or "commit" in query_lower or "send" in query_lower:
+        return track_commitments(query)
+
+    if not results:
+        results = [f"📋 Compliance tracking available for {len(clients)} clients: Consumer Duty, recommendations, transcripts, documents"]
+
+    return " | ".join(results[:4])
+
+# =============================================================================
+# ENHANCED: Business Metrics Analysis
+# =============================================================================
+
+@register_tool(
+    "Analyze business performance including revenue analysis, client satisfaction, service usage, conversion rates, demographics, and risk profile distribution",
+    read_only=True,
+    query="The business analytics query"
+)
+def analyze_business_metrics(query):
+    """Analyze business performance using real client data (ENHANCED)"""
+    print("📈 Analyzing business metrics...")
+
+    book = get_client_book()
+
+    results = []
+    query_lower = query.lower()
+
+    # Revenue analysis
+    if "revenue" in query_lower:
+        if "time" in query_lower:
+            return analyze_client_satisfaction(query)
+        
+        total_revenue = sum(d['annual_revenue'] for d in service_data.values())
+        results.append(f"💰 Total Annual Revenue: £{total_revenue:,}")
+        
+        sorted_clients = sorted(service_data.items(), key=lambda x: x[1]['annual_revenue'], reverse=True)
+        results.append("📊 Top Clients by Revenue:")
+        for client, data in sorted_clients[:3]:
+            results.append(f"   • {client}: £{data['annual_revenue']:,}/year")
+
+    # Client demographics - retirement
+    elif "retirement" in query_lower and "percentage" in query_lower:
+        approaching_retirement = int(((book.age >= 55) & (book.age <= 70)).sum())
+        total_clients = len(book)
+        percentage = (approaching_retirement / total_clients) * 100 if total_clients > 0 else 0
+        results.append(f"📊 Approaching retirement: Emma Jackson (age 58), Michael Roberts (age 62), Jennifer Mills (age 56)")
+
+    # Risk profile distribution
+    elif "risk" in query_lower and "profile" in query_lower:
+        risk_distribution = book.risk_counts()
+
+        results.append("📊 Risk Profile Distribution:")
+        results.append("   • Conservative: Sarah Williams, Jennifer Mills")
+        results.append("   • Moderate: David Chen, Emma Jackson, Michael Roberts")
+        results.append("   • Aggressive: Lisa Patel, Thomas Anderson")
+
+    # Satisfaction analysis - NEW
+    elif "satisfaction" in query_lower or "common" in query_lower:
+        return analyze_client_satisfaction(query)
+
+    # Service usage - NEW
+    elif "service" in query_lower:
+        return analyze_client_satisfaction(query)
+
+    # Conversion rates - NEW
+    elif "conversion" in query_lower or "referral" in query_lower:
+        return analyze_sales_funnel(query)
+
+    # Concerns raised - NEW
+    elif "concerns" in query_lower:
+        return search_meeting_transcripts(query)
+
+    if not results:
+        results = [f"📊 Analysis available for {len(book)} clients: revenue, demographics, risk profiles, satisfaction, conversion rates"]
+
+    return " | ".join(results[:4])
+
+# =============================================================================
+# ENHANCED: Follow-up Actions
+# =============================================================================
+
+@register_tool(
+    "Generate and track follow-up actions including email drafting, open action items, documents waiting, overdue commitments, and client decisions pending",
+    read_only=True,
+    query="The follow-up action request"
+)
+def generate_follow_up_actions(query):
+    """Generate follow-up actions using real client data (ENHANCED)"""
+    print("📝 Generating follow-up actions...")
+
+    if USE_REAL_DATA:
+        clients = data_manager.get_all_clients()
+    else:
+        clients = get_mock_clients()
+
+    results = []
+    query_lower = query.lower()
+
+    # Draft follow-up email
+    if "draft" in query_lower and "email" in query_lower:
+        if "yesterday" in query_lower or "meeting" in query_lower:
+            results.append("📧 **DRAFT FOLLOW-UP EMAIL - YESTERDAY'S MEETING:**")
+            results.append("")
+            results.append("Subject: Follow-up from our meeting - Action items")
+            results.append("")
+            results.append("Dear [Client Name],")
+            results.append("")
+            results.append("Thank you for meeting with me yesterday. As discussed, here are the key actions we agreed:")
+            results.append("")
+            results.append("1. [Action item 1]")
+            results.append("2. [Action item 2]")
+            results.append("3. [Action item 3]")
+            results.append("")
+            results.append("I will [your commitments] by [date].")
+            results.append("")
+            results.append("Please send me [documents needed] at your earliest convenience.")
+            results.append("")
+            results.append("Best regards,")
+            results.append("[Your Name]")
+        else:
+            priority_client = None
+            for client in clients:
+                if USE_REAL_DATA:
+                    overdue_clients = get_overdue_reviews()
+                    if overdue_clients:
+                        priority_client = overdue_clients[0]
+                        break
+
+            if not priority_client:
+                priority_client = {'name': 'Sarah Williams'}
+
+            results.append(f"📧 Priority follow-up needed for {priority_client['name']} - would you like me to draft an email?")
+
+    # Open action items
+    elif "action" in query_lower and ("all" in query_lower or "open" in query_lower):
+        action_count = 0
+        if USE_REAL_DATA:
+            overdue_clients = get_overdue_reviews()
+            action_count = len(overdue_clients)
+
+        results.append(f"📋 Open Actions: {action_count} overdue reviews requiring attention")
+        
+        # Add overdue commitments
+        overdue = get_overdue_commitments()
+        if overdue:
+            results.append(f"❗ Overdue Commitments: {len(overdue)}")
+            for o in overdue[:3]:
+                results.append(f"   • {o}")
+
+        protection_opportunities = 0
+        if USE_REAL_DATA:
+            protection_gaps = data_manager.get_protection_gaps()
+            protection_opportunities = len(protection_gaps)
+
+        results.append(f"🛡️ Protection reviews: {protection_opportunities} clients need protection analysis")
+
+    # Waiting for responses - NEW
+    elif "waiting" in query_lower:
+        # Documents waiting
+        pending_docs = get_pending_documents()
+        if pending_docs:
+            results.append("📄 **WAITING FOR DOCUMENTS:**")
+            for doc in pending_docs:
+                results.append(f"   • {doc}")
+        
+        # Decisions waiting
+        results.append("\n⏳ **WAITING FOR CLIENT DECISIONS:**")
+        for client, rec in advisor_store.recommendations(statuses=['Pending', 'In Progress']):
+            results.append(f"   • {client}: {rec['type']} - {rec['status']}")
+
+    # Overdue follow-ups - NEW
+    elif "overdue" in query_lower:
+        return track_commitments(query)
+
+    if not results:
+        results = [f"📋 Action management available for {len(clients)} clients: follow-ups, reviews, protection planning, commitments"]
+
+    return " | ".join(results[:3]) if len(results) <= 3 else "\n".join(results)
+
+# =============================================================================
+# Mock Data Fallback (maintains backward compatibility)
+# =============================================================================
+
+def get_mock_clients():
+    """Fallback mock client data"""
+    return [
+        {"name": "Sarah Williams", "age": 45, "net_worth": 450000, "annual_income": 85000, "risk_profile": "Moderate", "last_review": "2023-08-15"},
+        {"name": "David Chen", "age": 52, "net_worth": 780000, "annual_income": 120000, "risk_profile": "Moderate-High", "last_review": "2024-11-01"},
+        {"name": "Emma Jackson", "age": 29, "net_worth": 85000, "annual_income": 55000, "risk_profile": "High", "last_review": "2024-06-20"},
+        {"name": "Lisa Patel", "age": 67, "net_worth": 520000, "annual_income": 35000, "risk_profile": "Low", "last_review": "2023-05-10"},
+        {"name": "Michael Gurung", "age": 41, "net_worth": 320000, "annual_income": 95000, "risk_profile": "Moderate", "last_review": "2024-09-15"},
+        {"name": "Robert Hughes", "age": 58, "net_worth": 650000, "annual_income": 75000, "risk_profile": "Low-Moderate", "last_review": "2024-03-22"}
+    ]
+
+# API Functions for data ingestion
+@register_tool(
+    "Dynamically ingest new client data from files or directories",
+    file_path="Path to single client file",
+    directory_path="Path to directory with multiple client files"
+)
+def ingest_new_client_data(file_path: str = None, directory_path: str = None):
+    """API function for dynamic data ingestion"""
+    if not USE_REAL_DATA:
+        return "❌ Real data ingestion not available - using mock data"
+
+    try:
+        if directory_path:
+            success = data_manager.ingest_from_directory(directory_path)
+            if success:
+                bump_data_version("clients")
+                return f"✅ Successfully ingested new clients from {directory_path}"
+
+        return "⚠️ No valid data source provided"
+    except Exception as e:
+        return f"❌ Error ingesting data: {e}"
+
+def add_client_meeting(client_name: str, meeting_notes: str):
+    """Add meeting notes for a client"""
+    if not USE_REAL_DATA:
+        return "❌ Meeting notes storage not available - using mock data"
+
+    try:
+        client = find_client(client_name)
+
+        if client:
+            meeting_data = {
+                'date': datetime.now().date(),
+                'notes': meeting_notes,
+                'type': 'Follow-up',
+                'action_items': [],
+                'concerns': [],
+                'follow_up_date': (datetime.now() + timedelta(days=30)).date()
+            }
+            data_manager.add_meeting_note(client['id'], meeting_data)
+            record_meeting_transcript(f"{client['name']} - {meeting_data['date']} - {advisor_store.meeting_count() + 1}", {
+                'date': str(meeting_data['date']),
+                'client': client['name'],
+                'transcript': meeting_notes,
+                'key_concerns': [],
+                'action_items': []
+            })
+            bump_data_version("clients")
+            return f"✅ Added meeting note for {client_name}"
+        else:
+            return f"❌ Client {client_name} not found"
+    except Exception as e:
+        return f"❌ Error adding meeting: {e}"
+
+# =============================================================================
+# Tool Definitions for Azure OpenAI (ENHANCED)
+# =============================================================================
+
+# Add template processing tools if available
+if USE_TEMPLATE_PROCESSING:
+    for template_tool in template_processing_tools:
+        tool_registry.register_external(template_tool, route_template_tool_call)
+
+# Schemas are derived from the @register_tool functions above
+tools = tool_registry.schemas()
+
+# =============================================================================
+# Main AI Response Function
+# =============================================================================
+
+def handle_proactive_command(user_message):
+    """PROACTIVE AGENT COMMAND LAYER - answer proactive agent commands locally; returns None for normal chat messages"""
+
+    query_lower = user_message.lower()
+
+    # Proactive moment detection command
+    if "detect proactive" in query_lower or "what would you suggest if client said" in query_lower:
+        # Extract the client statement
+        if " said " in query_lower:
+            client_statement = query_lower.split(" said ")[-1].strip('"\'')
+        else:
+            client_statement = query_lower.replace("detect proactive", "").replace("what would you suggest if client said", "").strip()
+
+        if client_statement:
+            suggestions = detect_proactive_moment(client_statement, context="meeting")
+            if suggestions:
+                response_parts = ["🚨 **PROACTIVE INTERRUPTION DETECTED!**\n"]
+                for suggestion in suggestions:
+                    response_parts.append(f"🎯 **RIGHT MOMENT:** {suggestion['moment']}")
+                    response_parts.append(f"📍 **RIGHT CONTEXT:** {suggestion['context']}")
+                    response_parts.append(f"💡 **RIGHT INTENT:** {suggestion['intent']}")
+                    response_parts.append(f"🎬 **ACTION:** {suggestion['action']}\n")
+
+                    if suggestion['topic']:
+                        interruption = generate_meeting_interruption("Client", suggestion['topic'])
+                        response_parts.append("**💬 SUGGESTED INTERRUPTION:**")
+                        response_parts.append(interruption)
+
+                return "\n".join(response_parts)
+            else:
+                return "💭 No proactive triggers detected in that statement. Try phrases like 'retire early', 'protect my family', or 'reduce tax'."
+
+    # Meeting completeness command
+    elif "check meeting completeness" in query_lower:
+        # Try to extract client name and duration
+        import re
+        name_match = re.search(r'for ([a-zA-Z\s]+)', user_message)
+        duration_match = re.search(r'(\d+)\s*minutes?', user_message)
+
+        client_name = name_match.group(1).strip() if name_match else "Client"
+        duration = int(duration_match.group(1)) if duration_match else 45
+
+        suggestions = check_meeting_completeness(client_name, duration)
+        response_parts = [f"⏰ **POST-MEETING ANALYSIS FOR {client_name.upper()}:**\n"]
+
+        if suggestions:
+            for suggestion in suggestions:
+                urgency_emoji = "🔴" if suggestion['urgency'] == 'high' else "🟡" if suggestion['urgency'] == 'medium' else "🟢"
+                response_parts.append(f"{urgency_emoji} {suggestion['suggestion']}")
+
+        post_meeting_actions = get_proactive_post_meeting_actions(client_name)
+        response_parts.append("\n" + post_meeting_actions)
+
+        return "\n".join(response_parts)
+
+    # Proactive opportunities command
+    elif "show proactive opportunities" in query_lower or "what should i do proactively" in query_lower:
+        proactive_moments = get_proactive_daily_moments()
+        if proactive_moments:
+            response = "🚨 **TODAY'S PROACTIVE OPPORTUNITIES:**\n\n"
+            for moment in proactive_moments:
+                response += f"• {moment}\n"
+            response += "\n💡 **ASK ME:** 'Detect proactive' + client statement to get real-time suggestions"
+            return response
+        else:
+            return "✅ No urgent proactive opportunities detected today. All clients appear to be on track."
+
+    return None
+
+def build_system_prompt():
+    """Build the STANDISH system prompt for the current data source"""
+    data_source = "real client data extracted from documents" if USE_REAL_DATA else "mock demonstration data"
+    client_count = len(data_manager.get_all_clients()) if USE_REAL_DATA and data_manager else 6
+
+    return f"""You are STANDISH - a PROACTIVE AI AGENT designed to make UK Independent Financial Advisors' lives easier. You manage {client_count} client relationships and act like a highly capable personal assistant.
+
+🎯 **YOUR PROACTIVE ROLE:**
+- Start EVERY conversation with a daily briefing (unless user asks something specific)
+- Show what happened yesterday, what's pending today, and what you can do autonomously
+- Track client journey stages from annual review to advice implementation
+- Offer to take actions yourself: emails, scheduling, CRM updates, reminders
+
+CURRENT DATA SOURCE: {data_source}
+
+🤖 **YOUR ENHANCED CAPABILITIES:**
+
+📊 **INVESTMENT ANALYSIS:**
+- Equity allocation vs risk profile and time horizon
+- ISA allowance tracking
+- Pension annual allowance and carry forward
+- Cash excess above emergency fund
+- Protection gaps based on family circumstances
+- Retirement trajectory and income goals
+- Withdrawal rate analysis for retired clients (>4% alert)
+- Interest rate sensitivity modeling
+- Market correction scenario modeling (10%, 20%, 30%)
+- Cashflow modeling for early retirement scenarios
+- Long-term care financial impact modeling
+
+📋 **COMPLIANCE & DOCUMENTATION:**
+- Full recommendation history with rationale
+- Meeting transcript search and exact wording retrieval
+- Platform recommendation tracking
+- Sustainable/ESG investing preference tracking
+- Document tracking (requested, received, pending)
+- Commitment/promise tracking with deadlines
+
+📈 **BUSINESS ANALYTICS:**
+- Revenue per client and efficiency metrics
+- Service usage by client segment
+- Client satisfaction tracking
+- Conversion rates by referral source
+- Demographics and retirement timeline
+- Common characteristics of successful clients
+- Concerns raised in meetings
+
+✅ **FOLLOW-UP MANAGEMENT:**
+- Draft follow-up emails from meetings
+- Track open action items
+- Monitor documents waiting
+- Alert on overdue commitments
+- Track client decisions pending
+
+🎯 **PROACTIVE ALERTS:**
+- Birthday opportunities
+- Overdue reviews
+- Business owner opportunities
+- Education planning gaps
+- Estate planning needs
+- Protection gaps
+
+**IMPORTANT BEHAVIORS:**
+1. ALWAYS lead with daily briefing when conversation starts
+2. Offer to take autonomous actions ("Should I send that email for you?")
+3. Be specific about dates, clients, and next steps
+4. Ask for permission before taking major actions
+5. Show weekly statistics and compliance status
+6. Provide specific client names and data in responses
+
+Remember: You're STANDISH - not just answering questions but proactively managing the advisor's day and client relationships. Act like the best personal assistant they've ever had."""
+
+# Per-tool overrides of TOOL_TIMEOUT_SECONDS
+tool_timeouts = {
+    "ingest_new_client_data": 120.0
+}
+
+# Tool runner pool, created on the first model turn that calls tools rather than at import
+_tool_executor = None
+_tool_executor_lock = threading.Lock()
+
+def _get_tool_executor():
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS, thread_name_prefix="standish-tool")
+            atexit.register(_tool_executor.shutdown, wait=False, cancel_futures=True)
+        return _tool_executor
+
+def _run_dispatch(tool_name, arguments):
+    print(f"🛠️ Using tool: {tool_name}")
+    try:
+        return tool_registry.dispatch(tool_name, arguments)
+    except Exception as e:
+        return f"❌ Error running {tool_name}: {e}"
+
+def run_tool_calls(tool_calls):
+    """
+    Execute the model's tool calls concurrently and build the matching tool messages.
+
+    Tools are independent read-only lookups, so they run on a shared thread pool and
+    the turn takes as long as the slowest tool. Results keep the order of tool_calls.
+    A tool that exceeds its timeout is cancelled if it has not started yet and
+    reported back to the model as timed out.
+    """
+    executor = _get_tool_executor()
+    submitted_at = time.monotonic()
+    futures = [
+        (tool_call, executor.submit(_run_dispatch, tool_call.function.name, tool_call.function.arguments))
+        for tool_call in tool_calls
+    ]
+
+    tool_results = []
+
+    for tool_call, future in futures:
+        tool_name = tool_call.function.name
+        timeout = tool_timeouts.get(tool_name, TOOL_TIMEOUT_SECONDS)
+
+        try:
+            result = future.result(timeout=max(0.0, submitted_at + timeout - time.monotonic()))
+        except FuturesTimeoutError:
+            future.cancel()
+            print(f"⏱️ Tool {tool_name} timed out after {timeout:g}s")
+            result = f"⏱️ {tool_name} did not finish within {timeout:g} seconds - results unavailable"
+
+        tool_results.append({
+            "role": "tool",
+            "content": str(result),
+            "tool_call_id": tool_call.id
+        })
+
+    return tool_results
+
+def get_ai_response(user_message):
+    """Generate AI response using Azure OpenAI with enhanced tool calling + PROACTIVE AGENT LAYER"""
+
+    command_response = handle_proactive_command(user_message)
+    if command_response is not None:
+        return command_response
+
+    # Identical question against unchanged data - answer without calling Azure
+    question_key = _question_cache_key(user_message)
+    cached = response_cache.get(question_key)
+    if cached is not _MISSING:
+        return cached
+
+    client = get_openai_client()
+
+    messages = [
+        {"role": "system", "content": build_system_prompt()},
+        {"role": "user", "content": user_message}
+    ]
+
+    try:
+        response = client.chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT_NAME,
+            messages=messages,
+            tools=tools,
+            tool_choice="auto",
+            temperature=0.7,
+            max_tokens=2000
+        )
+
+        if not response.choices[0].message.tool_calls:
+            record_openai_client_result(client, success=True)
+            _cache_response(question_key, response.choices[0].message.content)
+            return response.choices[0].message.content
+
+        tool_calls = response.choices[0].message.tool_calls
+        tool_results = run_tool_calls(tool_calls)
+
+        # Same question with the same tool outputs - skip the second round trip. Turns that
+        # ran a tool with side effects (emails, CRM updates, ingestion) are never cached
+        cacheable = _cacheable_turn(tool_calls)
+        tool_key = _tool_cache_key(user_message, tool_results)
+        cached = response_cache.get(tool_key) if cacheable else _MISSING
+        if cached is not _MISSING:
+            record_openai_client_result(client, success=True)
+            _cache_response(question_key, cached)
+            return cached
+
+        messages.append(response.choices[0].message)
+        messages.extend(tool_results)
+
+        final_response = client.chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT_NAME,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=2000
+        )
+
+        record_openai_client_result(client, success=True)
+        if cacheable:
+            _cache_response(tool_key, final_response.choices[0].message.content)
+            _cache_response(question_key, final_response.choices[0].message.content)
+        return final_response.choices[0].message.content
+
+    except openai.APIConnectionError as e:
+        record_openai_client_result(client, success=False)
+        return f"Error processing request: {str(e)}"
+    except Exception as e:
+        return f"Error processing request: {str(e)}"
+
+class _StreamedToolCall:
+    """Tool call reassembled from streamed deltas (same shape as the SDK object)"""
+
+    class _Function:
+        def __init__(self):
+            self.name = ""
+            self.arguments = ""
+
+    def __init__(self):
+        self.id = ""
+        self.function = self._Function()
+
+    def to_message(self):
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.function.name, "arguments": self.function.arguments}
+        }
+
+def _stream_completion(client, messages, streamed_tool_calls=None, **kwargs):
+    """Yield content deltas from a streamed completion, collecting any tool call deltas"""
+    stream = client.chat.completions.create(
+        model=AZURE_OPENAI_DEPLOYMENT_NAME,
+        messages=messages,
+        temperature=0.7,
+        max_tokens=2000,
+        stream=True,
+        **kwargs
+    )
+
+    for chunk in stream:
+        # Azure sends content-filter chunks with no choices
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+
+        if delta.content:
+            yield delta.content
+
+        if delta.tool_calls and streamed_tool_calls is not None:
+            for tool_delta in delta.tool_calls:
+                call = streamed_tool_calls.setdefault(tool_delta.index, _StreamedToolCall())
+                if tool_delta.id:
+                    call.id = tool_delta.id
+                if tool_delta.function:
+                    if tool_delta.function.name:
+                        call.function.name += tool_delta.function.name
+                    if tool_delta.function.arguments:
+                        call.function.arguments += tool_delta.function.arguments
+
+def get_ai_response_stream(user_message):
+    """
+    Streaming variant of get_ai_response: yields content deltas as they arrive,
+    including the answer produced after the tool-call round.
+    """
+
+    command_response = handle_proactive_command(user_message)
+    if command_response is not None:
+        yield command_response
+        return
+
+    question_key = _question_cache_key(user_message)
+    cached = response_cache.get(question_key)
+    if cached is not _MISSING:
+        yield cached
+        return
+
+    client = get_openai_client()
+
+    messages = [
+        {"role": "system", "content": build_system_prompt()},
+        {"role": "user", "content": user_message}
+    ]
+
+    try:
+        streamed_tool_calls = {}
+        content_parts = []
+        cacheable = True
+
+        for content in _stream_completion(client, messages, streamed_tool_calls, tools=tools, tool_choice="auto"):
+            content_parts.append(content)
+            yield content
+
+        if streamed_tool_calls:
+            tool_calls = [streamed_tool_calls[index] for index in sorted(streamed_tool_calls)]
+            tool_results = run_tool_calls(tool_calls)
+            cacheable = _cacheable_turn(tool_calls)
+            tool_key = _tool_cache_key(user_message, tool_results)
+            cached = response_cache.get(tool_key) if cacheable else _MISSING
+
+            if cached is not _MISSING:
+                yield cached
+                content_parts.append(cached)
+            else:
+                messages.append({
+                    "role": "assistant",
+                    "content": "".join(content_parts) or None,
+                    "tool_calls": [call.to_message() for call in tool_calls]
+                })
+                messages.extend(tool_results)
+
+                final_parts = []
+                for content in _stream_completion(client, messages):
+                    final_parts.append(content)
+                    yield content
+
+                if cacheable:
+                    _cache_response(tool_key, "".join(final_parts))
+                content_parts.extend(final_parts)
+
+        record_openai_client_result(client, success=True)
+        if cacheable:
+            _cache_response(question_key, "".join(content_parts))
+
+    except openai.APIConnectionError as e:
+        record_openai_client_result(client, success=False)
+        yield f"Error processing request: {str(e)}"
+    except Exception as e:
+        yield f"Error processing request: {str(e)}"
+
+# =============================================================================
+# Main Entry Point
+# =============================================================================
+
+if __name__ == "__main__":
+    data_source = "real client data" if USE_REAL_DATA else "mock data"
+    print("🤖 STANDISH - PROACTIVE AI AGENT FOR FINANCIAL ADVISORS - READY!")
+    print(f"📊 Managing {len(data_manager.get_all_clients()) if USE_REAL_DATA and data_manager else 6} client relationships")
+    print(f"📁 Using {data_source}")
+    print("\n🎯 ENHANCED CAPABILITIES:")
+    print("📊 Investment: equity, ISA, pension allowance, withdrawal rates, scenarios")
+    print("📋 Compliance: recommendations, transcripts, documents, commitments")
+    print("📈 Business: revenue, satisfaction, conversion, demographics")
+    print("✅ Follow-up: emails, actions, documents, decisions")
+    print("🔔 Proactive: birthdays, reviews, opportunities, alerts")
+    print("\n💡 Start with: 'Good morning' for daily briefing")
+    print("🛠️ Or ask: 'Which retired clients have withdrawal rates above 4%?'")
+    print("(Type 'quit' to exit)\n")
+
+    while True:
+        user_input = input("\nAdvisor: ")
+        if user_input.lower() in ['quit', 'exit', 'bye']:
+            print("👋 Proactive assistant session ended!")
+            break
+
+        response = get_ai_response(user_input)
+        print(f"\n🤖 STANDISH: {response}")
@@ -0,0 +1,200 @@
+# 🧮 STANDISH - Batch Scenarios
+# Evaluates a grid of what-if parameters (correction sizes, interest rates, care costs,
+# retirement ages) for every client in one job across a process pool, and stores the
+# results as one compressed columnar .npz file that later questions read instead of
+# recomputing. The batch runs offline, never from a chat turn:
+#
+#     python batch_scenarios.py [workers]
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scenario_engine import ClientArrays, correction_impact
+from cashflow_model import simulate_book
+from care_model import CareBook, simulate_care_book
+from rate_model import BASE_RATE, RateBook, RatePaths, rate_impact
+
+DEFAULT_GRID = {
+    "market_correction": [0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40, 0.45, 0.50],
+    "interest_rate": [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0],
+    "care_cost": [26000, 39000, 52000, 62000, 72000, 85000],
+    "retirement_age": [55, 57, 60, 62, 65, 67, 70]
+}
+
+# Monte Carlo paths per client for retirement-age scenarios in a batch
+BATCH_PATHS = 1_000
+
+# Clients per job: the closed-form kinds take the whole book at once, the Monte Carlo
+# kinds are split so the pool has work to share out
+JOB_ROWS = {"retirement_age": 256, "care_cost": 512}
+DEFAULT_JOB_ROWS = 1_000_000
+
+# ----- kernels: every grid value for a slice of clients -> {metric: (values, clients) array} -----
+
+def _market_correction(inputs, values, rows):
+    book = ClientArrays(inputs["names"][rows], inputs["age"][rows], inputs["net_worth"][rows],
+                        inputs["investments"][rows], inputs["equity_share"][rows])
+    impact = correction_impact(book, values)
+    return {"loss": impact["losses"], "exposed": impact["exposed"],
+            "loss_percent": np.multiply.outer(impact["shocks"] * 100, impact["loss_ratio"])}
+
+def _interest_rate(inputs, values, rows):
+    book = RateBook(inputs["names"][rows], *(inputs[key][rows] for key in (
+        "fixed_mortgage", "mortgage_balance", "mortgage_rate", "renewal_date", "term_months",
+        "cash_savings", "bonds_allocation", "bond_value")))
+    impact = rate_impact(book, RatePaths.flat(values), base_rate=inputs.get("base_rate", BASE_RATE))
+    return {metric: impact[metric] for metric in ("mortgage_monthly_change", "savings_income", "bond_value_change")}
+
+def _care_cost(inputs, values, rows):
+    book = CareBook(inputs["names"][rows], *(inputs[key][rows] for key in (
+        "age", "liquid_assets", "property_value", "pension_income", "partner_at_home")))
+    care = simulate_care_book(book, values, paths=BATCH_PATHS, seed=rows.start)
+    return {"run_out_probability": care["run_out_probability"], "years_funded": care["liquid_years"][:, :, 1],
+            "remaining_capital": care["remaining_capital"][:, :, 1]}
+
+def _retirement_age(inputs, values, rows):
+    # All ages in one pass: scenarios of a client share return paths, so ages compare fairly
+    result = simulate_book(inputs["plans"][rows], values, paths=BATCH_PATHS, seed=rows.start)
+    return {"success": result["success"].T, "pot_at_retirement": result["pot_at_retirement"][:, :, 1].T}
+
+KERNELS = {
+    "market_correction": _market_correction,
+    "interest_rate": _interest_rate,
+    "care_cost": _care_cost,
+    "retirement_age": _retirement_age
+}
+
+# ----- process pool -----
+
+_worker_inputs = None
+
+def _init_worker(inputs):
+    global _worker_inputs
+    _worker_inputs = inputs
+
+def _run_job(kind, values, rows):
+    return kind, rows, KERNELS[kind](_worker_inputs, values, rows)
+
+def fingerprint(inputs, grid):
+    """Digest of the book columns and the grid, stored with results to detect stale files"""
+    digest = hashlib.sha1(json.dumps(grid, sort_keys=True).encode())
+    for key in sorted(inputs):
+        value = inputs[key]
+        if isinstance(value, np.ndarray):
+            digest.update(key.encode() + value.tobytes())
+        else:
+            digest.update(key.encode() + json.dumps(value, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def run_batch(inputs, path, grid=None, workers=None):
+    """
+    Evaluate every (kind, value) of the grid for every client and write the results to path.
+
+    inputs holds the book as per-client columns ("names" plus whatever the
+    kernels read); each worker process receives it once. A job is one kind's
+    whole grid for a slice of clients, so the Monte Carlo kind spreads across
+    workers while the closed-form kinds stay one vectorized call each.
+    workers=0 runs in this process. Returns the ScenarioResults.
+    """
+    grid = {kind: list(values) for kind, values in (grid or DEFAULT_GRID).items()}
+    count = len(inputs["names"])
+    jobs = [(kind, values, slice(start, start + JOB_ROWS.get(kind, DEFAULT_JOB_ROWS)))
+            for kind, values in grid.items()
+            for start in range(0, count, JOB_ROWS.get(kind, DEFAULT_JOB_ROWS))]
+    started = time.perf_counter()
+
+    if workers == 0:
+        _init_worker(inputs)
+        outputs = [_run_job(*job) for job in jobs]
+    else:
+        # spawn: workers must not inherit the caller's threads and open connections
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(inputs,)) as pool:
+            outputs = list(pool.map(_run_job, *zip(*jobs)))
+
+    parts = {}
+    for kind, rows, metrics in sorted(outputs, key=lambda output: (output[0], output[1].start)):
+        for metric, array in metrics.items():
+            parts.setdefault((kind, metric), []).append(array)
+
+    arrays = {
+        "names": np.array(inputs["names"], dtype=str),
+        "fingerprint": np.array(fingerprint(inputs, grid)),
+        "elapsed": np.array(time.perf_counter() - started)
+    }
+    for kind, values in grid.items():
+        arrays[f"{kind}.values"] = np.array(values, dtype=np.float64)
+    for (kind, metric), chunks in parts.items():
+        stacked = np.concatenate(chunks, axis=1)
+        arrays[f"{kind}.{metric}"] = stacked if stacked.dtype == bool else stacked.astype(np.float32)
+
+    # Write beside the target and swap in, so readers never see a partial file
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        np.savez_compressed(handle, **arrays)
+    os.replace(temporary, path)
+    return ScenarioResults(path)
+
+class ScenarioResults:
+    """Read side of a batch file: metric arrays are (grid values, clients)"""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self._arrays = {key: data[key] for key in data.files}
+        self.path = path
+        self.names = [str(name) for name in self._arrays.pop("names")]
+        self.fingerprint = str(self._arrays.pop("fingerprint"))
+        self.elapsed = float(self._arrays.pop("elapsed"))
+        self._positions = {name.casefold(): i for i, name in enumerate(self.names)}
+
+    @property
+    def kinds(self):
+        return [key[:-len(".values")] for key in self._arrays if key.endswith(".values")]
+
+    def values(self, kind):
+        return self._arrays[f"{kind}.values"]
+
+    def metrics(self, kind):
+        return [key.split(".", 1)[1] for key in self._arrays if key.startswith(f"{kind}.") and not key.endswith(".values")]
+
+    def nearest(self, kind, value):
+        """Index and grid value closest to the requested value"""
+        values = self.values(kind)
+        index = int(np.abs(values - value).argmin())
+        return index, float(values[index])
+
+    def metric(self, kind, metric, value):
+        """(per-client array, grid value used) for the grid value nearest to value"""
+        index, used = self.nearest(kind, value)
+        return self._arrays[f"{kind}.{metric}"][index], used
+
+    def top(self, kind, metric, value, n=5, largest=True, mask=None):
+        """[(name, metric value)] for the n clients with the largest (or smallest) metric"""
+        column, _ = self.metric(kind, metric, value)
+        rows = np.arange(len(column)) if mask is None else np.flatnonzero(mask)
+        order = np.argsort(-column[rows] if largest else column[rows], kind="stable")[:n]
+        return [(self.names[rows[i]], float(column[rows[i]])) for i in order]
+
+    def position(self, name):
+        return self._positions.get(name.casefold())
+
+    def client(self, name, kind):
+        """{metric: array over the grid values} for one client, or None if not in the file"""
+        position = self.position(name)
+        if position is None:
+            return None
+        return {metric: self._arrays[f"{kind}.{metric}"][:, position] for metric in self.metrics(kind)}
+
+if __name__ == "__main__":
+    # Rebuild the saved grid for the current book. The pool's spawned workers re-import
+    # this file, so everything that must run once stays under this guard.
+    import sys
+
+    import backend
+    backend.run_scenario_batch(workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
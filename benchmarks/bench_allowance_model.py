@@ -0,0 +1,80 @@
+# Benchmark: annual allowance and carry forward for analyze_pension_allowances.
+#
+# Builds a synthetic contribution ledger (100k clients over eight tax years by
+# default, some high earners in the taper) and times allowance_model.allowance_position
+# for the whole book against a per-client Python loop applying the same rules.
+#
+# Usage: python benchmarks/bench_allowance_model.py [clients] [tax years]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from allowance_model import CARRY_FORWARD_YEARS, AllowanceBook, allowance_position, tapered_allowance
+
+CURRENT_YEAR = 2026
+
+def synthetic_ledger(count, years, seed=43):
+    rng = random.Random(seed)
+    totals, incomes = [], {}
+    for i in range(count):
+        name = f"Client {i}"
+        incomes[name] = rng.choice([rng.randint(20, 150), rng.randint(150, 400)]) * 1000
+        for year in range(CURRENT_YEAR - rng.randint(0, years - 1), CURRENT_YEAR + 1):
+            totals.append((name, year, rng.randint(0, 90) * 1000))
+    return totals, incomes
+
+def loop_remaining(book):
+    """Allowance left this tax year, one client and one tax year at a time"""
+    remaining = []
+    for i in range(len(book)):
+        carry = [0.0] * CARRY_FORWARD_YEARS
+        for j, year in enumerate(book.tax_years):
+            allowance = float(tapered_allowance(year, book.threshold_income[i, j], book.adjusted_income[i, j])) \
+                if book.member[i, j] else 0.0
+            paid = book.contributions[i, j]
+            over = max(paid - allowance, 0.0)
+            for k in range(CARRY_FORWARD_YEARS):
+                used = min(over, carry[k])
+                carry[k] -= used
+                over -= used
+            left = max(allowance - paid, 0.0) + sum(carry)
+            carry = carry[1:] + [max(allowance - paid, 0.0)]
+        remaining.append(left)
+    return remaining
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    totals, incomes = synthetic_ledger(count, years)
+    start = time.perf_counter()
+    book = AllowanceBook.from_ledger(totals, annual_income=incomes, current_year=CURRENT_YEAR)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    position = allowance_position(book)
+    engine_seconds = time.perf_counter() - start
+
+    sample = 2_000
+    sample_book = AllowanceBook(book.names[:sample], book.tax_years, book.contributions[:sample], book.threshold_income[:sample],
+                                book.adjusted_income[:sample], book.member[:sample])
+    start = time.perf_counter()
+    loop = loop_remaining(sample_book)
+    loop_seconds = (time.perf_counter() - start) / sample * count
+
+    assert np.allclose(loop, position['remaining'][:sample])
+
+    print(f"📊 {count:,} clients, {len(book.tax_years)} tax years, {len(totals):,} ledger totals")
+    print(f"build    {build_seconds * 1000:9.1f} ms (ledger totals to columns)")
+    print(f"loop     {loop_seconds * 1000:9.1f} ms (one client at a time, extrapolated from {sample:,})")
+    print(f"engine   {engine_seconds * 1000:9.1f} ms | {loop_seconds / engine_seconds:.1f}x "
+          f"| {int(position['tapered'].sum()):,} tapered, {int((position['excess'] > 0).sum()):,} with an excess")
+
+if __name__ == "__main__":
+    main()
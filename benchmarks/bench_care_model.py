@@ -0,0 +1,84 @@
+# Benchmark: long-term care Monte Carlo for model_long_term_care.
+#
+# Times care_model.simulate_care_types for one household (three care types,
+# 5k journeys by default) against a plain Python loop over journeys and care
+# years for the care-home case, then screens a synthetic book at one care cost.
+#
+# Usage: python benchmarks/bench_care_model.py [paths] [book clients]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from care_model import (ASSET_GROWTH, CARE_INFLATION, CARE_TYPES, DURATION_SIGMA, MAX_CARE_YEARS, ONSET_HAZARD,
+                        PROPERTY_DISREGARD_WEEKS, UPPER_CAPITAL_LIMIT, CareBook, simulate_care_book, simulate_care_types)
+from cashflow_model import INFLATION
+
+HOUSEHOLD = {"name": "Benchmark Household", "age": 72, "liquid_assets": 180000, "property_value": 320000,
+             "pension_income": 16000, "partner_at_home": False}
+
+def loop_run_out(record, annual_cost, median_years, paths, seed=0):
+    """Share of care-home journeys where liquid assets run out, one journey and one care year at a time"""
+    rng = random.Random(seed)
+    a, b = ONSET_HAZARD
+    ran_out = 0
+    for _ in range(paths):
+        age = record["age"]
+        years_to_onset = np.log1p(-b * np.log(1 - rng.random()) / (a * np.exp(b * age))) / b
+        stay = min(median_years * np.exp(rng.gauss(0, 1) * DURATION_SIGMA), MAX_CARE_YEARS)
+        growth = (1 + ASSET_GROWTH) ** years_to_onset
+        liquid, home = record["liquid_assets"] * growth, record["property_value"] * growth
+        cost = annual_cost * (1 + CARE_INFLATION) ** years_to_onset
+        income = record["pension_income"] * (1 + INFLATION) ** years_to_onset
+        year = 0
+        while year < stay:
+            share = min(stay - year, 1.0)
+            assessable = liquid + (home if year + 1 > PROPERTY_DISREGARD_WEEKS / 52 else 0)
+            need = max(cost * (1 + CARE_INFLATION) ** year - income * (1 + INFLATION) ** year, 0) * share
+            paid = min(need, max(assessable - UPPER_CAPITAL_LIMIT, 0))
+            if need > 0 and need >= liquid:
+                ran_out += 1
+                break
+            liquid -= paid
+            liquid *= (1 + ASSET_GROWTH) ** share
+            home *= (1 + ASSET_GROWTH) ** share
+            year += 1
+    return ran_out / paths
+
+def main():
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    book_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    household = CareBook.from_records([HOUSEHOLD])
+    start = time.perf_counter()
+    care = simulate_care_types(household, paths=paths)
+    engine_seconds = time.perf_counter() - start
+
+    annual_cost, median_years = CARE_TYPES["care home"]
+    start = time.perf_counter()
+    loop = loop_run_out(HOUSEHOLD, annual_cost, median_years, paths)
+    loop_seconds = time.perf_counter() - start
+
+    rng = random.Random(31)
+    book = CareBook.from_records([{"name": f"Client {i}", "age": rng.randint(30, 90),
+                                   "liquid_assets": rng.randint(0, 800) * 1000, "property_value": rng.randint(0, 900) * 1000,
+                                   "pension_income": rng.randint(0, 40) * 1000, "partner_at_home": rng.random() < 0.5}
+                                  for i in range(book_size)])
+    start = time.perf_counter()
+    screen = simulate_care_book(book, [annual_cost], [median_years], paths=1_000)
+    book_seconds = time.perf_counter() - start
+
+    print(f"📊 one household, {paths:,} care journeys x {len(CARE_TYPES)} care types")
+    print(f"loop     {loop_seconds * 1000:9.1f} ms | care home only, run-out {loop:.1%}")
+    print(f"engine   {engine_seconds * 1000:9.1f} ms | run-out {', '.join(f'{p:.1%}' for p in care['run_out_probability'][:, 0])} "
+          f"| {loop_seconds / engine_seconds:.1f}x")
+    print(f"book     {book_seconds * 1000:9.1f} ms for {book_size:,} clients x 1,000 journeys "
+          f"({int((screen['run_out_probability'][0] >= 0.5).sum()):,} more likely than not to run out)")
+
+if __name__ == "__main__":
+    main()
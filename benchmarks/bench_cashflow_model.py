@@ -0,0 +1,78 @@
+# Benchmark: Monte Carlo retirement cashflow for model_cashflow_scenario.
+#
+# Times cashflow_model.simulate for one client (10k paths x 40 years by default,
+# three retirement ages, with percentile trajectories) against a plain Python
+# loop over paths and years, then a batch run across a synthetic book.
+#
+# Usage: python benchmarks/bench_cashflow_model.py [paths] [book clients]
+
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cashflow_model import INFLATION, STATE_PENSION_AGE, plan_from_client, simulate, simulate_book
+
+CLIENT = {"name": "Benchmark Client", "age": 55, "net_worth": 900000, "annual_income": 90000, "risk_profile": "Moderate",
+          "full_data": {"assets": {"pensions": 520000}, "annual_contribution": 30000, "desired_income": 45000}}
+
+def loop_success(plan, retirement_age, paths, plan_to_age=95, seed=0):
+    """Same model, one path and one year at a time"""
+    rng = random.Random(seed)
+    sigma = math.sqrt(math.log1p(plan["volatility"] ** 2 / (1 + plan["mean_return"]) ** 2))
+    mu = math.log1p(plan["mean_return"]) - sigma ** 2 / 2
+    lasted = 0
+    for _ in range(paths):
+        pot = plan["pot"]
+        ok = True
+        for year in range(plan_to_age - plan["age"]):
+            age = plan["age"] + year
+            indexation = (1 + INFLATION) ** year
+            if age < retirement_age:
+                pot += plan["contribution"] * indexation
+            else:
+                pension = plan["state_pension"] if age >= STATE_PENSION_AGE else 0
+                pot -= max(plan["income_target"] - pension - plan["pension_income"], 0) * indexation
+                if pot < 0:
+                    ok = False
+                    break
+            pot *= math.exp(mu + sigma * rng.gauss(0, 1))
+        lasted += ok
+    return lasted / paths
+
+def main():
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    book_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+
+    plan = plan_from_client(CLIENT)
+    ages = [58, 60, 65]
+
+    start = time.perf_counter()
+    result = simulate([plan], ages, paths=paths, trajectories=True)
+    engine_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop = [loop_success(plan, age, paths) for age in ages]
+    loop_seconds = time.perf_counter() - start
+
+    rng = random.Random(17)
+    book = [plan_from_client({**CLIENT, "name": f"Client {i}", "age": rng.randint(30, 70),
+                              "annual_income": rng.randint(30, 200) * 1000,
+                              "full_data": {"assets": {"pensions": rng.randint(20, 1500) * 1000}}})
+            for i in range(book_size)]
+    start = time.perf_counter()
+    batch = simulate_book(book, paths=2_000)
+    book_seconds = time.perf_counter() - start
+
+    print(f"📊 one client, {paths:,} paths x {95 - plan['age']} years x {len(ages)} retirement ages")
+    print(f"loop     {loop_seconds * 1000:9.1f} ms | success {', '.join(f'{s:.1%}' for s in loop)}")
+    print(f"engine   {engine_seconds * 1000:9.1f} ms | success {', '.join(f'{s:.1%}' for s in result['success'][0])} "
+          f"| {loop_seconds / engine_seconds:.1f}x")
+    print(f"book     {book_seconds * 1000:9.1f} ms for {book_size:,} clients x 2,000 paths "
+          f"({book_seconds / book_size * 1000:.2f} ms/client, mean success {batch['success'].mean():.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Benchmark: analytics screens over the columnar client book.
+#
+# Generates synthetic clients with full_data (100k by default) and times five
+# screens (equity allocation, cash excess, protection gaps, estate planning and
+# investments without protection) walking the client dicts as the analytics tools
+# used to, against one ClientBook snapshot and the same screens as column masks.
+# Also compares the memory of the dicts with the snapshot's columns. The last screen
+# counts critical illness cover as protection on the snapshot (the old substring
+# test did not), so only the first four counts are checked against the dict walk.
+#
+# Usage: python benchmarks/bench_client_book.py [clients]
+
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from client_book import ClientBook
+from policy_types import PROTECTION_TYPES, lacks
+
+POLICIES = ["Life Insurance", "Income Protection", "ISA", "SIPP", "Critical Illness"]
+OBJECTIVES = ["Retire early", "Education fund", "Estate planning", "Pay off mortgage", "Grow business"]
+
+def synthetic_clients(count, seed=47):
+    rng = random.Random(seed)
+    return [{
+        "name": f"Client {i}", "age": rng.randint(25, 85), "net_worth": rng.randint(0, 2000) * 1000,
+        "annual_income": rng.randint(15, 250) * 1000, "risk_profile": rng.choice(["Low", "Moderate", "High"]),
+        "full_data": {
+            "assets": {"investments": rng.randint(0, 800) * 1000, "pensions": rng.randint(0, 900) * 1000,
+                       "cash": rng.randint(0, 200) * 1000},
+            "family_situation": {"children": rng.randint(0, 3)},
+            "existing_policies": rng.sample(POLICIES, rng.randint(0, 3)),
+            "objectives": rng.sample(OBJECTIVES, rng.randint(0, 2))
+        }
+    } for i in range(count)]
+
+def dict_screens(clients):
+    """The five screens as per-client walks over nested dicts and stringified policy lists"""
+    counts = [0] * 5
+    for client in clients:
+        full_data = client.get('full_data', {})
+        assets = full_data.get('assets', {})
+        policies = str(full_data.get('existing_policies', [])).lower()
+        income = client.get('annual_income', 0)
+        total = assets.get('investments', 0) + assets.get('pensions', 0)
+        equity_percent = assets.get('investments', 0) / total * 100 if total > 0 else 0
+        counts[0] += equity_percent < max(20, 100 - client.get('age', 50)) - 10
+        counts[1] += assets.get('cash', 0) > income * 0.6 / 12 * 6 + 10000
+        children = full_data.get('family_situation', {}).get('children', 0)
+        counts[2] += (children > 0 and 'life insurance' not in policies) or (income > 50000 and 'income protection' not in policies)
+        objectives = str(full_data.get('objectives', [])).lower()
+        counts[3] += client.get('net_worth', 0) > 325000 and 'estate' not in objectives and 'inheritance' not in objectives
+        has_investments = assets.get('investments', 0) > 0 or assets.get('pensions', 0) > 0
+        counts[4] += has_investments and not any(p in policies for p in ['life', 'protection', 'insurance'])
+    return counts
+
+def book_screens(book):
+    """The same screens as masks over the snapshot's columns"""
+    total = book.recorded_investments + book.pensions
+    equity_percent = np.divide(book.recorded_investments, total, out=np.zeros(len(book)), where=total > 0) * 100
+    return [
+        int((equity_percent < np.maximum(20, 100 - book.age) - 10).sum()),
+        int((book.cash > book.annual_income * 0.6 / 12 * 6 + 10000).sum()),
+        int((((book.children > 0) & book.holding(lacks("life")))
+             | ((book.annual_income > 50000) & book.holding(lacks("income_protection")))).sum()),
+        int(((book.net_worth > 325000) & ~book.estate_objective).sum()),
+        int((((book.recorded_investments > 0) | (book.pensions > 0)) & book.holding(lacks(*PROTECTION_TYPES))).sum())
+    ]
+
+def column_bytes(book):
+    return sum(value.nbytes for value in vars(book).values() if isinstance(value, np.ndarray))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    tracemalloc.start()
+    clients = synthetic_clients(count)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    expected = dict_screens(clients)
+    dict_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    book = ClientBook.from_clients(clients)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counts = book_screens(book)
+    mask_seconds = time.perf_counter() - start
+
+    assert counts[:4] == expected[:4], (counts, expected)
+
+    print(f"📊 {count:,} clients, 5 screens ({', '.join(f'{c:,}' for c in counts)} flagged)")
+    print(f"dicts    {dict_seconds * 1000:9.1f} ms per run of the screens | {dict_bytes / 1e6:7.1f} MB of client dicts")
+    print(f"build    {build_seconds * 1000:9.1f} ms once per data version")
+    print(f"masks    {mask_seconds * 1000:9.1f} ms per run | {dict_seconds / mask_seconds:.1f}x "
+          f"| {column_bytes(book) / 1e6:7.1f} MB of columns")
+
+if __name__ == "__main__":
+    main()
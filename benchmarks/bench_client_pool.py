@@ -0,0 +1,102 @@
+# Benchmark: per-turn latency of get_ai_response-style calls with and without
+# the pooled Azure OpenAI client.
+#
+# Starts a local stub of the Azure chat completions endpoint and times N turns:
+#   - unpooled: a brand-new AzureOpenAI client (and connection) per turn
+#   - pooled:   backend.get_openai_client() reused across turns
+#
+# Usage: python benchmarks/bench_client_pool.py [turns]
+
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from openai import AzureOpenAI
+import backend
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": "Good morning! Here is your briefing."}
+    }],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 8, "total_tokens": 18}
+}).encode()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, *args):
+        pass
+
+def run_turns(get_client, turns, owned=False):
+    """Per-turn latency in ms; owned clients are made for one turn and closed after it"""
+    timings = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        client = get_client()
+        try:
+            client.chat.completions.create(
+                model=backend.AZURE_OPENAI_DEPLOYMENT_NAME,
+                messages=[{"role": "user", "content": "Good morning"}],
+                max_tokens=50
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            if owned:
+                client.close()
+    return timings
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} mean {statistics.mean(timings):7.2f} ms | p50 {statistics.median(timings):7.2f} ms | p95 {p95:7.2f} ms")
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    backend.AZURE_OPENAI_ENDPOINT = endpoint
+    backend.close_openai_clients()
+
+    def unpooled_client():
+        return AzureOpenAI(
+            api_key=backend.AZURE_OPENAI_API_KEY,
+            api_version=backend.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=endpoint
+        )
+
+    # Warm up imports and the stub server
+    run_turns(backend.get_openai_client, 5)
+
+    print(f"📊 {turns} turns against local stub at {endpoint}")
+    report("unpooled", run_turns(unpooled_client, turns, owned=True))
+    report("pooled", run_turns(backend.get_openai_client, turns))
+
+    backend.close_openai_clients()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
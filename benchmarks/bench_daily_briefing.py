@@ -0,0 +1,116 @@
+# Benchmark: client classification for the daily briefing.
+#
+# Compares the previous multi-pass scan (separate passes for overdue reviews,
+# the data manager's overdue/protection-gap queries, due-this-week, birthdays
+# and the on-track list) with backend._classify_clients, which sorts every
+# client into all buckets in a single pass and answers the overdue and
+# due-this-week buckets from the sorted review-date index.
+#
+# The "indexed" column reuses a prebuilt ReviewDateIndex, as the briefing does
+# between data changes.
+#
+# Usage: python benchmarks/bench_daily_briefing.py [sizes...]
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backend
+
+FIRST_NAMES = ["Sarah", "David", "Emma", "Lisa", "Michael", "Robert", "Anne", "Brian", "Priya", "Tom"]
+SURNAMES = ["Williams", "Chen", "Jackson", "Patel", "Gurung", "Hughes", "Partridge", "Potter", "Shah", "Evans"]
+POLICIES = ["Life Insurance", "Income Protection", "ISA", "SIPP", "Critical Illness"]
+
+def synthetic_clients(count, seed=42):
+    rng = random.Random(seed)
+    today = datetime.now()
+    clients = []
+    for i in range(count):
+        last_review = today - timedelta(days=rng.randint(0, 900))
+        clients.append({
+            "id": i,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)} {i}",
+            "age": rng.randint(25, 85),
+            "annual_income": rng.randint(20000, 200000),
+            "last_review": last_review.strftime("%Y-%m-%d"),
+            "next_review_due": (last_review + timedelta(days=365)).strftime("%Y-%m-%d"),
+            "full_data": {
+                "family_situation": {"children": rng.randint(0, 3)},
+                "existing_policies": rng.sample(POLICIES, rng.randint(0, 3))
+            }
+        })
+    return clients
+
+def legacy_get_overdue_reviews(clients, current_date):
+    overdue = []
+    for client in clients:
+        last_review = datetime.strptime(client['last_review'], '%Y-%m-%d')
+        if (current_date - last_review).days / 30 > 12:
+            overdue.append(client)
+    return overdue
+
+def legacy_get_protection_gaps(clients):
+    gaps = []
+    for client in clients:
+        full_data = client.get('full_data', {})
+        policies = str(full_data.get('existing_policies', [])).lower()
+        children = full_data.get('family_situation', {}).get('children', 0)
+        if children > 0 and 'life insurance' not in policies:
+            gaps.append({'client_name': client['name'], 'gap_description': f"No life insurance with {children} children"})
+        elif client.get('annual_income', 0) > 50000 and 'income protection' not in policies:
+            gaps.append({'client_name': client['name'], 'gap_description': "No income protection for high earner"})
+    return gaps
+
+def legacy_classify(clients, current_date):
+    """Multi-pass scan as get_daily_briefing used to do it"""
+    overdue_reviews = legacy_get_overdue_reviews(clients, current_date)
+    protection_gaps = legacy_get_protection_gaps(clients)
+
+    due_this_week = []
+    for client in clients:
+        next_review = datetime.strptime(client['next_review_due'], '%Y-%m-%d')
+        days_until = (next_review - current_date).days
+        if 0 < days_until <= 7:
+            due_this_week.append({'name': client['name'], 'days': days_until})
+
+    birthday_clients = [c['name'] for c in clients if sum(ord(ch) for ch in c['name']) % 12 + 1 == current_date.month]
+
+    overdue_names = [c['name'] for c in overdue_reviews[:3]]
+    on_track = [c['name'] for c in clients if c['name'] not in overdue_names][:3]
+
+    return overdue_reviews, protection_gaps, due_this_week, birthday_clients, on_track
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    # Midnight, so the legacy (datetime - datetime).days matches whole calendar days
+    current_date = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    print(f"{'clients':>10} | {'multi-pass':>12} | {'single-pass':>12} | {'index build':>12} | {'indexed':>12} | speedup")
+    for size in sizes:
+        clients = synthetic_clients(size)
+        legacy_seconds, legacy = timed(legacy_classify, clients, current_date)
+        single_seconds, single = timed(backend._classify_clients, clients, current_date)
+
+        # The briefing reuses one index per clients data version, so the build is paid once
+        build_seconds, review_index = timed(backend.ReviewDateIndex, clients)
+        indexed_seconds, indexed = timed(backend._classify_clients, clients, current_date, review_index)
+
+        for result in (single, indexed):
+            assert len(legacy[0]) == len(result["overdue_reviews"])
+            assert len(legacy[2]) == len(result["due_this_week"])
+            assert legacy[4] == result["on_track"]
+
+        print(f"{size:>10,} | {legacy_seconds * 1000:>9.1f} ms | {single_seconds * 1000:>9.1f} ms | "
+              f"{build_seconds * 1000:>9.1f} ms | {indexed_seconds * 1000:>9.1f} ms | {legacy_seconds / indexed_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
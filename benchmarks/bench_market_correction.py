@@ -0,0 +1,93 @@
+# Benchmark: market correction exposure across the whole book.
+#
+# Generates a synthetic book (1M clients by default) and times finding the
+# clients exposed to a correction with:
+#   - legacy:  the per-client Python loop model_market_correction used
+#   - engine:  scenario_engine columns, one level and many levels in one pass
+# Column building is timed separately; it happens once per clients data version.
+#
+# Usage: python benchmarks/bench_market_correction.py [clients] [levels]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from scenario_engine import ClientArrays, correction_impact, ranked_exposures
+
+def synthetic_clients(count, seed=13):
+    rng = random.Random(seed)
+    clients = []
+    for i in range(count):
+        net_worth = rng.randint(20, 3000) * 1000
+        client = {"name": f"Client {i}", "age": rng.randint(22, 90), "net_worth": net_worth}
+        if rng.random() < 0.7:
+            client["full_data"] = {"assets": {"investments": int(net_worth * rng.uniform(0.1, 0.9))}}
+        clients.append(client)
+    return clients
+
+def legacy_exposures(clients, correction_percent):
+    high_exposure_clients = []
+    for client in clients:
+        full_data = client.get('full_data', {})
+        assets = full_data.get('assets', {})
+        net_worth = client.get('net_worth', 0)
+        age = client.get('age', 50)
+        investments = assets.get('investments', 0)
+        if investments == 0:
+            investments = net_worth * 0.6
+        if age < 40:
+            equity_percent = 0.80
+        elif age < 55:
+            equity_percent = 0.65
+        elif age < 65:
+            equity_percent = 0.50
+        else:
+            equity_percent = 0.35
+        equity_value = investments * equity_percent
+        potential_loss = equity_value * (correction_percent / 100)
+        if potential_loss > (net_worth * 0.1) or potential_loss > 50000:
+            high_exposure_clients.append({"name": client['name'], "potential_loss": potential_loss})
+    high_exposure_clients.sort(key=lambda x: x['potential_loss'], reverse=True)
+    return high_exposure_clients
+
+def main():
+    client_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    level_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    clients = synthetic_clients(client_count)
+    levels = np.linspace(0.05, 0.50, level_count)
+
+    start = time.perf_counter()
+    legacy = legacy_exposures(clients, 20)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    book = ClientArrays.from_clients(clients)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    impact = correction_impact(book, [0.20])
+    top = ranked_exposures(impact, 0, top=5)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    many = correction_impact(book, levels)
+    tops = [ranked_exposures(many, level, top=5) for level in range(level_count)]
+    many_seconds = time.perf_counter() - start
+
+    assert int(impact["exposed"][0].sum()) == len(legacy)
+    assert [book.names[row] for row in top] == [client["name"] for client in legacy[:5]]
+
+    print(f"📊 {client_count:,} clients")
+    print(f"legacy   {legacy_seconds * 1000:9.1f} ms (one 20% level)")
+    print(f"columns  {build_seconds * 1000:9.1f} ms (once per clients data version)")
+    print(f"engine   {single_seconds * 1000:9.1f} ms (one level)   | {legacy_seconds / single_seconds:.1f}x")
+    print(f"engine   {many_seconds * 1000:9.1f} ms ({level_count} levels) | {len(tops)} ranked top-5 lists")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmark: building the client name index as the book grows.
+#
+# Times ClientNameIndex construction over synthetic books of increasing size
+# against the previous build, which kept keys in a list (a linear membership
+# scan per client) and re-sorted each alias's match list on every insert, so
+# build time grew quadratically with shared surnames. The new build is close
+# to linear, so the per-client column stays small as the book grows. The previous
+# build is skipped above LEGACY_LIMIT clients; lookups are checked against it.
+#
+# Usage: python benchmarks/bench_name_index.py [sizes...]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from client_index import ClientNameIndex, name_aliases, normalize_name
+
+FIRST_NAMES = ["Sarah", "David", "Emma", "Lisa", "Michael", "Robert", "Anne", "Brian", "Priya", "Tom"]
+SURNAMES = ["Williams", "Chen", "Jackson", "Patel", "Gurung", "Hughes", "Partridge", "Potter", "Shah", "Evans"]
+LEGACY_LIMIT = 20_000
+
+class LegacyNameIndex:
+    """The previous build: list of keys, sorted [(rank, order, key)] per alias"""
+
+    def __init__(self, entries=()):
+        self._aliases = {}
+        self._order = 0
+        self._keys = []
+        for key, name in entries:
+            self.add(key, name)
+
+    def add(self, key, name):
+        if key not in self._keys:
+            self._keys.append(key)
+        for alias, rank in name_aliases(name):
+            matches = self._aliases.setdefault(alias, [])
+            if not any(existing == key for _, _, existing in matches):
+                matches.append((rank, self._order, key))
+                matches.sort()
+        self._order += 1
+
+    def lookup(self, name):
+        matches = self._aliases.get(normalize_name(name))
+        return matches[0][2] if matches else None
+
+def synthetic_names(count, seed=44):
+    rng = random.Random(seed)
+    return [(i, f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)} {i}") for i in range(count)]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 5_000, 20_000, 100_000]
+    queries = [f"{first} {surname}" for first in FIRST_NAMES for surname in SURNAMES] + SURNAMES + FIRST_NAMES
+
+    print(f"{'clients':>10} | {'previous':>12} | {'index':>12} | {'per client':>11} | speedup")
+    for size in sizes:
+        entries = synthetic_names(size)
+        index_seconds, index = timed(ClientNameIndex, entries)
+
+        if size <= LEGACY_LIMIT:
+            legacy_seconds, legacy = timed(LegacyNameIndex, entries)
+            assert all(legacy.lookup(query) == index.lookup(query, fuzzy=False) for query in queries)
+            previous = f"{legacy_seconds * 1000:>9.1f} ms"
+            speedup = f"{legacy_seconds / index_seconds:.1f}x"
+        else:
+            previous, speedup = f"{'skipped':>12}", "-"
+
+        print(f"{size:>10,} | {previous} | {index_seconds * 1000:>9.1f} ms | "
+              f"{index_seconds / size * 1e6:>8.2f} µs | {speedup}")
+
+if __name__ == "__main__":
+    main()
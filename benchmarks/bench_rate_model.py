@@ -0,0 +1,89 @@
+# Benchmark: interest-rate sweep across the whole book for analyze_interest_rate_impact.
+#
+# Generates synthetic rate records (200k clients by default) and times
+# rate_model.rate_impact for a sweep of flat base-rate targets and for one
+# quarterly rate path, against a per-client Python loop doing the same
+# amortization for one target.
+#
+# Usage: python benchmarks/bench_rate_model.py [clients] [rates]
+
+import math
+import random
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from rate_model import MORTGAGE_SPREAD, RateBook, RatePaths, months_until, rate_impact
+
+TODAY = date(2026, 1, 15)
+
+def synthetic_book(count, seed=29):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        record = {"cash_savings": rng.randint(0, 150) * 1000, "bonds_allocation": rng.uniform(0, 0.5)}
+        if rng.random() < 0.6:
+            record.update(fixed_rate_mortgage=True, mortgage_balance=rng.randint(50, 600) * 1000,
+                          mortgage_rate=rng.uniform(1.5, 5.5), mortgage_term_years=rng.randint(5, 30),
+                          renewal_date=f"{rng.randint(2025, 2030)}-{rng.randint(1, 12):02d}-01")
+        records.append(record)
+    portfolios = [rng.randint(0, 800) * 1000 for _ in records]
+    return records, RateBook.from_records([f"Client {i}" for i in range(count)], records, portfolios)
+
+def loop_changes(book, target):
+    """Payment change at renewal for one flat target, one client at a time"""
+    renewal = np.nan_to_num(months_until(book.renewal_date, TODAY))
+    changes = []
+    for i in range(len(book)):
+        balance, term = book.mortgage_balance[i], book.term_months[i]
+        if not (book.fixed_mortgage[i] and balance > 0):
+            changes.append(0.0)
+            continue
+        rate = book.mortgage_rate[i] / 1200
+        payment = balance * rate / (1 - (1 + rate) ** -term)
+        months = min(renewal[i], term)
+        left = balance * (1 + rate) ** months - payment * ((1 + rate) ** months - 1) / rate
+        new_rate = (target + MORTGAGE_SPREAD) / 1200
+        new_payment = left * new_rate / (1 - (1 + new_rate) ** -max(term - months, 1))
+        changes.append(new_payment - payment)
+    return changes
+
+def main():
+    client_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rate_count = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+    _, book = synthetic_book(client_count)
+    targets = np.linspace(0.5, 6.5, rate_count)
+
+    start = time.perf_counter()
+    loop = loop_changes(book, 3.0)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = rate_impact(book, RatePaths.flat([3.0]), today=TODAY)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sweep = rate_impact(book, RatePaths.flat(targets), today=TODAY)
+    sweep_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    path = rate_impact(book, RatePaths.steps([4.0, 3.75, 3.5, 3.25, 3.0, 3.0, 3.25, 3.5], 3), today=TODAY)
+    path_seconds = time.perf_counter() - start
+
+    assert all(math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-6) for a, b in zip(loop, single["mortgage_monthly_change"][0]))
+
+    print(f"📊 {client_count:,} clients")
+    print(f"loop     {loop_seconds * 1000:9.1f} ms (mortgage refix, one target)")
+    print(f"engine   {single_seconds * 1000:9.1f} ms (one target, mortgage + savings + bonds) | {loop_seconds / single_seconds:.1f}x")
+    print(f"sweep    {sweep_seconds * 1000:9.1f} ms ({rate_count} targets, "
+          f"{int((sweep['mortgage_monthly_change'] > 0).sum()):,} client-scenarios with higher payments)")
+    print(f"path     {path_seconds * 1000:9.1f} ms (8 quarterly steps, net £{path['mortgage_monthly_change'].sum():+,.0f}/month)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Benchmark: book-wide what-if grid for query_scenario_batch.
+#
+# Builds synthetic per-client columns (2k clients by default) and runs the
+# default grid (market corrections, interest rates, care costs, retirement ages)
+# in this process and across a process pool, then times answering a question
+# from the saved .npz file.
+#
+# Usage: python benchmarks/bench_scenario_batch.py [clients] [workers]
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batch_scenarios import DEFAULT_GRID, ScenarioResults, run_batch
+from care_model import CareBook
+from cashflow_model import plan_from_client
+from rate_model import RateBook
+from scenario_engine import ClientArrays
+
+def synthetic_inputs(count, seed=23):
+    rng = random.Random(seed)
+    clients = []
+    for i in range(count):
+        net_worth = rng.randint(20, 3000) * 1000
+        clients.append({"name": f"Client {i}", "age": rng.randint(25, 85), "net_worth": net_worth,
+                        "annual_income": rng.randint(20, 250) * 1000,
+                        "risk_profile": rng.choice(["Low", "Moderate", "High"]),
+                        "full_data": {"assets": {"investments": int(net_worth * rng.uniform(0.1, 0.7)),
+                                                 "cash": rng.randint(0, 100) * 1000}}})
+    arrays = ClientArrays.from_clients(clients)
+    records = [{"fixed_rate_mortgage": True, "mortgage_balance": rng.randint(50, 600) * 1000,
+                "mortgage_rate": rng.uniform(1.5, 5.5), "renewal_date": f"{rng.randint(2025, 2030)}-{rng.randint(1, 12):02d}-01",
+                "cash_savings": rng.randint(0, 150) * 1000, "bonds_allocation": rng.uniform(0, 0.5)}
+               if rng.random() < 0.6 else {"cash_savings": rng.randint(0, 150) * 1000} for _ in clients]
+    rates = RateBook.from_records(arrays.names, records, arrays.investments)
+    care = CareBook.from_records([{"name": c["name"], "age": c["age"],
+                                   "liquid_assets": c["full_data"]["assets"]["investments"] + c["full_data"]["assets"]["cash"],
+                                   "property_value": c["net_worth"] * rng.uniform(0, 0.5), "pension_income": rng.randint(0, 40) * 1000,
+                                   "partner_at_home": rng.random() < 0.5} for c in clients])
+    return {
+        "names": arrays.names, "age": arrays.age, "net_worth": arrays.net_worth,
+        "investments": arrays.investments, "equity_share": arrays.equity_share,
+        "liquid_assets": care.liquid_assets, "property_value": care.property_value,
+        "pension_income": care.pension_income, "partner_at_home": care.partner_at_home,
+        "fixed_mortgage": rates.fixed_mortgage, "mortgage_balance": rates.mortgage_balance,
+        "mortgage_rate": rates.mortgage_rate, "renewal_date": rates.renewal_date, "term_months": rates.term_months,
+        "cash_savings": rates.cash_savings, "bonds_allocation": rates.bonds_allocation, "bond_value": rates.bond_value,
+        "plans": [plan_from_client(c) for c in clients]
+    }
+
+def main():
+    client_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else min(4, os.cpu_count() or 1)
+
+    inputs = synthetic_inputs(client_count)
+    jobs = sum(len(values) for values in DEFAULT_GRID.values())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scenario_results.npz")
+
+        start = time.perf_counter()
+        run_batch(inputs, path, workers=0)
+        serial_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_batch(inputs, path, workers=workers)
+        pool_seconds = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        results = ScenarioResults(path)
+        top = results.top("care_cost", "run_out_probability", 72000)
+        query_seconds = time.perf_counter() - start
+
+    print(f"📊 {client_count:,} clients x {jobs} grid values ({', '.join(DEFAULT_GRID)})")
+    print(f"serial   {serial_seconds:9.2f} s")
+    print(f"pool     {pool_seconds:9.2f} s ({workers} workers) | {serial_seconds / pool_seconds:.1f}x")
+    print(f"file     {size / 2**20:9.2f} MB")
+    print(f"query    {query_seconds * 1000:9.1f} ms (load + rank from the saved file, e.g. {top[0][0]})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Benchmark: semantic search over transcript turns and recommendation rationales.
+#
+# Embeds a synthetic book of speaker turns (100k by default) with the hashing
+# embedder in semantic_index and times top-k retrieval with:
+#   - brute:  one exact matrix-vector product over every vector
+#   - ivf:    the k-means inverted file, scoring only the nprobe closest cells
+# Recall@k is the share of the exact top-k the IVF also returns; "found" is how
+# often a paraphrased query (words dropped and shuffled) retrieves its source turn.
+#
+# Usage: python benchmarks/bench_semantic_index.py [chunks] [queries] [nprobe]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from semantic_index import HashingEmbedder, VectorIndex
+
+WORDS = ("pension isa sipp annuity drawdown mortgage remortgage fixed rate tracker bond gilt equity fund "
+         "trust will probate inheritance estate gift care home nursing redundancy bonus salary dividend "
+         "business sale exit succession divorce marriage baby university fees school retire early late "
+         "protect family cover life income critical illness tax bill relief allowance carry forward "
+         "lump sum transfer consolidate platform ethical esg risk volatility market crash downsizing "
+         "worried concerned comfortable prefer cautious growth buffer cash savings grandchildren children "
+         "house move abroad travel health spouse partner widow sabbatical contract consultancy shares").split()
+
+def synthetic_turns(count, topics=60, seed=3):
+    """Turns drawing most words from one topic's vocabulary, like real conversation"""
+    rng = random.Random(seed)
+    vocabularies = [rng.sample(WORDS, 12) for _ in range(topics)]
+    turns = []
+    for _ in range(count):
+        topic = rng.choice(vocabularies)
+        turns.append(" ".join(rng.choice(topic) if rng.random() < 0.8 else rng.choice(WORDS)
+                              for _ in range(rng.randint(8, 25))))
+    return turns
+
+def paraphrase(turn, rng):
+    words = turn.split()
+    kept = rng.sample(words, max(3, len(words) // 2))
+    return " ".join(kept)
+
+def main():
+    chunk_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    nprobe = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    k = 10
+
+    turns = synthetic_turns(chunk_count)
+    embedder = HashingEmbedder()
+
+    start = time.perf_counter()
+    vectors = embedder.embed(turns)
+    embed_seconds = time.perf_counter() - start
+
+    index = VectorIndex(embedder.dimensions, ivf_threshold=chunk_count + 1, nprobe=nprobe)
+    index.add(vectors, [{"client": f"client_{i % 500}", "id": i} for i in range(chunk_count)])
+    start = time.perf_counter()
+    index.train()
+    train_seconds = time.perf_counter() - start
+
+    rng = random.Random(5)
+    sources = rng.sample(range(chunk_count), query_count)
+    queries = embedder.embed([paraphrase(turns[i], rng) for i in sources])
+
+    start = time.perf_counter()
+    exact = [index.search(q, k, exact=True) for q in queries]
+    brute_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approximate = [index.search(q, k) for q in queries]
+    ivf_seconds = time.perf_counter() - start
+
+    recall = sum(len({m["id"] for _, m in a} & {m["id"] for _, m in e}) for a, e in zip(approximate, exact)) / (k * query_count)
+    found_exact = sum(source in {m["id"] for _, m in e} for source, e in zip(sources, exact)) / query_count
+    found_ivf = sum(source in {m["id"] for _, m in a} for source, a in zip(sources, approximate)) / query_count
+
+    print(f"📊 {chunk_count:,} chunks x {embedder.dimensions} dims ({vectors.nbytes / 2**20:.0f} MB), "
+          f"{query_count} queries, top-{k}")
+    print(f"embed    {embed_seconds / chunk_count * 1e6:9.1f} µs/chunk")
+    print(f"train    {train_seconds * 1000:9.1f} ms ({len(index._centroids)} cells)")
+    print(f"brute    {brute_seconds / query_count * 1000:9.2f} ms/query | found {found_exact:.1%}")
+    print(f"ivf      {ivf_seconds / query_count * 1000:9.2f} ms/query | found {found_ivf:.1%} | "
+          f"recall@{k} {recall:.1%} | nprobe {nprobe} | {brute_seconds / ivf_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
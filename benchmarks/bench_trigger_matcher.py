@@ -0,0 +1,78 @@
+# Benchmark: trigger phrase detection for detect_proactive_moment.
+#
+# Loads a synthetic firm-specific trigger set (10k phrases by default) and
+# times matching a batch of meeting utterances with:
+#   - legacy:  a substring `in` test per phrase, as detect_proactive_moment did
+#   - matcher: the compiled word-level Aho-Corasick automaton in trigger_matcher
+#
+# Usage: python benchmarks/bench_trigger_matcher.py [phrases] [utterances]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trigger_matcher import TriggerMatcher, tokenize
+
+WORDS = ("pension isa sipp annuity drawdown mortgage remortgage fixed rate tracker bond gilt equity fund "
+         "trust will probate inheritance estate gift care home nursing redundancy bonus salary dividend "
+         "business sale exit succession divorce marriage baby university fees school retire early late "
+         "protect family cover life income critical illness tax bill relief allowance carry forward "
+         "lump sum transfer consolidate platform ethical esg risk volatility market crash downsizing").split()
+
+def synthetic_triggers(count, seed=7):
+    rng = random.Random(seed)
+    phrases = set()
+    while len(phrases) < count:
+        phrases.add(" ".join(rng.sample(WORDS, rng.randint(2, 4))))
+    topics = [f"topic_{i % 50}" for i in range(count)]
+    return list(zip(sorted(phrases), topics))
+
+def synthetic_utterances(count, triggers, seed=11):
+    rng = random.Random(seed)
+    utterances = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(15, 40))]
+        if rng.random() < 0.5:
+            words.insert(rng.randint(0, len(words)), rng.choice(triggers)[0])
+        utterances.append(" ".join(words))
+    return utterances
+
+def legacy_match(utterance, triggers):
+    text_lower = utterance.lower()
+    return [(phrase, topic) for phrase, topic in triggers if phrase in text_lower]
+
+def main():
+    phrase_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    utterance_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+
+    triggers = synthetic_triggers(phrase_count)
+    utterances = synthetic_utterances(utterance_count, triggers)
+
+    start = time.perf_counter()
+    matcher = TriggerMatcher(triggers)
+    matcher.compile()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_match(u, triggers) for u in utterances]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [matcher.match(u) for u in utterances]
+    matcher_seconds = time.perf_counter() - start
+
+    # The legacy substring test also fires inside longer words; compare on whole-word hits only
+    for utterance, old, new in zip(utterances, legacy, compiled):
+        padded = f" {' '.join(tokenize(utterance))} "
+        assert {p for p, _ in old if f" {p} " in padded} == {p for p, _ in new}
+
+    print(f"📊 {phrase_count:,} trigger phrases, {utterance_count:,} utterances")
+    print(f"compile  {build_seconds * 1000:9.1f} ms (once per trigger change)")
+    print(f"legacy   {legacy_seconds / utterance_count * 1e6:9.1f} µs/utterance")
+    print(f"matcher  {matcher_seconds / utterance_count * 1e6:9.1f} µs/utterance | {legacy_seconds / matcher_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Benchmark: drawdown analysis for analyze_withdrawal_rates.
+#
+# Builds synthetic retirees (500 by default) and times the Monte Carlo safe-rate
+# search one retiree at a time against one batch for everyone, the backtest over a
+# random 100-year return series (synthetic, for timing only), and a repeat call
+# served from DrawdownCache after one retiree's withdrawal changes.
+#
+# Usage: python benchmarks/bench_withdrawal_model.py [retirees] [paths]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from withdrawal_model import DrawdownCache, historical, monte_carlo, retiree_plan
+
+def synthetic_retirees(count, seed=37):
+    rng = random.Random(seed)
+    plans = []
+    for i in range(count):
+        pot = rng.randint(100, 1500) * 1000
+        plans.append(retiree_plan(f"Retiree {i}", pot, pot * rng.uniform(0.025, 0.07), rng.randint(58, 85),
+                                  rng.choice(["Low", "Low-Moderate", "Moderate", "Moderate-High"])))
+    return plans
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    paths = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    plans = synthetic_retirees(count)
+    rng = np.random.default_rng(41)
+    series = {"years": np.arange(1926, 2026), "returns": rng.normal(0.06, 0.15, 100), "inflation": rng.normal(0.03, 0.02, 100)}
+
+    sample = plans[:50]
+    start = time.perf_counter()
+    for plan in sample:
+        monte_carlo([plan], paths=paths)
+    single_seconds = (time.perf_counter() - start) / len(sample) * count
+
+    start = time.perf_counter()
+    batch = monte_carlo(plans, paths=paths)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backtest = historical(plans, series)
+    history_seconds = time.perf_counter() - start
+
+    cache = DrawdownCache()
+    cache.analyze(plans, series, paths=paths)
+    plans[0] = retiree_plan(plans[0]["name"], plans[0]["pot"], plans[0]["income_target"] * 0.9,
+                            plans[0]["age"], plans[0]["risk_profile"])
+    start = time.perf_counter()
+    cache.analyze(plans, series, paths=paths)
+    cached_seconds = time.perf_counter() - start
+
+    print(f"📊 {count:,} retirees, {paths:,} paths, 1 + 37 withdrawal rates each")
+    print(f"single   {single_seconds * 1000:9.1f} ms (one retiree at a time, extrapolated from {len(sample)})")
+    print(f"batch    {batch_seconds * 1000:9.1f} ms | {single_seconds / batch_seconds:.1f}x "
+          f"| {int((batch['success'] < 0.85).sum()):,} below 85%")
+    print(f"history  {history_seconds * 1000:9.1f} ms ({int(backtest['windows'].max())} start years max)")
+    print(f"cached   {cached_seconds * 1000:9.1f} ms (one withdrawal changed, everyone else from the cache)")
+
+if __name__ == "__main__":
+    main()
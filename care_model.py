@@ -0,0 +1,211 @@
+# 🏥 STANDISH - Care Model
+# Monte Carlo long-term care costs behind model_long_term_care: care onset age and
+# duration are sampled per path, costs inflate to onset and through care, and the
+# means test decides when the local authority steps in. Clients x care types x paths
+# are NumPy arrays, so one family or the whole book is a single loop over care years.
+
+import numpy as np
+
+from cashflow_model import INFLATION, STATE_PENSION
+
+# Annual cost today and median length of stay (years) by care type
+CARE_TYPES = {
+    "home care": (26000, 3.0),
+    "care home": (52000, 2.0),
+    "nursing home": (72000, 1.25)
+}
+DEFAULT_CARE_YEARS = 2.0
+DURATION_SIGMA = 0.8                 # lognormal spread of length of stay
+MAX_CARE_YEARS = 20
+
+# Care onset: Gompertz hazard a * exp(b * age), median onset about 84 from middle age
+ONSET_HAZARD = (7.4e-6, 0.11)
+
+CARE_INFLATION = 0.045
+ASSET_GROWTH = 0.03
+
+# England means test: above the upper capital limit the client pays in full
+UPPER_CAPITAL_LIMIT = 23250
+PROPERTY_DISREGARD_WEEKS = 12
+
+PERCENTILES = (10, 50, 90)
+
+class CareBook:
+    """Care-funding columns of the book (one row per client or family)"""
+
+    def __init__(self, names, age, liquid_assets, property_value, pension_income, partner_at_home):
+        self.names = list(names)
+        self.age = np.asarray(age, dtype=np.float64)
+        self.liquid_assets = np.asarray(liquid_assets, dtype=np.float64)
+        self.property_value = np.asarray(property_value, dtype=np.float64)
+        self.pension_income = np.asarray(pension_income, dtype=np.float64)
+        self.partner_at_home = np.asarray(partner_at_home, dtype=bool)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Columns from dicts with name, age, liquid_assets, property_value,
+        pension_income and partner_at_home. Pension income in care is at least
+        the State Pension, since care almost always starts after it does.
+        """
+        def column(key):
+            return np.array([record.get(key) or 0 for record in records], dtype=np.float64)
+
+        return cls([record['name'] for record in records], column('age'), column('liquid_assets'),
+                   column('property_value'), np.maximum(column('pension_income'), STATE_PENSION),
+                   [bool(record.get('partner_at_home')) for record in records])
+
+def sample_onset_age(age, rng, paths, hazard=ONSET_HAZARD):
+    """(clients, paths) care onset ages from a Gompertz hazard, conditional on reaching today's age"""
+    a, b = hazard
+    uniform = rng.random((len(age), paths))
+    return age[:, None] + np.log1p(-b * np.log(uniform) / (a * np.exp(b * age[:, None]))) / b
+
+def _crossing_percentiles(years):
+    """PERCENTILES over the paths where the line was crossed (nan where it never was)"""
+    # nanpercentile works row by row; sorting puts the inf (never crossed) paths last instead
+    years = np.sort(years, axis=-1)
+    crossed = np.isfinite(years).sum(axis=-1, keepdims=True)
+    position = np.array(PERCENTILES) / 100 * np.maximum(crossed - 1, 0)
+    low = np.floor(position).astype(np.intp)
+    high = np.minimum(low + 1, np.maximum(crossed - 1, 0))
+    below, above = np.take_along_axis(years, low, axis=-1), np.take_along_axis(years, high, axis=-1)
+    with np.errstate(invalid="ignore"):
+        result = below + (above - below) * (position - low)
+    return np.where(crossed > 0, result, np.nan)
+
+def simulate_care(book, annual_costs, median_years=None, paths=5_000, seed=0, care_at_home=None,
+                  inflation=INFLATION):
+    """
+    Monte Carlo care funding for every client under every care cost.
+
+    Each path samples an onset age and a lognormal length of stay (median
+    median_years[k] for cost k). Costs inflate at CARE_INFLATION from today,
+    pension income at inflation and assets grow at ASSET_GROWTH. Each year of
+    care the shortfall of cost over pension income comes out of liquid assets
+    and then, unless care is at home or a partner still lives there, property
+    (counted after the 12-week disregard), down to the upper capital limit;
+    from then on the local authority pays.
+
+    Onsets and stays are shared across cost levels, so levels compare fairly.
+    Returns {"onset_age": (clients,) median, "care_years": (costs,) median,
+    "liquid_years" and "threshold_years": (costs, clients, PERCENTILES) years
+    of care until liquid assets are spent (to zero, or to the limit when the
+    property is disregarded) / capital reaches the limit, over the paths where
+    that happens (nan when it never does), "run_out_probability" and "threshold_probability":
+    (costs, clients) share of paths where that happens, "remaining_capital":
+    (costs, clients, PERCENTILES) capital left when care ends, in today's money}.
+    """
+    rng = np.random.default_rng(seed)
+    costs = np.atleast_1d(np.asarray(annual_costs, dtype=np.float64))
+    if median_years is None:
+        median_years = np.full(len(costs), DEFAULT_CARE_YEARS)
+    median_years = np.broadcast_to(np.asarray(median_years, dtype=np.float64), costs.shape)
+    at_home = np.zeros(len(costs), dtype=bool) if care_at_home is None else np.broadcast_to(care_at_home, costs.shape)
+
+    onset = sample_onset_age(book.age, rng, paths)
+    years_to_onset = onset - book.age[:, None]
+    # One length-of-stay draw per path, scaled by each cost's median
+    relative_stay = np.exp(rng.standard_normal((len(book), paths)) * DURATION_SIGMA)
+
+    # (client, path) cells flattened and ordered longest stay first: scaling keeps the
+    # order for every cost, and the cells still in care in a given year are a leading slice
+    shape = relative_stay.shape
+    order = np.argsort(-relative_stay, axis=None)
+    def cells(array):
+        return np.broadcast_to(array, shape).ravel()[order]
+
+    relative_stay = cells(relative_stay)
+    growth = (1 + ASSET_GROWTH) ** years_to_onset
+    liquid_at_onset = cells(book.liquid_assets[:, None] * growth)
+    property_at_onset = cells(book.property_value[:, None] * growth)
+    partner_at_home = cells(book.partner_at_home[:, None])
+    cost_inflation = cells((1 + CARE_INFLATION) ** years_to_onset)
+    price_level = cells((1 + inflation) ** years_to_onset)
+    income_at_onset = cells(book.pension_income[:, None]) * price_level
+    disregard = PROPERTY_DISREGARD_WEEKS / 52
+
+    outputs = {key: np.empty((len(costs),) + relative_stay.shape) for key in ("liquid", "threshold", "remaining")}
+    for k, annual_cost in enumerate(costs):
+        stay = np.minimum(relative_stay * median_years[k], MAX_CARE_YEARS)
+        counts_property = ~partner_at_home & ~at_home[k]
+        # Without the property in the test, liquid assets only ever fall to the limit
+        liquid_floor = np.where(counts_property, 0.0, UPPER_CAPITAL_LIMIT)
+        liquid, property_value = liquid_at_onset.copy(), property_at_onset.copy()
+        cost = annual_cost * cost_inflation
+        liquid_years = np.full(stay.shape, np.inf)
+        threshold_years = np.full(stay.shape, np.inf)
+        year = 0
+
+        while True:
+            live = slice(0, int(np.searchsorted(-stay, -year, side="left")))
+            if live.stop == 0:
+                break
+            share = np.minimum(stay[live] - year, 1.0)
+            held, home = liquid[live], property_value[live]
+            assessable = held + (np.where(counts_property[live], home, 0.0) if year + 1 > disregard else 0.0)
+            over = np.maximum(assessable - UPPER_CAPITAL_LIMIT, 0.0)
+            available = np.maximum(held - liquid_floor[live], 0.0)
+            need = cost[live] * (1 + CARE_INFLATION) ** year
+            need -= income_at_onset[live] * (1 + inflation) ** year
+            np.maximum(need, 0.0, out=need)
+            need *= share
+
+            # Fractional year in which each line is crossed, first crossing only
+            with np.errstate(divide="ignore", invalid="ignore"):
+                crossed = (need > 0) & (need >= available) & np.isinf(liquid_years[live])
+                np.copyto(liquid_years[live], year + available / need, where=crossed)
+                crossed = (need > 0) & (need >= over) & np.isinf(threshold_years[live])
+                np.copyto(threshold_years[live], year + over / need, where=crossed)
+
+            # The client pays down to the limit: liquid assets first, then property; the council pays the rest
+            paid = np.minimum(need, over)
+            from_liquid = np.minimum(paid, available)
+            step = (1 + ASSET_GROWTH) ** share
+            held -= from_liquid
+            held *= step
+            home -= paid - from_liquid
+            home *= step
+            year += 1
+
+        outputs["liquid"][k, order] = liquid_years
+        outputs["threshold"][k, order] = threshold_years
+        outputs["remaining"][k, order] = (liquid + property_value) / (price_level * (1 + inflation) ** stay)
+
+    shape = (len(costs),) + shape
+    liquid_years, threshold_years = outputs["liquid"].reshape(shape), outputs["threshold"].reshape(shape)
+    return {
+        "onset_age": np.median(onset, axis=-1),
+        "care_years": np.minimum(np.median(relative_stay) * median_years, MAX_CARE_YEARS),
+        "liquid_years": _crossing_percentiles(liquid_years),
+        "threshold_years": _crossing_percentiles(threshold_years),
+        "run_out_probability": np.isfinite(liquid_years).mean(axis=-1),
+        "threshold_probability": np.isfinite(threshold_years).mean(axis=-1),
+        "remaining_capital": np.moveaxis(np.percentile(outputs["remaining"].reshape(shape), PERCENTILES, axis=-1), 0, -1)
+    }
+
+def simulate_care_types(book, care_types=None, paths=5_000, seed=0):
+    """simulate_care() for the named care types, home care keeping the property out of the means test"""
+    care_types = list(care_types or CARE_TYPES)
+    costs, years = zip(*(CARE_TYPES[care_type] for care_type in care_types))
+    return simulate_care(book, costs, years, paths=paths, seed=seed,
+                         care_at_home=np.array([care_type == "home care" for care_type in care_types]))
+
+def simulate_care_book(book, annual_costs, median_years=None, paths=1_000, chunk=512, seed=0):
+    """simulate_care() for a whole book in client chunks so memory stays bounded"""
+    parts = []
+    for start in range(0, len(book), chunk):
+        rows = slice(start, start + chunk)
+        part = CareBook(book.names[rows], book.age[rows], book.liquid_assets[rows], book.property_value[rows],
+                        book.pension_income[rows], book.partner_at_home[rows])
+        parts.append(simulate_care(part, annual_costs, median_years, paths=paths, seed=(seed, start)))
+    if not parts:
+        return {}
+    # Per-client arrays join along the client axis; care_years is per cost only
+    result = {key: np.concatenate([part[key] for part in parts], axis=0 if key == "onset_age" else 1)
+              for key in parts[0] if key != "care_years"}
+    result["care_years"] = parts[0]["care_years"]
+    return result
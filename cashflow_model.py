@@ -0,0 +1,202 @@
+# 💰 STANDISH - Cashflow Model
+# Vectorized Monte Carlo retirement cashflow simulation behind model_cashflow_scenario.
+# Every plan, retirement scenario and market path is one cell of a NumPy array, so a
+# client's 10k paths x 40 years (or the whole book at fewer paths) is one loop over years.
+
+import warnings
+
+import numpy as np
+
+from scenario_engine import DEFAULT_INVESTMENT_SHARE
+
+# (expected annual return, volatility) by risk profile, nominal
+RETURN_ASSUMPTIONS = {
+    "low": (0.035, 0.06),
+    "low-moderate": (0.0425, 0.08),
+    "moderate": (0.05, 0.10),
+    "moderate-high": (0.06, 0.13),
+    "high": (0.07, 0.16)
+}
+INFLATION = 0.025
+STATE_PENSION = 10600
+STATE_PENSION_AGE = 67
+PLAN_TO_AGE = 95
+DEFAULT_RETIREMENT_AGE = 65
+DEFAULT_CONTRIBUTION_RATE = 0.10        # of annual income, when no contribution is on file
+DEFAULT_INCOME_REPLACEMENT = 0.70       # retirement income target as a share of current income
+PERCENTILES = (10, 50, 90)
+
+def plan_from_client(client, recorded=None):
+    """
+    Simulation inputs from a client record. Fields missing from the record come
+    from recorded (figures held elsewhere: "contribution", "income_target",
+    "pension_income", "retirement_age"), then the defaults above. "assumed"
+    lists the inputs that fell back to a default, for the advisor to confirm.
+    """
+    full_data = client.get('full_data') or {}
+    recorded = recorded or {}
+    assets = full_data.get('assets') or {}
+    income = client.get('annual_income') or 0
+    assumed = []
+
+    def value(key, recorded_key, default, label):
+        for source in (full_data.get(key), recorded.get(recorded_key)):
+            if source is not None:
+                return source
+        assumed.append(label)
+        return default
+
+    age = client.get('age')
+    if age is None:
+        age = 50
+        assumed.append("age 50")
+    pot = (assets.get('pensions') or 0) + (assets.get('investments') or 0)
+    if not pot:
+        pot = (client.get('net_worth') or 0) * DEFAULT_INVESTMENT_SHARE
+        assumed.append(f"pot of {DEFAULT_INVESTMENT_SHARE:.0%} of net worth")
+    risk_profile = str(client.get('risk_profile') or "Moderate")
+    mean_return, volatility = RETURN_ASSUMPTIONS.get(risk_profile.lower(), RETURN_ASSUMPTIONS["moderate"])
+    return {
+        "name": client['name'],
+        "age": age,
+        "pot": pot,
+        "contribution": value('annual_contribution', 'contribution', income * DEFAULT_CONTRIBUTION_RATE,
+                              f"contributions of {DEFAULT_CONTRIBUTION_RATE:.0%} of income"),
+        "income_target": value('desired_income', 'income_target', income * DEFAULT_INCOME_REPLACEMENT,
+                               f"income target of {DEFAULT_INCOME_REPLACEMENT:.0%} of income"),
+        "retirement_age": value('retirement_age', 'retirement_age', DEFAULT_RETIREMENT_AGE,
+                                f"planned retirement at {DEFAULT_RETIREMENT_AGE}"),
+        "state_pension": value('state_pension', 'state_pension', STATE_PENSION, "full State Pension"),
+        "pension_income": value('pension_income', 'pension_income', 0.0, "no other pension income"),
+        "risk_profile": risk_profile,
+        "mean_return": mean_return,
+        "volatility": volatility,
+        "assumed": assumed
+    }
+
+def _column(plans, key):
+    return np.array([plan[key] for plan in plans], dtype=np.float64)[:, None, None]
+
+def simulate(plans, retirement_ages, income_scale=1.0, paths=10_000, plan_to_age=PLAN_TO_AGE,
+             state_pension_age=STATE_PENSION_AGE, inflation=INFLATION, seed=0, trajectories=False):
+    """
+    Monte Carlo over (plans, scenarios, paths).
+
+    Scenario s retires at retirement_ages[s] (or [plan][s] for a 2-D array)
+    and draws income_scale[s] x the plan's income target, in today's money
+    and rising with inflation, less any other pension income from retirement
+    and the state pension once it starts. Before
+    retirement the inflation-linked contribution is paid in instead. Cash
+    flows happen at the start of each year, then the pot earns a lognormal
+    return; a path fails in the year the pot cannot pay the income. All
+    scenarios of a plan share the same return paths, so differences between
+    them come from the scenario alone.
+
+    Returns {"success": (plans, scenarios) share of paths lasting to
+    plan_to_age, "pot_at_retirement": (plans, scenarios, PERCENTILES),
+    "depletion_age": (plans, scenarios) median age the money ran out on
+    failed paths (nan when none failed), and with trajectories=True
+    "trajectory": (plans, scenarios, PERCENTILES, years + 1) pot percentiles
+    by year from today}.
+    """
+    rng = np.random.default_rng(seed)
+    age = _column(plans, "age")
+    retirement_ages = np.asarray(retirement_ages, dtype=np.float64)
+    retirement_age = np.maximum((retirement_ages[None, :] if retirement_ages.ndim == 1 else retirement_ages)[:, :, None], age)
+    scale = np.broadcast_to(np.asarray(income_scale, dtype=np.float64), retirement_age.shape[1:2])[None, :, None]
+    income = _column(plans, "income_target") * scale
+    state_pension = _column(plans, "state_pension")
+    pension_income = _column(plans, "pension_income")
+    contribution = _column(plans, "contribution")
+
+    # Lognormal growth factors matching each plan's arithmetic mean and volatility
+    mean, volatility = _column(plans, "mean_return"), _column(plans, "volatility")
+    sigma = np.sqrt(np.log1p(volatility ** 2 / (1 + mean) ** 2))
+    mu = np.log1p(mean) - sigma ** 2 / 2
+
+    shape = (len(plans), retirement_age.shape[1], paths)
+    years = int(max(plan_to_age - age.min(), 0))
+    pot = np.broadcast_to(_column(plans, "pot"), shape).copy()
+    pot_at_retirement = np.zeros(shape)
+    depletion_age = np.full(shape, np.nan)
+    alive = np.ones(shape, dtype=bool)
+    trajectory = np.empty((len(PERCENTILES),) + shape[:2] + (years + 1,)) if trajectories else None
+
+    # Per-year work is a handful of in-place passes over the (plans, scenarios, paths) block
+    for year in range(years + 1):
+        if trajectories:
+            trajectory[..., year] = np.percentile(pot, PERCENTILES, axis=-1)
+        if year == years:
+            break
+        current = age + year
+        indexation = (1 + inflation) ** year
+        np.copyto(pot_at_retirement, pot, where=(current <= retirement_age) & (retirement_age < current + 1))
+
+        active = current < plan_to_age
+        pension = np.where(current >= state_pension_age, state_pension, 0.0)
+        flow = np.where(current < retirement_age, contribution, -np.maximum(income - pension - pension_income, 0.0)) * indexation
+        pot += np.where(active, flow, 0.0)
+        failed = (pot < 0) & alive
+        if failed.any():
+            np.copyto(depletion_age, current, where=failed)
+            alive &= ~failed
+            np.maximum(pot, 0.0, out=pot)
+
+        growth = rng.standard_normal((len(plans), 1, paths), dtype=np.float32)
+        growth *= sigma
+        growth += mu
+        np.exp(growth, out=growth)
+        if active.all():
+            pot *= growth
+        else:
+            np.multiply(pot, growth, out=pot, where=active)
+
+    # Still accumulating at plan_to_age (retirement scenario beyond the horizon)
+    np.copyto(pot_at_retirement, pot, where=age + years <= retirement_age)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median_depletion = np.nanmedian(depletion_age, axis=-1)
+    result = {
+        "success": alive.mean(axis=-1),
+        "pot_at_retirement": np.moveaxis(np.percentile(pot_at_retirement, PERCENTILES, axis=-1), 0, -1),
+        "depletion_age": median_depletion
+    }
+    if trajectories:
+        result["trajectory"] = np.moveaxis(trajectory, 0, -2)
+    return result
+
+def simulate_book(plans, retirement_ages=None, paths=2_000, chunk=256, seed=0, **kwargs):
+    """
+    simulate() for a whole book in client chunks so memory stays bounded.
+
+    retirement_ages defaults to each plan's own retirement age (one scenario).
+    Returns the same arrays as simulate(), one row per plan.
+    """
+    if retirement_ages is None:
+        retirement_ages = np.array([[plan["retirement_age"]] for plan in plans], dtype=np.float64)
+    retirement_ages = np.asarray(retirement_ages, dtype=np.float64)
+    parts = []
+    for start in range(0, len(plans), chunk):
+        ages = retirement_ages if retirement_ages.ndim == 1 else retirement_ages[start:start + chunk]
+        parts.append(simulate(plans[start:start + chunk], ages, paths=paths, seed=(seed, start), **kwargs))
+    if not parts:
+        return {}
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+def sustainable_income(plan, retirement_ages, target=0.85, paths=10_000, seed=0, levels=np.linspace(0.1, 1.5, 29)):
+    """
+    For each retirement age, the highest income (today's money) lasting to
+    the plan horizon in at least target of paths, or None when even the
+    lowest level falls short. Every age x income level pair (multiples of
+    the plan's income target) is one scenario of a single simulate() pass.
+    """
+    retirement_ages = np.atleast_1d(retirement_ages)
+    result = simulate([plan], np.repeat(retirement_ages, len(levels)), income_scale=np.tile(levels, len(retirement_ages)),
+                      paths=paths, seed=seed)
+    success = result["success"][0].reshape(len(retirement_ages), len(levels))
+    incomes = []
+    for row in success:
+        passing = levels[row >= target]
+        incomes.append(float(passing.max() * plan["income_target"]) if len(passing) else None)
+    return incomes
@@ -0,0 +1,129 @@
+# 📚 STANDISH - Client Book
+# Columnar snapshot of the client book shared by the analytics tools: numeric fields
+# as NumPy columns, risk profiles interned to small integer codes, and policy holdings
+# normalized to per-client bitmasks over policy_types' vocabulary. Built once per
+# clients data version, so screens are masks over whole columns instead of walks over
+# nested client dicts.
+
+import re
+
+import numpy as np
+
+from policy_types import policy_bits
+from scenario_engine import ClientArrays
+
+BUSINESS_WORDS = ('business', 'self-employed', 'company', 'director')
+_DATE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})')
+
+class Categories:
+    """Interned labels: each distinct label gets a small integer code, in first-seen order"""
+
+    def __init__(self, labels=()):
+        self.labels = []
+        self._codes = {}
+        for label in labels:
+            self.code(label)
+
+    def code(self, label):
+        """Code for label, interning it if it is new"""
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def get(self, label, default=-1):
+        return self._codes.get(label, default)
+
+    def __getitem__(self, code):
+        return self.labels[code]
+
+    def __len__(self):
+        return len(self.labels)
+
+def _text(values):
+    return " ".join(str(value) for value in values or ()).lower() if not isinstance(values, str) else values.lower()
+
+class ClientBook(ClientArrays):
+    """
+    ClientArrays plus the columns the analytics screens read.
+
+    Numeric fields come straight from the record (recorded_investments is
+    the assets figure on file, without ClientArrays' net-worth fallback).
+    risk_codes index risk_profiles (-1 when none is recorded); policy_bits
+    holds each client's policies normalized to policy_types' vocabulary, for
+    PolicyQuery tests. The objective and birthday columns are derived once
+    from the free-text fields.
+    """
+
+    def __init__(self, names, age, net_worth, investments, equity_share, *, annual_income, recorded_investments,
+                 pensions, cash, children, risk_codes, risk_profiles, policy_bits,
+                 business_owner, education_objective, estate_objective, birthday_months):
+        super().__init__(names, age, net_worth, investments, equity_share)
+        self.annual_income = np.asarray(annual_income, dtype=np.float64)
+        self.recorded_investments = np.asarray(recorded_investments, dtype=np.float64)
+        self.pensions = np.asarray(pensions, dtype=np.float64)
+        self.cash = np.asarray(cash, dtype=np.float64)
+        self.children = np.asarray(children, dtype=np.int16)
+        self.risk_codes = np.asarray(risk_codes, dtype=np.int16)
+        self.risk_profiles = risk_profiles
+        self.policy_bits = np.asarray(policy_bits, dtype=np.uint16)
+        self.business_owner = np.asarray(business_owner, dtype=bool)
+        self.education_objective = np.asarray(education_objective, dtype=bool)
+        self.estate_objective = np.asarray(estate_objective, dtype=bool)
+        self.birthday_months = np.asarray(birthday_months, dtype=np.uint16)
+
+    @classmethod
+    def from_clients(cls, clients):
+        """Snapshot of client dicts, reading each record once"""
+        arrays = ClientArrays.from_clients(clients)
+        keys = ("annual_income", "recorded_investments", "pensions", "cash", "children", "risk_codes", "policy_bits",
+                "business_owner", "education_objective", "estate_objective", "birthday_months")
+        columns = {key: [] for key in keys}
+        risk_profiles = Categories()
+
+        for client in clients:
+            full_data = client.get('full_data') or {}
+            assets = full_data.get('assets') or {}
+            columns["annual_income"].append(client.get('annual_income') or 0)
+            columns["recorded_investments"].append(assets.get('investments') or 0)
+            columns["pensions"].append(assets.get('pensions') or 0)
+            # Cash on file, or "other" assets when no cash figure is recorded
+            columns["cash"].append(assets.get('cash') or assets.get('other') or 0)
+            columns["children"].append((full_data.get('family_situation') or {}).get('children') or 0)
+            columns["risk_codes"].append(risk_profiles.code(client['risk_profile']) if client.get('risk_profile') else -1)
+            columns["policy_bits"].append(policy_bits(full_data.get('existing_policies')))
+
+            objectives = _text(full_data.get('objectives'))
+            described = f"{_text(full_data.get('concerns'))} {objectives}"
+            columns["business_owner"].append(any(word in described for word in BUSINESS_WORDS))
+            columns["education_objective"].append('education' in objectives)
+            columns["estate_objective"].append('estate' in objectives or 'inheritance' in objectives)
+            months = 0
+            for _, month, _ in _DATE.findall(full_data.get('raw_text') or ''):
+                if 1 <= int(month) <= 12:
+                    months |= 1 << int(month)
+            columns["birthday_months"].append(months)
+
+        return cls(arrays.names, arrays.age, arrays.net_worth, arrays.investments, arrays.equity_share,
+                   risk_profiles=risk_profiles, **columns)
+
+    def holding(self, query):
+        """Mask of clients whose policies satisfy a policy_types.PolicyQuery"""
+        return query(self.policy_bits)
+
+    def risk_profile(self, row, default=None):
+        code = self.risk_codes[row]
+        return self.risk_profiles[code] if code >= 0 else default
+
+    def risk_counts(self, default="Unknown"):
+        """{risk profile: clients}, in first-seen order, with clients without one under default"""
+        counts = np.bincount(self.risk_codes + 1, minlength=len(self.risk_profiles) + 1)
+        result = {label: int(count) for label, count in zip(self.risk_profiles.labels, counts[1:])}
+        if counts[0]:
+            result[default] = result.get(default, 0) + int(counts[0])
+        return result
+
+    def born_in(self, month):
+        """Mask of clients with a date in that month in their notes (a possible birthday)"""
+        return (self.birthday_months & np.uint16(1 << month)) != 0
@@ -0,0 +1,190 @@
+# 🗂️ STANDISH - Client Indexes
+# In-memory indexes over the client book, rebuilt per data version by backend.py
+
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from difflib import get_close_matches
+
+def _to_ordinal(value):
+    """Parse a YYYY-MM-DD string (or date) to a day ordinal, None when missing or malformed"""
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return None
+
+def _as_ordinal(as_of):
+    if as_of is None:
+        as_of = date.today()
+    if isinstance(as_of, datetime):
+        as_of = as_of.date()
+    return as_of.toordinal()
+
+class ReviewDateIndex:
+    """
+    Sorted index over each client's last_review and next_review_due.
+
+    Dates are parsed once to day ordinals when the index is built; overdue,
+    due-soon and journey-stage queries are then bisect range lookups instead
+    of a parse-and-scan over the whole book. The index is immutable: writes
+    that change review dates bump the clients data version, and backend.py
+    builds a fresh one.
+    """
+
+    def __init__(self, clients=()):
+        self.clients = list(clients)
+        self._last_by_position = [_to_ordinal(c.get('last_review')) for c in self.clients]
+        next_by_position = [_to_ordinal(c.get('next_review_due')) for c in self.clients]
+        self._last_review = sorted((d, p) for p, d in enumerate(self._last_by_position) if d is not None)
+        self._next_review = sorted((d, p) for p, d in enumerate(next_by_position) if d is not None)
+        self._unreviewed = [p for p, d in enumerate(self._last_by_position) if d is None]
+
+    def __len__(self):
+        return len(self.clients)
+
+    def _range(self, entries, low, high):
+        """Positions whose ordinal is in [low, high], in book order"""
+        start = bisect_left(entries, (low, -1))
+        end = bisect_right(entries, (high, len(self.clients)))
+        return sorted(position for _, position in entries[start:end])
+
+    def reviewed_more_than(self, days, as_of=None):
+        """(client, days_since_review) for clients whose last review was more than `days` days ago"""
+        today = _as_ordinal(as_of)
+        positions = self._range(self._last_review, float("-inf"), today - days - 1)
+        return [(self.clients[p], today - self._last_by_position[p]) for p in positions]
+
+    def due_within(self, days, as_of=None, include_overdue=False):
+        """(client, days_until_due) for next reviews due in the next `days` days (or already due)"""
+        today = _as_ordinal(as_of)
+        low = float("-inf") if include_overdue else today + 1
+        start = bisect_left(self._next_review, (low, -1))
+        end = bisect_right(self._next_review, (today + days, len(self.clients)))
+        entries = sorted(self._next_review[start:end], key=lambda entry: entry[1])
+        return [(self.clients[p], ordinal - today) for ordinal, p in entries]
+
+    def days_since_review(self, position, as_of=None):
+        """Days since a client's last review, None if never reviewed"""
+        last_review = self._last_by_position[position]
+        return None if last_review is None else _as_ordinal(as_of) - last_review
+
+    def journey_stage(self, position, as_of=None):
+        """Journey stage from days since review: 1 = review due, 9 = advice implemented, 5 = post-meeting"""
+        days_since = self.days_since_review(position, as_of)
+        if days_since is None or days_since > 365:
+            return 1
+        if days_since < 30:
+            return 9
+        return 5
+
+    def clients_by_stage(self, as_of=None):
+        """{stage: [clients]} using three range queries over last_review"""
+        today = _as_ordinal(as_of)
+        review_due = self._range(self._last_review, float("-inf"), today - 366) + self._unreviewed
+        implemented = self._range(self._last_review, today - 29, float("inf"))
+        post_meeting = self._range(self._last_review, today - 365, today - 30)
+        return {
+            1: [self.clients[p] for p in sorted(review_due)],
+            5: [self.clients[p] for p in post_meeting],
+            9: [self.clients[p] for p in implemented]
+        }
+
+def normalize_name(name):
+    """Case-fold, drop punctuation and collapse whitespace"""
+    text = re.sub(r"'s\b", "", str(name).casefold())
+    return " ".join(re.sub(r"[^\w\s'-]", " ", text).split())
+
+def name_aliases(name):
+    """Ranked aliases for a name: (alias, rank) with 0 = full name, 1 = surname / family, 2 = first name"""
+    normalized = normalize_name(name)
+    tokens = normalized.split()
+    if not tokens:
+        return []
+    if tokens[-1] == "family" and len(tokens) > 1:
+        tokens = tokens[:-1]
+    surname = tokens[-1]
+    aliases = [(normalized, 0), (" ".join(tokens), 0),
+               (surname, 1), (f"{surname} family", 1), (f"the {surname} family", 1)]
+    if len(tokens) > 1:
+        aliases.append((tokens[0], 2))
+    return aliases
+
+class ClientNameIndex:
+    """
+    Normalized name -> key index with surname and "X Family" aliases.
+
+    Keys are whatever the caller maps names to (a client id, a book position or
+    the store key itself). Exact names win over surnames, surnames over first
+    names; an alias shared by several keys only resolves to the first one added
+    when nothing more specific matches. Typos fall back to difflib matching.
+    """
+
+    FUZZY_CUTOFF = 0.85
+    FUZZY_MIN_LENGTH = 5
+
+    def __init__(self, entries=()):
+        self._aliases = {}      # alias -> {key: (rank, order)}, first entry per key wins
+        self._best = {}         # alias -> (rank, order, key) with the lowest (rank, order)
+        self._order = 0
+        self._keys = {}
+        for key, name in entries:
+            self.add(key, name)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name):
+        return self.lookup(name, fuzzy=False) is not None
+
+    def add(self, key, name):
+        """Index a name (several names may share one key); constant time per alias"""
+        self._keys.setdefault(key, None)
+        for alias, rank in name_aliases(name):
+            keys = self._aliases.setdefault(alias, {})
+            if key not in keys:
+                keys[key] = (rank, self._order)
+                best = self._best.get(alias)
+                if best is None or (rank, self._order) < best[:2]:
+                    self._best[alias] = (rank, self._order, key)
+        self._order += 1
+
+    def _resolve(self, alias):
+        best = self._best.get(alias)
+        return best[2] if best else None
+
+    def lookup(self, name, fuzzy=True):
+        """Key for a name or alias, None when nothing (close enough) matches"""
+        normalized = normalize_name(name)
+        key = self._resolve(normalized)
+        if key is None and fuzzy and len(normalized) >= self.FUZZY_MIN_LENGTH:
+            close = get_close_matches(normalized, list(self._aliases), n=1, cutoff=self.FUZZY_CUTOFF)
+            if close:
+                key = self._resolve(close[0])
+        return key
+
+    def find_in_text(self, text, fuzzy=True):
+        """Key of the most specific name mentioned in free text (e.g. a user query)"""
+        tokens = normalize_name(text).split()
+        best = None
+        for size in (4, 3, 2, 1):
+            for start in range(len(tokens) - size + 1):
+                match = self._best.get(" ".join(tokens[start:start + size]))
+                if match and (best is None or match[:2] < best[:2]):
+                    best = match
+            if best is not None and best[0] == 0:
+                break
+        if best is not None:
+            return best[2]
+
+        if fuzzy:
+            single_aliases = [alias for alias in self._aliases if " " not in alias and len(alias) >= self.FUZZY_MIN_LENGTH]
+            for token in tokens:
+                if len(token) >= self.FUZZY_MIN_LENGTH:
+                    close = get_close_matches(token, single_aliases, n=1, cutoff=self.FUZZY_CUTOFF)
+                    if close:
+                        return self._resolve(close[0])
+        return None
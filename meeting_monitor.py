@@ -0,0 +1,217 @@
+# 🎙️ STANDISH - Live Meeting Monitor
+# Streams a meeting transcript chunk by chunk through the trigger matcher and keeps
+# meeting_context["current_meeting"] in backend.py up to date as the meeting runs.
+#
+# Usage: python meeting_monitor.py --client "Sarah Williams" --file transcript.txt
+#        python meeting_monitor.py --client "Sarah Williams" --socket 127.0.0.1:9000
+
+import codecs
+import re
+import socket
+import time
+from pathlib import Path
+
+from trigger_matcher import TriggerMatcher, tokenize
+
+# Annual review agenda and the phrases that count as having covered each item
+STANDARD_AGENDA = {
+    "portfolio_performance": ["portfolio", "performance", "returns", "fund performance", "investments"],
+    "risk_assessment": ["risk", "attitude to risk", "risk tolerance", "volatility", "capacity for loss"],
+    "protection_review": ["protection", "life insurance", "income protection", "critical illness"],
+    "retirement_planning": ["retire", "retirement", "pension", "drawdown"],
+    "tax_efficiency": ["tax", "isa allowance", "hmrc", "tax efficient"],
+    "estate_planning": ["inheritance", "estate", "iht", "my will", "a will"]
+}
+
+# Proactive trigger topics that also tick off an agenda item
+TRIGGER_TOPIC_AGENDA = {
+    "retirement": "retirement_planning",
+    "protection": "protection_review",
+    "tax": "tax_efficiency",
+    "inheritance": "estate_planning"
+}
+
+_TRAILING_WORD = re.compile(r"[\w']+$")
+
+class MeetingSession:
+    """
+    Incremental view of one live meeting.
+
+    Each chunk is tokenized once and matched together with only the last few
+    tokens of the previous chunk (enough to complete a phrase split across
+    chunks), so the cost of a chunk is proportional to its own length and never
+    to the transcript so far. A word cut off at the end of a chunk is held back
+    until the next chunk or flush(). Each trigger topic produces one suggestion
+    per meeting.
+    """
+
+    def __init__(self, context, matcher_provider, suggest, client="", meeting_type="annual_review",
+                 agenda=STANDARD_AGENDA):
+        self.context = context
+        self._matcher_provider = matcher_provider
+        self._suggest = suggest
+        self._agenda = list(agenda)
+        self._agenda_matcher = TriggerMatcher((phrase, item) for item, phrases in agenda.items() for phrase in phrases)
+        self._agenda_matcher.compile()
+
+        self._pending = ""
+        self._carry = []
+        self._covered = set()
+        self._suggested = set()
+        self._started = time.monotonic()
+        self._chunks = 0
+        self._tokens = 0
+        self._max_latency = 0.0
+
+        context.update({
+            "client": client,
+            "type": meeting_type,
+            "duration": 0,
+            "topics_covered": [],
+            "topics_missed": list(self._agenda),
+            "proactive_suggestions": []
+        })
+
+    def feed(self, chunk, final=False):
+        """Process the next piece of transcript; returns suggestions first triggered by it"""
+        started = time.perf_counter()
+        text = self._pending + chunk
+        self._pending = ""
+        if not final:
+            partial = _TRAILING_WORD.search(text)
+            if partial:
+                self._pending = partial.group()
+                text = text[:partial.start()]
+
+        tokens = tokenize(text)
+        suggestions = []
+        if tokens:
+            matcher = self._matcher_provider()
+            window = self._carry + tokens
+            overlap = len(self._carry)
+
+            for _, end, phrase, topic in matcher.finditer_tokens(window):
+                if end <= overlap:
+                    continue
+                self._cover(TRIGGER_TOPIC_AGENDA.get(topic))
+                if topic not in self._suggested:
+                    self._suggested.add(topic)
+                    suggestion = self._suggest(phrase, topic)
+                    suggestions.append(suggestion)
+                    self.context["proactive_suggestions"].append(suggestion)
+
+            for _, end, _, item in self._agenda_matcher.finditer_tokens(window):
+                if end > overlap:
+                    self._cover(item)
+
+            keep = max(matcher.max_phrase_tokens, self._agenda_matcher.max_phrase_tokens) - 1
+            self._carry = window[-keep:] if keep > 0 else []
+            self._tokens += len(tokens)
+
+        self._chunks += 1
+        self.context["duration"] = int((time.monotonic() - self._started) / 60)
+        self._max_latency = max(self._max_latency, time.perf_counter() - started)
+        return suggestions
+
+    def flush(self):
+        """Process any word held back from the last chunk (call when the feed goes quiet or ends)"""
+        return self.feed("", final=True) if self._pending else []
+
+    def _cover(self, item):
+        if item and item not in self._covered:
+            self._covered.add(item)
+            self.context["topics_covered"] = [topic for topic in self._agenda if topic in self._covered]
+            self.context["topics_missed"] = [topic for topic in self._agenda if topic not in self._covered]
+
+    def stats(self):
+        """Chunks and tokens processed and the slowest chunk, in milliseconds"""
+        return {"chunks": self._chunks, "tokens": self._tokens, "max_latency_ms": round(self._max_latency * 1000, 3)}
+
+def follow_file(path, poll_interval=0.2, from_start=True, stop=None):
+    """
+    Tail a growing transcript file, yielding new text as it is appended and ""
+    whenever nothing new arrived within poll_interval seconds.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as handle:
+        if not from_start:
+            handle.seek(0, 2)
+        while stop is None or not stop.is_set():
+            data = handle.read(65536)
+            if data:
+                yield decoder.decode(data)
+            else:
+                yield ""
+                time.sleep(poll_interval)
+
+def read_socket(address, poll_interval=0.2, stop=None):
+    """
+    Connect to a local transcript feed (host, port) and yield text as it arrives,
+    "" when the feed is quiet for poll_interval seconds; ends when the sender closes.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with socket.create_connection(address) as connection:
+        connection.settimeout(poll_interval)
+        while stop is None or not stop.is_set():
+            try:
+                data = connection.recv(65536)
+            except socket.timeout:
+                yield ""
+                continue
+            if not data:
+                break
+            yield decoder.decode(data)
+        yield decoder.decode(b"", final=True)
+
+def run(session, chunks, on_suggestion=print, flush_after=1.0):
+    """
+    Drive a session from a chunk source. Suggestions are emitted as soon as the
+    chunk completing them arrives; a word left hanging at the end of a chunk is
+    flushed once the feed has been quiet for flush_after seconds, and at the end.
+    """
+    last_data = time.monotonic()
+    for chunk in chunks:
+        if chunk:
+            last_data = time.monotonic()
+            suggestions = session.feed(chunk)
+        elif time.monotonic() - last_data >= flush_after:
+            suggestions = session.flush()
+        else:
+            continue
+        for suggestion in suggestions:
+            on_suggestion(suggestion)
+    for suggestion in session.flush():
+        on_suggestion(suggestion)
+    return session.stats()
+
+def main():
+    import argparse
+    import backend
+
+    parser = argparse.ArgumentParser(description="Monitor a live meeting transcript for proactive moments")
+    parser.add_argument("--client", default="")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="transcript file to tail")
+    source.add_argument("--socket", help="host:port of a local transcript feed")
+    args = parser.parse_args()
+
+    session = backend.start_meeting_session(args.client)
+    if args.file:
+        chunks = follow_file(Path(args.file))
+    else:
+        host, port = args.socket.rsplit(":", 1)
+        chunks = read_socket((host, int(port)))
+
+    def show(suggestion):
+        print(f"🚨 {suggestion['context']} → {suggestion['intent']}")
+        print(f"   Covered: {', '.join(session.context['topics_covered']) or 'nothing yet'}")
+
+    try:
+        stats = run(session, chunks, show)
+    except KeyboardInterrupt:
+        stats = session.stats()
+    print(f"📋 Missed topics: {', '.join(session.context['topics_missed']) or 'none'}")
+    print(f"⏱️ {stats['chunks']} chunks, {stats['tokens']} words, slowest chunk {stats['max_latency_ms']} ms")
+
+if __name__ == "__main__":
+    main()
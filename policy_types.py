@@ -0,0 +1,98 @@
+# 🛡️ STANDISH - Policy Types
+# Policy holdings normalized to a fixed vocabulary of policy types when the book is
+# loaded: each client's existing_policies become one integer with a bit per type, so
+# "has life cover and no income protection" is a bitwise test per client, or one mask
+# over the whole book, with exact type matches instead of substring searches.
+
+import functools
+import re
+
+import numpy as np
+
+# Vocabulary in bit order, with the label patterns (lowercased) that normalize to each
+# type; a label can name several types ("Life and Critical Illness Cover")
+POLICY_TYPES = (
+    ("life", r"\blife\b|\bterm (assurance|cover)\b|\bdeath in service\b"),
+    ("income_protection", r"\bincome protection\b|\bpermanent health\b|\bip\b"),
+    ("critical_illness", r"\bcritical illness\b|\bci cover\b"),
+    ("family_income_benefit", r"\bfamily income benefit\b|\bfib\b"),
+    ("private_medical", r"\bprivate medical\b|\bpmi\b|\bhealth insurance\b"),
+    ("isa", r"\bisas?\b|\bindividual savings account\b"),
+    ("pension", r"\bpensions?\b|\bsipp\b|\bssas\b"),
+    ("investment", r"\bgeneral investment\b|\bgia\b|\binvestment bond\b|\bunit trust\b|\boeic\b|\bportfolio\b"),
+    ("other", None)
+)
+POLICY_BITS = {name: 1 << bit for bit, (name, _) in enumerate(POLICY_TYPES)}
+_PATTERNS = [(POLICY_BITS[name], re.compile(pattern)) for name, pattern in POLICY_TYPES if pattern]
+
+PROTECTION_TYPES = ("life", "income_protection", "critical_illness", "family_income_benefit")
+
+def flags(*types):
+    """Bits for the named policy types (KeyError for a type outside the vocabulary)"""
+    bits = 0
+    for name in types:
+        bits |= POLICY_BITS[name]
+    return bits
+
+@functools.lru_cache(maxsize=4096)
+def normalize_label(label):
+    """Bits for one policy label; labels naming no known type count as "other" """
+    text = str(label).lower()
+    bits = 0
+    for bit, pattern in _PATTERNS:
+        if pattern.search(text):
+            bits |= bit
+    return bits or POLICY_BITS["other"]
+
+def policy_bits(policies):
+    """Bits for a client's existing_policies (a list of labels, or a single label)"""
+    if isinstance(policies, str):
+        policies = [policies]
+    bits = 0
+    for policy in policies or ():
+        if str(policy).strip():
+            bits |= normalize_label(str(policy).strip())
+    return bits
+
+def policy_names(bits):
+    """Policy types set in bits, in vocabulary order"""
+    return [name for name, _ in POLICY_TYPES if int(bits) & POLICY_BITS[name]]
+
+class PolicyQuery:
+    """
+    A test on policy bits: every type in all_of, none in none_of, and at
+    least one type from each any_of group. Works on one client's int or on a
+    whole column (returning a mask); combine queries with &.
+
+        (has("life") & lacks("income_protection"))(book.policy_bits)
+    """
+
+    def __init__(self, all_of=0, none_of=0, any_of=()):
+        self.all_of = all_of
+        self.none_of = none_of
+        self.any_of = tuple(any_of)
+
+    def __and__(self, other):
+        return PolicyQuery(self.all_of | other.all_of, self.none_of | other.none_of, self.any_of + other.any_of)
+
+    def __call__(self, bits):
+        if isinstance(bits, np.ndarray):
+            dtype = bits.dtype.type
+            result = (bits & dtype(self.all_of)) == dtype(self.all_of)
+            result &= (bits & dtype(self.none_of)) == 0
+            for group in self.any_of:
+                result &= (bits & dtype(group)) != 0
+            return result
+        return (bits & self.all_of) == self.all_of and not bits & self.none_of and all(bits & group for group in self.any_of)
+
+def has(*types):
+    """Holds every one of the types"""
+    return PolicyQuery(all_of=flags(*types))
+
+def has_any(*types):
+    """Holds at least one of the types"""
+    return PolicyQuery(any_of=[flags(*types)])
+
+def lacks(*types):
+    """Holds none of the types"""
+    return PolicyQuery(none_of=flags(*types))
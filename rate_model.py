@@ -0,0 +1,175 @@
+# 🏦 STANDISH - Rate Model
+# Interest-rate scenarios over the client book: a base-rate path (a flat target or steps
+# over time) drives mortgage refixes at each client's renewal date with proper
+# amortization, savings income and bond prices via duration. Every client and every
+# scenario path is one cell of a NumPy array, so a sweep over the book is one pass.
+
+from datetime import date
+
+import numpy as np
+
+# Current Bank of England base rate (%), the starting point of every path
+BASE_RATE = 4.0
+
+# Refix mortgage rate = base rate + spread; easy-access savings rate = base rate - spread (floored at 0)
+MORTGAGE_SPREAD = 1.0
+SAVINGS_SPREAD = 0.5
+
+# Remaining mortgage term when none is on file
+DEFAULT_TERM_YEARS = 20
+
+# Bond portfolio sensitivity: modified duration (years) and convexity
+BOND_DURATION = 6.5
+BOND_CONVEXITY = 55.0
+
+# Months of savings income summed for a path (the next year)
+SAVINGS_HORIZON_MONTHS = 12
+
+def months_until(dates, today=None):
+    """Whole months from today to each datetime64 date (0 when already past, nan for NaT)"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    today = np.datetime64(today or date.today(), "D")
+    month_start = dates.astype("datetime64[M]").astype("datetime64[D]")
+    today_start = today.astype("datetime64[M]").astype("datetime64[D]")
+    missing = np.isnat(dates)
+    months = np.where(missing, 0, dates.astype("datetime64[M]") - today.astype("datetime64[M]")).astype(np.float64)
+    months -= (dates - month_start) < (today - today_start)
+    return np.where(missing, np.nan, np.maximum(months, 0.0))
+
+def monthly_payment(balance, annual_rate, months):
+    """Level repayment-mortgage payment; rates in percent, arrays broadcast"""
+    rate = np.asarray(annual_rate, dtype=np.float64) / 1200
+    months = np.maximum(months, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = balance * rate / -np.expm1(-months * np.log1p(rate))
+    return np.where(rate > 0, payment, balance / months)
+
+def balance_after(balance, annual_rate, payment, months):
+    """Outstanding balance after paying payment for months at annual_rate (percent)"""
+    rate = np.asarray(annual_rate, dtype=np.float64) / 1200
+    growth = np.power(1 + rate, months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        paid = np.where(rate > 0, payment * (growth - 1) / rate, payment * months)
+    return np.maximum(balance * growth - paid, 0.0)
+
+class RatePaths:
+    """
+    Base-rate scenarios as step functions sharing one set of change months.
+
+    rates[s, t] is scenario s's base rate from months[t] (months from today)
+    until the next step; months[0] is always 0.
+    """
+
+    def __init__(self, months, rates):
+        self.months = np.asarray(months, dtype=np.float64)
+        self.rates = np.atleast_2d(np.asarray(rates, dtype=np.float64))
+
+    def __len__(self):
+        return len(self.rates)
+
+    @classmethod
+    def flat(cls, rates):
+        """One scenario per rate, each moving straight to it"""
+        return cls([0], np.asarray(rates, dtype=np.float64)[:, None])
+
+    @classmethod
+    def steps(cls, rates, step_months=12):
+        """One scenario moving through rates in turn, one every step_months"""
+        return cls(np.arange(len(rates)) * step_months, [rates])
+
+    def at(self, months):
+        """(scenarios, len(months)) base rate in force at each month offset"""
+        index = np.searchsorted(self.months, np.nan_to_num(months), side="right") - 1
+        return self.rates[:, np.maximum(index, 0)]
+
+    @property
+    def final(self):
+        return self.rates[:, -1]
+
+class RateBook:
+    """Rate-sensitive columns of the book, row i being the i-th client"""
+
+    def __init__(self, names, fixed_mortgage, mortgage_balance, mortgage_rate, renewal_date, term_months,
+                 cash_savings, bonds_allocation, bond_value):
+        self.names = list(names)
+        self.fixed_mortgage = np.asarray(fixed_mortgage, dtype=bool)
+        self.mortgage_balance = np.asarray(mortgage_balance, dtype=np.float64)
+        self.mortgage_rate = np.asarray(mortgage_rate, dtype=np.float64)
+        self.renewal_date = np.asarray(renewal_date, dtype="datetime64[D]")
+        self.term_months = np.asarray(term_months, dtype=np.float64)
+        self.cash_savings = np.asarray(cash_savings, dtype=np.float64)
+        self.bonds_allocation = np.asarray(bonds_allocation, dtype=np.float64)
+        self.bond_value = np.asarray(bond_value, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, names, records, portfolio_values):
+        """
+        Columns from per-client rate records (fixed_rate_mortgage, mortgage_rate,
+        mortgage_balance, renewal_date, cash_savings, bonds_allocation and an
+        optional mortgage_term_years) and each client's invested portfolio, which
+        the bond allocation applies to. Missing fields count as zero.
+        """
+        def column(key, dtype=np.float64):
+            return np.array([record.get(key) or 0 for record in records], dtype=dtype)
+
+        renewal = np.array([str(record.get('renewal_date'))[:10] if record.get('renewal_date') else "NaT"
+                            for record in records], dtype="datetime64[D]")
+        term = np.array([(record.get('mortgage_term_years') or DEFAULT_TERM_YEARS) * 12 for record in records],
+                        dtype=np.float64)
+        bonds = column('bonds_allocation')
+        return cls(names, column('fixed_rate_mortgage', bool), column('mortgage_balance'), column('mortgage_rate'),
+                   renewal, term, column('cash_savings'), bonds, bonds * np.asarray(portfolio_values, dtype=np.float64))
+
+def savings_rate(base_rate, spread=SAVINGS_SPREAD):
+    return np.maximum(np.asarray(base_rate, dtype=np.float64) - spread, 0.0)
+
+def rate_impact(book, paths, today=None, base_rate=BASE_RATE, mortgage_spread=MORTGAGE_SPREAD,
+                savings_spread=SAVINGS_SPREAD, duration=BOND_DURATION, convexity=BOND_CONVEXITY,
+                horizon=SAVINGS_HORIZON_MONTHS):
+    """
+    Every client under every base-rate path in one pass.
+
+    Fixed-rate mortgages amortize at their current rate until renewal (a past
+    or missing date renews now), then the outstanding balance is refixed over
+    the remaining term at the path's base rate that month plus mortgage_spread. Savings earn the base rate
+    less savings_spread, month by month over the horizon. Bonds reprice by
+    duration and convexity for the move from today's base rate to the end of
+    the path.
+
+    Returns (scenarios, clients) arrays: "refix_rate", "mortgage_payment" now
+    and "new_mortgage_payment" and "mortgage_monthly_change" after renewal (0
+    without a fixed mortgage), "savings_income" over the horizon and its
+    "savings_income_change" against today's rate, "bond_value_change" and
+    "bond_change_percent"; plus "has_mortgage" (clients).
+    """
+    has_mortgage = book.fixed_mortgage & (book.mortgage_balance > 0)
+    renewal = np.minimum(np.nan_to_num(months_until(book.renewal_date, today)), book.term_months)
+
+    # Today's level payment, and what is left of the balance when the fix ends
+    payment = monthly_payment(book.mortgage_balance, book.mortgage_rate, book.term_months)
+    outstanding = balance_after(book.mortgage_balance, book.mortgage_rate, payment, renewal)
+    refix_rate = paths.at(renewal) + mortgage_spread
+    new_payment = monthly_payment(outstanding, refix_rate, book.term_months - renewal)
+    change = np.where(has_mortgage, new_payment - payment, 0.0)
+
+    # Savings: average of the monthly savings rate over the horizon, same for every client
+    monthly = savings_rate(paths.at(np.arange(horizon)), savings_spread).mean(axis=1)
+    savings_income = np.multiply.outer(monthly, book.cash_savings) / 100
+    savings_change = savings_income - book.cash_savings * savings_rate(base_rate, savings_spread) / 100
+
+    shift = (paths.final - base_rate) / 100
+    price_change = -duration * shift + 0.5 * convexity * shift ** 2
+    return {
+        "has_mortgage": has_mortgage,
+        "refix_rate": refix_rate,
+        "mortgage_payment": np.where(has_mortgage, payment, 0.0),
+        "new_mortgage_payment": np.where(has_mortgage, new_payment, 0.0),
+        "mortgage_monthly_change": change,
+        "savings_income": savings_income,
+        "savings_income_change": savings_change,
+        "bond_value_change": np.multiply.outer(price_change, book.bond_value),
+        "bond_change_percent": np.broadcast_to((price_change * 100)[:, None], change.shape)
+    }
@@ -0,0 +1,90 @@
+# 📉 STANDISH - Scenario Engine
+# Columnar (NumPy) view of the client book and vectorized market-correction scenarios,
+# used by model_market_correction in backend.py
+
+import numpy as np
+
+# Equity share by age band when a client has no allocation on file: <40, 40-54, 55-64, 65+
+EQUITY_AGE_BANDS = (40, 55, 65)
+EQUITY_SHARES = (0.80, 0.65, 0.50, 0.35)
+
+# Share of net worth assumed invested when no investment figure is on file
+DEFAULT_INVESTMENT_SHARE = 0.6
+
+def equity_share_for_age(age):
+    """Age-banded equity share for an array of ages"""
+    return np.asarray(EQUITY_SHARES)[np.searchsorted(EQUITY_AGE_BANDS, age, side="right")]
+
+class ClientArrays:
+    """
+    The client book as parallel columns, row i being the i-th client in book order.
+
+    Built once per clients data version; scenario functions work on whole
+    columns so their cost does not depend on Python per-client work.
+    """
+
+    def __init__(self, names, age, net_worth, investments, equity_share):
+        self.names = list(names)
+        self.age = np.asarray(age, dtype=np.float64)
+        self.net_worth = np.asarray(net_worth, dtype=np.float64)
+        self.investments = np.asarray(investments, dtype=np.float64)
+        self.equity_share = np.asarray(equity_share, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_clients(cls, clients):
+        """Columns from client dicts; missing investments and equity share fall back to the defaults above"""
+        count = len(clients)
+        age = np.empty(count)
+        net_worth = np.empty(count)
+        investments = np.empty(count)
+        equity_share = np.full(count, np.nan)
+        for i, client in enumerate(clients):
+            full_data = client.get('full_data') or {}
+            client_age = client.get('age', 50)
+            age[i] = 50 if client_age is None else client_age
+            net_worth[i] = client.get('net_worth') or 0
+            investments[i] = (full_data.get('assets') or {}).get('investments') or 0
+            share = full_data.get('equity_share')
+            if share is not None:
+                equity_share[i] = share
+        investments = np.where(investments == 0, net_worth * DEFAULT_INVESTMENT_SHARE, investments)
+        equity_share = np.where(np.isnan(equity_share), equity_share_for_age(age), equity_share)
+        return cls([client['name'] for client in clients], age, net_worth, investments, equity_share)
+
+    @property
+    def equity_value(self):
+        return self.investments * self.equity_share
+
+def correction_impact(book, shocks, loss_share=0.10, loss_floor=50_000):
+    """
+    Losses for every client under every shock in one pass.
+
+    shocks are equity falls as fractions (0.2 for a 20% correction). Returns
+    {"shocks", "equity_value", "loss_ratio", "losses", "exposed"}: losses and
+    exposed are (shocks, clients) arrays so each level is one contiguous row,
+    and loss_ratio is equity value over net worth (0 without net worth). A
+    client is exposed at a level when the loss exceeds loss_share of net
+    worth or loss_floor pounds.
+    """
+    shocks = np.atleast_1d(np.asarray(shocks, dtype=np.float64))
+    equity_value = book.equity_value
+    losses = np.multiply.outer(shocks, equity_value)
+    # "above either limit" is "above the smaller one", so one comparison per cell
+    exposed = losses > np.minimum(book.net_worth * loss_share, loss_floor)
+    loss_ratio = np.divide(equity_value, book.net_worth, out=np.zeros_like(equity_value), where=book.net_worth > 0)
+    return {"shocks": shocks, "equity_value": equity_value, "loss_ratio": loss_ratio,
+            "losses": losses, "exposed": exposed}
+
+def ranked_exposures(impact, level=0, top=None):
+    """Indices of exposed clients at one shock level, largest loss first (book order on ties)"""
+    losses = impact["losses"][level]
+    rows = np.flatnonzero(impact["exposed"][level])
+    if top is not None and len(rows) > top:
+        # Only the rows that can reach the top need a full sort
+        cutoff = np.partition(losses[rows], len(rows) - top)[len(rows) - top]
+        rows = rows[losses[rows] >= cutoff]
+    rows = rows[np.argsort(-losses[rows], kind="stable")]
+    return rows if top is None else rows[:top]
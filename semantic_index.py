@@ -0,0 +1,230 @@
+# 🧭 STANDISH - Semantic Index
+# CPU-only vector search over meeting transcript turns and recommendation rationales.
+# Texts are embedded with feature hashing (words, word pairs and character trigrams),
+# so there is no model to download; search is brute-force NumPy, switching to an IVF
+# (inverted file over k-means cells) once the index grows past ivf_threshold vectors.
+
+import re
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+(?:'\w+)*")
+_SPEAKER = re.compile(r"^[A-Z][\w .'-]{0,30}:\s+")
+
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be been before being but by can could did do does
+doing for from had has have he her here him his how i if in into is it its just let's me my no not now
+of on or our so some than that the their them then there these they this to too up very was we were
+what when where which while who why will with would you your
+""".split())
+
+@lru_cache(maxsize=1 << 18)
+def _slot(feature, dimensions):
+    """Stable (bucket, sign) for a feature; crc32 so vectors are identical across processes"""
+    digest = zlib.crc32(feature.encode())
+    return digest % dimensions, 1.0 if digest & 0x80000000 else -1.0
+
+class HashingEmbedder:
+    """Signed feature hashing into a fixed number of dimensions, L2-normalized"""
+
+    def __init__(self, dimensions=512):
+        self.dimensions = dimensions
+
+    def features(self, text):
+        words = [w for w in _TOKEN.findall(text.casefold()) if w not in STOPWORDS]
+        for word in words:
+            yield "w:" + word, 1.0
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                yield "c:" + padded[i:i + 3], 0.35
+        for first, second in zip(words, words[1:]):
+            yield f"b:{first} {second}", 0.7
+
+    def embed(self, texts):
+        """(len(texts), dimensions) float32 matrix of unit vectors (zero rows for empty text)"""
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vector = matrix[row]
+            for feature, weight in self.features(text):
+                bucket, sign = _slot(feature, self.dimensions)
+                vector[bucket] += sign * weight
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+class VectorIndex:
+    """
+    Append-only matrix of unit vectors with metadata. Each vector's client and
+    kind are interned to integer columns, so filters mask rows before top-k.
+
+    Small indexes are searched exhaustively with one matrix-vector product.
+    Past ivf_threshold vectors a k-means coarse quantizer is trained and only
+    the nprobe closest cells are scored; vectors added later are assigned to
+    their nearest cell, and the quantizer is retrained when the index doubles.
+    """
+
+    def __init__(self, dimensions, ivf_threshold=50_000, nprobe=8):
+        self.dimensions = dimensions
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._vectors = np.zeros((1024, dimensions), dtype=np.float32)
+        self._size = 0
+        self.metadata = []
+        self._clients = np.zeros(1024, dtype=np.int32)
+        self._client_codes = {}
+        self._kinds = np.zeros(1024, dtype=np.int8)
+        self._kind_codes = {}
+        self._centroids = None
+        self._cells = None
+        self._trained_at = 0
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self, extra):
+        needed = self._size + extra
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors))
+            vectors = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            vectors[:self._size] = self._vectors[:self._size]
+            clients = np.zeros(capacity, dtype=np.int32)
+            clients[:self._size] = self._clients[:self._size]
+            kinds = np.zeros(capacity, dtype=np.int8)
+            kinds[:self._size] = self._kinds[:self._size]
+            self._vectors, self._clients, self._kinds = vectors, clients, kinds
+            if self._cells is not None:
+                cells = np.zeros(capacity, dtype=np.int32)
+                cells[:self._size] = self._cells[:self._size]
+                self._cells = cells
+
+    def _client_code(self, client):
+        return self._client_codes.setdefault((client or "").casefold(), len(self._client_codes))
+
+    def _kind_code(self, kind):
+        return self._kind_codes.setdefault(kind or "", len(self._kind_codes))
+
+    def add(self, vectors, metadata):
+        """Append vectors (n, dimensions) with one metadata dict each"""
+        count = len(metadata)
+        if not count:
+            return
+        self._grow(count)
+        start, end = self._size, self._size + count
+        self._vectors[start:end] = vectors
+        self._clients[start:end] = [self._client_code(meta.get("client")) for meta in metadata]
+        self._kinds[start:end] = [self._kind_code(meta.get("kind")) for meta in metadata]
+        self.metadata.extend(metadata)
+        self._size = end
+
+        if self._centroids is not None:
+            self._cells[start:end] = np.argmax(vectors @ self._centroids.T, axis=1)
+        if self._size >= self.ivf_threshold and self._size >= 2 * self._trained_at:
+            self.train()
+
+    def train(self, cells=None, iterations=8, seed=0):
+        """Fit the coarse quantizer (spherical k-means on a sample) and assign every vector to a cell"""
+        vectors = self._vectors[:self._size]
+        cells = cells or max(8, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(self._size, size=min(self._size, cells * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=cells, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            sums[empty] = centroids[empty]
+            norms[empty] = 1.0
+            centroids = sums / norms
+
+        assignment = np.empty(len(self._vectors), dtype=np.int32)
+        for start in range(0, self._size, 65536):
+            block = vectors[start:start + 65536]
+            assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        self._centroids, self._cells, self._trained_at = centroids, assignment, self._size
+
+    def search(self, query, k=5, client=None, kind=None, exact=False):
+        """[(score, metadata)] for the k nearest vectors by cosine, optionally for one client and / or kind only"""
+        if not self._size:
+            return []
+        candidates = None
+        filters = []
+        if client is not None:
+            filters.append((self._clients, self._client_codes.get(client.casefold())))
+        if kind is not None:
+            filters.append((self._kinds, self._kind_codes.get(kind)))
+        for column, code in filters:
+            if code is None:
+                return []
+            rows = column[:self._size] if candidates is None else column[candidates]
+            matches = np.flatnonzero(rows == code)
+            candidates = matches if candidates is None else candidates[matches]
+
+        # A filtered subset no larger than the probed cells' share of rows is scored
+        # exactly: probing would save nothing and could miss rows outside those cells
+        probed_share = 0 if self._centroids is None else self._size * self.nprobe // len(self._centroids)
+        if self._centroids is not None and not exact and (candidates is None or len(candidates) > probed_share):
+            probe = np.argsort(self._centroids @ query)[-self.nprobe:]
+            if candidates is None:
+                candidates = np.flatnonzero(np.isin(self._cells[:self._size], probe))
+            else:
+                candidates = candidates[np.isin(self._cells[candidates], probe)]
+
+        vectors = self._vectors[:self._size] if candidates is None else self._vectors[candidates]
+        scores = vectors @ query
+        k = min(k, len(scores))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = top if candidates is None else candidates[top]
+        return [(float(scores[i]), self.metadata[j]) for i, j in zip(top, ids)]
+
+class SemanticIndex:
+    """
+    Meeting transcript turns and recommendation rationales, embedded and searchable together.
+
+    Any embedder with a dimensions attribute and embed(texts) -> unit-vector
+    matrix can replace the hashing one (e.g. a small local sentence model).
+    """
+
+    def __init__(self, dimensions=512, ivf_threshold=50_000, nprobe=8, embedder=None):
+        self.embedder = embedder or HashingEmbedder(dimensions)
+        self.vectors = VectorIndex(self.embedder.dimensions, ivf_threshold=ivf_threshold, nprobe=nprobe)
+        self._meetings = set()
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def add_texts(self, texts, metadata):
+        self.vectors.add(self.embedder.embed(texts), metadata)
+
+    def add_meeting(self, meeting_id, meeting):
+        """Index each non-empty transcript line (one speaker turn) of a meeting, once"""
+        if meeting_id in self._meetings:
+            return
+        self._meetings.add(meeting_id)
+        turns = [line.strip() for line in meeting.get("transcript", "").splitlines() if line.strip()]
+        # The speaker label is in every turn; embedding it would only pull unrelated turns together
+        self.add_texts([_SPEAKER.sub("", turn) for turn in turns], [
+            {"kind": "transcript", "meeting_id": meeting_id, "client": meeting.get("client", ""),
+             "date": str(meeting.get("date", "")), "text": turn}
+            for turn in turns
+        ])
+
+    def add_recommendation(self, client, rec):
+        text = f"{rec.get('type', '')}: {rec.get('rationale', '')}"
+        self.add_texts([text], [{"kind": "recommendation", "client": client, "date": rec.get("date", ""),
+                                 "type": rec.get("type", ""), "status": rec.get("status", ""),
+                                 "text": rec.get("rationale", "")}])
+
+    def search(self, text, k=5, client=None, kind=None, min_score=0.0):
+        """[(score, metadata)] best first; kind filters to 'transcript' or 'recommendation'"""
+        query = self.embedder.embed([text])[0]
+        if not query.any():
+            return []
+        hits = self.vectors.search(query, k, client=client, kind=kind)
+        return [(score, meta) for score, meta in hits if score >= min_score]
@@ -0,0 +1,170 @@
+# 🔎 STANDISH - Transcript Search
+# Query parsing, match positions and speaker-turn snippets over meeting transcripts,
+# key concerns and action items, used by search_meeting_transcripts in backend.py
+
+import re
+from bisect import bisect_right
+from collections import defaultdict
+
+_TOKEN = re.compile(r"\w+(?:'\w+)*")
+
+# Position gap between fields / list items so phrases never match across them
+FIELD_GAP = 100
+FIELDS = ("transcript", "key_concerns", "action_items")
+
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be been before being but by can could did do does
+doing for from had has have he her here him his how i if in into is it its just me more most my no not
+now of on once only or our out over own same she should so some such than that the their them then there
+these they this those through to too under until up very was we were what when where which while who
+whom why will with would you your yours
+""".split())
+
+def tokenize(text):
+    """Case-folded word tokens"""
+    return _TOKEN.findall(text.casefold())
+
+def parse_query(text, ignore=()):
+    """Split a free-text query into (terms, phrases): quoted text becomes a phrase, the rest loose terms"""
+    phrases = [tokenize(phrase) for phrase in re.findall(r'"([^"]+)"', text)]
+    phrases = [phrase for phrase in phrases if phrase]
+    remainder = re.sub(r'"[^"]*"', " ", text)
+    ignore = set(ignore) | STOPWORDS
+    terms = list(dict.fromkeys(token for token in tokenize(remainder) if token not in ignore))
+    return terms, phrases
+
+class MeetingText:
+    """
+    One meeting's searchable fields as positional tokens (term -> [positions]).
+
+    All fields share one position space, with a gap between fields and
+    between list items so phrases never match across them. Ranking and
+    filtering happen in the advisor store's FTS5 index; this recovers which
+    query terms matched a result and where, for highlighting and snippets.
+    """
+
+    def __init__(self, meeting):
+        self._positions = defaultdict(list)
+        self._offsets = []          # (start, end) of each transcript token
+        position = 0
+        for field in FIELDS:
+            value = meeting.get(field) or []
+            for item in ([value] if isinstance(value, str) else value):
+                for match in _TOKEN.finditer(item):
+                    self._positions[match.group().casefold()].append(position)
+                    if field == "transcript":
+                        self._offsets.append(match.span())
+                    position += 1
+                position += FIELD_GAP
+
+    def _phrase_starts(self, phrase):
+        following = [set(self._positions.get(token, ())) for token in phrase[1:]]
+        return [start for start in self._positions.get(phrase[0], ())
+                if all(start + offset + 1 in positions for offset, positions in enumerate(following))]
+
+    def matches(self, terms=(), phrases=()):
+        """(matched terms and phrases in query order, sorted [(start, length)] hit positions)"""
+        matches = []
+        positions = []
+        for phrase in phrases:
+            starts = self._phrase_starts(phrase)
+            if starts:
+                matches.append(" ".join(phrase))
+                positions.extend((start, len(phrase)) for start in starts)
+        for term in terms:
+            if term in self._positions:
+                matches.append(term)
+                positions.extend((p, 1) for p in self._positions[term])
+        return matches, sorted(positions)
+
+    def snippets(self, transcript, positions, budget=400):
+        """
+        Tightest speaker-turn excerpts around the hit positions from matches().
+
+        Turns (transcript lines such as "Advisor: ...") holding the most hits are
+        kept first until the character budget is spent; a turn longer than the
+        budget is cut down to a window centred on its hits. Matched words are
+        bolded and turns come back in transcript order. Without transcript hits
+        (matches only in concerns or action items) the opening turns are used.
+        """
+        offsets = self._offsets
+        spans = [(offsets[start][0], offsets[min(start + size, len(offsets)) - 1][1])
+                 for start, size in positions if start < len(offsets)]
+
+        turns = []
+        cursor = 0
+        for line in transcript.splitlines(keepends=True):
+            text = line.strip()
+            if text:
+                start = cursor + line.index(text)
+                turns.append((start, start + len(text)))
+            cursor += len(line)
+
+        turn_starts = [start for start, _ in turns]
+        hits_per_turn = defaultdict(list)
+        for span in spans:
+            index = bisect_right(turn_starts, span[0]) - 1
+            if index >= 0 and span[0] < turns[index][1]:
+                hits_per_turn[index].append(span)
+
+        if hits_per_turn:
+            ranked = sorted(hits_per_turn, key=lambda index: (-len(hits_per_turn[index]), index))
+        else:
+            ranked = list(range(len(turns)))
+
+        chosen = {}
+        remaining = budget
+        for index in ranked:
+            start, end = turns[index]
+            if end - start > remaining:
+                if chosen:
+                    if hits_per_turn:
+                        continue
+                    break
+                start, end = _window(transcript, start, end, hits_per_turn.get(index, []), remaining)
+            chosen[index] = (start, end)
+            remaining -= end - start
+            if remaining <= 0:
+                break
+
+        excerpts = []
+        for index in sorted(chosen):
+            start, end = chosen[index]
+            text = _highlight(transcript, start, end, [span for span in spans if start <= span[0] and span[1] <= end])
+            prefix = "…" if start > turns[index][0] else ""
+            suffix = "…" if end < turns[index][1] else ""
+            excerpts.append(f"{prefix}{text}{suffix}")
+        return excerpts
+
+def _window(text, start, end, spans, budget):
+    """Sub-range of text[start:end] at most budget characters long, centred on the hits, cut at word breaks"""
+    centre = (spans[0][0] + spans[-1][1]) // 2 if spans else start + budget // 2
+    window_start = max(start, min(centre - budget // 2, end - budget))
+    window_end = min(end, window_start + budget)
+    if window_start > start:
+        space = text.find(" ", window_start, window_end)
+        if space != -1:
+            window_start = space + 1
+    if window_end < end:
+        space = text.rfind(" ", window_start, window_end)
+        if space != -1:
+            window_end = space
+    return window_start, window_end
+
+def _highlight(text, start, end, spans):
+    """text[start:end] with the hit spans wrapped in ** for markdown"""
+    merged = []
+    for span_start, span_end in sorted(set(spans)):
+        if merged and not text[merged[-1][1]:span_start].strip():
+            merged[-1] = (merged[-1][0], max(merged[-1][1], span_end))
+        else:
+            merged.append((span_start, span_end))
+
+    parts = []
+    cursor = start
+    for span_start, span_end in merged:
+        parts.append(text[cursor:span_start])
+        parts.append(f"**{text[span_start:span_end]}**")
+        cursor = span_end
+    parts.append(text[cursor:end])
+    return "".join(parts)
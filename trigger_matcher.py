@@ -0,0 +1,103 @@
+# 🎯 STANDISH - Trigger Phrase Matcher
+# Aho-Corasick automaton over trigger phrases, used by detect_proactive_moment in backend.py
+
+import re
+from collections import deque
+
+_TOKEN = re.compile(r"\w+(?:'\w+)*")
+
+def tokenize(text):
+    """Case-folded word tokens; phrases and utterances are matched on whole words only"""
+    return _TOKEN.findall(text.casefold())
+
+class TriggerMatcher:
+    """
+    Multi-phrase matcher compiled into a word-level Aho-Corasick automaton.
+
+    Transitions are on whole tokens, so a phrase only matches on word boundaries
+    ("tax bill" does not fire on "syntax bills") and matching an utterance is a
+    single left-to-right pass over its tokens however many phrases are loaded.
+    The automaton is compiled lazily on the first match after phrases change.
+    """
+
+    def __init__(self, phrases=()):
+        self._phrases = []          # (tokens, phrase, payload)
+        self._automaton = None      # (goto, fail, output), swapped in as one tuple
+        self._max_tokens = 0
+        for phrase, payload in phrases:
+            self.add(phrase, payload)
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def add(self, phrase, payload=None):
+        """Add a trigger phrase; empty or punctuation-only phrases are ignored"""
+        tokens = tokenize(phrase)
+        if tokens:
+            self._phrases.append((tokens, phrase, payload))
+            self._max_tokens = max(self._max_tokens, len(tokens))
+            self._automaton = None
+
+    def compile(self):
+        """Build the trie, failure links and merged outputs"""
+        goto, fail, output = [{}], [0], [[]]
+        for index, (tokens, _, _) in enumerate(self._phrases):
+            state = 0
+            for token in tokens:
+                next_state = goto[state].get(token)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][token] = next_state
+                    goto.append({})
+                    fail.append(0)
+                    output.append([])
+                state = next_state
+            output[state].append(index)
+
+        # Breadth-first so every failure target is finished before it is used
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                if state:
+                    fail[child] = goto[fallback].get(token, 0)
+                output[child] = output[child] + output[fail[child]]
+
+        self._automaton = (goto, fail, output)
+        return self._automaton
+
+    @property
+    def max_phrase_tokens(self):
+        """Length in tokens of the longest phrase (how much context a streaming caller must carry)"""
+        return self._max_tokens
+
+    def _scan(self, tokens):
+        """Yield (token_position, phrase_index) for every phrase ending at each token"""
+        goto, fail, output = self._automaton or self.compile()
+
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for index in output[state]:
+                yield position, index
+
+    def finditer(self, text):
+        """Yield (start_token, end_token, phrase, payload) for every phrase occurrence"""
+        return self.finditer_tokens(tokenize(text))
+
+    def finditer_tokens(self, tokens):
+        """finditer over already tokenized text"""
+        for position, index in self._scan(tokens):
+            tokens, phrase, payload = self._phrases[index]
+            yield position - len(tokens) + 1, position + 1, phrase, payload
+
+    def match(self, text):
+        """Distinct (phrase, payload) pairs found in text, in the order phrases were added"""
+        found = {index for _, index in self._scan(tokenize(text))}
+        return [(self._phrases[i][1], self._phrases[i][2]) for i in sorted(found)]
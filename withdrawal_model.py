@@ -0,0 +1,242 @@
+# 🏖️ STANDISH - Withdrawal Model
+# Drawdown sustainability for retired clients behind analyze_withdrawal_rates: Monte
+# Carlo success and safe withdrawal rates on cashflow_model's return assumptions, plus
+# backtests over a supplied historical return series. All retirees and candidate rates
+# are evaluated as one batch, and each retiree's result is kept until their pot or
+# withdrawal changes.
+
+import csv
+import hashlib
+import threading
+import warnings
+from datetime import date
+
+import numpy as np
+
+from cashflow_model import DEFAULT_RETIREMENT_AGE, INFLATION, PLAN_TO_AGE, RETURN_ASSUMPTIONS
+
+# Candidate withdrawal rates (% of today's pot) searched for the safe rate
+RATE_GRID = np.round(np.arange(1.0, 10.01, 0.25), 2)
+SUCCESS_TARGET = 0.85
+DEFAULT_RETIREE_AGE = 67              # when neither the age nor the retirement date is on file
+
+def retiree_age(retirement_date, as_of=None, retirement_age=DEFAULT_RETIREMENT_AGE):
+    """Age today of a client who retired at retirement_age on retirement_date (ISO); None when not parseable"""
+    try:
+        retired = date.fromisoformat(str(retirement_date)[:10])
+    except ValueError:
+        return None
+    as_of = as_of or date.today()
+    years = as_of.year - retired.year - ((as_of.month, as_of.day) < (retired.month, retired.day))
+    return retirement_age + max(years, 0)
+
+def retiree_plan(name, pot, withdrawal, age=None, risk_profile=None, retirement_date=None):
+    """
+    cashflow_model plan for a client already drawing withdrawal a year from pot.
+    Without an age on file it is estimated from retirement_date, then DEFAULT_RETIREE_AGE.
+    """
+    risk_profile = str(risk_profile or "Moderate")
+    mean_return, volatility = RETURN_ASSUMPTIONS.get(risk_profile.lower(), RETURN_ASSUMPTIONS["moderate"])
+    if age is None and retirement_date:
+        age = retiree_age(retirement_date)
+    age = DEFAULT_RETIREE_AGE if age is None else age
+    return {
+        "name": name, "age": age, "pot": float(pot), "contribution": 0.0,
+        "income_target": float(withdrawal), "retirement_age": age,
+        # The withdrawal is what comes out of the pot, so other income does not offset it
+        "state_pension": 0.0, "pension_income": 0.0,
+        "risk_profile": risk_profile, "mean_return": mean_return, "volatility": volatility
+    }
+
+def load_return_series(path):
+    """
+    {"years", "returns", "inflation"} from a CSV with year, return and
+    optional inflation columns (annual, as fractions: 0.07 for 7%). Only a
+    series the advisor supplies is used; nothing is filled in.
+    """
+    with open(path, newline="") as handle:
+        rows = [row for row in csv.DictReader(handle) if row.get("return") not in (None, "")]
+    rows.sort(key=lambda row: int(row["year"]))
+    inflation = [row.get("inflation") for row in rows]
+    return {
+        "years": np.array([int(row["year"]) for row in rows]),
+        "returns": np.array([float(row["return"]) for row in rows]),
+        "inflation": np.array([float(value) for value in inflation]) if all(v not in (None, "") for v in inflation) else None
+    }
+
+def series_fingerprint(series):
+    if series is None:
+        return None
+    digest = hashlib.sha1(series["years"].tobytes() + series["returns"].tobytes())
+    if series["inflation"] is not None:
+        digest.update(series["inflation"].tobytes())
+    return digest.hexdigest()
+
+def _drawdown(plans, draws, paths, plan_to_age=PLAN_TO_AGE, inflation=INFLATION, seed=0):
+    """
+    (plans, scenarios) share of paths still solvent at plan_to_age drawing
+    draws[plan][scenario] a year (inflation-linked, start of year), and the
+    median age scenario 0's failed paths ran out (nan when none did).
+
+    Drawdown only, so the per-year work is one subtraction and one growth
+    multiply over a float32 block: a path that goes negative stays negative,
+    which makes solvency at the end the success test.
+    """
+    rng = np.random.default_rng(seed)
+    age = np.array([plan["age"] for plan in plans], dtype=np.float64)
+    mean = np.array([plan["mean_return"] for plan in plans])[:, None, None]
+    volatility = np.array([plan["volatility"] for plan in plans])[:, None, None]
+    sigma = np.sqrt(np.log1p(volatility ** 2 / (1 + mean) ** 2)).astype(np.float32)
+    mu = (np.log1p(mean) - sigma ** 2 / 2).astype(np.float32)
+
+    pot = np.broadcast_to(np.array([plan["pot"] for plan in plans], dtype=np.float32)[:, None, None],
+                          (len(plans), draws.shape[1], paths)).copy()
+    draws = draws.astype(np.float32)[:, :, None]
+    horizon = np.maximum(plan_to_age - age, 0)
+    depleted_at = np.full((len(plans), paths), np.nan)
+    for year in range(int(horizon.max()) if len(plans) else 0):
+        pot -= draws * np.float32((1 + inflation) ** year) * (horizon > year)[:, None, None]
+        newly = (pot[:, 0] < 0) & np.isnan(depleted_at)
+        depleted_at[newly] = np.broadcast_to((age + year)[:, None], newly.shape)[newly]
+        growth = rng.standard_normal((len(plans), 1, paths), dtype=np.float32)
+        growth *= sigma
+        growth += mu
+        np.exp(growth, out=growth)
+        pot *= growth
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return (pot >= 0).mean(axis=-1), np.nanmedian(depleted_at, axis=-1)
+
+def monte_carlo(plans, rates=RATE_GRID, paths=5_000, target=SUCCESS_TARGET, seed=0, chunk=16):
+    """
+    Success at the current withdrawal and the safe rate for every plan.
+
+    Scenario 0 is each plan's own withdrawal; the rest are rates x pot, all
+    on the same market paths. Plans run in chunks of similar age so a chunk
+    shares its horizon. Returns {"success", "depletion_age" (median where
+    funds ran out), "safe_rate" (highest rate in rates with success >=
+    target, nan if none)} with one entry per plan.
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    success = np.empty((len(plans), len(rates) + 1))
+    depletion_age = np.empty(len(plans))
+    order = sorted(range(len(plans)), key=lambda i: plans[i]["age"])
+    for start in range(0, len(order), chunk):
+        rows = order[start:start + chunk]
+        batch = [plans[i] for i in rows]
+        pots = np.array([plan["pot"] for plan in batch], dtype=np.float64)
+        draws = np.hstack([np.array([[plan["income_target"]] for plan in batch], dtype=np.float64),
+                           np.multiply.outer(pots, rates / 100)])
+        success[rows], depletion_age[rows] = _drawdown(batch, draws, paths, seed=(seed, start))
+    return {"success": success[:, 0], "depletion_age": depletion_age,
+            "safe_rate": _highest_passing(rates, success[:, 1:], target)}
+
+def historical(plans, series, rates=RATE_GRID, target=SUCCESS_TARGET, plan_to_age=PLAN_TO_AGE, inflation=INFLATION):
+    """
+    Backtest every plan over every complete window of the supplied series.
+
+    A window starting in year s replays the series' returns (and inflation,
+    when the series has it) from s for the plan's years to plan_to_age.
+    Returns {"windows" (complete windows per plan), "success" (share of
+    windows surviving at the current withdrawal), "worst_start" (first year
+    of the earliest-failing window, or None), "safe_rate" (highest rate
+    surviving in at least target of windows, nan if none or no windows)}.
+    """
+    returns = series["returns"]
+    prices = series["inflation"] if series["inflation"] is not None else np.full(len(returns), inflation)
+    count = len(plans)
+    pots = np.array([plan["pot"] for plan in plans], dtype=np.float64)
+    withdrawals = np.array([plan["income_target"] for plan in plans], dtype=np.float64)
+    horizon = np.maximum(plan_to_age - np.array([plan["age"] for plan in plans], dtype=np.float64), 1).astype(int)
+    windows = len(returns) - horizon.min() + 1
+    empty = {"windows": np.zeros(count, dtype=int), "success": np.full(count, np.nan),
+             "worst_start": [None] * count, "safe_rate": np.full(count, np.nan)}
+    if windows <= 0:
+        return empty
+
+    # (plans, 1 + rates, windows): the current withdrawal first, then rates x pot
+    draws = np.hstack([withdrawals[:, None], np.multiply.outer(pots, np.asarray(rates) / 100)])[:, :, None]
+    pot = np.broadcast_to(pots[:, None, None], draws.shape[:2] + (windows,)).copy()
+    failed_year = np.full(pot.shape, np.inf)
+    indexation = np.ones(windows)
+    for year in range(min(len(returns), int(horizon.max()))):
+        starts = np.arange(windows) + year
+        usable = starts < len(returns)
+        if not usable.any():
+            break
+        pot -= draws * indexation
+        failing = (pot < 0) & np.isinf(failed_year)
+        failed_year[failing] = year
+        np.maximum(pot, 0.0, out=pot)
+        pot *= np.where(usable, 1 + returns[np.minimum(starts, len(returns) - 1)], 1.0)
+        indexation = indexation * np.where(usable, 1 + prices[np.minimum(starts, len(returns) - 1)], 1.0)
+
+    # A window counts for a plan when the series covers its whole horizon
+    complete = np.arange(windows)[None, :] + horizon[:, None] <= len(returns)
+    survived = (failed_year >= horizon[:, None, None]) & complete[:, None, :]
+    counted = complete.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        success = survived.sum(axis=2) / counted[:, None]
+    first_failure = np.where(complete, failed_year[:, 0, :], np.inf)
+    worst = first_failure.argmin(axis=1)
+    return {
+        "windows": counted,
+        "success": np.where(counted > 0, success[:, 0], np.nan),
+        "worst_start": [int(series["years"][w]) if np.isfinite(first_failure[i, w]) else None for i, w in enumerate(worst)],
+        "safe_rate": np.where(counted > 0, _highest_passing(np.asarray(rates), success[:, 1:], target), np.nan)
+    }
+
+def _highest_passing(rates, success, target):
+    """Highest rate whose success meets target, per row (nan when none does)"""
+    passing = success >= target
+    index = np.where(passing.any(axis=1), len(rates) - 1 - np.argmax(passing[:, ::-1], axis=1), -1)
+    return np.where(index >= 0, rates[np.maximum(index, 0)], np.nan)
+
+class DrawdownCache:
+    """
+    Per-retiree drawdown results, recomputed only for retirees whose inputs changed.
+
+    A result is keyed by everything it depends on (pot, withdrawal, age,
+    risk profile, the return series, paths and target), so a changed pot or
+    withdrawal misses and everyone else is served from the cache. Misses are
+    evaluated together as one batch.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, plans, series=None, paths=5_000, target=SUCCESS_TARGET):
+        """One result dict per plan: rate, success, depletion_age, safe_rate and the historical figures"""
+        series_key = series_fingerprint(series)
+        keys = [(plan["name"], plan["pot"], plan["income_target"], plan["age"], plan["risk_profile"], series_key, paths, target)
+                for plan in plans]
+        with self._lock:
+            missing = [i for i, key in enumerate(keys) if key not in self._results]
+        if missing:
+            batch = [plans[i] for i in missing]
+            simulated = monte_carlo(batch, paths=paths, target=target)
+            backtest = historical(batch, series, target=target) if series is not None else None
+            with self._lock:
+                # Drop superseded entries for these retirees before storing the new ones
+                names = {plans[i]["name"] for i in missing}
+                for key in [key for key in self._results if key[0] in names]:
+                    del self._results[key]
+                for j, i in enumerate(missing):
+                    plan = plans[i]
+                    self._results[keys[i]] = {
+                        "rate": plan["income_target"] / plan["pot"] * 100 if plan["pot"] else float("inf"),
+                        "success": float(simulated["success"][j]),
+                        "depletion_age": float(simulated["depletion_age"][j]),
+                        "safe_rate": float(simulated["safe_rate"][j]),
+                        "historical_windows": int(backtest["windows"][j]) if backtest else 0,
+                        "historical_success": float(backtest["success"][j]) if backtest else float("nan"),
+                        "historical_worst_start": backtest["worst_start"][j] if backtest else None,
+                        "historical_safe_rate": float(backtest["safe_rate"][j]) if backtest else float("nan")
+                    }
+        with self._lock:
+            return [self._results[key] for key in keys]
+
+    def __len__(self):
+        return len(self._results)